@@ -3,7 +3,6 @@ Translation Applet
 Single component handling all translation logic including batch processing
 """
 
-import asyncio
 import time
 from typing import Dict, Any, List, Optional
 from pathlib import Path
@@ -46,28 +45,14 @@ class TranslationApplet:
         try:
             self.logger.info(f"Starting single file translation: {input_path}")
             
-            # Add single job to scheduler
-            job_id = f"single_{Path(input_path).stem}"
-            self.core_manager.add_translation_job(job_id, input_path, output_path)
-            
-            # Start scheduler
-            await self.core_manager.start_scheduler()
-            
-            # Wait for job to complete
-            while True:
-                job_status = self.core_manager.job_scheduler.get_job_status(job_id)
-                if job_status and job_status["total_runs"] > 0:
-                    break
-                await asyncio.sleep(0.1)
-            
-            # Stop scheduler
-            await self.core_manager.stop_scheduler()
+            # Run the job directly, without waiting for a scheduler interval
+            job_result = await self.core_manager.translate_file(input_path, output_path)
             
             # Calculate processing time
             processing_time = time.time() - start_time
             
-            # Check if output file was created
-            if Path(output_path).exists():
+            # Check if the job succeeded and the output file was created
+            if job_result.get("status") == "success" and Path(output_path).exists():
                 # Count words in output
                 word_count = self._count_words_in_file(output_path)
                 
@@ -86,13 +71,13 @@ class TranslationApplet:
                     input_path=input_path,
                     output_path=output_path,
                     status="failed",
-                    error="Output file not created",
+                    error=job_result.get("error", "Output file not created"),
                     processing_time=processing_time
                 )
                 
                 self.logger.error(f"Single file translation failed: {input_path}")
                 return result
-                
+        
         except Exception as e:
             processing_time = time.time() - start_time
             error_msg = f"Translation failed: {str(e)}"
@@ -109,12 +94,14 @@ class TranslationApplet:
             return result
     
     async def translate_batch_from_directory(self, input_dir: str, output_dir: str, 
-                                          pattern: str = "chunk_*.json") -> Dict[str, Any]:
+                                          pattern: str = "chunk_*.json",
+                                          target_languages: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Translate multiple files from directory using batch processing
         :param input_dir: Input directory path
         :param output_dir: Output directory path
         :param pattern: File pattern to match
+        :param target_languages: Languages to translate every file into, written to output_dir/<language>/
         :return: Batch processing summary
         """
         try:
@@ -124,12 +111,13 @@ class TranslationApplet:
             summary = await self.core_manager.process_batch_translation(
                 input_dir=input_dir,
                 output_dir=output_dir,
-                pattern=pattern
+                pattern=pattern,
+                target_languages=target_languages
             )
             
             self.logger.info(f"Batch translation completed: {summary}")
             return summary
-            
+        
         except Exception as e:
             error_msg = f"Batch translation failed: {str(e)}"
             self.logger.error(error_msg)
@@ -143,6 +131,18 @@ class TranslationApplet:
                 "error": error_msg
             }
     
+    def plan_batch_from_directory(self, input_dir: str, pattern: str = "chunk_*.json",
+                                  output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Estimate a batch translation without sending any request
+        :param input_dir: Input directory path
+        :param pattern: File pattern to match
+        :param output_dir: Output directory (files the journal already completed are left out)
+        :return: Plan with request count, tokens, cost and ETA
+        """
+        self.logger.info(f"Planning batch translation from: {input_dir}")
+        return self.core_manager.plan_batch_translation(input_dir, pattern=pattern, output_dir=output_dir)
+    
     async def translate_text(self, text_dict: Dict[str, str]) -> Dict[str, str]:
         """
         Translate text dictionary directly
@@ -152,24 +152,12 @@ class TranslationApplet:
         try:
             self.logger.info("Starting direct text translation")
             
-            # Standardize input
-            standardized_input = self.core_manager.standardizer.standardize(text_dict)
-            
-            # Prepare translation request
-            request_data = self.core_manager._prepare_translation_request(standardized_input)
-            
-            # Send request
-            error_code, response = await self.core_manager.request_manager.send_request(request_data)
-            
-            if error_code != 0:  # ERR_NONE
-                raise RuntimeError(f"Translation request failed with error code: {error_code}")
-            
-            # Validate response
-            validated_response = self.core_manager.validator.validate_and_raise(response)
+            # Translate directly, without going through the job scheduler
+            validated_response = await self.core_manager.translate_text(text_dict)
             
             self.logger.info("Direct text translation completed")
             return validated_response
-            
+        
         except Exception as e:
             error_msg = f"Direct text translation failed: {str(e)}"
             self.logger.error(error_msg)
@@ -222,7 +210,7 @@ class TranslationApplet:
             api_healthy = await self.core_manager.request_manager.health_check()
             
             return api_healthy
-            
+        
         except Exception as e:
             self.logger.error(f"Health check failed: {e}")
             return False
@@ -0,0 +1,201 @@
+"""
+Batch Planner
+Dry run of a batch: token, request, cost and wall-time estimates without any network call
+"""
+
+import bisect
+import heapq
+from typing import Dict, Any, List, Optional, Tuple
+
+from services.common.api_client import message_text
+from services.common.logger import get_logger
+from services.infrastructure import KeyStatus
+from services.translation.dedup_index import DedupIndex
+from services.translation.glossary import GlossaryIndex
+from services.translation.request_packer import RequestPacker, PackedRequest
+
+class BatchPlanner:
+    """Plans a batch the way the pipeline would run it and simulates the key pool's capacity"""
+    
+    def __init__(self, core_manager, completion_ratio: float = 1.2, base_latency: float = 2.0,
+                 latency_per_token: float = 0.002, tokens_per_minute: Optional[int] = None,
+                 input_price_per_million: float = 0.0, output_price_per_million: float = 0.0):
+        """
+        Initialize batch planner
+        :param core_manager: CoreManager providing the standardizer, memory, packing policy and key pool
+        :param completion_ratio: Expected completion tokens per payload token
+        :param base_latency: Expected fixed latency per request in seconds
+        :param latency_per_token: Expected additional latency per completion token in seconds
+        :param tokens_per_minute: Token limit per key per minute (None for no limit)
+        :param input_price_per_million: Price per million prompt tokens
+        :param output_price_per_million: Price per million completion tokens
+        """
+        self.core_manager = core_manager
+        self.completion_ratio = completion_ratio
+        self.base_latency = base_latency
+        self.latency_per_token = latency_per_token
+        self.tokens_per_minute = tokens_per_minute
+        self.input_price_per_million = input_price_per_million
+        self.output_price_per_million = output_price_per_million
+        self.logger = get_logger("BatchPlanner")
+    
+    def plan(self, input_paths: List[str], max_concurrent: int) -> Dict[str, Any]:
+        """
+        Estimate the requests, tokens, cost and duration of translating the given files
+        :param input_paths: Input files, in dispatch order
+        :param max_concurrent: Maximum number of requests in flight
+        :return: Plan dictionary
+        """
+        core_manager = self.core_manager
+        pipeline_config = core_manager.config_manager.get_pipeline_config()
+        dedup_index = DedupIndex() if pipeline_config.get("deduplicate", True) else None
+        # A throwaway glossary index, so planning leaves the batch index and its statistics alone
+        glossary_index = GlossaryIndex(core_manager.glossary) if core_manager.glossary else None
+        
+        # Standardize and claim every file in dispatch order, as the pipeline's load stage would
+        packer = RequestPacker(core_manager.token_counter, core_manager._get_request_token_budget())
+        requests: List[PackedRequest] = []
+        unreadable = []
+        counts = {"total_entries": 0, "cached_entries": 0, "deduplicated_entries": 0, "sent_entries": 0}
+        for index, input_path in enumerate(input_paths):
+            try:
+                standardized_input = core_manager.standardizer.standardize(input_path)
+            except Exception as e:
+                unreadable.append({"input_path": input_path, "error": str(e)})
+                continue
+            cached, pending, hints = core_manager._split_cached_translations(standardized_input, dry_run=True)
+            send, borrowed = dedup_index.claim(index, pending) if dedup_index else (pending, {})
+            if glossary_index:
+                glossary_index.add(index, send)
+            counts["total_entries"] += len(standardized_input)
+            counts["cached_entries"] += len(cached)
+            counts["deduplicated_entries"] += len(borrowed)
+            counts["sent_entries"] += len(send)
+            ready, _ = packer.add(index, send, hints)
+            requests.extend(ready)
+        requests.extend(packer.flush())
+        
+        # Count tokens on the request exactly as it would be sent, static prompt prefix included
+        static_prompt_tokens = self._count_prompt_tokens(core_manager._prepare_translation_request({}))
+        request_tokens = []
+        for packed in requests:
+            glossary = core_manager._select_glossary(packed.origins.values(), glossary_index=glossary_index)
+            prompt_tokens = self._count_prompt_tokens(core_manager._prepare_translation_request(
+                packed.entries, packed.hints, glossary=glossary
+            ))
+            request_tokens.append((prompt_tokens, int(packed.tokens * self.completion_ratio)))
+        
+        prompt_tokens = sum(prompt for prompt, _ in request_tokens)
+        completion_tokens = sum(completion for _, completion in request_tokens)
+        plan = {
+            "total_files": len(input_paths),
+            "unreadable_files": unreadable,
+            **counts,
+            "requests": len(requests),
+            "request_token_budget": packer.token_budget,
+            "static_prompt_tokens": static_prompt_tokens * len(requests),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "estimated_cost": (prompt_tokens * self.input_price_per_million
+                               + completion_tokens * self.output_price_per_million) / 1_000_000,
+            **self._simulate_key_pool(request_tokens, max_concurrent)
+        }
+        
+        self.logger.info(f"Batch plan: {plan['requests']} requests, {plan['total_tokens']} tokens, "
+                         f"ETA {plan['eta_seconds']}s (bound by {plan['bottleneck']})")
+        return plan
+    
+    def _count_prompt_tokens(self, request_data: Dict[str, Any]) -> int:
+        """
+        Count the prompt tokens of a prepared request
+        :param request_data: Request data for API
+        :return: Token estimate over all messages
+        """
+        return sum(self.core_manager.token_counter.count_text(message_text(message))
+                   for message in request_data["messages"])
+    
+    def _simulate_key_pool(self, request_tokens: List[Tuple[int, int]], max_concurrent: int) -> Dict[str, Any]:
+        """
+        Discrete-event simulation of requests dispatched in order over the key pool
+        :param request_tokens: (prompt tokens, completion tokens) per request, in dispatch order
+        :param max_concurrent: Maximum number of requests in flight
+        :return: Key pool figures, ETA, time spent waiting on each rate limit and the limit that bounds the ETA
+        """
+        key_manager = self.core_manager.key_manager
+        num_keys = sum(1 for key in key_manager.keys if key['status'] == KeyStatus.ACTIVE)
+        rpm = key_manager.max_requests_per_minute
+        lanes = max(1, max_concurrent)
+        capacity = {
+            "keys": num_keys,
+            "requests_per_minute": rpm,
+            "tokens_per_minute": self.tokens_per_minute,
+            "max_concurrent": lanes
+        }
+        if not request_tokens:
+            return {**capacity, "eta_seconds": 0.0, "bottleneck": "none"}
+        if not num_keys:
+            return {**capacity, "eta_seconds": None, "bottleneck": "no active keys"}
+        
+        # Per key: sorted start times and the tokens of each request (rate windows are 60 seconds)
+        starts: List[List[float]] = [[] for _ in range(num_keys)]
+        tokens: List[List[int]] = [[] for _ in range(num_keys)]
+        lane_free = [0.0] * lanes
+        waits = {"rpm": 0.0, "tpm": 0.0}
+        eta = 0.0
+        for prompt, completion in request_tokens:
+            lane_time = heapq.heappop(lane_free)
+            # The key that can start soonest takes the request (lowest index on ties, like rotation)
+            start, limit, key = min(
+                (self._earliest_start(starts[k], tokens[k], lane_time, prompt + completion, rpm) + (k,)
+                 for k in range(num_keys)),
+                key=lambda candidate: (candidate[0], candidate[2])
+            )
+            if limit:
+                waits[limit] += start - lane_time
+            position = bisect.bisect(starts[key], start)
+            starts[key].insert(position, start)
+            tokens[key].insert(position, prompt + completion)
+            
+            latency = self.base_latency + self.latency_per_token * completion
+            heapq.heappush(lane_free, start + latency)
+            eta = max(eta, start + latency)
+        
+        if any(waits.values()):
+            bottleneck = max(waits, key=waits.get)
+        else:
+            bottleneck = "concurrency" if len(request_tokens) > lanes else "latency"
+        return {
+            **capacity,
+            "rate_limit_wait_seconds": waits,
+            "eta_seconds": eta,
+            "bottleneck": bottleneck
+        }
+    
+    def _earliest_start(self, starts: List[float], tokens: List[int], not_before: float,
+                        request_tokens: int, rpm: int) -> Tuple[float, Optional[str]]:
+        """
+        Earliest time a key can take a request without exceeding its per-minute limits
+        :param starts: Sorted start times of the key's requests
+        :param tokens: Tokens of the key's requests, aligned with starts
+        :param not_before: Time a lane becomes free
+        :param request_tokens: Tokens of the request to place
+        :param rpm: Requests per minute per key
+        :return: Tuple of (start time, limit that delayed it: "rpm", "tpm" or None)
+        """
+        start, limit = not_before, None
+        while True:
+            # Only requests started in the 60 seconds up to the candidate start count against it
+            window = bisect.bisect_right(starts, start - 60)
+            window_end = bisect.bisect_right(starts, start)
+            in_window = window_end - window
+            if rpm and in_window >= rpm:
+                # Wait until the oldest request that keeps the window full ages out
+                start, limit = starts[window_end - rpm] + 60, "rpm"
+                continue
+            if self.tokens_per_minute:
+                used = sum(tokens[window:window_end])
+                if used + request_tokens > self.tokens_per_minute and in_window:
+                    start, limit = starts[window] + 60, "tpm"
+                    continue
+            return start, limit
@@ -4,16 +4,35 @@ Single entry point for all middleware operations
 """
 
 import asyncio
+import hashlib
 import json
 import time
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Callable, Awaitable
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 
-from services.infrastructure import ConfigManager, APIKeyManager, JobScheduler
-from services.translation import RequestManager, Validator, Standardizer
+from services.infrastructure import (
+    ConfigManager, APIKeyManager, JobScheduler, JobOrdering, JobJournal, JobStatus, AdaptiveConcurrencyController
+)
+from services.infrastructure.job_journal import file_checksum
+from services.translation import (
+    RequestManager, Validator, JSONValidationStrategy, Standardizer, TranslationMemory, FuzzyTranslationMemory, RequestPacker, PayloadEncoding,
+    MarkupMasker, Glossary, GlossaryIndex, StandardizationCache, POStandardizer, XLIFFStandardizer, CSVStandardizer,
+    AnomalyDetector
+)
+from services.translation.payload_encoding import resolve_encoding, encode_payload
+from services.translation.validator import BLOCKING_ISSUES
+from services.translation.anomaly_detector import Anomaly
 from services.common.logger import get_logger
+from services.common.token_counter import TokenCounter
 from services.common.error_codes import ERR_NONE
+from services.translation.validator import ValidationError
+from middleware.worker_pool import WorkerPool
+from middleware.translation_pipeline import TranslationPipeline
+from middleware.batch_planner import BatchPlanner
+
+# OpenRouter model prefixes whose providers only cache prompts up to an explicit cache_control breakpoint
+CACHE_CONTROL_MODEL_PREFIXES = ("anthropic/", "google/gemini")
 
 @dataclass
 class TranslationJob:
@@ -30,22 +49,39 @@ class TranslationJob:
 class CoreManager:
     """Single entry point for all middleware operations"""
     
-    def __init__(self, config_path: str = "config/config.yaml"):
+    def __init__(self, config_path: str = "config/config.yaml", api_keys: Optional[List[str]] = None):
         """
         Initialize core manager
         :param config_path: Path to configuration file
+        :param api_keys: API keys to use instead of config/api_keys.json (used by worker processes)
         """
         self.logger = get_logger("CoreManager")
+        self.config_path = config_path
+        self._api_keys_override = api_keys
         
         # Initialize infrastructure services
         self.config_manager = ConfigManager(config_path)
         self.key_manager = None
         self.job_scheduler = None
+        self.job_journal = None
+        self.concurrency_controller = None
         
         # Initialize translation services
         self.request_manager = None
         self.validator = None
         self.standardizer = None
+        self.token_counter = None
+        self.translation_memory = None
+        self.fuzzy_memory = None
+        self.markup_masker = None
+        self.glossary = None
+        self.glossary_index = None
+        self.prompt_version = None
+        self.dedup_counters: Dict[str, int] = {}
+        self.rerequest_counters: Dict[str, int] = {"rerequests": 0, "rerequested_keys": 0, "unresolved_keys": 0}
+        self.anomaly_detector = None
+        self.anomaly_counters: Dict[str, int] = {}
+        self._prompt_prefixes: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
         
         # Initialize components
         self._initialize_components()
@@ -56,7 +92,10 @@ class CoreManager:
         """Initialize all middleware components"""
         try:
             # Load API keys
-            api_keys = self._load_api_keys()
+            if self._api_keys_override is not None:
+                api_keys = list(self._api_keys_override)
+            else:
+                api_keys = self._load_api_keys()
             
             # Initialize key manager
             api_config = self.config_manager.get_api_config()
@@ -73,25 +112,115 @@ class CoreManager:
                 default_interval=scheduling_config.get("job_delay", 10.0)
             )
             
+            # Initialize job journal
+            journal_config = self.config_manager.get_journal_config()
+            if journal_config.get("enabled", False):
+                self.job_journal = JobJournal(journal_config.get("path", "work_space/job_journal.db"))
+            
+            # Initialize adaptive concurrency controller (sits between scheduler and requests)
+            concurrency_config = self.config_manager.get_concurrency_config()
+            if concurrency_config.get("enabled", False):
+                self.concurrency_controller = AdaptiveConcurrencyController(
+                    initial_limit=concurrency_config.get("initial_limit", 4),
+                    min_limit=concurrency_config.get("min_limit", 1),
+                    max_limit=concurrency_config.get("max_limit") or scheduling_config.get("max_concurrent", 100),
+                    additive_increase=concurrency_config.get("additive_increase", 1.0),
+                    decrease_factor=concurrency_config.get("decrease_factor", 0.5),
+                    latency_spike_factor=concurrency_config.get("latency_spike_factor", 2.0),
+                    cooldown=concurrency_config.get("cooldown", 2.0)
+                )
+            
             # Initialize request manager
             self.request_manager = RequestManager(
                 key_manager=self.key_manager,
                 api_url=api_config.get("url"),
-                config=api_config
+                config=api_config,
+                status_callback=self.concurrency_controller.record_status if self.concurrency_controller else None
             )
             
             # Initialize validator
             validation_config = self.config_manager.get_validation_config()
-            self.validator = Validator()
+            self.validator = Validator(
+                JSONValidationStrategy(
+                    strict=validation_config.get("strict_json", True),
+                    allow_partial=validation_config.get("allow_partial", False),
+                    repair=validation_config.get("repair_json", True)
+                ),
+                blocking_issues=validation_config.get("rerequest_issues", BLOCKING_ISSUES),
+                length_ratio=tuple(validation_config.get("length_ratio", (0.3, 3.0)))
+            )
             
             # Initialize standardizer
             standardization_config = self.config_manager.get_standardization_config()
+            standardization_cache = None
+            if standardization_config.get("cache", False):
+                standardization_cache = StandardizationCache(
+                    standardization_config.get("cache_path", "work_space/standardization_cache.db")
+                )
+                standardization_cache.prune()
             self.standardizer = Standardizer(
-                auto_convert=standardization_config.get("auto_convert", True)
+                auto_convert=standardization_config.get("auto_convert", True),
+                cache=standardization_cache
             )
+            if standardization_config.get("localization_formats", False):
+                sidecar_dir = standardization_config.get("sidecar_dir", "work_space/l10n_maps")
+                csv_columns = standardization_config.get("csv_columns") or {}
+                for localization_standardizer in (
+                    POStandardizer(sidecar_dir, self.standardizer.logger),
+                    XLIFFStandardizer(sidecar_dir, self.standardizer.logger),
+                    CSVStandardizer(
+                        sidecar_dir, self.standardizer.logger,
+                        source_column=csv_columns.get("source", "source"),
+                        target_column=csv_columns.get("target", "target"),
+                        id_column=csv_columns.get("id", "key")
+                    )
+                ):
+                    self.standardizer.add_standardizer(localization_standardizer, position=0)
             
-            self.logger.info("All middleware components initialized")
+            # Initialize token counter
+            tokenizer_config = self.config_manager.get_tokenizer_config()
+            self.token_counter = TokenCounter(
+                tokenizer_name=tokenizer_config.get("name"),
+                chars_per_token=tokenizer_config.get("chars_per_token", 4.0)
+            )
+            
+            # Initialize markup masking (tags and interpolations become placeholders on the wire)
+            if self.config_manager.get_translation_config().get("mask_markup", True):
+                self.markup_masker = MarkupMasker()
+            
+            # Initialize glossary (indexed per batch, injected per request)
+            glossary_config = self.config_manager.get_glossary_config()
+            if glossary_config.get("path"):
+                self.glossary = Glossary.load(glossary_config["path"], glossary_config.get("case_sensitive", False))
+                self.glossary_index = GlossaryIndex(self.glossary)
             
+            # Initialize batch anomaly detection (fed by the pipeline, run once per batch)
+            anomaly_config = self.config_manager.get_anomaly_detection_config()
+            if anomaly_config.get("enabled", True):
+                self.anomaly_detector = AnomalyDetector(
+                    z_threshold=anomaly_config.get("z_threshold", 3.5),
+                    min_script_share=anomaly_config.get("min_script_share", 0.25),
+                    min_group_size=anomaly_config.get("min_group_size", 30)
+                )
+            
+            # Initialize translation memory
+            memory_config = self.config_manager.get_translation_memory_config()
+            if memory_config.get("enabled", False):
+                self.translation_memory = TranslationMemory(
+                    memory_config.get("path", "work_space/translation_memory.db"),
+                    memory_size=memory_config.get("memory_size", 10000)
+                )
+                self.prompt_version = memory_config.get("prompt_version") or self._compute_prompt_version()
+                
+                if memory_config.get("fuzzy", False):
+                    self.fuzzy_memory = FuzzyTranslationMemory(
+                        memory_config.get("path", "work_space/translation_memory.db"),
+                        names=memory_config.get("names") or [],
+                        hint_threshold=memory_config.get("fuzzy_hint_threshold", 0.7)
+                    )
+            
+            self.logger.info("All middleware components initialized")
+        
         except Exception as e:
             self.logger.error(f"Failed to initialize components: {e}")
             raise
@@ -112,7 +241,7 @@ class CoreManager:
             # Fallback to empty list
             self.logger.warning("No API keys found, please configure in config/api_keys.json")
             return []
-            
+        
         except Exception as e:
             self.logger.error(f"Failed to load API keys: {e}")
             return []
@@ -143,12 +272,475 @@ class CoreManager:
         
         # Create job task
         async def translation_task():
-            return await self._execute_translation_job(input_path, output_path)
+            result = await self._execute_translation_job(input_path, output_path)
+            # Surface failures so the scheduler counts them as failed runs
+            if result.get("status") != "success":
+                raise RuntimeError(result.get("error", "Translation job failed"))
+            return result
         
         # Add to scheduler
         self.job_scheduler.add_job(job_id, translation_task, interval)
         self.logger.info(f"Added translation job '{job_id}' for {input_path}")
     
+    async def translate_file(self, input_path: str, output_path: str) -> Dict[str, Any]:
+        """
+        Translate a single file immediately, bypassing interval scheduling
+        :param input_path: Input file path
+        :param output_path: Output file path
+        :return: Job result
+        """
+        return await self._execute_translation_job(input_path, output_path)
+    
+    async def translate_text(self, text_dict: Dict[str, str]) -> Dict[str, str]:
+        """
+        Translate an in-memory text dictionary immediately
+        :param text_dict: Dictionary with text to translate
+        :return: Validated translation dictionary
+        """
+        standardized_input = self.standardizer.standardize(text_dict)
+        return await self._translate_standardized(standardized_input)
+    
+    async def translate_files(self, jobs: List[Tuple[str, str]], max_concurrent: int = 100,
+                              target_languages: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Translate several files immediately through the staged pipeline
+        :param jobs: List of (input_path, output_path) pairs, in dispatch order
+        :param max_concurrent: Maximum number of requests in flight
+        :param target_languages: Languages to translate into, written to <output dir>/<language>/
+                                 (None for translation.target_language, written to output_path)
+        :return: One job result per input and language, in input order
+        """
+        pipeline = self._create_pipeline(max_concurrent)
+        results = await pipeline.run(jobs, target_languages)
+        self.logger.info(f"Pipeline stage statistics: {pipeline.get_pipeline_stats()}")
+        self.logger.info(f"Request packing statistics: {pipeline.get_packing_stats()}")
+        
+        dedup_stats = pipeline.get_dedup_stats()
+        if dedup_stats:
+            self.logger.info(f"Deduplication statistics: {dedup_stats}")
+            for name in ("total_strings", "unique_strings", "fanned_out", "tokens_saved"):
+                self.dedup_counters[name] = self.dedup_counters.get(name, 0) + dedup_stats[name]
+        
+        if self.anomaly_detector is not None and len(self.anomaly_detector):
+            checked = len(self.anomaly_detector)
+            anomalies = await asyncio.to_thread(self.anomaly_detector.detect)
+            self.anomaly_detector.clear()
+            self._report_anomalies(checked, anomalies)
+            # The pipeline owns each job's entries by its (per-language) output path
+            jobs_by_output = {
+                self._language_output_path(output_path, language) if language else output_path: (input_path, language)
+                for input_path, output_path in jobs for language in (target_languages or [None])
+            }
+            await asyncio.to_thread(self._invalidate_anomalies, anomalies, jobs_by_output)
+        return results
+    
+    def anomaly_group(self, target_language: Optional[str] = None) -> str:
+        """
+        Group translated entries are compared within for anomaly detection
+        :param target_language: Target language (None for translation.target_language)
+        :return: "<model>|<source language>-><target language>"
+        """
+        translation_config = self.config_manager.get_translation_config()
+        return (f"{translation_config.get('model', '')}|{translation_config.get('source_language', 'en')}"
+                f"->{self._target_language(target_language)}")
+    
+    def _report_anomalies(self, checked: int, anomalies: List[Anomaly]) -> None:
+        """
+        Append a batch's anomalies to the anomaly report (JSON lines) and count them
+        :param checked: Number of entries the detector checked
+        :param anomalies: Anomalies flagged by the detector
+        """
+        self.anomaly_counters["checked_entries"] = self.anomaly_counters.get("checked_entries", 0) + checked
+        for anomaly in anomalies:
+            self.anomaly_counters[anomaly.kind] = self.anomaly_counters.get(anomaly.kind, 0) + 1
+        if not anomalies:
+            return
+        
+        report_path = Path(self.config_manager.get_anomaly_detection_config().get("report_path", "work_space/anomalies.jsonl"))
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'a', encoding='utf-8') as f:
+            for anomaly in anomalies:
+                f.write(json.dumps(asdict(anomaly), ensure_ascii=False) + "\n")
+        self.logger.warning(f"{len(anomalies)} translation anomalies flagged for re-translation, see {report_path}")
+    
+    def _invalidate_anomalies(self, anomalies: List[Anomaly], jobs_by_output: Dict[str, Tuple[str, Optional[str]]]) -> None:
+        """
+        Make flagged entries translate again on the next run: drop their translations from translation memory
+        and fuzzy memory, and reopen their files in the job journal
+        :param anomalies: Anomalies flagged by the detector
+        :param jobs_by_output: (input path, target language) of each job, keyed by its output path
+        """
+        flagged: Dict[str, Dict[str, str]] = {}
+        for anomaly in anomalies:
+            flagged.setdefault(anomaly.owner, {})[anomaly.key] = anomaly.source
+        
+        for output_path, sources in flagged.items():
+            input_path, target_language = jobs_by_output[output_path]
+            if self.translation_memory:
+                discarded = self.translation_memory.discard(
+                    self._memory_key(source, target_language) for source in sources.values()
+                )
+                self.anomaly_counters["discarded_translations"] = (
+                    self.anomaly_counters.get("discarded_translations", 0) + discarded
+                )
+                if self.fuzzy_memory:
+                    self.fuzzy_memory.discard(sources.values(), self._memory_context(target_language))
+            if self.job_journal:
+                self.job_journal.record_outcome(
+                    input_path, output_path, False,
+                    error=f"Translation anomalies flagged in {len(sources)} entries"
+                )
+    
+    def _create_pipeline(self, max_concurrent: int) -> TranslationPipeline:
+        """
+        Create a translation pipeline from the pipeline configuration
+        :param max_concurrent: Default request worker count
+        :return: TranslationPipeline instance
+        """
+        pipeline_config = self.config_manager.get_pipeline_config()
+        return TranslationPipeline(
+            self,
+            load_workers=pipeline_config.get("load_workers", 2),
+            request_workers=pipeline_config.get("request_workers") or max_concurrent,
+            validate_workers=pipeline_config.get("validate_workers", 2),
+            write_workers=pipeline_config.get("write_workers", 1),
+            queue_size=pipeline_config.get("queue_size", 8),
+            deduplicate=pipeline_config.get("deduplicate", True),
+            token_budget=self._get_request_token_budget()
+        )
+    
+    @staticmethod
+    def _language_output_path(output_path: str, target_language: str) -> str:
+        """
+        Output path of a file for one target language of a multi-language batch
+        :param output_path: Output path in the batch output directory
+        :param target_language: Target language
+        :return: Path in the language's subdirectory of the output directory
+        """
+        path = Path(output_path)
+        return str(path.parent / target_language / path.name)
+    
+    def _get_request_token_budget(self) -> Optional[int]:
+        """
+        Get the target payload tokens per request
+        :return: Token budget, or None to send each input in a single request
+        """
+        return self.config_manager.get_translation_config().get("request_token_budget")
+    
+    async def _translate_standardized(self, standardized_input: Dict[str, str],
+                                      target_language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send standardized input to the API and validate the response
+        :param standardized_input: Standardized text dictionary
+        :param target_language: Target language (None for translation.target_language)
+        :return: Validated translation dictionary
+        """
+        # Serve what we can from translation memory
+        cached, pending, hints = self._split_cached_translations(standardized_input, target_language)
+        if not pending:
+            return cached
+        
+        # Split large inputs into token-budgeted requests and send them concurrently
+        owner = object()
+        self._index_glossary(owner, pending, target_language)
+        packer = RequestPacker(self.token_counter, self._get_request_token_budget(), target_language)
+        requests, _ = packer.add(owner, pending, hints)
+        requests.extend(packer.flush())
+        try:
+            await asyncio.gather(*[self._send_packed_request(packed) for packed in requests])
+        finally:
+            if self.glossary_index:
+                self.glossary_index.discard(owner)
+        
+        # Map request keys back and merge cached translations
+        validated_response, missing = {}, []
+        for packed in requests:
+            for _, translations, missing_keys in packed.split_response(packed.translations):
+                validated_response.update(translations)
+                missing.extend(missing_keys)
+        
+        if missing:
+            # Keep what was translated so the next attempt only sends the missing keys
+            self._store_translations(standardized_input, cached, validated_response, target_language)
+            raise ValidationError(f"{len(missing)} keys still missing or invalid after re-requests")
+        return self._merge_cached_translations(standardized_input, cached, validated_response, target_language)
+    
+    async def _send_packed_request(self, packed, run_blocking: Optional[Callable[..., Awaitable[Any]]] = None) -> None:
+        """
+        Send one packed request, then re-request only the missing or invalid keys
+        until every key is valid or the re-request budget runs out
+        :param packed: PackedRequest to send; its valid translations are stored in packed.translations
+        :param run_blocking: Coroutine function running a blocking call off the event loop, as
+                             run_blocking(func, *args) (None for asyncio.to_thread)
+        """
+        run_blocking = run_blocking or asyncio.to_thread
+        max_rerequests = self.config_manager.get_validation_config().get("max_rerequests", 2)
+        packed.translations = {}
+        pending = packed.entries
+        for attempt in range(max_rerequests + 1):
+            if attempt:
+                self.logger.warning(f"Re-requesting {len(pending)} of {len(packed.entries)} keys "
+                                    f"(attempt {attempt}/{max_rerequests})")
+                self.rerequest_counters["rerequests"] += 1
+                self.rerequest_counters["rerequested_keys"] += len(pending)
+            
+            masked, slots, request_data = await run_blocking(self._prepare_packed_attempt, packed, pending)
+            error_code, response = await self._send_request(request_data)
+            
+            if error_code != ERR_NONE:
+                if not attempt:
+                    raise RuntimeError(f"Translation request failed with error code: {error_code}")
+                # Keep the keys salvaged so far; only the remainder is unresolved
+                self.logger.warning(f"Re-request failed with error code: {error_code}, "
+                                    f"{len(pending)} keys left unresolved")
+                break
+            
+            valid, invalid = await run_blocking(self._salvage_response, response, masked, slots, pending)
+            packed.translations.update(valid)
+            if not invalid:
+                return
+            pending = {key: pending[key] for key in invalid}
+        
+        self.rerequest_counters["unresolved_keys"] += len(pending)
+    
+    def _prepare_packed_attempt(self, packed, pending: Dict[str, Any]
+                                ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        Mask the pending entries of a packed request and build the request data
+        :param packed: PackedRequest being sent
+        :param pending: Entries of this attempt, keyed by request key
+        :return: Tuple of (masked entries, placeholder slots, request data)
+        """
+        # Send markup as placeholders; a translation that loses one is re-requested
+        masked, slots = self.markup_masker.mask(pending) if self.markup_masker else (pending, {})
+        request_data = self._prepare_translation_request(
+            masked, packed.hints, packed.target_language,
+            self._select_glossary((packed.origins[key] for key in pending), packed.target_language)
+        )
+        return masked, slots, request_data
+    
+    def _salvage_response(self, response: Any, masked: Dict[str, Any], slots: Dict[str, Any],
+                          pending: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Parse, repair and validate a response key by key, then restore the masked markup
+        :param response: API response
+        :param masked: Masked entries that were sent
+        :param slots: Placeholder slots returned by the markup masker
+        :param pending: Unmasked entries that were sent
+        :return: Tuple of (valid translations, keys to re-request)
+        """
+        valid, invalid = self.validator.salvage(
+            self._extract_response_content(response), masked, self._payload_encoding(masked)
+        )
+        if slots:
+            valid, rejected = self.markup_masker.unmask(valid, slots)
+            invalid = [key for key in pending if key in invalid or key in rejected]
+        return valid, invalid
+    
+    def _compute_prompt_version(self) -> str:
+        """
+        Derive the prompt version from the prompt texts, so prompt edits invalidate cached translations
+        :return: Short hex digest of the prompts
+        """
+        prompts = json.dumps(self.config_manager.prompts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(prompts.encode('utf-8')).hexdigest()[:16]
+    
+    def _target_language(self, target_language: Optional[str] = None) -> str:
+        """
+        Resolve the target language of a request
+        :param target_language: Explicit target language, or None
+        :return: target_language, or translation.target_language when None
+        """
+        return target_language or self.config_manager.get_translation_config().get("target_language", "")
+    
+    def _memory_key(self, source: str, target_language: Optional[str] = None) -> str:
+        """
+        Build the translation memory key for a source string
+        :param source: Source string
+        :param target_language: Target language (None for translation.target_language)
+        :return: Cache key
+        """
+        translation_config = self.config_manager.get_translation_config()
+        return TranslationMemory.make_key(
+            source,
+            translation_config.get("model", ""),
+            self.prompt_version,
+            self._target_language(target_language)
+        )
+    
+    def _memory_context(self, target_language: Optional[str] = None) -> str:
+        """
+        Identify the translation context (model, prompt version, target language) for fuzzy matching
+        :param target_language: Target language (None for translation.target_language)
+        :return: Context string
+        """
+        translation_config = self.config_manager.get_translation_config()
+        return f"{translation_config.get('model', '')}|{self.prompt_version}|{self._target_language(target_language)}"
+    
+    def _split_cached_translations(self, standardized_input: Dict[str, str], target_language: Optional[str] = None,
+                                   dry_run: bool = False
+                                   ) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, Dict[str, str]]]:
+        """
+        Split standardized input into translation memory hits and entries that still need the API
+        :param standardized_input: Standardized text dictionary
+        :param target_language: Target language (None for translation.target_language)
+        :param dry_run: Look entries up without updating memory statistics or LRU order (batch planning)
+        :return: Tuple of (cached translations, pending source entries, reference hints for pending entries)
+        """
+        if not self.translation_memory:
+            return {}, standardized_input, {}
+        
+        cached, pending, hints = {}, {}, {}
+        context = self._memory_context(target_language) if self.fuzzy_memory else None
+        tokens_saved = 0
+        for key, source in standardized_input.items():
+            cache_key = self._memory_key(source, target_language)
+            translation = self.translation_memory.peek(cache_key) if dry_run else self.translation_memory.get(cache_key)
+            
+            # Exact miss: a template match (only tags, numbers or names differ) is served directly,
+            # a near match is sent along as a reference translation
+            if translation is None and self.fuzzy_memory and isinstance(source, str):
+                match = self.fuzzy_memory.lookup(source, context, record_stats=not dry_run)
+                if match and match.kind == "template":
+                    translation = match.translation
+                elif match:
+                    hints[key] = {"source": match.example_source, "translation": match.example_translation}
+            
+            if translation is None:
+                pending[key] = source
+            else:
+                cached[key] = translation
+                tokens_saved += self.token_counter.count_text(source) + self.token_counter.count_text(translation)
+        
+        if cached and not dry_run:
+            self.translation_memory.record_tokens_saved(tokens_saved)
+        return cached, pending, hints
+    
+    def _merge_cached_translations(self, standardized_input: Dict[str, str], cached: Dict[str, str],
+                                   validated_response: Dict[str, Any],
+                                   target_language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Store new translations in translation memory and merge cached ones back in input order
+        :param standardized_input: Full standardized text dictionary
+        :param cached: Translations served from memory
+        :param validated_response: Validated API translations for the pending entries
+        :param target_language: Target language (None for translation.target_language)
+        :return: Complete translation dictionary
+        """
+        if not self.translation_memory:
+            return validated_response
+        
+        self._store_translations(standardized_input, cached, validated_response, target_language)
+        if not cached:
+            return validated_response
+        
+        merged = {}
+        for key in standardized_input:
+            if key in cached:
+                merged[key] = cached[key]
+            elif key in validated_response:
+                merged[key] = validated_response[key]
+        # Keep anything extra the model returned, as without translation memory
+        for key, value in validated_response.items():
+            merged.setdefault(key, value)
+        return merged
+    
+    def _store_translations(self, standardized_input: Dict[str, str], cached: Dict[str, str],
+                            translations: Dict[str, Any], target_language: Optional[str] = None) -> None:
+        """
+        Store new translations in translation memory
+        :param standardized_input: Full standardized text dictionary
+        :param cached: Translations served from memory (not stored again)
+        :param translations: Validated API translations
+        :param target_language: Target language (None for translation.target_language)
+        """
+        if not self.translation_memory:
+            return
+        
+        translation_config = self.config_manager.get_translation_config()
+        new_entries = {}
+        for key, translation in translations.items():
+            source = standardized_input.get(key)
+            if key in cached or not isinstance(source, str) or not isinstance(translation, str):
+                continue
+            new_entries[self._memory_key(source, target_language)] = {
+                "source": source,
+                "translation": translation,
+                "model": translation_config.get("model"),
+                "prompt_version": self.prompt_version,
+                "target_language": self._target_language(target_language)
+            }
+        self.translation_memory.put_many(new_entries)
+        if self.fuzzy_memory:
+            self.fuzzy_memory.add_many(
+                {entry["source"]: entry["translation"] for entry in new_entries.values()},
+                self._memory_context(target_language)
+            )
+    
+    def _get_memory_counters(self) -> Dict[str, int]:
+        """
+        Snapshot translation memory counters used in batch summaries
+        :return: Counter dictionary (empty when translation memory is disabled)
+        """
+        if not self.translation_memory:
+            return {}
+        stats = self.translation_memory.get_memory_stats()
+        counters = {name: stats[name] for name in ("memory_hits", "disk_hits", "misses", "tokens_saved")}
+        if self.fuzzy_memory:
+            fuzzy_stats = self.fuzzy_memory.get_fuzzy_stats()
+            counters["fuzzy_template_hits"] = fuzzy_stats["template_hits"]
+            counters["fuzzy_near_hits"] = fuzzy_stats["near_hits"]
+        return counters
+    
+    def _summarize_memory_counters(self, counters: Dict[str, int]) -> Optional[Dict[str, Any]]:
+        """
+        Build the translation memory part of a batch summary
+        :param counters: Counters accumulated during the batch
+        :return: Hit rate and tokens saved, or None when translation memory is disabled
+        """
+        if not counters:
+            return None
+        hits = counters.get("memory_hits", 0) + counters.get("disk_hits", 0)
+        lookups = hits + counters.get("misses", 0)
+        return {
+            "hits": hits,
+            "memory_hits": counters.get("memory_hits", 0),
+            "disk_hits": counters.get("disk_hits", 0),
+            "misses": counters.get("misses", 0),
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "fuzzy_template_hits": counters.get("fuzzy_template_hits", 0),
+            "fuzzy_hints": counters.get("fuzzy_near_hits", 0),
+            "tokens_saved": counters.get("tokens_saved", 0)
+        }
+    
+    async def _send_request(self, request_data: Dict[str, Any]) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """
+        Send a request through the adaptive concurrency controller, if enabled
+        :param request_data: Request data for API
+        :return: Tuple of (error_code, response)
+        """
+        if not self.concurrency_controller:
+            return await self.request_manager.send_request(request_data)
+        
+        async with self.concurrency_controller.slot() as slot:
+            error_code, response = await self.request_manager.send_request(request_data, slot.record_latency)
+            if error_code != ERR_NONE:
+                slot.mark_failed()
+            return error_code, response
+    
+    def _extract_response_content(self, response: Any) -> str:
+        """
+        Extract the assistant message content from an API response
+        :param response: API response (chat completion dict or raw string)
+        :return: Message content string
+        """
+        if isinstance(response, dict):
+            try:
+                return response["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                raise RuntimeError("API response does not contain message content")
+        return response
+    
     async def _execute_translation_job(self, input_path: str, output_path: str) -> Dict[str, Any]:
         """
         Execute a single translation job
@@ -156,66 +748,110 @@ class CoreManager:
         :param output_path: Output file path
         :return: Job result
         """
+        if self.job_journal:
+            self.job_journal.record_attempt(input_path, output_path)
+        
         try:
             self.logger.info(f"🔄 [EXECUTING] Translation job: {input_path} -> {output_path}")
             
             # Standardize input
             standardized_input = self.standardizer.standardize(input_path)
             
-            # Prepare translation request
-            request_data = self._prepare_translation_request(standardized_input)
-            
-            # Send request
-            error_code, response = await self.request_manager.send_request(request_data)
-            
-            if error_code != ERR_NONE:
-                raise RuntimeError(f"Translation request failed with error code: {error_code}")
-            
-            # Validate response
-            validated_response = self.validator.validate_and_raise(response)
+            # Translate and validate
+            validated_response = await self._translate_standardized(standardized_input)
             
             # Save result
-            self._save_translation_result(output_path, validated_response)
+            output_checksum = self._save_translation_result(output_path, validated_response, input_path)
+            
+            if self.job_journal:
+                self.job_journal.record_outcome(input_path, output_path, True, output_checksum=output_checksum)
             
             self.logger.info(f"✅ [COMPLETED] Translation job: {input_path}")
             return {"status": "success", "input_path": input_path, "output_path": output_path}
-            
+        
         except Exception as e:
             error_msg = f"Translation job failed: {str(e)}"
             self.logger.error(f"❌ [FAILED] {error_msg}")
+            if self.job_journal:
+                self.job_journal.record_outcome(input_path, output_path, False, error=error_msg)
             return {"status": "failed", "input_path": input_path, "error": error_msg}
     
-    def _prepare_translation_request(self, text_dict: Dict[str, str]) -> Dict[str, Any]:
+    def _index_glossary(self, owner: Any, entries: Dict[str, Any], target_language: Optional[str] = None) -> None:
+        """
+        Index the glossary terms in an owner's entries so its requests can select their glossary
+        :param owner: Hashable owner of the entries, as recorded in packed request origins
+        :param entries: Source entries to send, keyed by the owner's keys
+        :param target_language: Target language (None for translation.target_language)
+        """
+        if self.glossary_index and self._target_language(target_language) == self._target_language():
+            self.glossary_index.add(owner, entries)
+    
+    def _select_glossary(self, refs: Iterable[Tuple[Any, str]], target_language: Optional[str] = None,
+                         glossary_index: Optional[GlossaryIndex] = None) -> Dict[str, str]:
+        """
+        Glossary entries for the terms occurring in a request's source text
+        :param refs: (owner, key) of each source entry of the request, indexed by _index_glossary
+        :param target_language: Target language (None for translation.target_language)
+        :param glossary_index: Index to select from (None for the current batch's index)
+        :return: {source term: required target} within glossary.max_prompt_tokens; empty without a glossary
+                 or for languages other than translation.target_language, which the glossary is written for
+        """
+        glossary_index = glossary_index or self.glossary_index
+        if not glossary_index:
+            return {}
+        if self._target_language(target_language) != self._target_language():
+            return {}
+        return glossary_index.select(
+            refs, self.token_counter, self.config_manager.get_glossary_config().get("max_prompt_tokens", 300)
+        )
+    
+    def _prepare_translation_request(self, text_dict: Dict[str, str],
+                                     hints: Optional[Dict[str, Dict[str, str]]] = None,
+                                     target_language: Optional[str] = None,
+                                     glossary: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         Prepare translation request data
         :param text_dict: Standardized text dictionary
+        :param hints: Reference translations of similar lines, keyed like text_dict
+        :param target_language: Target language (None for translation.target_language)
+        :param glossary: Required translations of the glossary terms in text_dict (see _select_glossary)
         :return: Request data for API
         """
-        # Get translation configuration
         translation_config = self.config_manager.get_translation_config()
+        language = self._target_language(target_language)
+        encoding = self._payload_encoding(text_dict)
         
-        # Get prompts
-        system_message = self.config_manager.get_prompt("system_message", "")
-        format_rules = self.config_manager.get_prompt("format_rules", "")
-        style_rules = self.config_manager.get_prompt("style_rules", "")
-        translation_flow = self.config_manager.get_prompt("translation_flow", "")
+        # Static prompt prefix first, byte-identical across requests so providers can cache it
+        messages = list(self._prompt_prefix(language, encoding))
         
-        # Prepare messages
-        messages = []
-        if system_message:
-            messages.append({"role": "system", "content": system_message})
+        # Add the glossary entries that occur in the blocks being sent
+        if glossary:
+            glossary_rules = self.config_manager.get_prompt(
+                "glossary_rules",
+                "## GLOSSARY\nRequired translations of terms and names in these blocks. Always use them.",
+                language
+            )
+            messages.append({
+                "role": "user",
+                "content": f"{glossary_rules}\n{json.dumps(glossary, ensure_ascii=False)}"
+            })
         
-        # Add format and style rules
-        if format_rules:
-            messages.append({"role": "user", "content": format_rules})
-        if style_rules:
-            messages.append({"role": "user", "content": style_rules})
-        if translation_flow:
-            messages.append({"role": "system", "content": translation_flow})
+        # Add reference translations of similar lines for the blocks being sent
+        hints = {key: hint for key, hint in (hints or {}).items() if key in text_dict}
+        if hints:
+            reference_hints = self.config_manager.get_prompt(
+                "reference_hints",
+                "## REFERENCE TRANSLATIONS\nSimilar lines translated before, keyed by block number. "
+                "Use them for consistent wording; the block text always takes precedence.",
+                language
+            )
+            messages.append({
+                "role": "user",
+                "content": f"{reference_hints}\n{json.dumps(hints, ensure_ascii=False)}"
+            })
         
         # Add the text to translate
-        json_text = json.dumps(text_dict, ensure_ascii=False, indent=2)
-        messages.append({"role": "user", "content": json_text})
+        messages.append({"role": "user", "content": encode_payload(text_dict, encoding)})
         
         # Build request data
         request_data = {
@@ -233,97 +869,428 @@ class CoreManager:
         
         return request_data
     
-    def _save_translation_result(self, output_path: str, result: Dict[str, Any]) -> None:
+    def _payload_encoding(self, text_dict: Dict[str, Any]) -> str:
+        """
+        Resolve the wire encoding of a payload
+        :param text_dict: Entries to send
+        :return: translation.payload_encoding, or minified JSON when the entries do not fit the line format
+        """
+        encoding = self.config_manager.get_translation_config().get("payload_encoding", PayloadEncoding.JSON)
+        return resolve_encoding(text_dict, encoding)
+    
+    def _prompt_prefix(self, language: str, encoding: str = PayloadEncoding.JSON) -> List[Dict[str, Any]]:
+        """
+        Build (once per language and encoding) the static prompt messages every request starts with
+        :param language: Resolved target language
+        :param encoding: Resolved payload encoding
+        :return: Prompt messages; the last one carries a cache_control breakpoint when enabled
+        """
+        if (language, encoding) in self._prompt_prefixes:
+            return self._prompt_prefixes[(language, encoding)]
+        
+        translation_config = self.config_manager.get_translation_config()
+        
+        # Get prompts (config/prompts.<language>.json overrides config/prompts.json)
+        system_message = self.config_manager.get_prompt("system_message", "", language)
+        format_rules = self.config_manager.get_prompt("format_rules", "", language)
+        style_rules = self.config_manager.get_prompt("style_rules", "", language)
+        translation_flow = self.config_manager.get_prompt("translation_flow", "", language)
+        
+        # Prepare messages
+        messages = []
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        
+        # Add format and style rules
+        if format_rules:
+            messages.append({"role": "user", "content": format_rules})
+        if style_rules:
+            messages.append({"role": "user", "content": style_rules})
+        if translation_flow:
+            messages.append({"role": "system", "content": translation_flow})
+        
+        # The base prompts are written for translation.target_language; other languages without
+        # their own prompt file get an explicit instruction
+        if (language != translation_config.get("target_language", "")
+                and not self.config_manager.has_language_prompts(language)):
+            target_language_rule = self.config_manager.get_prompt(
+                "target_language_rule",
+                "## TARGET LANGUAGE\nTranslate every block into the language with code '{language}'. "
+                "This overrides any other target language named above."
+            )
+            messages.append({"role": "system", "content": target_language_rule.format(language=language)})
+        
+        # Masked markup reaches the model as ⟦n⟧ placeholders
+        if self.markup_masker:
+            messages.append({"role": "system", "content": self.config_manager.get_prompt(
+                "placeholder_rules",
+                "## PLACEHOLDERS\n⟦0⟧, ⟦1⟧, ... stand for markup. Keep every placeholder exactly once, unchanged; "
+                "move it with the words it wraps.",
+                language
+            )})
+        
+        # The format rules describe JSON; the line format replaces them for input and output
+        if encoding == PayloadEncoding.LINES:
+            messages.append({"role": "system", "content": self.config_manager.get_prompt(
+                "lines_format_rules",
+                "## LINE FORMAT\nThe input is one block per line: the block number, a tab, then the text. "
+                "Answer in the same format only, one translated line per block, same numbers, no JSON.",
+                language
+            )})
+        
+        # Providers that only cache up to an explicit breakpoint get one after the static prefix
+        if messages and self._use_cache_control(translation_config):
+            last = messages[-1]
+            messages[-1] = {
+                "role": last["role"],
+                "content": [{"type": "text", "text": last["content"], "cache_control": {"type": "ephemeral"}}]
+            }
+        
+        self._prompt_prefixes[(language, encoding)] = messages
+        return messages
+    
+    @staticmethod
+    def _use_cache_control(translation_config: Dict[str, Any]) -> bool:
+        """
+        Decide whether requests mark their prompt prefix with a cache_control breakpoint
+        :param translation_config: Translation configuration
+        :return: True for prompt_cache_control "always", or "auto" with a model that needs explicit breakpoints
+        """
+        mode = translation_config.get("prompt_cache_control", "auto")
+        if mode == "auto":
+            # OpenAI, DeepSeek and Grok models cache prefixes automatically
+            model = translation_config.get("model", "")
+            return model.startswith(CACHE_CONTROL_MODEL_PREFIXES)
+        return mode == "always"
+    
+    def _save_translation_result(self, output_path: str, result: Dict[str, Any],
+                                 input_path: Optional[str] = None) -> str:
         """
         Save translation result to file
         :param output_path: Output file path
         :param result: Translation result
+        :param input_path: Input file; localization files (PO, XLIFF, CSV) are written back in their own format
+        :return: SHA-256 checksum of the written file
         """
         try:
             # Ensure output directory exists
             output_dir = Path(output_path).parent
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Save result
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f"Translation result saved to: {output_path}")
+            if input_path and self.standardizer.write_back(input_path, result, output_path):
+                self.logger.info(f"Translation result saved to: {output_path}")
+                return file_checksum(output_path)
             
+            # Save result
+            return self._write_translation_result(output_path, self._serialize_translation_result(result))
+        
         except Exception as e:
             self.logger.error(f"Failed to save translation result: {e}")
             raise
     
+    def _serialize_translation_result(self, result: Dict[str, Any]) -> bytes:
+        """
+        Serialize a translation result to output file content
+        :param result: Translation result
+        :return: UTF-8 encoded JSON
+        """
+        return json.dumps(result, ensure_ascii=False, indent=2).encode('utf-8')
+    
+    def _write_translation_result(self, output_path: str, content: bytes) -> str:
+        """
+        Write serialized translation result to file
+        :param output_path: Output file path
+        :param content: Serialized result
+        :return: SHA-256 checksum of the written file
+        """
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'wb') as f:
+            f.write(content)
+        
+        self.logger.info(f"Translation result saved to: {output_path}")
+        return hashlib.sha256(content).hexdigest()
+    
     async def process_batch_translation(self, input_dir: str, output_dir: str, 
-                                      pattern: str = "*.json") -> Dict[str, Any]:
+                                      pattern: str = "*.json", workers: Optional[int] = None,
+                                      target_languages: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Process batch translation from directory
         :param input_dir: Input directory path
         :param output_dir: Output directory path
         :param input_pattern: File pattern to match
+        :param workers: Number of worker processes (uses scheduling.worker_processes if None)
+        :param target_languages: Languages to translate every file into in one pass, each written to
+                                 output_dir/<language>/ (None for translation.target_language, written to output_dir)
         :return: Batch processing summary
         """
         try:
             start_time = time.time()
             
             # Find input files
-            input_path = Path(input_dir)
             output_path = Path(output_dir)
             output_path.mkdir(parents=True, exist_ok=True)
-            
-            # Find matching files and sort numerically
-            file_paths = list(input_path.glob(pattern))
-            file_paths.sort(key=lambda x: self._extract_file_number(x.name))
+            file_paths = self._find_input_files(input_dir, pattern)
             
             if not file_paths:
                 return {
                     "total_jobs": 0,
                     "completed": 0,
                     "failed": 0,
+                    "skipped": 0,
                     "total_time": 0,
                     "success_rate": 0.0
                 }
             
-            # Add jobs to scheduler
-            for i, file_path in enumerate(file_paths):
-                if file_path.is_file():
-                    output_file = output_path / file_path.name
-                    job_id = f"translation_{i+1}_{file_path.stem}"
-                    
-                    self.add_translation_job(job_id, str(file_path), str(output_file))
+            # Skip jobs the journal already completed; interrupted ones are re-queued
+            jobs = self._filter_completed_jobs([
+                (f"translation_{i+1}_{file_path.stem}", str(file_path), str(output_path / file_path.name))
+                for i, file_path in enumerate(file_paths)
+            ], target_languages)
+            # One job per file and target language
+            jobs_per_file = len(target_languages) if target_languages else 1
+            total_jobs = len(file_paths) * jobs_per_file
+            skipped = (len(file_paths) - len(jobs)) * jobs_per_file
+            
+            if not jobs:
+                summary = {
+                    "total_jobs": total_jobs,
+                    "completed": 0,
+                    "failed": 0,
+                    "skipped": skipped,
+                    "total_time": time.time() - start_time,
+                    "success_rate": 1.0
+                }
+                self.logger.info(f"All jobs already completed according to journal: {summary}")
+                return summary
+            
+            scheduling_config = self.config_manager.get_scheduling_config()
+            jobs = self._order_jobs(jobs, scheduling_config.get("job_ordering", JobOrdering.FILENAME))
             
-            # Start scheduler
-            await self.start_scheduler()
+            if workers is None:
+                workers = scheduling_config.get("worker_processes", 1)
             
-            # Wait for all jobs to complete
-            while True:
-                stats = self.job_scheduler.get_scheduler_stats()
-                if stats["total_runs"] >= len(file_paths):
-                    break
-                await asyncio.sleep(1)
+            if workers > 1:
+                return await self._process_jobs_with_workers(
+                    [(input_file, output_file) for _, input_file, output_file in jobs],
+                    workers, start_time, skipped, target_languages
+                )
             
-            # Stop scheduler
-            await self.stop_scheduler()
+            # Run jobs through the staged pipeline in job order
+            memory_before = self._get_memory_counters()
+            dedup_before = dict(self.dedup_counters)
+            rerequests_before = dict(self.rerequest_counters)
+            anomalies_before = dict(self.anomaly_counters)
+            usage_before = dict(self.request_manager.usage_counters)
+            results = await self.translate_files(
+                [(input_file, output_file) for _, input_file, output_file in jobs],
+                scheduling_config.get("max_concurrent", 100),
+                target_languages
+            )
             
             # Calculate summary
             total_time = time.time() - start_time
-            scheduler_stats = self.job_scheduler.get_scheduler_stats()
-            
+            completed = sum(1 for result in results if result.get("status") == "success")
             summary = {
-                "total_jobs": len(file_paths),
-                "completed": scheduler_stats["total_successful"],
-                "failed": scheduler_stats["total_failed"],
+                "total_jobs": total_jobs,
+                "completed": completed,
+                "failed": len(results) - completed,
+                "skipped": skipped,
                 "total_time": total_time,
-                "success_rate": scheduler_stats["overall_success_rate"] / 100
+                "success_rate": (completed + skipped) / total_jobs,
+                "translation_memory": self._summarize_memory_counters({
+                    name: value - memory_before[name] for name, value in self._get_memory_counters().items()
+                }),
+                "deduplication": self._summarize_dedup_counters({
+                    name: value - dedup_before.get(name, 0) for name, value in self.dedup_counters.items()
+                }),
+                "rerequests": {
+                    name: value - rerequests_before[name] for name, value in self.rerequest_counters.items()
+                },
+                "anomalies": {
+                    name: value - anomalies_before.get(name, 0) for name, value in self.anomaly_counters.items()
+                },
+                "prompt_cache": RequestManager.summarize_prompt_cache({
+                    name: value - usage_before[name] for name, value in self.request_manager.usage_counters.items()
+                })
             }
+            if target_languages:
+                summary["target_languages"] = list(target_languages)
             
             self.logger.info(f"Batch translation completed: {summary}")
             return summary
-            
+        
         except Exception as e:
             self.logger.error(f"Batch translation failed: {e}")
             raise
     
+    def plan_batch_translation(self, input_dir: str, pattern: str = "*.json",
+                               output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Dry-run a batch translation: estimate requests, tokens, cost and ETA without any network call
+        :param input_dir: Input directory path
+        :param pattern: File pattern to match
+        :param output_dir: Output directory; when given, files the journal already completed are left out
+        :return: Plan dictionary
+        """
+        file_paths = self._find_input_files(input_dir, pattern)
+        scheduling_config = self.config_manager.get_scheduling_config()
+        
+        skipped = 0
+        if output_dir and self.job_journal:
+            pending = [
+                str(file_path) for file_path in file_paths
+                if not self.job_journal.is_completed(str(file_path), str(Path(output_dir) / file_path.name),
+                                                     file_checksum(str(file_path)))
+            ]
+            skipped = len(file_paths) - len(pending)
+            file_paths = [Path(path) for path in pending]
+        
+        jobs = self._order_jobs(
+            [(f"translation_{i+1}_{file_path.stem}", str(file_path), "") for i, file_path in enumerate(file_paths)],
+            scheduling_config.get("job_ordering", JobOrdering.FILENAME)
+        )
+        
+        planning_config = self.config_manager.get_planning_config()
+        planner = BatchPlanner(
+            self,
+            completion_ratio=planning_config.get("completion_ratio", 1.2),
+            base_latency=planning_config.get("base_latency", 2.0),
+            latency_per_token=planning_config.get("latency_per_token", 0.002),
+            tokens_per_minute=planning_config.get("tokens_per_minute"),
+            input_price_per_million=planning_config.get("input_price_per_million", 0.0),
+            output_price_per_million=planning_config.get("output_price_per_million", 0.0)
+        )
+        plan = planner.plan([input_file for _, input_file, _ in jobs], scheduling_config.get("max_concurrent", 100))
+        plan["skipped"] = skipped
+        return plan
+    
+    def _find_input_files(self, input_dir: str, pattern: str) -> List[Path]:
+        """
+        Find matching input files, sorted numerically
+        :param input_dir: Input directory path
+        :param pattern: File pattern to match
+        :return: Input file paths
+        """
+        file_paths = [p for p in Path(input_dir).glob(pattern) if p.is_file()]
+        file_paths.sort(key=lambda x: self._extract_file_number(x.name))
+        return file_paths
+    
+    def _summarize_dedup_counters(self, counters: Dict[str, int]) -> Optional[Dict[str, Any]]:
+        """
+        Build the deduplication part of a batch summary
+        :param counters: Counters accumulated during the batch
+        :return: Duplication ratio and fan-out counts, or None when deduplication is disabled
+        """
+        if not counters:
+            return None
+        total_strings = counters.get("total_strings", 0)
+        unique_strings = counters.get("unique_strings", 0)
+        return {
+            "total_strings": total_strings,
+            "unique_strings": unique_strings,
+            "duplication_ratio": 1 - unique_strings / total_strings if total_strings else 0.0,
+            "fanned_out": counters.get("fanned_out", 0),
+            "tokens_saved": counters.get("tokens_saved", 0)
+        }
+    
+    def _filter_completed_jobs(self, jobs: List[Tuple[str, str, str]],
+                               target_languages: Optional[List[str]] = None) -> List[Tuple[str, str, str]]:
+        """
+        Record job submissions in the journal and drop jobs that already completed
+        :param jobs: List of (job_id, input_path, output_path)
+        :param target_languages: Languages of a multi-language batch; a file is dropped once every language completed
+        :return: Jobs that still need to run
+        """
+        if not self.job_journal:
+            return jobs
+        
+        interrupted = self.job_journal.get_jobs(JobStatus.RUNNING)
+        if interrupted:
+            self.logger.warning(f"Re-queueing {len(interrupted)} jobs interrupted in a previous run")
+        
+        pending_jobs = []
+        for job_id, input_file, output_file in jobs:
+            input_checksum = file_checksum(input_file)
+            if target_languages:
+                outputs = [(f"{job_id}_{language}", self._language_output_path(output_file, language))
+                           for language in target_languages]
+            else:
+                outputs = [(job_id, output_file)]
+            
+            if all(self.job_journal.is_completed(input_file, output, input_checksum) for _, output in outputs):
+                self.logger.info(f"⏭️ [SKIPPED] Already completed: {input_file}")
+                continue
+            
+            for output_job_id, output in outputs:
+                self.job_journal.record_submission(output_job_id, input_file, output, input_checksum)
+            pending_jobs.append((job_id, input_file, output_file))
+        
+        return pending_jobs
+    
+    async def _process_jobs_with_workers(self, jobs: List[Tuple[str, str]], workers: int,
+                                         start_time: float, skipped: int = 0,
+                                         target_languages: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Process batch jobs across worker processes
+        :param jobs: List of (input_path, output_path) pairs
+        :param workers: Requested number of worker processes
+        :param start_time: Batch start timestamp
+        :param skipped: Number of jobs skipped because the journal marks them completed
+        :param target_languages: Languages to translate every file into (None for translation.target_language)
+        :return: Batch processing summary
+        """
+        scheduling_config = self.config_manager.get_scheduling_config()
+        worker_pool = WorkerPool(
+            config_path=self.config_path,
+            key_manager=self.key_manager,
+            num_workers=workers,
+            max_concurrent=scheduling_config.get("max_concurrent", 100)
+        )
+        results = await worker_pool.run(jobs, target_languages)
+        
+        completed = sum(1 for result in results if result.get("status") == "success")
+        failed = len(results) - completed
+        total_jobs = len(jobs) * (len(target_languages) if target_languages else 1) + skipped
+        summary = {
+            "total_jobs": total_jobs,
+            "completed": completed,
+            "failed": failed,
+            "skipped": skipped,
+            "total_time": time.time() - start_time,
+            "success_rate": (completed + skipped) / total_jobs if total_jobs else 0.0,
+            "translation_memory": self._summarize_memory_counters(worker_pool.memory_counters),
+            "deduplication": self._summarize_dedup_counters(worker_pool.dedup_counters),
+            "rerequests": worker_pool.rerequest_counters,
+            "anomalies": worker_pool.anomaly_counters,
+            "prompt_cache": RequestManager.summarize_prompt_cache(worker_pool.usage_counters)
+        }
+        if target_languages:
+            summary["target_languages"] = list(target_languages)
+        
+        self.logger.info(f"Batch translation completed with {workers} workers: {summary}")
+        return summary
+    
+    def _order_jobs(self, jobs: List[Tuple[str, str, str]], ordering: str) -> List[Tuple[str, str, str]]:
+        """
+        Order batch jobs by estimated size
+        :param jobs: List of (job_id, input_path, output_path), in file name order
+        :param ordering: JobOrdering policy (filename, lpt or sjf)
+        :return: Jobs in dispatch order
+        """
+        if ordering == JobOrdering.FILENAME:
+            return jobs
+        
+        if ordering not in (JobOrdering.LPT, JobOrdering.SJF):
+            self.logger.warning(f"Unknown job ordering '{ordering}', keeping file name order")
+            return jobs
+        
+        # File size is a cheap token estimate; sorted() is stable so ties keep file name order
+        return sorted(
+            jobs,
+            key=lambda job: self.token_counter.estimate_file_tokens(job[1]),
+            reverse=(ordering == JobOrdering.LPT)
+        )
+    
     def _extract_file_number(self, filename: str) -> int:
         """Extract number from filename for sorting"""
         import re
@@ -344,6 +1311,12 @@ class CoreManager:
             },
             "key_manager": self.key_manager.get_key_stats() if self.key_manager else None,
             "scheduler": self.job_scheduler.get_scheduler_stats() if self.job_scheduler else None,
+            "journal": self.job_journal.get_journal_stats() if self.job_journal else None,
+            "translation_memory": self.translation_memory.get_memory_stats() if self.translation_memory else None,
+            "fuzzy_memory": self.fuzzy_memory.get_fuzzy_stats() if self.fuzzy_memory else None,
+            "markup_masking": self.markup_masker.get_masking_stats() if self.markup_masker else None,
+            "glossary": self.glossary_index.get_index_stats() if self.glossary_index else None,
+            "concurrency": self.concurrency_controller.get_controller_stats() if self.concurrency_controller else None,
             "request_manager": self.request_manager.get_request_stats() if self.request_manager else None,
             "validator": self.validator.get_validation_stats() if self.validator else None,
             "standardizer": self.standardizer.get_standardization_stats() if self.standardizer else None
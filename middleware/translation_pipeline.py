@@ -0,0 +1,538 @@
+"""
+Translation Pipeline
+Staged batch translation (load -> pack -> request -> validate -> write) connected by bounded queues
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+
+from services.common.logger import get_logger
+from services.infrastructure.job_journal import file_checksum
+from services.translation.dedup_index import DedupIndex
+from services.translation.glossary import GlossaryIndex
+from services.translation.request_packer import RequestPacker, PackedRequest
+from services.translation.validator import ValidationError
+
+@dataclass(eq=False)
+class PipelineItem:
+    """One batch job (an input file and one target language) moving through the pipeline stages"""
+    index: int
+    input_path: str
+    output_path: str
+    target_language: Optional[str] = None  # None for translation.target_language
+    result_index: int = 0
+    standardized_input: Dict[str, str] = None
+    cached: Dict[str, str] = None
+    hints: Dict[str, Dict[str, str]] = None
+    send: Dict[str, str] = None
+    borrowed: Dict[str, str] = None
+    received: Dict[str, Any] = None
+    outstanding: int = 0  # packed requests still carrying entries of this job
+    translations: Dict[str, Any] = None
+    failed: bool = False
+
+class PipelineStage:
+    """A pipeline stage: a handler run by a fixed number of workers reading from one bounded queue"""
+    
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[List[Any]]],
+                 workers: int, queue_size: int, flush: Optional[Callable[[], Awaitable[List[Any]]]] = None):
+        """
+        Initialize pipeline stage
+        :param name: Stage name used in logs and statistics
+        :param handler: Coroutine function that processes one object and returns the objects passed on
+        :param workers: Number of concurrent workers for this stage
+        :param queue_size: Capacity of the stage input queue (backpressure on the previous stage)
+        :param flush: Coroutine function returning objects held back by the stage, called once its workers finish
+        """
+        self.name = name
+        self.handler = handler
+        self.flush = flush
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.queue: Optional[asyncio.Queue] = None
+        self.stats = {
+            'processed': 0,
+            'failed': 0,
+            'busy_time': 0.0,
+            'peak_queue_depth': 0
+        }
+    
+    def get_stage_stats(self) -> Dict[str, Any]:
+        """
+        Get stage statistics
+        :return: Stage statistics dictionary
+        """
+        return {
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            **self.stats
+        }
+
+class TranslationPipeline:
+    """Runs batch jobs through overlapping stages so file I/O and parsing proceed during network waits"""
+    
+    def __init__(self, core_manager, load_workers: int = 2, request_workers: int = 100,
+                 validate_workers: int = 2, write_workers: int = 1, queue_size: int = 8,
+                 deduplicate: bool = True, token_budget: Optional[int] = None):
+        """
+        Initialize translation pipeline
+        :param core_manager: CoreManager providing the standardizer, request path, validator and journal
+        :param load_workers: Workers reading and standardizing input files
+        :param request_workers: Workers sending API requests (the concurrency controller still caps in-flight requests)
+        :param validate_workers: Workers validating responses
+        :param write_workers: Workers serializing and writing output files
+        :param queue_size: Capacity of each inter-stage queue
+        :param deduplicate: Translate each unique source string once per batch and fan it out to duplicates
+        :param token_budget: Target payload tokens per request when packing entries across files
+                             (None sends one request per file)
+        """
+        self.core_manager = core_manager
+        self.stages = [
+            PipelineStage("load", self._load, load_workers, queue_size),
+            # Single packing worker: the packer fills one request at a time in dispatch order
+            PipelineStage("pack", self._pack, 1, queue_size, flush=self._flush_packer),
+            PipelineStage("request", self._request, request_workers, queue_size),
+            PipelineStage("validate", self._validate, validate_workers, queue_size),
+            PipelineStage("write", self._write, write_workers, queue_size)
+        ]
+        self.deduplicate = deduplicate
+        self.token_budget = token_budget
+        self.dedup_indexes: Dict[Optional[str], DedupIndex] = {}
+        self.packers: Dict[Optional[str], RequestPacker] = {}
+        self.packing_stats = {
+            'requests': 0,
+            'entries': 0,
+            'payload_tokens': 0
+        }
+        self.results: List[Optional[Dict[str, Any]]] = []
+        self._deferred: List[PipelineItem] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.logger = get_logger("TranslationPipeline")
+    
+    async def run(self, jobs: List[Tuple[str, str]], target_languages: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Run jobs through the pipeline
+        :param jobs: List of (input_path, output_path) pairs, in dispatch order
+        :param target_languages: Languages to translate each input into, sharing one read, standardization
+                                 and deduplication pass (None for translation.target_language)
+        :return: One job result per input and language, in input order
+        """
+        languages = target_languages or [None]
+        self.results = [None] * (len(jobs) * len(languages))
+        # Requests never mix languages: each language has its own prompts
+        self.packers = {
+            language: RequestPacker(self.core_manager.token_counter, self.token_budget, language)
+            for language in languages
+        }
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+        
+        # Blocking stages (file reads, parsing, validation, serialization, writes) run off the event loop
+        executor_workers = sum(stage.workers for stage in self.stages if stage.name != "request")
+        self._executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix="pipeline")
+        try:
+            # One deduplication index per language: translation memory leaves different entries pending in each
+            self.dedup_indexes = {
+                language: DedupIndex(self.core_manager.token_counter) for language in languages
+            } if self.deduplicate else {}
+            if self.core_manager.glossary:
+                # Requests select their glossary entries from this batch's index, filled as jobs are loaded
+                self.core_manager.glossary_index = GlossaryIndex(self.core_manager.glossary)
+            self._deferred = []
+            await asyncio.gather(
+                self._feed(jobs, languages),
+                *[self._run_stage(position) for position in range(len(self.stages))]
+            )
+            # Strings whose owning job failed are translated once per language, then fanned out to every deferred job
+            languages_deferred = list(dict.fromkeys(item.target_language for item in self._deferred))
+            errors = dict(zip(languages_deferred, await asyncio.gather(
+                *[self._resolve_deferred(language) for language in languages_deferred]
+            )))
+            await asyncio.gather(*[self._finish_deferred(item, errors[item.target_language]) for item in self._deferred])
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        
+        return self.results
+    
+    async def _feed(self, jobs: List[Tuple[str, str]], languages: List[Optional[str]]) -> None:
+        """
+        Put jobs on the first stage queue, one group of per-language items per input; blocks while the pipeline is full
+        :param jobs: List of (input_path, output_path) pairs
+        :param languages: Target languages (a single None for translation.target_language)
+        """
+        first_stage = self.stages[0]
+        for index, (input_path, output_path) in enumerate(jobs):
+            await self._put(first_stage, [
+                PipelineItem(
+                    index, input_path,
+                    self.core_manager._language_output_path(output_path, language) if language else output_path,
+                    target_language=language,
+                    result_index=index * len(languages) + position
+                )
+                for position, language in enumerate(languages)
+            ])
+        
+        for _ in range(first_stage.workers):
+            await first_stage.queue.put(None)
+    
+    async def _run_stage(self, position: int) -> None:
+        """
+        Run all workers of a stage, then signal the next stage to shut down
+        :param position: Stage position in the pipeline
+        """
+        stage = self.stages[position]
+        next_stage = self.stages[position + 1] if position + 1 < len(self.stages) else None
+        
+        await asyncio.gather(*[self._stage_worker(stage, next_stage) for _ in range(stage.workers)])
+        
+        if stage.flush:
+            for output in await stage.flush():
+                await self._put(next_stage, output)
+        
+        if next_stage:
+            for _ in range(next_stage.workers):
+                await next_stage.queue.put(None)
+    
+    async def _stage_worker(self, stage: PipelineStage, next_stage: Optional[PipelineStage]) -> None:
+        """
+        Process objects from a stage queue until the shutdown marker arrives
+        :param stage: Stage to work on
+        :param next_stage: Stage that receives the handler outputs (None for the last stage)
+        """
+        while True:
+            obj = await stage.queue.get()
+            if obj is None:
+                return
+            
+            busy_start = time.perf_counter()
+            try:
+                outputs = await stage.handler(obj)
+            except Exception as e:
+                stage.stats['failed'] += 1
+                # A failed packed request fails every job with entries in it, a failed load every language
+                for item in self._items_of(obj):
+                    self._fail(item, stage.name, e)
+                continue
+            finally:
+                stage.stats['busy_time'] += time.perf_counter() - busy_start
+            
+            stage.stats['processed'] += 1
+            for output in outputs:
+                if next_stage:
+                    await self._put(next_stage, output)
+                else:
+                    self._complete(output)
+    
+    @staticmethod
+    def _items_of(obj: Any) -> List[PipelineItem]:
+        """
+        Pipeline items carried by a stage input
+        :param obj: Pipeline item, group of per-language items or packed request
+        :return: Pipeline items
+        """
+        if isinstance(obj, PackedRequest):
+            return obj.owners()
+        if isinstance(obj, list):
+            return obj
+        return [obj]
+    
+    async def _put(self, stage: PipelineStage, obj: Any) -> None:
+        """
+        Put an object on a stage queue and track its peak depth
+        :param stage: Receiving stage
+        :param obj: Pipeline item or packed request
+        """
+        await stage.queue.put(obj)
+        stage.stats['peak_queue_depth'] = max(stage.stats['peak_queue_depth'], stage.queue.qsize())
+    
+    async def _run_blocking(self, func: Callable, *args) -> Any:
+        """
+        Run a blocking function on the pipeline executor
+        :param func: Function to run
+        :return: Function result
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
+    async def _load(self, group: List[PipelineItem]) -> List[PipelineItem]:
+        """Read and standardize the input file once, look entries up in each language's translation memory and claim them"""
+        for item in group:
+            if self.core_manager.job_journal:
+                self.core_manager.job_journal.record_attempt(item.input_path, item.output_path)
+            self.core_manager.logger.info(f"🔄 [EXECUTING] Translation job: {item.input_path} -> {item.output_path}")
+        
+        standardized_input = await self._run_blocking(
+            self.core_manager.standardizer.standardize, group[0].input_path
+        )
+        for item in group:
+            item.standardized_input = standardized_input
+            item.cached, pending, item.hints = await self._run_blocking(
+                self.core_manager._split_cached_translations, standardized_input, item.target_language
+            )
+            
+            # The first job to claim a string sends it; later duplicates borrow its translation at write time
+            dedup_index = self.dedup_indexes.get(item.target_language)
+            if dedup_index:
+                item.send, item.borrowed = await self._run_blocking(dedup_index.claim, item.index, pending)
+            else:
+                item.send, item.borrowed = pending, {}
+            await self._run_blocking(self.core_manager._index_glossary, item, item.send, item.target_language)
+            item.received = {}
+        return group
+    
+    async def _pack(self, item: PipelineItem) -> List[Any]:
+        """Pack the entries this job sends into token-budgeted requests shared with neighbouring jobs"""
+        packer = self.packers[item.target_language]
+        ready, item.outstanding = await self._run_blocking(packer.add, item, item.send, item.hints)
+        self._count_packed(ready)
+        # A job with nothing to send passes straight through to the write stage
+        return ready + ([] if item.outstanding else [item])
+    
+    async def _flush_packer(self) -> List[PackedRequest]:
+        """Emit the last partially filled requests once every job has been packed"""
+        ready = [packed for packer in self.packers.values() for packed in packer.flush()]
+        self._count_packed(ready)
+        return ready
+    
+    def _count_packed(self, requests: List[PackedRequest]) -> None:
+        """
+        Update packing statistics
+        :param requests: Requests emitted by the packer
+        """
+        for packed in requests:
+            self.packing_stats['requests'] += 1
+            self.packing_stats['entries'] += len(packed.entries)
+            self.packing_stats['payload_tokens'] += packed.tokens
+    
+    async def _request(self, obj: Any) -> List[Any]:
+        """Send a packed translation request, re-requesting only keys that came back missing or invalid"""
+        if isinstance(obj, PipelineItem):
+            return [obj]
+        
+        # Masking, response parsing, repair and validation run on the pipeline executor between network waits
+        await self.core_manager._send_packed_request(obj, self._run_blocking)
+        return [obj]
+    
+    async def _validate(self, obj: Any) -> List[PipelineItem]:
+        """Hand packed translations back to their jobs and finish jobs whose requests all returned"""
+        if isinstance(obj, PipelineItem):
+            return [await self._run_blocking(self._finish_translations, obj)]
+        
+        finished = []
+        for item, translations, missing in obj.split_response(obj.translations):
+            if item.failed:
+                continue
+            item.received.update(translations)
+            dedup_index = self.dedup_indexes.get(item.target_language)
+            if dedup_index:
+                dedup_index.resolve({key: item.send[key] for key in translations}, translations)
+            
+            if missing:
+                # Keep what was translated so the next run only sends the missing keys
+                await self._run_blocking(
+                    self.core_manager._store_translations, item.standardized_input, item.cached, item.received,
+                    item.target_language
+                )
+                self._fail(item, "validate",
+                           ValidationError(f"{len(missing)} keys still missing or invalid after re-requests"))
+                continue
+            
+            item.outstanding -= 1
+            if item.outstanding == 0:
+                try:
+                    finished.append(await self._run_blocking(self._finish_translations, item))
+                except Exception as e:
+                    self._fail(item, "validate", e)
+        return finished
+    
+    def _finish_translations(self, item: PipelineItem) -> PipelineItem:
+        """
+        Merge cached translations with those received for the job's packed requests
+        :param item: Pipeline item whose requests all returned
+        :return: The item, with translations of the job except borrowed entries
+        """
+        if item.send:
+            item.translations = self.core_manager._merge_cached_translations(
+                item.standardized_input, item.cached, item.received, item.target_language
+            )
+        else:
+            item.translations = item.cached
+        item.cached = item.hints = item.send = item.received = None
+        return item
+    
+    async def _write(self, item: PipelineItem) -> List[PipelineItem]:
+        """Fan out borrowed translations, then serialize and write the output file"""
+        if item.borrowed:
+            resolved, unresolved = self.dedup_indexes[item.target_language].fan_out(item.borrowed)
+            if unresolved:
+                # The owning job has not finished yet; write once the pipeline drains
+                self._deferred.append(item)
+                return []
+            self._add_borrowed(item, resolved)
+        
+        await self._write_output(item)
+        return [item]
+    
+    async def _resolve_deferred(self, language: Optional[str]) -> Optional[Exception]:
+        """
+        Translate the borrowed strings left unresolved by failed owning jobs, once for all deferred jobs of a language
+        :param language: Target language (None for translation.target_language)
+        :return: Exception raised by the translation, or None
+        """
+        dedup_index = self.dedup_indexes[language]
+        sources: Dict[bytes, str] = {}
+        for item in self._deferred:
+            if item.target_language == language:
+                sources.update(dedup_index.unresolved(item.borrowed))
+        if not sources:
+            return None
+        
+        entries = {str(number): source for number, source in enumerate(sources.values())}
+        try:
+            translations = await self.core_manager._translate_standardized(entries, language)
+        except Exception as e:
+            return e
+        dedup_index.resolve(entries, translations)
+        return None
+    
+    async def _finish_deferred(self, item: PipelineItem, error: Optional[Exception] = None) -> None:
+        """
+        Complete a job whose borrowed entries were unresolved when it reached the write stage
+        :param item: Deferred pipeline item
+        :param error: Exception raised while translating the strings of failed owning jobs, if any
+        """
+        try:
+            resolved, unresolved = self.dedup_indexes[item.target_language].fan_out(item.borrowed)
+            if unresolved:
+                raise error or ValidationError(f"{len(unresolved)} borrowed keys could not be translated")
+            self._add_borrowed(item, resolved)
+            await self._write_output(item)
+        except Exception as e:
+            self._fail(item, "write", e)
+            return
+        
+        self._complete(item)
+    
+    def _add_borrowed(self, item: PipelineItem, borrowed_translations: Dict[str, str]) -> None:
+        """
+        Merge fanned-out translations into the job translations, in input order
+        :param item: Pipeline item
+        :param borrowed_translations: Translations of the borrowed entries
+        """
+        translations = {}
+        for key in item.standardized_input:
+            if key in item.translations:
+                translations[key] = item.translations[key]
+            elif key in borrowed_translations:
+                translations[key] = borrowed_translations[key]
+        for key, value in item.translations.items():
+            translations.setdefault(key, value)
+        item.translations = translations
+    
+    async def _write_output(self, item: PipelineItem) -> None:
+        """
+        Serialize and write the output file, then record the outcome
+        :param item: Pipeline item with complete translations
+        """
+        output_checksum = await self._run_blocking(
+            self._serialize_and_write, item.input_path, item.output_path, item.translations
+        )
+        if self.core_manager.anomaly_detector is not None:
+            self.core_manager.anomaly_detector.add(
+                self.core_manager.anomaly_group(item.target_language), item.output_path,
+                item.standardized_input, item.translations
+            )
+        item.standardized_input = item.translations = None
+        
+        if self.core_manager.job_journal:
+            self.core_manager.job_journal.record_outcome(
+                item.input_path, item.output_path, True, output_checksum=output_checksum
+            )
+    
+    def _serialize_and_write(self, input_path: str, output_path: str, translations: Dict[str, Any]) -> str:
+        """
+        Serialize translations and write them to the output file
+        :param input_path: Input file path (localization files are written back in their own format)
+        :param output_path: Output file path
+        :param translations: Translation dictionary
+        :return: SHA-256 checksum of the written file
+        """
+        if self.core_manager.standardizer.write_back(input_path, translations, output_path):
+            return file_checksum(output_path)
+        content = self.core_manager._serialize_translation_result(translations)
+        return self.core_manager._write_translation_result(output_path, content)
+    
+    def _complete(self, item: PipelineItem) -> None:
+        """
+        Record a successful job result
+        :param item: Finished pipeline item
+        """
+        self.core_manager.logger.info(f"✅ [COMPLETED] Translation job: {item.input_path} -> {item.output_path}")
+        self.results[item.result_index] = {
+            "status": "success",
+            "input_path": item.input_path,
+            "output_path": item.output_path
+        }
+        if item.target_language:
+            self.results[item.result_index]["target_language"] = item.target_language
+    
+    def _fail(self, item: PipelineItem, stage_name: str, error: Exception) -> None:
+        """
+        Record a failed job result; the item leaves the pipeline
+        :param item: Failed pipeline item
+        :param stage_name: Stage where the job failed
+        :param error: Raised exception
+        """
+        if item.failed:
+            return
+        item.failed = True
+        
+        error_msg = f"Translation job failed: {str(error)}"
+        self.core_manager.logger.error(f"❌ [FAILED] ({stage_name}) {error_msg}")
+        if self.core_manager.job_journal:
+            self.core_manager.job_journal.record_outcome(item.input_path, item.output_path, False, error=error_msg)
+        
+        self.results[item.result_index] = {
+            "status": "failed",
+            "input_path": item.input_path,
+            "error": error_msg
+        }
+        if item.target_language:
+            self.results[item.result_index]["target_language"] = item.target_language
+    
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """
+        Get per-stage statistics of the last run
+        :return: Statistics dictionary keyed by stage name
+        """
+        return {stage.name: stage.get_stage_stats() for stage in self.stages}
+    
+    def get_packing_stats(self) -> Dict[str, Any]:
+        """
+        Get request packing statistics of the last run
+        :return: Statistics dictionary including entries and payload tokens per request
+        """
+        requests = self.packing_stats['requests']
+        return {
+            'token_budget': self.token_budget,
+            **self.packing_stats,
+            'avg_entries_per_request': self.packing_stats['entries'] / requests if requests else 0.0,
+            'avg_tokens_per_request': self.packing_stats['payload_tokens'] / requests if requests else 0.0
+        }
+    
+    def get_dedup_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get deduplication statistics of the last run
+        :return: Statistics dictionary summed over target languages, or None when deduplication is disabled
+        """
+        if not self.dedup_indexes:
+            return None
+        
+        merged = DedupIndex()
+        for dedup_index in self.dedup_indexes.values():
+            for name, value in dedup_index.stats.items():
+                merged.stats[name] += value
+        return merged.get_dedup_stats()
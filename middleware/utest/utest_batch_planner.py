@@ -0,0 +1,177 @@
+# Test Module: batch_planner
+# Purpose: Unit tests for the BatchPlanner dry run and key pool simulation
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from middleware.batch_planner import BatchPlanner
+from middleware.core_manager import CoreManager
+from services.common.logger import get_logger
+from services.common.token_counter import TokenCounter
+from services.infrastructure import ConfigManager, KeyStatus
+from services.translation.translation_memory import TranslationMemory
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_INT
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+
+class FakeKeyManager:
+    """Key pool of num_keys active keys"""
+    
+    def __init__(self, num_keys, max_requests_per_minute):
+        self.keys = [{"status": KeyStatus.ACTIVE} for _ in range(num_keys)]
+        self.max_requests_per_minute = max_requests_per_minute
+
+class FakeStandardizer:
+    """Serves standardized inputs from a dictionary keyed by input path"""
+    
+    def __init__(self, files):
+        self.files = files
+    
+    def standardize(self, input_path):
+        return dict(self.files[input_path])
+
+def build_core(tmp_path, files):
+    """CoreManager with the real config and a translation memory, without API clients"""
+    core = CoreManager.__new__(CoreManager)
+    core.logger = get_logger("CoreManager")
+    core.config_manager = ConfigManager("config/config.yaml")
+    core.token_counter = TokenCounter()
+    core.standardizer = FakeStandardizer(files)
+    core.translation_memory = TranslationMemory(str(tmp_path / "tm.db"))
+    core.fuzzy_memory = None
+    core.glossary = None
+    core.glossary_index = None
+    core.markup_masker = None
+    core.prompt_version = "v1"
+    core.key_manager = FakeKeyManager(1, 60)
+    core._prompt_prefixes = {}
+    return core
+
+##################################### Test `_earliest_start` ##################################
+
+'''
+Equivalent class of _earliest_start(starts, tokens, not_before, request_tokens, rpm)
+
+Test case    *  key's requests started at              *  limits          * Expected Result
+             *                                         *                  *
+TC001        *  0, 100, 110 (two after the candidate)  *  rpm 2           *  Success - starts at not_before (later starts ignored)
+TC002        *  0, 10                                  *  rpm 2           *  Success - waits until 0 ages out, limited by rpm
+TC003        *  0 (80 tokens)                          *  tpm 100         *  Success - waits until 0 ages out, limited by tpm
+TC004        *  0 (10 tokens), 100 (90 tokens)         *  tpm 100         *  Success - starts at not_before (later tokens ignored)
+'''
+
+# Test Description: Requests started after the candidate start do not count against it
+# Test Objective: Success
+# Test Case: TC001
+def utest_batch_planner_earliest_start_later_starts_ignored():
+    # Test data
+    sut = BatchPlanner(None)
+    # Call SUT (act)
+    act = sut._earliest_start([0.0, 100.0, 110.0], [10, 10, 10], 50.0, 10, 2)
+    # Check result, assertion
+    CHECK_EQUAL(act, (50.0, None), "Only the start at 0 is in the window before 50")
+
+# Test Description: A full request window delays the start until its oldest request ages out
+# Test Objective: Success
+# Test Case: TC002
+def utest_batch_planner_earliest_start_rpm():
+    # Test data
+    sut = BatchPlanner(None)
+    # Call SUT (act)
+    act = sut._earliest_start([0.0, 10.0], [10, 10], 20.0, 10, 2)
+    # Check result, assertion
+    CHECK_EQUAL(act, (60.0, "rpm"), "Start should wait for the request at 0 to age out")
+
+# Test Description: A full token window delays the start until its oldest request ages out
+# Test Objective: Success
+# Test Case: TC003
+def utest_batch_planner_earliest_start_tpm():
+    # Test data
+    sut = BatchPlanner(None, tokens_per_minute=100)
+    # Call SUT (act)
+    act = sut._earliest_start([0.0], [80], 5.0, 30, 0)
+    # Check result, assertion
+    CHECK_EQUAL(act, (60.0, "tpm"), "Start should wait for the tokens at 0 to age out")
+
+# Test Description: Tokens of requests started after the candidate start do not count against it
+# Test Objective: Success
+# Test Case: TC004
+def utest_batch_planner_earliest_start_later_tokens_ignored():
+    # Test data
+    sut = BatchPlanner(None, tokens_per_minute=100)
+    # Call SUT (act)
+    act = sut._earliest_start([0.0, 100.0], [10, 90], 5.0, 30, 0)
+    # Check result, assertion
+    CHECK_EQUAL(act, (5.0, None), "Only the 10 tokens at 0 are in the window before 5")
+
+##################################### Test `_simulate_key_pool` ##################################
+
+'''
+Equivalent class of _simulate_key_pool(request_tokens, max_concurrent)
+
+Test case    *  requests  *  keys / rpm  *  max_concurrent  * Expected Result
+             *            *              *                  *
+TC001        *  3         *  1 / 2       *  3               *  Success - third request waits for the window, bound by rpm
+TC002        *  3         *  2 / 2       *  1               *  Success - one at a time, bound by concurrency
+'''
+
+# Test Description: More requests than one key's rpm wait for the window and report rpm as the bottleneck
+# Test Objective: Success
+# Test Case: TC001
+def utest_batch_planner_simulate_key_pool_rpm(tmp_path):
+    # Test data
+    core = build_core(tmp_path, {})
+    core.key_manager = FakeKeyManager(1, 2)
+    sut = BatchPlanner(core, base_latency=1.0, latency_per_token=0.0)
+    # Call SUT (act)
+    act = sut._simulate_key_pool([(10, 10)] * 3, 3)
+    # Check result, assertion
+    CHECK_EQUAL(act["eta_seconds"], 61.0, "Third request should start at 60")
+    CHECK_EQUAL(act["bottleneck"], "rpm", "Requests per minute should bound the ETA")
+
+# Test Description: A single lane runs requests back to back and reports concurrency as the bottleneck
+# Test Objective: Success
+# Test Case: TC002
+def utest_batch_planner_simulate_key_pool_concurrency(tmp_path):
+    # Test data
+    core = build_core(tmp_path, {})
+    core.key_manager = FakeKeyManager(2, 2)
+    sut = BatchPlanner(core, base_latency=1.0, latency_per_token=0.0)
+    # Call SUT (act)
+    act = sut._simulate_key_pool([(10, 10)] * 3, 1)
+    # Check result, assertion
+    CHECK_EQUAL(act["eta_seconds"], 3.0, "Requests should run back to back")
+    CHECK_EQUAL(act["bottleneck"], "concurrency", "The single lane should bound the ETA")
+
+##################################### Test `plan` ##################################
+
+'''
+Equivalent class of plan(input_paths, max_concurrent)
+
+Test case    *  inputs                                          * Expected Result
+             *                                                  *
+TC001        *  one cached entry, one duplicate, one unreadable  *  Success - counts match, memory statistics and LRU untouched
+'''
+
+# Test Description: A dry run counts cached and deduplicated entries without touching translation memory
+# Test Objective: Success
+# Test Case: TC001
+def utest_batch_planner_plan_dry_run(tmp_path):
+    # Test data
+    core = build_core(tmp_path, {"a.json": {"0": "Hello", "1": "Bye"}, "b.json": {"0": "Hello"}})
+    core._store_translations({"1": "Bye"}, {}, {"1": "Tạm biệt"})
+    memory = core.translation_memory
+    memory._memory.clear()
+    stats = dict(memory.stats)
+    sut = BatchPlanner(core)
+    # Call SUT (act)
+    plan = sut.plan(["a.json", "b.json", "missing.json"], 4)
+    # Check result, assertion
+    CHECK_INT(plan["cached_entries"], 1, "Stored translation should be counted as cached")
+    CHECK_INT(plan["deduplicated_entries"], 1, "Duplicate should be counted once")
+    CHECK_INT(plan["sent_entries"], 1, "Only the unique uncached entry should be sent")
+    CHECK_INT(len(plan["unreadable_files"]), 1, "Missing file should be reported")
+    CHECK_EQUAL(memory.stats, stats, "Translation memory statistics should not change")
+    CHECK_INT(len(memory._memory), 0, "Disk hits should not be promoted")
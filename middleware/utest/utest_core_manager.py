@@ -0,0 +1,194 @@
+# Test Module: core_manager
+# Purpose: Unit tests for the CoreManager packed request path
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+import asyncio
+import json
+from middleware.core_manager import CoreManager
+from services.common.error_codes import ERR_NONE, ERR_REQUEST_FAILED
+from services.common.logger import get_logger
+from services.common.token_counter import TokenCounter
+from services.infrastructure import ConfigManager
+from services.infrastructure.job_journal import JobJournal, JobStatus
+from services.translation import Validator, MarkupMasker
+from services.translation.anomaly_detector import AnomalyDetector
+from services.translation.request_packer import PackedRequest
+from services.translation.standardizer import Standardizer
+from services.translation.translation_memory import TranslationMemory
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_BOOL
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+ENTRIES = {"0": "Hello {i}there{/i}", "1": "Good morning", "2": "See you"}
+
+class FakeRequestManager:
+    """Returns queued (error_code, content) pairs and records the entries sent with each request"""
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = []
+    
+    async def send_request(self, request_data):
+        self.sent.append(json.loads(request_data["messages"][-1]["content"]))
+        error_code, content = self.responses.pop(0)
+        return error_code, content
+
+def build_core(responses):
+    """CoreManager with the real config, validator and masker, and a fake request manager"""
+    core = CoreManager.__new__(CoreManager)
+    core.logger = get_logger("CoreManager")
+    core.config_manager = ConfigManager("config/config.yaml")
+    core.config_manager.config["translation"]["payload_encoding"] = "json"
+    core.validator = Validator()
+    core.markup_masker = MarkupMasker()
+    core.glossary_index = None
+    core.concurrency_controller = None
+    core.request_manager = FakeRequestManager(responses)
+    core.rerequest_counters = {"rerequests": 0, "rerequested_keys": 0, "unresolved_keys": 0}
+    core._prompt_prefixes = {}
+    return core
+
+##################################### Test `_send_packed_request` ##################################
+
+'''
+Equivalent class of _send_packed_request(packed, run_blocking)
+
+Test case    *  first response           *  re-request response      * Expected Result
+             *                           *                           *
+TC001        *  key "1" missing          *  key "1" translated       *  Success - only key "1" re-requested, all keys valid
+TC002        *  key "1" missing          *  error code               *  Success - valid keys kept, key "1" unresolved
+TC003        *  error code               *  -                        *  Failure - RuntimeError, nothing salvaged
+TC004        *  placeholder dropped      *  placeholder kept         *  Success - key "0" re-requested and unmasked
+'''
+
+# Test Description: Only the missing key is re-requested and parsing runs on the given executor
+# Test Objective: Success
+# Test Case: TC001
+@pytest.mark.asyncio
+async def utest_core_manager_send_packed_request_rerequest():
+    # Test data
+    sut = build_core([
+        (ERR_NONE, '{"0": "Xin chào ⟦0⟧bạn⟦1⟧", "2": "Hẹn gặp lại",}'),
+        (ERR_NONE, '{"1": "Chào buổi sáng"}')
+    ])
+    packed = PackedRequest(entries=dict(ENTRIES))
+    blocking_calls = []
+    
+    async def run_blocking(func, *args):
+        blocking_calls.append(func.__name__)
+        return await asyncio.to_thread(func, *args)
+    
+    # Call SUT (act)
+    await sut._send_packed_request(packed, run_blocking)
+    # Check result, assertion
+    CHECK_EQUAL(packed.translations, {"0": "Xin chào {i}bạn{/i}", "1": "Chào buổi sáng", "2": "Hẹn gặp lại"},
+                "Every key should be valid and unmasked")
+    CHECK_EQUAL(list(sut.request_manager.sent[1]), ["1"], "Only the missing key should be re-requested")
+    CHECK_EQUAL(sut.rerequest_counters, {"rerequests": 1, "rerequested_keys": 1, "unresolved_keys": 0},
+                "One re-request of one key")
+    CHECK_EQUAL(blocking_calls.count("_salvage_response"), 2, "Each response should be parsed off the event loop")
+
+# Test Description: A failed re-request keeps the salvaged keys and leaves only the remainder unresolved
+# Test Objective: Success
+# Test Case: TC002
+@pytest.mark.asyncio
+async def utest_core_manager_send_packed_request_rerequest_error():
+    # Test data
+    sut = build_core([
+        (ERR_NONE, '{"0": "Xin chào ⟦0⟧bạn⟦1⟧", "2": "Hẹn gặp lại"}'),
+        (ERR_REQUEST_FAILED, None)
+    ])
+    packed = PackedRequest(entries=dict(ENTRIES))
+    # Call SUT (act)
+    await sut._send_packed_request(packed)
+    # Check result, assertion
+    CHECK_EQUAL(packed.translations, {"0": "Xin chào {i}bạn{/i}", "2": "Hẹn gặp lại"}, "Salvaged keys should be kept")
+    CHECK_EQUAL(sut.rerequest_counters["unresolved_keys"], 1, "Only the missing key should be unresolved")
+
+# Test Description: A failed first request raises, as no key was translated
+# Test Objective: Failure
+# Test Case: TC003
+@pytest.mark.asyncio
+async def utest_core_manager_send_packed_request_error():
+    # Test data
+    sut = build_core([(ERR_REQUEST_FAILED, None)])
+    packed = PackedRequest(entries=dict(ENTRIES))
+    # Call SUT (act)
+    with pytest.raises(RuntimeError):
+        await sut._send_packed_request(packed)
+    # Check result, assertion
+    CHECK_EQUAL(packed.translations, {}, "Nothing should be salvaged")
+
+# Test Description: A translation that drops a placeholder is re-requested, not written with broken markup
+# Test Objective: Success
+# Test Case: TC004
+@pytest.mark.asyncio
+async def utest_core_manager_send_packed_request_placeholder_dropped():
+    # Test data
+    sut = build_core([
+        (ERR_NONE, '{"0": "Xin chào bạn⟦1⟧", "1": "Chào buổi sáng", "2": "Hẹn gặp lại"}'),
+        (ERR_NONE, '{"0": "Xin chào ⟦0⟧bạn⟦1⟧"}')
+    ])
+    packed = PackedRequest(entries=dict(ENTRIES))
+    # Call SUT (act)
+    await sut._send_packed_request(packed)
+    # Check result, assertion
+    CHECK_EQUAL(sut.request_manager.sent[1], {"0": "Hello ⟦0⟧there⟦1⟧"}, "Only the broken key should be re-sent")
+    CHECK_EQUAL(packed.translations["0"], "Xin chào {i}bạn{/i}", "Re-requested key should be unmasked")
+    CHECK_BOOL(sut.rerequest_counters["unresolved_keys"] == 0, True, "Every key should be resolved")
+
+##################################### Test `translate_files` (anomalies) ##################################
+
+def build_batch_core(tmp_path, responses):
+    """build_core plus what a batch needs: standardizer, translation memory, job journal and anomaly detector"""
+    core = build_core(responses)
+    core.config_manager.config["anomaly_detection"]["report_path"] = str(tmp_path / "anomalies.jsonl")
+    core.token_counter = TokenCounter()
+    core.standardizer = Standardizer()
+    core.translation_memory = TranslationMemory(str(tmp_path / "tm.db"))
+    core.fuzzy_memory = None
+    core.glossary = None
+    core.job_journal = JobJournal(str(tmp_path / "journal.db"))
+    core.anomaly_detector = AnomalyDetector()
+    core.anomaly_counters = {}
+    core.dedup_counters = {}
+    core.prompt_version = "v1"
+    return core
+
+'''
+Equivalent class of translate_files(jobs) run twice on the same input
+
+Test case    *  first run                                   * Expected Result
+             *                                              *
+TC001        *  key "2" comes back as an echo of its source  *  Success - flagged, file reopened, only key "2" re-sent next run
+'''
+
+# Test Description: A flagged translation is not served from memory again: the next run re-sends only that entry
+# Test Objective: Success
+# Test Case: TC001
+@pytest.mark.asyncio
+async def utest_core_manager_translate_files_anomaly_resent(tmp_path):
+    # Test data
+    input_path = tmp_path / "chunk_1.json"
+    input_path.write_text(json.dumps({"0": "Good morning", "1": "See you", "2": "Where are you going?"}),
+                          encoding="utf-8")
+    output_path = str(tmp_path / "out" / "chunk_1.json")
+    sut = build_batch_core(tmp_path, [
+        (ERR_NONE, '{"0": "Chào buổi sáng", "1": "Hẹn gặp lại", "2": "Where are you going?"}'),
+        (ERR_NONE, '{"0": "Cậu đi đâu vậy?"}')
+    ])
+    jobs = [(str(input_path), output_path)]
+    # Call SUT (act)
+    await sut.translate_files(jobs)
+    status = sut.job_journal.get_jobs()[0]["status"]
+    await sut.translate_files(jobs)
+    # Check result, assertion
+    CHECK_EQUAL(sut.anomaly_counters["discarded_translations"], 1, "Echoed translation should leave memory")
+    CHECK_EQUAL(status, JobStatus.FAILED, "Flagged file should be reopened in the journal")
+    CHECK_EQUAL(sut.request_manager.sent[1], {"0": "Where are you going?"}, "Only the flagged entry should be re-sent")
+    with open(output_path, encoding="utf-8") as f:
+        CHECK_EQUAL(json.load(f), {"0": "Chào buổi sáng", "1": "Hẹn gặp lại", "2": "Cậu đi đâu vậy?"},
+                    "Output should hold the new translation")
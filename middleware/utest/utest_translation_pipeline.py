@@ -0,0 +1,277 @@
+# Test Module: translation_pipeline
+# Purpose: Unit tests for the TranslationPipeline stages
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+import asyncio
+from middleware.translation_pipeline import TranslationPipeline
+from services.common.logger import get_logger
+from services.common.token_counter import TokenCounter
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_INT, CHECK_BOOL, CHECK_STR
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+
+class FakeStandardizer:
+    """Serves standardized inputs from a dictionary keyed by input path"""
+    
+    def __init__(self, files):
+        self.files = files
+        self.loaded = []
+    
+    def standardize(self, input_path):
+        self.loaded.append(input_path)
+        return dict(self.files[input_path])
+    
+    def write_back(self, input_path, translations, output_path):
+        return False
+
+class FakeCoreManager:
+    """Core manager whose requests translate to "vi:<source>" after a per-source delay, fail, or drop sources"""
+    
+    def __init__(self, files, delays=None, failing=(), dropped=(), failing_direct=False):
+        self.standardizer = FakeStandardizer(files)
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.failing_direct = failing_direct
+        self.dropped = set(dropped)
+        self.token_counter = TokenCounter()
+        self.logger = get_logger("CoreManager")
+        self.glossary = None
+        self.glossary_index = None
+        self.job_journal = None
+        self.anomaly_detector = None
+        self.sent = []
+        self.loaded_ahead = []  # Files loaded but not yet written when each request was sent
+        self.direct = []
+        self.written = {}
+    
+    @staticmethod
+    def _language_output_path(output_path, target_language):
+        return f"{target_language}/{output_path}"
+    
+    def _split_cached_translations(self, standardized_input, target_language=None):
+        return {}, dict(standardized_input), {}
+    
+    def _index_glossary(self, owner, entries, target_language=None):
+        pass
+    
+    async def _send_packed_request(self, packed, run_blocking=None):
+        sources = list(packed.entries.values())
+        self.sent.extend(sources)
+        self.loaded_ahead.append(len(self.standardizer.loaded) - len(self.written))
+        await asyncio.sleep(max(self.delays.get(source, 0) for source in sources))
+        if self.failing.intersection(sources):
+            raise RuntimeError("request failed")
+        packed.translations = {key: f"vi:{source}" for key, source in packed.entries.items()
+                               if source not in self.dropped}
+    
+    def _merge_cached_translations(self, standardized_input, cached, received, target_language=None):
+        return {**cached, **received}
+    
+    def _store_translations(self, standardized_input, cached, received, target_language=None):
+        pass
+    
+    async def _translate_standardized(self, standardized_input, target_language=None):
+        self.direct.append(dict(standardized_input))
+        if self.failing_direct:
+            raise RuntimeError("direct translation failed")
+        return {key: f"vi:{source}" for key, source in standardized_input.items()}
+    
+    def _serialize_translation_result(self, result):
+        return result
+    
+    def _write_translation_result(self, output_path, content):
+        self.written[output_path] = content
+        return "checksum"
+
+def statuses(results):
+    """Status of each job result"""
+    return [result["status"] for result in results]
+
+##################################### Test `run` (deduplication) ##################################
+
+'''
+Equivalent class of run(jobs) with deduplicate=True and one load worker, so "a.json" claims "Hello" first
+
+Test case    *  owner job "a.json"                 *  borrower job "b.json"          * Expected Result
+             *                                     *                                 *
+TC001        *  resolves before "b.json" writes    *  also sends its own entry       *  Success - fanned out at write, "Hello" sent once
+TC002        *  resolves after "b.json" writes     *  only borrowed entries          *  Success - deferred, written after the drain
+TC003        *  request fails                      *  only borrowed entries          *  Success - "b.json" translates "Hello" directly
+TC004        *  request fails                      *  "b.json" and "c.json" borrow   *  Success - "Hello" translated once for both borrowers
+TC005        *  request fails                      *  direct translation fails too   *  Failure - every job fails
+'''
+
+# Test Description: A borrowed entry is filled from the owner's translation when the borrower is written
+# Test Objective: Success
+# Test Case: TC001
+@pytest.mark.asyncio
+async def utest_translation_pipeline_run_dedup_fan_out():
+    # Test data
+    core = FakeCoreManager({"a.json": {"0": "Hello", "1": "Bye"}, "b.json": {"0": "Hello", "1": "Thanks"}},
+                           delays={"Thanks": 0.05})
+    sut = TranslationPipeline(core, load_workers=1)
+    # Call SUT (act)
+    results = await sut.run([("a.json", "out/a.json"), ("b.json", "out/b.json")])
+    # Check result, assertion
+    CHECK_EQUAL(statuses(results), ["success", "success"], "Both jobs should succeed")
+    CHECK_EQUAL(core.written["out/b.json"], {"0": "vi:Hello", "1": "vi:Thanks"}, "Borrowed entry should be filled in order")
+    CHECK_INT(core.sent.count("Hello"), 1, "Duplicate should be sent once")
+    CHECK_EQUAL(core.direct, [], "Nothing should be translated directly")
+    CHECK_INT(sut.get_dedup_stats()["fanned_out"], 1, "One entry should be fanned out")
+
+# Test Description: A borrower reaching the write stage before its owner is deferred until the pipeline drains
+# Test Objective: Success
+# Test Case: TC002
+@pytest.mark.asyncio
+async def utest_translation_pipeline_run_dedup_deferred():
+    # Test data
+    core = FakeCoreManager({"a.json": {"0": "Hello"}, "b.json": {"0": "Hello"}}, delays={"Hello": 0.05})
+    sut = TranslationPipeline(core, load_workers=1)
+    # Call SUT (act)
+    results = await sut.run([("a.json", "out/a.json"), ("b.json", "out/b.json")])
+    # Check result, assertion
+    CHECK_EQUAL(statuses(results), ["success", "success"], "Both jobs should succeed")
+    CHECK_INT(len(sut._deferred), 1, "Borrower should have been deferred")
+    CHECK_EQUAL(core.written["out/b.json"], {"0": "vi:Hello"}, "Deferred job should be written from the owner")
+    CHECK_EQUAL(core.direct, [], "Nothing should be translated directly")
+
+# Test Description: When the owning job fails, deferred duplicates are translated directly
+# Test Objective: Success
+# Test Case: TC003
+@pytest.mark.asyncio
+async def utest_translation_pipeline_run_dedup_owner_failed():
+    # Test data
+    core = FakeCoreManager({"a.json": {"0": "Hello"}, "b.json": {"0": "Hello"}}, failing={"Hello"})
+    sut = TranslationPipeline(core, load_workers=1)
+    # Call SUT (act)
+    results = await sut.run([("a.json", "out/a.json"), ("b.json", "out/b.json")])
+    # Check result, assertion
+    CHECK_EQUAL(statuses(results), ["failed", "success"], "Only the owner should fail")
+    CHECK_EQUAL(core.direct, [{"0": "Hello"}], "Borrowed entry should be translated directly")
+    CHECK_EQUAL(core.written["out/b.json"], {"0": "vi:Hello"}, "Borrower should be written")
+
+# Test Description: Deferred duplicates of a failed owner share one direct translation per string
+# Test Objective: Success
+# Test Case: TC004
+@pytest.mark.asyncio
+async def utest_translation_pipeline_run_dedup_owner_failed_shared():
+    # Test data
+    files = {"a.json": {"0": "Hello"}, "b.json": {"0": "Hello"}, "c.json": {"0": "Hello ", "1": "Hello"}}
+    core = FakeCoreManager(files, failing={"Hello"})
+    sut = TranslationPipeline(core, load_workers=1)
+    # Call SUT (act)
+    results = await sut.run([("a.json", "out/a.json"), ("b.json", "out/b.json"), ("c.json", "out/c.json")])
+    # Check result, assertion
+    CHECK_EQUAL(statuses(results), ["failed", "success", "success"], "Only the owner should fail")
+    CHECK_INT(len(core.direct), 1, "Borrowed string should be translated in one call")
+    CHECK_INT(len(core.direct[0]), 1, "Borrowed string should be translated once")
+    CHECK_EQUAL(core.written["out/c.json"], {"0": "vi:Hello", "1": "vi:Hello"}, "Every borrower should be written")
+
+# Test Description: When the direct translation fails too, every deferred borrower fails with its error
+# Test Objective: Failure
+# Test Case: TC005
+@pytest.mark.asyncio
+async def utest_translation_pipeline_run_dedup_direct_failed():
+    # Test data
+    core = FakeCoreManager({"a.json": {"0": "Hello"}, "b.json": {"0": "Hello"}}, failing={"Hello"}, failing_direct=True)
+    sut = TranslationPipeline(core, load_workers=1)
+    # Call SUT (act)
+    results = await sut.run([("a.json", "out/a.json"), ("b.json", "out/b.json")])
+    # Check result, assertion
+    CHECK_EQUAL(statuses(results), ["failed", "failed"], "Borrower should fail with its owner")
+    CHECK_BOOL("direct translation failed" in results[1]["error"], msg="Direct translation error should be reported")
+    CHECK_EQUAL(core.written, {}, "Nothing should be written")
+
+##################################### Test `run` (backpressure) ##################################
+
+'''
+Equivalent class of run(jobs) with bounded queues, one worker per stage and a slow request stage
+
+Test case    *  jobs  *  queue_size  * Expected Result
+             *        *              *
+TC001        *  30    *  1           *  Success - loading stays within the pipeline capacity ahead of the writes
+'''
+
+# Test Description: A slow request stage blocks the load stage once every queue between them is full
+# Test Objective: Success
+# Test Case: TC001
+@pytest.mark.asyncio
+async def utest_translation_pipeline_run_backpressure():
+    # Test data
+    files = {f"{i}.json": {"0": f"Line {i}"} for i in range(30)}
+    core = FakeCoreManager(files, delays={source["0"]: 0.01 for source in files.values()})
+    sut = TranslationPipeline(core, load_workers=1, request_workers=1, validate_workers=1,
+                              queue_size=1, deduplicate=False)
+    capacity = sum(stage.workers + stage.queue_size for stage in sut.stages)
+    # Call SUT (act)
+    results = await sut.run([(path, f"out/{path}") for path in files])
+    # Check result, assertion
+    CHECK_EQUAL(statuses(results), ["success"] * 30, "Every job should succeed")
+    CHECK_BOOL(max(core.loaded_ahead) <= capacity, True,
+               f"Loaded files ahead of the writes {max(core.loaded_ahead)} should not exceed {capacity}")
+    CHECK_EQUAL([stage.stats['peak_queue_depth'] for stage in sut.stages], [1] * 5,
+                "No queue should grow past its capacity")
+
+##################################### Test `run` (error propagation) ##################################
+
+'''
+Equivalent class of run(jobs) when a stage raises, deduplicate=False
+
+Test case    *  failing stage                                   * Expected Result
+             *                                                  *
+TC001        *  load: input missing, two target languages       *  Failure - the job fails in every language, others succeed
+TC002        *  request: packed request shared by two jobs      *  Failure - both jobs fail, the stage failure counted once
+TC003        *  validate: a key missing from the response       *  Failure - only that job fails
+'''
+
+# Test Description: A file that cannot be loaded fails each of its languages without stopping the pipeline
+# Test Objective: Failure
+# Test Case: TC001
+@pytest.mark.asyncio
+async def utest_translation_pipeline_run_load_failed():
+    # Test data
+    core = FakeCoreManager({"a.json": {"0": "Hello"}})
+    sut = TranslationPipeline(core, deduplicate=False)
+    # Call SUT (act)
+    results = await sut.run([("missing.json", "out/missing.json"), ("a.json", "out/a.json")], ["vi", "ja"])
+    # Check result, assertion
+    CHECK_EQUAL([(result["status"], result["target_language"]) for result in results],
+                [("failed", "vi"), ("failed", "ja"), ("success", "vi"), ("success", "ja")],
+                "Only the missing input should fail, in both languages")
+    CHECK_INT(sut.stages[0].stats['failed'], 1, "The file should be loaded and fail once")
+
+# Test Description: A failed request fails every job with entries packed into it
+# Test Objective: Failure
+# Test Case: TC002
+@pytest.mark.asyncio
+async def utest_translation_pipeline_run_request_failed():
+    # Test data
+    core = FakeCoreManager({"a.json": {"0": "Hello"}, "b.json": {"0": "Bye"}, "c.json": {}}, failing={"Hello"})
+    sut = TranslationPipeline(core, deduplicate=False, token_budget=1000)
+    # Call SUT (act)
+    results = await sut.run([("a.json", "out/a.json"), ("b.json", "out/b.json"), ("c.json", "out/c.json")])
+    # Check result, assertion
+    CHECK_EQUAL(statuses(results), ["failed", "failed", "success"], "Both packed jobs should fail")
+    CHECK_STR(results[1]["error"], "Translation job failed: request failed", "Request error should be reported")
+    CHECK_INT(sut.stages[2].stats['failed'], 1, "One request should fail")
+    CHECK_EQUAL(list(core.written), ["out/c.json"], "Only the job with nothing to send should be written")
+
+# Test Description: A key still missing from the response fails its job and leaves other jobs untouched
+# Test Objective: Failure
+# Test Case: TC003
+@pytest.mark.asyncio
+async def utest_translation_pipeline_run_validate_failed():
+    # Test data
+    core = FakeCoreManager({"a.json": {"0": "Hello", "1": "Bye"}, "b.json": {"0": "Thanks"}}, dropped={"Bye"})
+    sut = TranslationPipeline(core, deduplicate=False)
+    # Call SUT (act)
+    results = await sut.run([("a.json", "out/a.json"), ("b.json", "out/b.json")])
+    # Check result, assertion
+    CHECK_EQUAL(statuses(results), ["failed", "success"], "Only the job with a missing key should fail")
+    CHECK_STR(results[0]["error"], "Translation job failed: 1 keys still missing or invalid after re-requests",
+              "Missing key should be reported")
+    CHECK_EQUAL(core.written, {"out/b.json": {"0": "vi:Thanks"}}, "Only the complete job should be written")
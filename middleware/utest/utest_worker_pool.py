@@ -0,0 +1,105 @@
+# Test Module: worker_pool
+# Purpose: Unit tests for WorkerPool result handling
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from middleware.worker_pool import WorkerPool
+from services.infrastructure import APIKeyManager
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_INT
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+SHARD = [("in/a.json", "out/a.json"), ("in/b.json", "out/b.json")]
+
+def worker_output(key, input_path, cache_hits):
+    """Output of _run_worker_shard for one job, one request on key and cache_hits memory hits"""
+    return {
+        "results": [{"status": "success", "input_path": input_path}],
+        "key_usage": [{"key": key, "status": "active", "total_requests": 1,
+                       "successful_requests": 1, "failed_requests": 0}],
+        "memory_counters": {"cache_hits": cache_hits},
+        "dedup_counters": {"deduplicated": 1},
+        "rerequest_counters": {"rerequests": 0},
+        "anomaly_counters": {"anomalies": 0},
+        "usage_counters": {"prompt_tokens": 10}
+    }
+
+##################################### Test `_failed_results` ##################################
+
+'''
+Equivalent class of _failed_results(shard, error, target_languages)
+
+Test case    *  target_languages   * Expected Result
+             *                     *
+TC001        *  None               *  Success - one failed result per job, no target_language
+TC002        *  ["vi", "ja"]       *  Success - one failed result per job and language, with target_language
+'''
+
+# Test Description: Without target languages a failed worker fails each of its jobs once
+# Test Objective: Success
+# Test Case: TC001
+def utest_worker_pool_failed_results_default_language():
+    # Call SUT (act)
+    results = WorkerPool._failed_results(SHARD, RuntimeError("boom"))
+    # Check result, assertion
+    CHECK_EQUAL([result["input_path"] for result in results], ["in/a.json", "in/b.json"], "One result per job")
+    CHECK_EQUAL(results[0], {"status": "failed", "input_path": "in/a.json", "error": "Worker process failed: boom"},
+                "Result should match the pipeline's failed result")
+
+# Test Description: With target languages a failed worker fails every (job, language) pair
+# Test Objective: Success
+# Test Case: TC002
+def utest_worker_pool_failed_results_target_languages():
+    # Call SUT (act)
+    results = WorkerPool._failed_results(SHARD, RuntimeError("boom"), ["vi", "ja"])
+    # Check result, assertion
+    CHECK_INT(len(results), 4, "One result per job and language")
+    CHECK_EQUAL([(result["input_path"], result["target_language"]) for result in results],
+                [("in/a.json", "vi"), ("in/a.json", "ja"), ("in/b.json", "vi"), ("in/b.json", "ja")],
+                "Results should follow the pipeline's input-then-language order")
+
+##################################### Test `_collect_results` ##################################
+
+'''
+Equivalent class of _collect_results(shards, outputs, target_languages)
+
+Test case    *  outputs                              * Expected Result
+             *                                       *
+TC001        *  two successful workers               *  Success - results in shard order, counters and key usage summed
+TC002        *  one successful, one failed worker    *  Success - failed shard's jobs failed, only the successful output merged
+'''
+
+# Test Description: Results of all workers are collected and their counters and key usage summed
+# Test Objective: Success
+# Test Case: TC001
+def utest_worker_pool_collect_results_merged():
+    # Test data
+    sut = WorkerPool("config/config.yaml", APIKeyManager(["key-0", "key-1"]), 2)
+    sut.memory_counters = {"cache_hits": 1}
+    outputs = [worker_output("key-0", "in/a.json", 2), worker_output("key-1", "in/b.json", 3)]
+    # Call SUT (act)
+    results = sut._collect_results([SHARD[:1], SHARD[1:]], outputs)
+    # Check result, assertion
+    CHECK_EQUAL([result["input_path"] for result in results], ["in/a.json", "in/b.json"], "Results in shard order")
+    CHECK_EQUAL(sut.memory_counters, {"cache_hits": 6}, "Memory counters should add to the pool's")
+    CHECK_EQUAL(sut.dedup_counters, {"deduplicated": 2}, "Dedup counters should be summed")
+    CHECK_EQUAL(sut.usage_counters, {"prompt_tokens": 20}, "Usage counters should be summed")
+    CHECK_INT(sut.key_manager.get_key_stats()["total_requests"], 2, "Each worker's key usage should be applied")
+
+# Test Description: A failed worker fails its shard without affecting the other worker's merge
+# Test Objective: Success
+# Test Case: TC002
+def utest_worker_pool_collect_results_failed_worker():
+    # Test data
+    sut = WorkerPool("config/config.yaml", APIKeyManager(["key-0", "key-1"]), 2)
+    outputs = [worker_output("key-0", "in/a.json", 2), RuntimeError("boom")]
+    # Call SUT (act)
+    results = sut._collect_results([SHARD[:1], SHARD[1:]], outputs, ["vi"])
+    # Check result, assertion
+    CHECK_EQUAL([(result["input_path"], result["status"]) for result in results],
+                [("in/a.json", "success"), ("in/b.json", "failed")], "Failed shard's job should be failed")
+    CHECK_EQUAL(results[1]["target_language"], "vi", "Failed result should carry its language")
+    CHECK_EQUAL(sut.memory_counters, {"cache_hits": 2}, "Only the successful output should be merged")
+    CHECK_INT(sut.key_manager.get_key_stats()["total_requests"], 1, "Only the successful worker's usage applied")
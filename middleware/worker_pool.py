@@ -0,0 +1,142 @@
+"""
+Worker Pool
+Shards batch translation jobs across worker processes
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from services.infrastructure import APIKeyManager
+from services.common.logger import get_logger
+
+def _run_worker_shard(config_path: str, api_keys: List[str], jobs: List[Tuple[str, str]],
+                      max_concurrent: int, target_languages: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Worker process entry point: translate one shard on its own event loop
+    :param config_path: Path to configuration file
+    :param api_keys: Keys owned by this worker
+    :param jobs: List of (input_path, output_path) pairs
+    :param max_concurrent: Maximum in-flight jobs in this worker
+    :param target_languages: Languages to translate every file into (None for translation.target_language)
+    :return: Job results and per-key usage for the parent
+    """
+    # Imported here to avoid a circular import with core_manager
+    from middleware.core_manager import CoreManager
+    
+    core_manager = CoreManager(config_path, api_keys=api_keys)
+    results = asyncio.run(core_manager.translate_files(jobs, max_concurrent, target_languages))
+    return {
+        "results": results,
+        "key_usage": core_manager.key_manager.get_key_usage(),
+        "memory_counters": core_manager._get_memory_counters(),
+        "dedup_counters": core_manager.dedup_counters,
+        "rerequest_counters": core_manager.rerequest_counters,
+        "anomaly_counters": core_manager.anomaly_counters,
+        "usage_counters": core_manager.request_manager.usage_counters
+    }
+
+class WorkerPool:
+    """Runs translation jobs in N worker processes, each with its own event loop and HTTP session"""
+    
+    def __init__(self, config_path: str, key_manager: APIKeyManager,
+                 num_workers: int, max_concurrent: int = 100):
+        """
+        Initialize worker pool
+        :param config_path: Path to configuration file (loaded by each worker)
+        :param key_manager: Parent key manager that owns the key budgets
+        :param num_workers: Requested number of worker processes
+        :param max_concurrent: Total in-flight job limit, split across workers
+        """
+        self.config_path = config_path
+        self.key_manager = key_manager
+        self.num_workers = num_workers
+        self.max_concurrent = max_concurrent
+        self.memory_counters: Dict[str, int] = {}
+        self.dedup_counters: Dict[str, int] = {}
+        self.rerequest_counters: Dict[str, int] = {}
+        self.anomaly_counters: Dict[str, int] = {}
+        self.usage_counters: Dict[str, int] = {}
+        self.logger = get_logger("WorkerPool")
+    
+    async def run(self, jobs: List[Tuple[str, str]],
+                  target_languages: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Shard jobs across worker processes and collect their results
+        :param jobs: List of (input_path, output_path) pairs
+        :param target_languages: Languages to translate every file into (None for translation.target_language)
+        :return: One result dictionary per job and language
+        """
+        # Each worker gets a disjoint set of keys, so the key pool caps the worker count
+        key_partitions = self.key_manager.partition_keys(min(self.num_workers, len(jobs)))
+        if not key_partitions:
+            raise RuntimeError("No available API keys for worker processes")
+        
+        num_workers = len(key_partitions)
+        shards = [jobs[i::num_workers] for i in range(num_workers)]
+        per_worker_concurrency = max(1, self.max_concurrent // num_workers)
+        self.logger.info(f"Starting {num_workers} worker processes for {len(jobs)} jobs")
+        
+        loop = asyncio.get_running_loop()
+        # Spawn (not fork) so workers never inherit the parent's running event loop
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=num_workers, mp_context=context) as executor:
+            futures = [
+                loop.run_in_executor(executor, _run_worker_shard, self.config_path,
+                                     keys, shard, per_worker_concurrency, target_languages)
+                for keys, shard in zip(key_partitions, shards)
+            ]
+            outputs = await asyncio.gather(*futures, return_exceptions=True)
+        
+        return self._collect_results(shards, outputs, target_languages)
+    
+    def _collect_results(self, shards: List[List[Tuple[str, str]]], outputs: List[Any],
+                         target_languages: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Merge worker outputs: key usage into the parent key manager, counters into the pool totals
+        :param shards: Jobs of each worker
+        :param outputs: Output of _run_worker_shard, or the exception raised, per worker
+        :param target_languages: Languages every file was translated into (None for translation.target_language)
+        :return: Job results of all workers, shard by shard
+        """
+        results = []
+        for shard, output in zip(shards, outputs):
+            if isinstance(output, Exception):
+                self.logger.error(f"Worker process failed: {output}")
+                results.extend(self._failed_results(shard, output, target_languages))
+                continue
+            
+            self.key_manager.apply_key_usage(output["key_usage"])
+            for name, value in output["memory_counters"].items():
+                self.memory_counters[name] = self.memory_counters.get(name, 0) + value
+            for name, value in output["dedup_counters"].items():
+                self.dedup_counters[name] = self.dedup_counters.get(name, 0) + value
+            for name, value in output["rerequest_counters"].items():
+                self.rerequest_counters[name] = self.rerequest_counters.get(name, 0) + value
+            for name, value in output["anomaly_counters"].items():
+                self.anomaly_counters[name] = self.anomaly_counters.get(name, 0) + value
+            for name, value in output["usage_counters"].items():
+                self.usage_counters[name] = self.usage_counters.get(name, 0) + value
+            results.extend(output["results"])
+        
+        return results
+    
+    @staticmethod
+    def _failed_results(shard: List[Tuple[str, str]], error: Exception,
+                        target_languages: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Results of a shard whose worker process failed, shaped like the pipeline's failed results
+        :param shard: List of (input_path, output_path) pairs of the worker
+        :param error: Exception raised by the worker
+        :param target_languages: Languages every file was translated into (None for translation.target_language)
+        :return: One failed result per job and language, in input order
+        """
+        error_msg = f"Worker process failed: {error}"
+        if not target_languages:
+            return [{"status": "failed", "input_path": input_path, "error": error_msg} for input_path, _ in shard]
+        return [
+            {"status": "failed", "input_path": input_path, "error": error_msg, "target_language": language}
+            for input_path, _ in shard
+            for language in target_languages
+        ]
@@ -2,8 +2,10 @@
 @brief QualityAssurance: Multi-model validation và confidence scoring
 """
 from typing import Dict, List, Tuple, Optional, Callable
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
+import logging
 import re
 import time
 
@@ -21,6 +23,7 @@ class ValidationResult:
     score: float  # 0.0 to 1.0
     issues: List[str] = None
     suggestions: List[str] = None
+    critical: bool = False  # later validators are skipped: their checks would be meaningless
     
     def __post_init__(self):
         if self.issues is None:
@@ -37,23 +40,60 @@ class QualityReport:
     critical_issues: List[str]
     recommendations: List[str]
     processing_time: float
+    skipped_validators: List[str] = field(default_factory=list)
+
+@dataclass
+class ParsedBlocks:
+    """Input và output blocks, parsed once and shared by every validator"""
+    input_blocks: List
+    output_blocks: List
+    
+    @property
+    def sources(self) -> Dict[str, str]:
+        return {block.id: block.content for block in self.input_blocks}
+    
+    @property
+    def translations(self) -> Dict[str, str]:
+        return {block.id: block.content for block in self.output_blocks}
+
+# Worker-process state, set once per worker so the blocks are not pickled with every validator call
+_worker_state: Tuple = ()
+
+def _init_validator_process(quality_assurance, blocks: ParsedBlocks):
+    """Initializer of a worker process: keep the QualityAssurance copy và the shared blocks"""
+    global _worker_state
+    _worker_state = (quality_assurance, blocks)
+
+def _run_validator_in_process(validator_name: str) -> ValidationResult:
+    """Run one validator in a worker process"""
+    quality_assurance, blocks = _worker_state
+    return quality_assurance._run_validator(validator_name, blocks)
 
 class QualityAssurance:
     """
     Quality Assurance Pipeline với multi-model validation
     """
     
-    def __init__(self, block_manager, logger=None):
+    def __init__(self, block_manager, logger=None, glossary=None,
+                 parallel_min_blocks: int = 5000, max_workers: int = 3, executor: str = "process"):
         self.block_manager = block_manager
         self.logger = logger
+        # Glossary (services.translation.glossary.Glossary): term checks run in one automaton pass per block
+        self.glossary = glossary
         
-        # Initialize validators
+        # Initialize validators, cheapest first: structure (set operations) gates the per-block heuristics
         self.validators = {
             'structure_validator': self._structure_validator,
             'content_validator': self._content_validator,
             'consistency_validator': self._consistency_validator,
             'quality_validator': self._quality_validator
         }
+        # Independent heuristic validators: run concurrently for files with at least parallel_min_blocks blocks.
+        # They are pure-Python regex loops, so only "process" runs them in parallel; "thread" only overlaps I/O
+        self.heuristic_validators = ['content_validator', 'consistency_validator', 'quality_validator']
+        self.parallel_min_blocks = parallel_min_blocks
+        self.max_workers = max_workers
+        self.executor = executor
         
         # Quality thresholds
         self.thresholds = {
@@ -79,27 +119,27 @@ class QualityAssurance:
         
         self._log('info', f"🔍 Starting quality assurance validation...")
         
-        # Run all validators
+        # Parse both texts once; every validator reads the same blocks
+        blocks = self._parse_blocks(input_text, output_text)
+        
         validation_results = {}
-        for validator_name, validator_func in self.validators.items():
-            try:
-                result = validator_func(input_text, output_text)
-                validation_results[validator_name] = result
-                
-                self._log('info', f"📊 {validator_name}: {'✅ PASS' if result.passed else '❌ FAIL'} (score: {result.score:.2f})")
-                
-            except Exception as e:
-                self._log('error', f"❌ {validator_name} failed: {e}")
-                validation_results[validator_name] = ValidationResult(
-                    level=ValidationLevel.STRUCTURE,
-                    passed=False,
-                    score=0.0,
-                    issues=[f"Validator error: {e}"],
-                    suggestions=["Check validator implementation"]
-                )
+        skipped_validators = []
+        for validator_name in self.validators:
+            if validator_name in self.heuristic_validators:
+                break
+            result = self._run_validator(validator_name, blocks)
+            validation_results[validator_name] = result
+            if result.critical:
+                # Fail fast: per-block heuristics on a broken structure would only add noise
+                skipped_validators = [name for name in self.validators if name not in validation_results]
+                self._log('warning', f"⏭️ Skipping {', '.join(skipped_validators)}: {validator_name} failed critically")
+                break
+        
+        if not skipped_validators:
+            validation_results.update(self._run_heuristic_validators(blocks))
         
         # Calculate overall score
-        overall_score = self._calculate_overall_score(validation_results)
+        overall_score = self._calculate_overall_score(validation_results, skipped_validators)
         
         # Determine confidence level
         confidence_level = self._determine_confidence_level(overall_score)
@@ -118,7 +158,8 @@ class QualityAssurance:
             validation_results=validation_results,
             critical_issues=critical_issues,
             recommendations=recommendations,
-            processing_time=processing_time
+            processing_time=processing_time,
+            skipped_validators=skipped_validators
         )
         
         self._log('info', f"✅ Quality assurance completed in {processing_time:.2f}s")
@@ -126,10 +167,64 @@ class QualityAssurance:
         
         return report
     
-    def _structure_validator(self, input_text: str, output_text: str) -> ValidationResult:
+    def _parse_blocks(self, input_text: str, output_text: str) -> ParsedBlocks:
+        """Parse input và output into the shared block model"""
+        return ParsedBlocks(
+            input_blocks=self.block_manager.extract_blocks_with_info(input_text),
+            output_blocks=self.block_manager.extract_blocks_with_info(output_text)
+        )
+    
+    def _run_validator(self, validator_name: str, blocks: ParsedBlocks) -> ValidationResult:
+        """Run one validator; an exception becomes a failed result"""
+        try:
+            result = self.validators[validator_name](blocks)
+            self._log('info', f"📊 {validator_name}: {'✅ PASS' if result.passed else '❌ FAIL'} (score: {result.score:.2f})")
+            return result
+        except Exception as e:
+            self._log('error', f"❌ {validator_name} failed: {e}")
+            return ValidationResult(
+                level=ValidationLevel.STRUCTURE,
+                passed=False,
+                score=0.0,
+                issues=[f"Validator error: {e}"],
+                suggestions=["Check validator implementation"]
+            )
+    
+    def _run_heuristic_validators(self, blocks: ParsedBlocks) -> Dict[str, ValidationResult]:
+        """Run the independent heuristic validators, concurrently for large files"""
+        names = self.heuristic_validators
+        if len(blocks.output_blocks) < self.parallel_min_blocks or self.max_workers < 2:
+            return {name: self._run_validator(name, blocks) for name in names}
+        
+        try:
+            return self._run_in_pool(names, blocks)
+        except Exception as e:
+            # E.g. a glossary that cannot be pickled for spawned workers
+            self._log('warning', f"⚠️ Parallel validation failed ({e}), running validators sequentially")
+            return {name: self._run_validator(name, blocks) for name in names}
+    
+    def _run_in_pool(self, names: List[str], blocks: ParsedBlocks) -> Dict[str, ValidationResult]:
+        """Run validators in a process or thread pool"""
+        workers = min(self.max_workers, len(names))
+        if self.executor == "process":
+            # Workers log through the module logger (results are logged here); the blocks are handed over once per worker
+            worker = QualityAssurance(self.block_manager, logger=logging.getLogger(__name__), glossary=self.glossary)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_validator_process,
+                                     initargs=(worker, blocks)) as executor:
+                futures = {name: executor.submit(_run_validator_in_process, name) for name in names}
+                results = {name: future.result() for name, future in futures.items()}
+            for name, result in results.items():
+                self._log('info', f"📊 {name}: {'✅ PASS' if result.passed else '❌ FAIL'} (score: {result.score:.2f})")
+            return results
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {name: executor.submit(self._run_validator, name, blocks) for name in names}
+            return {name: future.result() for name, future in futures.items()}
+    
+    def _structure_validator(self, blocks: ParsedBlocks) -> ValidationResult:
         """Validate structure consistency"""
-        input_blocks = self.block_manager.extract_blocks_with_info(input_text)
-        output_blocks = self.block_manager.extract_blocks_with_info(output_text)
+        input_blocks = blocks.input_blocks
+        output_blocks = blocks.output_blocks
         
         validation = self.block_manager.validate_block_consistency(input_blocks, output_blocks)
         
@@ -171,13 +266,14 @@ class QualityAssurance:
             passed=len(issues) == 0,
             score=score,
             issues=issues,
-            suggestions=suggestions
+            suggestions=suggestions,
+            # Missing blocks (or no output at all) make the content checks meaningless
+            critical=bool(validation['missing_blocks']) or not output_blocks
         )
     
-    def _content_validator(self, input_text: str, output_text: str) -> ValidationResult:
+    def _content_validator(self, blocks: ParsedBlocks) -> ValidationResult:
         """Validate content quality"""
-        input_blocks = self.block_manager.extract_blocks_with_info(input_text)
-        output_blocks = self.block_manager.extract_blocks_with_info(output_text)
+        output_blocks = blocks.output_blocks
         
         issues = []
         score = 1.0
@@ -226,16 +322,19 @@ class QualityAssurance:
             suggestions=suggestions
         )
     
-    def _consistency_validator(self, input_text: str, output_text: str) -> ValidationResult:
+    def _consistency_validator(self, blocks: ParsedBlocks) -> ValidationResult:
         """Validate consistency across blocks"""
-        input_blocks = self.block_manager.extract_blocks_with_info(input_text)
-        output_blocks = self.block_manager.extract_blocks_with_info(output_text)
+        input_blocks = blocks.input_blocks
+        output_blocks = blocks.output_blocks
         
         issues = []
         score = 1.0
         
+        # Check glossary terms once for both the name and the terminology checks
+        glossary_issues = self._check_glossary(blocks) if self.glossary else None
+        
         # Check character name consistency
-        character_consistency = self._check_character_consistency(input_blocks, output_blocks)
+        character_consistency = self._check_character_consistency(input_blocks, output_blocks, glossary_issues)
         if character_consistency['issues']:
             issues.extend(character_consistency['issues'])
             score -= character_consistency['score_deduction']
@@ -247,7 +346,7 @@ class QualityAssurance:
             score -= style_consistency['score_deduction']
         
         # Check terminology consistency
-        terminology_consistency = self._check_terminology_consistency(output_blocks)
+        terminology_consistency = self._check_terminology_consistency(output_blocks, glossary_issues)
         if terminology_consistency['issues']:
             issues.extend(terminology_consistency['issues'])
             score -= terminology_consistency['score_deduction']
@@ -270,9 +369,9 @@ class QualityAssurance:
             suggestions=suggestions
         )
     
-    def _quality_validator(self, input_text: str, output_text: str) -> ValidationResult:
+    def _quality_validator(self, blocks: ParsedBlocks) -> ValidationResult:
         """Validate overall translation quality"""
-        output_blocks = self.block_manager.extract_blocks_with_info(output_text)
+        output_blocks = blocks.output_blocks
         
         issues = []
         score = 1.0
@@ -357,11 +456,35 @@ class QualityAssurance:
             'score_deduction': score_deduction
         }
     
-    def _check_character_consistency(self, input_blocks: List, output_blocks: List) -> Dict:
+    def _check_glossary(self, blocks: ParsedBlocks) -> List:
+        """Check every output block against the glossary (each block is scanned once)"""
+        return self.glossary.check_blocks(blocks.sources, blocks.translations)
+    
+    def _format_glossary_issues(self, glossary_issues: List, limit: int = 10) -> List[str]:
+        """Format glossary issues as 'block: source -> target (kind)'"""
+        formatted = [f"{issue.key}: {issue.term.source} -> {issue.term.target} ({issue.kind})"
+                     for issue in glossary_issues[:limit]]
+        if len(glossary_issues) > limit:
+            formatted.append(f"... {len(glossary_issues) - limit} more")
+        return formatted
+    
+    def _check_character_consistency(self, input_blocks: List, output_blocks: List,
+                                     glossary_issues: Optional[List] = None) -> Dict:
         """Check character name consistency"""
         issues = []
         score_deduction = 0.0
         
+        # With a glossary, names are its "name" entries
+        if glossary_issues is not None:
+            name_issues = [issue for issue in glossary_issues if issue.term.category == "name"]
+            if name_issues:
+                issues.append(f"Character names not kept: {self._format_glossary_issues(name_issues)}")
+                score_deduction += 0.2
+            return {
+                'issues': issues,
+                'score_deduction': score_deduction
+            }
+        
         # Extract character names from input and output
         input_names = self._extract_character_names(input_blocks)
         output_names = self._extract_character_names(output_blocks)
@@ -457,11 +580,22 @@ class QualityAssurance:
         else:
             return 'neutral'
     
-    def _check_terminology_consistency(self, output_blocks: List) -> Dict:
+    def _check_terminology_consistency(self, output_blocks: List, glossary_issues: Optional[List] = None) -> Dict:
         """Check terminology consistency"""
         issues = []
         score_deduction = 0.0
         
+        # With a glossary, every term must get its required translation
+        if glossary_issues is not None:
+            term_issues = [issue for issue in glossary_issues if issue.term.category != "name"]
+            if term_issues:
+                issues.append(f"Glossary terms not applied: {self._format_glossary_issues(term_issues)}")
+                score_deduction += 0.1
+            return {
+                'issues': issues,
+                'score_deduction': score_deduction
+            }
+        
         # Extract technical terms
         technical_terms = self._extract_technical_terms(output_blocks)
         
@@ -572,8 +706,9 @@ class QualityAssurance:
         else:
             return 0.4  # Poor transition
     
-    def _calculate_overall_score(self, validation_results: Dict[str, ValidationResult]) -> float:
-        """Calculate overall quality score"""
+    def _calculate_overall_score(self, validation_results: Dict[str, ValidationResult],
+                                 skipped_validators: List[str] = ()) -> float:
+        """Calculate overall quality score (skipped validators score 0)"""
         if not validation_results:
             return 0.0
         
@@ -592,6 +727,7 @@ class QualityAssurance:
             weight = weights.get(validator_name, 0.1)
             weighted_sum += result.score * weight
             total_weight += weight
+        total_weight += sum(weights.get(validator_name, 0.1) for validator_name in skipped_validators)
         
         return weighted_sum / total_weight if total_weight > 0 else 0.0
     
@@ -0,0 +1,85 @@
+# Test Module: quality_assurance
+# Purpose: Unit tests for QualityAssurance.validate_translation
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from unittest.mock import MagicMock
+from reference_modules.enhanced_block_manager import EnhancedBlockManager
+from reference_modules.quality_assurance import QualityAssurance
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_BOOL
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+HEURISTIC_VALIDATORS = ['content_validator', 'consistency_validator', 'quality_validator']
+
+def build_text(lines, skip=()):
+    """Block text with one ---------<n> block per line, without the blocks in skip"""
+    return "\n".join(f"---------{i}\n{line}" for i, line in enumerate(lines) if i not in skip)
+
+INPUT_TEXT = build_text(["Where are you going tonight?", "I will be back before the sun goes down.",
+                         "Do not worry, everything is fine.", "We have to leave right now."] * 3)
+OUTPUT_TEXT = build_text(["Tối nay cậu định đi đâu vậy?", "Tôi sẽ quay lại trước khi mặt trời lặn.",
+                          "Đừng lo, mọi chuyện đều ổn cả.", "Chúng ta phải đi ngay bây giờ."] * 3)
+
+def build_sut(**kwargs):
+    """QualityAssurance with a real block manager whose block extraction is counted"""
+    block_manager = EnhancedBlockManager()
+    block_manager.extract_blocks_with_info = MagicMock(wraps=block_manager.extract_blocks_with_info)
+    return QualityAssurance(block_manager, logger=MagicMock(), **kwargs)
+
+##################################### Test `validate_translation` ##################################
+
+'''
+Equivalent class of validate_translation(input_text, output_text)
+
+Test case    *  output_text             *  parallel_min_blocks  * Expected Result
+             *                          *                       *
+TC001        *  every block translated  *  default              *  Success - all validators run on one parse per text
+TC002        *  blocks missing          *  default              *  Success - heuristic validators skipped, low score
+TC003        *  every block translated  *  0 (thread / process) *  Success - same results as the sequential run
+'''
+
+# Test Description: Both texts are parsed once and every validator runs
+# Test Objective: Success
+# Test Case: TC001
+def utest_quality_assurance_validate_translation():
+    # Test data
+    sut = build_sut()
+    # Call SUT (act)
+    report = sut.validate_translation(INPUT_TEXT, OUTPUT_TEXT)
+    # Check result, assertion
+    CHECK_EQUAL(sut.block_manager.extract_blocks_with_info.call_count, 2, "Input and output should be parsed once")
+    CHECK_EQUAL(list(report.validation_results), list(sut.validators), "Validators should run in order")
+    CHECK_EQUAL(report.skipped_validators, [], "Nothing should be skipped")
+    CHECK_BOOL(report.validation_results['structure_validator'].passed, True, "Structure should pass")
+
+# Test Description: Missing blocks fail the structure check critically and skip the heuristic validators
+# Test Objective: Success
+# Test Case: TC002
+def utest_quality_assurance_validate_translation_fail_fast():
+    # Test data
+    sut = build_sut()
+    output_text = build_text(["Tối nay cậu định đi đâu vậy?"] * 12, skip=(3, 7))
+    # Call SUT (act)
+    report = sut.validate_translation(INPUT_TEXT, output_text)
+    # Check result, assertion
+    CHECK_BOOL(report.validation_results['structure_validator'].critical, True, "Missing blocks should be critical")
+    CHECK_EQUAL(list(report.validation_results), ['structure_validator'], "Only structure should run")
+    CHECK_EQUAL(report.skipped_validators, HEURISTIC_VALIDATORS, "Heuristic validators should be skipped")
+    CHECK_BOOL(report.overall_score < sut.thresholds['low_confidence'], True, "Skipped validators should score 0")
+
+# Test Description: Pooled heuristic validators give the same results as the sequential run
+# Test Objective: Success
+# Test Case: TC003
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def utest_quality_assurance_validate_translation_parallel(executor):
+    # Test data
+    expected = build_sut().validate_translation(INPUT_TEXT, OUTPUT_TEXT)
+    sut = build_sut(parallel_min_blocks=0, executor=executor)
+    # Call SUT (act)
+    report = sut.validate_translation(INPUT_TEXT, OUTPUT_TEXT)
+    # Check result, assertion
+    CHECK_EQUAL(report.validation_results, expected.validation_results, "Results should not depend on the executor")
+    CHECK_EQUAL(report.overall_score, expected.overall_score, "Score should not depend on the executor")
@@ -2,6 +2,17 @@ from abc import ABC, abstractmethod
 import aiohttp
 import json
 
+def message_text(message):
+    '''
+    @brief Text of a chat message, whether its content is a string or a list of content parts.
+    @param message (dict): Chat message.
+    @return (str): Concatenated text content.
+    '''
+    content = message.get('content', '')
+    if isinstance(content, list):
+        return ''.join(part.get('text', '') for part in content if isinstance(part, dict))
+    return content
+
 class APIClient(ABC): # pragma: no cover, abstract class
     @abstractmethod
     async def send_request(self, data): # pragma: no cover, abstract method
@@ -17,6 +28,7 @@ class APIClient(ABC): # pragma: no cover, abstract class
 - @param api_key_manager (APIKeyManager): Manages the pool of API keys.
 - @param api_url (str): API endpoint URL.
 - @param logger (Logger): Logger object for logging.
+- @param status_callback (callable, optional): Called with every non-200 HTTP status (e.g. for concurrency control).
 @method
 - `send_request(payload: dict) -> dict`
     - @param payload (dict): Data to send to the API.
@@ -24,16 +36,26 @@ class APIClient(ABC): # pragma: no cover, abstract class
     - @raises Exception: If the request fails or all keys are exhausted.
 '''
 class OpenRouterClient(APIClient):
-    def __init__(self, api_key_manager, api_url, logger):
+    def __init__(self, api_key_manager, api_url, logger, status_callback=None):
         '''
         @brief Constructor for OpenRouterClient.
         @param api_key_manager (APIKeyManager): Manages API keys.
         @param api_url (str): API endpoint URL.
         @param logger (Logger): Logger for logging events.
+        @param status_callback (callable, optional): Called with every non-200 HTTP status.
         '''
         self.api_key_manager = api_key_manager
         self.api_url = api_url
         self.logger = logger
+        self.status_callback = status_callback
+
+    def _report_status(self, status):
+        '''
+        @brief Forward a non-200 HTTP status to the status callback, if any.
+        @param status (int): HTTP status code.
+        '''
+        if self.status_callback:
+            self.status_callback(status)
 
     async def send_request(self, data):
         '''
@@ -137,6 +159,7 @@ class OpenRouterClient(APIClient):
                                 response_text = await response.text()
                                 last_error = response_text
                                 self.logger.warning(f"⚠️  [RATE LIMIT] Key rate-limited, switching to next key...")
+                                self._report_status(response.status)
                                 await self.api_key_manager.report_key_error(key, response.status)
                                 continue
                             elif response.status >= 500:
@@ -144,6 +167,7 @@ class OpenRouterClient(APIClient):
                                 response_text = await response.text()
                                 last_error = response_text
                                 self.logger.error(f"💥 [SERVER ERROR] API server error {response.status}: {response_text[:200]}")
+                                self._report_status(response.status)
                                 await self.api_key_manager.report_key_error(key, response.status)
                                 raise RuntimeError(f"API server error {response.status}")
                             else:
@@ -151,6 +175,7 @@ class OpenRouterClient(APIClient):
                                 response_text = await response.text()
                                 last_error = response_text
                                 self.logger.error(f"❌ [CLIENT ERROR] API error {response.status}: {response_text[:200]}")
+                                self._report_status(response.status)
                                 await self.api_key_manager.report_key_error(key, response.status)
                                 raise RuntimeError(f"API error {response.status}")
                     else:
@@ -176,18 +201,21 @@ class OpenRouterClient(APIClient):
                                 # Only switch key if rate limit
                                 last_error = response_text
                                 self.logger.warning(f"⚠️  [RATE LIMIT] Key rate-limited, switching to next key...")
+                                self._report_status(response.status)
                                 await self.api_key_manager.report_key_error(key, response.status)
                                 continue
                             elif response.status >= 500:
                                 # Server error: fail immediately (no backoff)
                                 last_error = response_text
                                 self.logger.error(f"💥 [SERVER ERROR] API server error {response.status}: {response_text[:200]}")
+                                self._report_status(response.status)
                                 await self.api_key_manager.report_key_error(key, response.status)
                                 raise RuntimeError(f"API server error {response.status}")
                             else:
                                 # Other client errors: fail immediately
                                 last_error = response_text
                                 self.logger.error(f"❌ [CLIENT ERROR] API error {response.status}: {response_text[:200]}")
+                                self._report_status(response.status)
                                 await self.api_key_manager.report_key_error(key, response.status)
                                 raise RuntimeError(f"API error {response.status}")
                 except aiohttp.ClientError as e:
@@ -0,0 +1,79 @@
+import os
+from services.common.logger import get_logger
+from services.common.api_client import message_text
+
+'''
+@brief TokenCounter module - Estimates token counts for texts, messages and input files.
+@details
+- Uses a HuggingFace tokenizer when one is configured and `transformers` is installed.
+- Falls back to a characters-per-token heuristic otherwise (no extra dependency, no I/O).
+@constructor
+- @param tokenizer_name (str, optional): HuggingFace tokenizer name (e.g. "gpt2").
+- @param chars_per_token (float): Average characters per token for the heuristic.
+@method
+- `count_text(text: str) -> int`
+- `count_messages(messages: list) -> int`
+- `estimate_file_tokens(path: str) -> int`
+'''
+class TokenCounter:
+    def __init__(self, tokenizer_name=None, chars_per_token=4.0):
+        '''
+        @brief Constructor for TokenCounter.
+        @param tokenizer_name (str, optional): HuggingFace tokenizer name.
+        @param chars_per_token (float): Average characters per token for the heuristic.
+        '''
+        self.logger = get_logger("TokenCounter")
+        self.tokenizer_name = tokenizer_name
+        self.chars_per_token = chars_per_token
+        self.tokenizer = None
+        
+        if tokenizer_name:
+            try:
+                from transformers import AutoTokenizer
+                self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+                self.logger.info(f"Using tokenizer: {tokenizer_name}")
+            except Exception as e:
+                self.logger.warning(f"Tokenizer '{tokenizer_name}' unavailable, using heuristic: {e}")
+    
+    def count_text(self, text):
+        '''
+        @brief Counts the tokens in a text.
+        @param text (str): Text to count.
+        @return (int): Number of tokens.
+        '''
+        if not text:
+            return 0
+        if self.tokenizer is not None:
+            return len(self.tokenizer.encode(text))
+        return max(1, int(len(text) / self.chars_per_token + 0.5))
+    
+    def count_messages(self, messages):
+        '''
+        @brief Counts the tokens in a list of chat messages.
+        @param messages (list): List of message dicts.
+        @return (int): Number of tokens in all messages.
+        '''
+        full_text = "".join(f"{m['role']}: {message_text(m)}\n" for m in messages)
+        return self.count_text(full_text)
+    
+    def estimate_file_tokens(self, path):
+        '''
+        @brief Estimates the tokens in a file from its size, without reading it.
+        @param path (str): File path.
+        @return (int): Estimated number of tokens.
+        '''
+        try:
+            return int(os.path.getsize(path) / self.chars_per_token)
+        except OSError:
+            return 0
+    
+    def get_stats(self):
+        '''
+        @brief Returns the counting mode.
+        @return (dict): Tokenizer name and whether the heuristic is used.
+        '''
+        return {
+            "tokenizer": self.tokenizer_name if self.tokenizer is not None else None,
+            "heuristic": self.tokenizer is None,
+            "chars_per_token": self.chars_per_token
+        }
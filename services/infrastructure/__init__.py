@@ -1,5 +1,16 @@
 from .key_manager import APIKeyManager, KeyStatus
-from .job_scheduler import JobScheduler
+from .job_scheduler import JobScheduler, JobOrdering
 from .config_manager import ConfigManager
+from .job_journal import JobJournal, JobStatus
+from .concurrency_controller import AdaptiveConcurrencyController
 
-__all__ = ['APIKeyManager', 'KeyStatus', 'JobScheduler', 'ConfigManager']
\ No newline at end of file
+__all__ = [
+    'APIKeyManager',
+    'KeyStatus',
+    'JobScheduler',
+    'JobOrdering',
+    'ConfigManager',
+    'JobJournal',
+    'JobStatus',
+    'AdaptiveConcurrencyController'
+]
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""
+Concurrency Controller
+AIMD (additive increase, multiplicative decrease) limit on in-flight API requests
+"""
+
+import asyncio
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+from services.common.logger import get_logger
+
+class ConcurrencySlot:
+    """Handle for one in-flight request, used to report its outcome"""
+    
+    def __init__(self):
+        self.failed = False
+        self.latency: Optional[float] = None
+    
+    def mark_failed(self) -> None:
+        """Mark the request as failed so it does not count as a healthy sample"""
+        self.failed = True
+    
+    def record_latency(self, latency: float) -> None:
+        """
+        Record the latency of the attempt that succeeded, excluding earlier retries and their backoff
+        :param latency: Attempt latency in seconds
+        """
+        self.latency = latency
+
+class AdaptiveConcurrencyController:
+    """Raises the in-flight limit additively while healthy and cuts it multiplicatively on congestion"""
+    
+    def __init__(self, initial_limit: int = 4, min_limit: int = 1, max_limit: int = 100,
+                 additive_increase: float = 1.0, decrease_factor: float = 0.5,
+                 latency_spike_factor: float = 2.0, cooldown: float = 2.0, history_size: int = 100,
+                 latency_window: int = 50):
+        """
+        Initialize concurrency controller
+        :param initial_limit: Starting in-flight request limit
+        :param min_limit: Lower bound for the limit
+        :param max_limit: Upper bound for the limit
+        :param additive_increase: Limit increase per round trip of healthy requests
+        :param decrease_factor: Multiplier applied to the limit on congestion
+        :param latency_spike_factor: Latency above this multiple of the baseline (median of the recent
+                                     latencies) counts as congestion
+        :param cooldown: Minimum seconds between two decreases (one cut per congestion event)
+        :param history_size: Number of limit changes kept in history
+        :param latency_window: Number of recent latencies the baseline is the median of
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.latency_spike_factor = latency_spike_factor
+        self.cooldown = cooldown
+        
+        self.in_flight = 0
+        # Spikes are kept too: after a lasting latency shift the median moves and the limit recovers
+        self.latencies = deque(maxlen=max(1, latency_window))
+        self.history = deque(maxlen=history_size)
+        self.stats = {
+            'successful_requests': 0,
+            'failed_requests': 0,
+            'rate_limited': 0,
+            'server_errors': 0,
+            'latency_spikes': 0
+        }
+        self._last_decrease: Optional[float] = None
+        self._condition = None
+        self._loop = None
+        self.logger = get_logger("ConcurrencyController")
+        
+        self._record_change("initial")
+    
+    @property
+    def current_limit(self) -> int:
+        """Current integer in-flight limit"""
+        return int(self.limit)
+    
+    @property
+    def latency_baseline(self) -> Optional[float]:
+        """Median of the recent successful request latencies (None before the first one)"""
+        return statistics.median(self.latencies) if self.latencies else None
+    
+    def _get_condition(self) -> asyncio.Condition:
+        """Get the wait condition bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+    
+    async def acquire(self) -> None:
+        """Wait until a request slot is free under the current limit"""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.current_limit)
+            self.in_flight += 1
+    
+    async def release(self) -> None:
+        """Release a request slot and wake up waiters"""
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+    
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold a request slot for the duration of the block and record its latency
+        :return: ConcurrencySlot used to mark the request as failed
+        """
+        await self.acquire()
+        request_slot = ConcurrencySlot()
+        start_time = time.monotonic()
+        try:
+            yield request_slot
+        except Exception:
+            request_slot.mark_failed()
+            raise
+        finally:
+            # Prefer the latency of the successful attempt reported by the request path
+            latency = request_slot.latency if request_slot.latency is not None else time.monotonic() - start_time
+            if request_slot.failed:
+                self.record_failure()
+            else:
+                self.record_success(latency)
+            await self.release()
+    
+    def record_success(self, latency: float) -> None:
+        """
+        Record a successful request; grows the limit unless latency spiked
+        :param latency: Request latency in seconds
+        """
+        self.stats['successful_requests'] += 1
+        
+        baseline = self.latency_baseline
+        self.latencies.append(latency)
+        if baseline is not None and latency > baseline * self.latency_spike_factor:
+            self.stats['latency_spikes'] += 1
+            self._decrease("latency_spike")
+            return
+        
+        # Spread the increase over one window of requests (≈ +additive_increase per round trip)
+        previous_limit = self.current_limit
+        self.limit = min(self.max_limit, self.limit + self.additive_increase / max(1.0, self.limit))
+        if self.current_limit != previous_limit:
+            self._record_change("increase")
+    
+    def record_failure(self) -> None:
+        """Record a request that failed after all retries"""
+        self.stats['failed_requests'] += 1
+        self._decrease("request_failed")
+    
+    def record_status(self, status_code: int) -> None:
+        """
+        Record an HTTP error status seen by the API client
+        :param status_code: HTTP status code
+        """
+        if status_code == 429:
+            self.stats['rate_limited'] += 1
+            self._decrease("rate_limited")
+        elif 500 <= status_code < 600:
+            self.stats['server_errors'] += 1
+            self._decrease("server_error")
+    
+    def _decrease(self, reason: str) -> None:
+        """
+        Cut the limit multiplicatively, at most once per cooldown window
+        :param reason: Reason recorded in the history
+        """
+        now = time.monotonic()
+        if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+            return
+        
+        self._last_decrease = now
+        previous_limit = self.current_limit
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        self._record_change(reason)
+        self.logger.warning(f"Concurrency limit {previous_limit} -> {self.current_limit} ({reason})")
+    
+    def _record_change(self, reason: str) -> None:
+        """
+        Append the current limit to the history
+        :param reason: Reason for the change
+        """
+        self.history.append({
+            'timestamp': time.time(),
+            'limit': self.current_limit,
+            'reason': reason
+        })
+    
+    def get_controller_stats(self) -> Dict[str, Any]:
+        """
+        Get controller statistics including the limit history
+        :return: Controller statistics dictionary
+        """
+        return {
+            'current_limit': self.current_limit,
+            'in_flight': self.in_flight,
+            'min_limit': self.min_limit,
+            'max_limit': self.max_limit,
+            'latency_baseline': self.latency_baseline,
+            **self.stats,
+            'history': list(self.history)
+        }
@@ -18,6 +18,7 @@ class ConfigManager:
         self.logger = get_logger("ConfigManager")
         self.config: Dict[str, Any] = {}
         self.prompts: Dict[str, Any] = {}
+        self._language_prompts: Dict[str, Dict[str, Any]] = {}
         self._load_config()
         self._load_prompts()
     
@@ -33,7 +34,7 @@ class ConfigManager:
                 self.config = yaml.safe_load(f)
             
             self.logger.info(f"Configuration loaded from: {self.config_path}")
-            
+        
         except Exception as e:
             self.logger.error(f"Failed to load configuration: {e}")
             self.config = self._get_default_config()
@@ -71,19 +72,91 @@ class ConfigManager:
                 "top_k": 50,
                 "min_p": 0,
                 "top_a": 1,
-                "repetition_penalty": 1.2
+                "repetition_penalty": 1.2,
+                "source_language": "en",
+                "target_language": "vi",
+                "request_token_budget": 2000,
+                "mask_markup": True,
+                "payload_encoding": "json",
+                "prompt_cache_control": "auto"
             },
             "scheduling": {
                 "job_delay": 10.0,
-                "max_concurrent": 100
+                "max_concurrent": 100,
+                "worker_processes": 1,
+                "job_ordering": "filename"
             },
             "validation": {
                 "strict_json": True,
-                "allow_partial": False
+                "allow_partial": False,
+                "max_rerequests": 2,
+                "repair_json": True,
+                "rerequest_issues": ["missing", "empty", "tag_mismatch"],
+                "length_ratio": [0.3, 3.0]
             },
             "standardization": {
                 "default_format": "json",
-                "auto_convert": True
+                "auto_convert": True,
+                "cache": True,
+                "cache_path": "work_space/standardization_cache.db",
+                "localization_formats": True,
+                "sidecar_dir": "work_space/l10n_maps",
+                "csv_columns": {"source": "source", "target": "target", "id": "key"}
+            },
+            "journal": {
+                "enabled": True,
+                "path": "work_space/job_journal.db"
+            },
+            "pipeline": {
+                "load_workers": 2,
+                "request_workers": None,
+                "validate_workers": 2,
+                "write_workers": 1,
+                "queue_size": 8,
+                "deduplicate": True
+            },
+            "translation_memory": {
+                "enabled": True,
+                "path": "work_space/translation_memory.db",
+                "memory_size": 10000,
+                "prompt_version": None,
+                "fuzzy": True,
+                "fuzzy_hint_threshold": 0.7,
+                "names": []
+            },
+            "tokenizer": {
+                "name": None,
+                "chars_per_token": 4.0
+            },
+            "concurrency": {
+                "enabled": True,
+                "initial_limit": 4,
+                "min_limit": 1,
+                "max_limit": None,
+                "additive_increase": 1.0,
+                "decrease_factor": 0.5,
+                "latency_spike_factor": 2.0,
+                "cooldown": 2.0
+            },
+            "planning": {
+                "completion_ratio": 1.2,
+                "base_latency": 2.0,
+                "latency_per_token": 0.002,
+                "tokens_per_minute": None,
+                "input_price_per_million": 0.0,
+                "output_price_per_million": 0.0
+            },
+            "glossary": {
+                "path": None,
+                "case_sensitive": False,
+                "max_prompt_tokens": 300
+            },
+            "anomaly_detection": {
+                "enabled": True,
+                "z_threshold": 3.5,
+                "min_script_share": 0.25,
+                "min_group_size": 30,
+                "report_path": "work_space/anomalies.jsonl"
             }
         }
     
@@ -98,10 +171,33 @@ class ConfigManager:
         except (KeyError, TypeError):
             return default
     
-    def get_prompt(self, key: str, default: str = "") -> str:
-        """Get prompt value by key"""
+    def get_prompt(self, key: str, default: str = "", language: Optional[str] = None) -> str:
+        """Get prompt value by key, preferring config/prompts.<language>.json when a language is given"""
+        if language:
+            language_prompts = self._get_language_prompts(language)
+            if key in language_prompts:
+                return language_prompts[key]
         return self.prompts.get(key, default)
     
+    def has_language_prompts(self, language: str) -> bool:
+        """Check whether a prompt file exists for a target language"""
+        return bool(self._get_language_prompts(language))
+    
+    def _get_language_prompts(self, language: str) -> Dict[str, Any]:
+        """Load (once) the prompt overrides for a target language"""
+        if language not in self._language_prompts:
+            prompts_path = f"config/prompts.{language}.json"
+            try:
+                with open(prompts_path, 'r', encoding='utf-8') as f:
+                    self._language_prompts[language] = json.load(f)
+                self.logger.info(f"Prompts for '{language}' loaded from: {prompts_path}")
+            except FileNotFoundError:
+                self._language_prompts[language] = {}
+            except Exception as e:
+                self.logger.error(f"Failed to load prompts for '{language}': {e}")
+                self._language_prompts[language] = {}
+        return self._language_prompts[language]
+    
     def get_api_config(self) -> Dict[str, Any]:
         """Get API configuration section"""
         return self.config.get("api", {})
@@ -122,8 +218,41 @@ class ConfigManager:
         """Get standardization configuration section"""
         return self.config.get("standardization", {})
     
+    def get_journal_config(self) -> Dict[str, Any]:
+        """Get job journal configuration section"""
+        return self.config.get("journal", {})
+    
+    def get_pipeline_config(self) -> Dict[str, Any]:
+        """Get batch pipeline configuration section"""
+        return self.config.get("pipeline", {})
+    
+    def get_translation_memory_config(self) -> Dict[str, Any]:
+        """Get translation memory configuration section"""
+        return self.config.get("translation_memory", {})
+    
+    def get_tokenizer_config(self) -> Dict[str, Any]:
+        """Get tokenizer configuration section"""
+        return self.config.get("tokenizer", {})
+    
+    def get_concurrency_config(self) -> Dict[str, Any]:
+        """Get adaptive concurrency configuration section"""
+        return self.config.get("concurrency", {})
+    
+    def get_planning_config(self) -> Dict[str, Any]:
+        """Get dry-run planning configuration section"""
+        return self.config.get("planning", {})
+    
+    def get_glossary_config(self) -> Dict[str, Any]:
+        """Get glossary configuration section"""
+        return self.config.get("glossary", {})
+    
+    def get_anomaly_detection_config(self) -> Dict[str, Any]:
+        """Get batch anomaly detection configuration section"""
+        return self.config.get("anomaly_detection", {})
+    
     def reload(self) -> None:
         """Reload configuration from files"""
         self._load_config()
         self._load_prompts()
+        self._language_prompts = {}
         self.logger.info("Configuration reloaded")
\ No newline at end of file
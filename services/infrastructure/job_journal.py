@@ -0,0 +1,209 @@
+"""
+Job Journal
+Durable SQLite record of translation jobs for crash recovery
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from services.common.logger import get_logger
+
+class JobStatus:
+    """Journal job status constants"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+def file_checksum(path: str) -> str:
+    """
+    Compute the SHA-256 checksum of a file
+    :param path: File path
+    :return: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class JobJournal:
+    """Records job submissions, attempts and outcomes in SQLite (WAL mode)"""
+    
+    def __init__(self, db_path: str = "work_space/job_journal.db"):
+        """
+        Initialize job journal
+        :param db_path: Path to the SQLite database file (":memory:" for a volatile journal)
+        """
+        self.db_path = db_path
+        self.logger = get_logger("JobJournal")
+        self._lock = threading.Lock()
+        
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        # Worker processes open the same database, so wait on locks instead of failing
+        self._conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                input_path TEXT NOT NULL,
+                output_path TEXT NOT NULL,
+                job_id TEXT,
+                input_checksum TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                output_checksum TEXT,
+                error TEXT,
+                submitted_at REAL,
+                updated_at REAL,
+                PRIMARY KEY (input_path, output_path)
+            )
+        """)
+        self._conn.commit()
+        
+        self.logger.info(f"Job journal opened: {db_path}")
+    
+    def record_submission(self, job_id: str, input_path: str, output_path: str,
+                          input_checksum: str) -> None:
+        """
+        Record that a job was submitted; a changed input resets the job to pending
+        :param job_id: Job identifier
+        :param input_path: Input file path
+        :param output_path: Output file path
+        :param input_checksum: Checksum of the input file
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO jobs (input_path, output_path, job_id, input_checksum, status,
+                                  attempts, submitted_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, 0, ?, ?)
+                ON CONFLICT (input_path, output_path) DO UPDATE SET
+                    job_id = excluded.job_id,
+                    status = CASE WHEN jobs.input_checksum = excluded.input_checksum
+                                  AND jobs.status = ? THEN jobs.status ELSE ? END,
+                    attempts = CASE WHEN jobs.input_checksum = excluded.input_checksum
+                                    THEN jobs.attempts ELSE 0 END,
+                    input_checksum = excluded.input_checksum,
+                    submitted_at = excluded.submitted_at,
+                    updated_at = excluded.updated_at
+            """, (input_path, output_path, job_id, input_checksum, JobStatus.PENDING,
+                  now, now, JobStatus.COMPLETED, JobStatus.PENDING))
+            self._conn.commit()
+    
+    def record_attempt(self, input_path: str, output_path: str) -> None:
+        """
+        Record the start of a job attempt
+        :param input_path: Input file path
+        :param output_path: Output file path
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO jobs (input_path, output_path, status, attempts, submitted_at, updated_at)
+                VALUES (?, ?, ?, 1, ?, ?)
+                ON CONFLICT (input_path, output_path) DO UPDATE SET
+                    status = excluded.status,
+                    attempts = jobs.attempts + 1,
+                    updated_at = excluded.updated_at
+            """, (input_path, output_path, JobStatus.RUNNING, now, now))
+            self._conn.commit()
+    
+    def record_outcome(self, input_path: str, output_path: str, success: bool,
+                       output_checksum: Optional[str] = None, error: Optional[str] = None) -> None:
+        """
+        Record the outcome of a job attempt
+        :param input_path: Input file path
+        :param output_path: Output file path
+        :param success: Whether the attempt succeeded
+        :param output_checksum: Checksum of the written output (on success)
+        :param error: Error message (on failure)
+        """
+        status = JobStatus.COMPLETED if success else JobStatus.FAILED
+        with self._lock:
+            self._conn.execute("""
+                UPDATE jobs SET status = ?, output_checksum = ?, error = ?, updated_at = ?
+                WHERE input_path = ? AND output_path = ?
+            """, (status, output_checksum, error, time.time(), input_path, output_path))
+            self._conn.commit()
+    
+    def is_completed(self, input_path: str, output_path: str, input_checksum: str) -> bool:
+        """
+        Check whether a job already completed for this exact input and its output is intact
+        :param input_path: Input file path
+        :param output_path: Output file path
+        :param input_checksum: Current checksum of the input file
+        :return: True if the job can be skipped
+        """
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT status, input_checksum, output_checksum FROM jobs
+                WHERE input_path = ? AND output_path = ?
+            """, (input_path, output_path)).fetchone()
+        
+        if not row:
+            return False
+        
+        status, recorded_input_checksum, output_checksum = row
+        if status != JobStatus.COMPLETED or recorded_input_checksum != input_checksum:
+            return False
+        
+        # The output must still exist and match what was written
+        if not output_checksum or not os.path.isfile(output_path):
+            return False
+        return file_checksum(output_path) == output_checksum
+    
+    def get_jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get journal entries, optionally filtered by status
+        :param status: Status filter (JobStatus constant)
+        :return: List of job dictionaries
+        """
+        query = "SELECT input_path, output_path, job_id, status, attempts, error FROM jobs"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        
+        return [
+            {
+                'input_path': row[0],
+                'output_path': row[1],
+                'job_id': row[2],
+                'status': row[3],
+                'attempts': row[4],
+                'error': row[5]
+            } for row in rows
+        ]
+    
+    def get_journal_stats(self) -> Dict[str, Any]:
+        """
+        Get job counts per status
+        :return: Journal statistics dictionary
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        
+        counts = {status: count for status, count in rows}
+        return {
+            'db_path': self.db_path,
+            'total_jobs': sum(counts.values()),
+            'pending': counts.get(JobStatus.PENDING, 0),
+            'running': counts.get(JobStatus.RUNNING, 0),
+            'completed': counts.get(JobStatus.COMPLETED, 0),
+            'failed': counts.get(JobStatus.FAILED, 0)
+        }
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -9,6 +9,12 @@ from typing import List, Dict, Any, Callable, Awaitable
 from dataclasses import dataclass
 from services.common.logger import get_logger
 
+class JobOrdering:
+    """Batch job ordering constants"""
+    FILENAME = "filename"  # numeric order of the file names
+    LPT = "lpt"            # longest processing time first (minimizes makespan)
+    SJF = "sjf"            # shortest job first (minimizes mean completion time)
+
 @dataclass
 class ScheduledJob:
     """Represents a scheduled job"""
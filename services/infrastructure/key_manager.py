@@ -174,6 +174,48 @@ class APIKeyManager:
             'success_rate': (successful_requests / total_requests * 100) if total_requests > 0 else 0
         }
     
+    def partition_keys(self, num_partitions: int) -> List[List[str]]:
+        """
+        Split the usable keys into disjoint partitions (one per worker process)
+        so that each key's rate-limit budget is owned by exactly one worker
+        :param num_partitions: Requested number of partitions
+        :return: Non-empty key partitions (fewer than requested if keys run short)
+        """
+        usable_keys = [k['key'] for k in self.keys
+                       if k['status'] not in (KeyStatus.ERROR, KeyStatus.EXHAUSTED)]
+        partitions = [usable_keys[i::num_partitions] for i in range(max(1, num_partitions))]
+        return [partition for partition in partitions if partition]
+    
+    def get_key_usage(self) -> List[Dict[str, Any]]:
+        """
+        Get per-key usage counters (used to report worker usage back to the parent)
+        :return: List of per-key usage dictionaries
+        """
+        return [
+            {
+                'key': k['key'],
+                'status': k['status'],
+                'total_requests': k['total_requests'],
+                'successful_requests': k['successful_requests'],
+                'failed_requests': k['failed_requests']
+            } for k in self.keys
+        ]
+    
+    def apply_key_usage(self, usage: List[Dict[str, Any]]) -> None:
+        """
+        Merge per-key usage reported by another key manager (e.g. a worker process)
+        :param usage: Output of get_key_usage() from the other manager
+        """
+        keys_by_value = {k['key']: k for k in self.keys}
+        for entry in usage:
+            key_info = keys_by_value.get(entry['key'])
+            if not key_info:
+                continue
+            key_info['total_requests'] += entry.get('total_requests', 0)
+            key_info['successful_requests'] += entry.get('successful_requests', 0)
+            key_info['failed_requests'] += entry.get('failed_requests', 0)
+            key_info['status'] = entry.get('status', key_info['status'])
+    
     def reset_key(self, key: str) -> bool:
         """
         Reset a key to active status
@@ -0,0 +1,118 @@
+# Test Module: key_manager
+# Purpose: Unit tests for APIKeyManager key partitioning and usage merging
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from services.infrastructure.key_manager import APIKeyManager, KeyStatus
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_INT
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+KEYS = ["key-0", "key-1", "key-2", "key-3", "key-4"]
+
+##################################### Test `partition_keys` ##################################
+
+'''
+Equivalent class of partition_keys(num_partitions)
+
+Test case    *  keys                          *  num_partitions  * Expected Result
+             *                                *                  *
+TC001        *  5 active                      *  2               *  Success - 2 disjoint partitions covering every key
+TC002        *  5 active                      *  8               *  Success - 5 partitions of one key, no empty partition
+TC003        *  5, one ERROR, one EXHAUSTED   *  2               *  Success - unusable keys left out
+TC004        *  all ERROR                     *  2               *  Success - no partition
+'''
+
+# Test Description: Every usable key is owned by exactly one partition
+# Test Objective: Success
+# Test Case: TC001
+def utest_key_manager_partition_keys_disjoint():
+    # Test data
+    sut = APIKeyManager(KEYS)
+    # Call SUT (act)
+    partitions = sut.partition_keys(2)
+    # Check result, assertion
+    CHECK_INT(len(partitions), 2, "One partition per worker")
+    CHECK_EQUAL(set(partitions[0]) & set(partitions[1]), set(), "Partitions should not share keys")
+    CHECK_EQUAL(sorted(partitions[0] + partitions[1]), KEYS, "Partitions should cover every key")
+
+# Test Description: With fewer keys than workers, only non-empty partitions are returned
+# Test Objective: Success
+# Test Case: TC002
+def utest_key_manager_partition_keys_fewer_keys():
+    # Test data
+    sut = APIKeyManager(KEYS)
+    # Call SUT (act)
+    partitions = sut.partition_keys(8)
+    # Check result, assertion
+    CHECK_EQUAL(partitions, [[key] for key in KEYS], "One key per partition, empty partitions dropped")
+
+# Test Description: Keys in ERROR or EXHAUSTED status are not handed to workers
+# Test Objective: Success
+# Test Case: TC003
+def utest_key_manager_partition_keys_unusable():
+    # Test data
+    sut = APIKeyManager(KEYS)
+    sut.keys[1]['status'] = KeyStatus.ERROR
+    sut.keys[3]['status'] = KeyStatus.EXHAUSTED
+    sut.keys[4]['status'] = KeyStatus.RATE_LIMITED
+    # Call SUT (act)
+    partitions = sut.partition_keys(2)
+    # Check result, assertion
+    CHECK_EQUAL(partitions, [["key-0", "key-4"], ["key-2"]], "Only usable keys should be partitioned")
+
+# Test Description: Without usable keys there is nothing to partition
+# Test Objective: Success
+# Test Case: TC004
+def utest_key_manager_partition_keys_none_usable():
+    # Test data
+    sut = APIKeyManager(KEYS[:2])
+    for key_info in sut.keys:
+        key_info['status'] = KeyStatus.ERROR
+    # Call SUT (act)
+    partitions = sut.partition_keys(2)
+    # Check result, assertion
+    CHECK_EQUAL(partitions, [], "No partition should be returned")
+
+##################################### Test `apply_key_usage` ##################################
+
+'''
+Equivalent class of apply_key_usage(usage)
+
+Test case    *  usage                                  * Expected Result
+             *                                         *
+TC001        *  get_key_usage() of a worker manager     *  Success - counts summed, worker status kept
+TC002        *  usage of a key the manager lacks        *  Success - ignored
+'''
+
+# Test Description: Usage reported by workers owning disjoint keys is summed into the parent
+# Test Objective: Success
+# Test Case: TC001
+def utest_key_manager_apply_key_usage_summed():
+    # Test data
+    sut = APIKeyManager(KEYS[:2])
+    sut.keys[0]['total_requests'] = 1
+    sut.keys[0]['successful_requests'] = 1
+    worker = APIKeyManager(KEYS[:2])
+    worker.keys[0].update(total_requests=3, successful_requests=2, failed_requests=1)
+    worker.keys[1].update(total_requests=2, failed_requests=2, status=KeyStatus.EXHAUSTED)
+    # Call SUT (act)
+    sut.apply_key_usage(worker.get_key_usage())
+    # Check result, assertion
+    CHECK_EQUAL([(k['total_requests'], k['successful_requests'], k['failed_requests']) for k in sut.keys],
+                [(4, 3, 1), (2, 0, 2)], "Counts should be added to the parent's")
+    CHECK_EQUAL(sut.keys[1]['status'], KeyStatus.EXHAUSTED, "Worker status should be kept")
+
+# Test Description: Usage of keys unknown to the manager is ignored
+# Test Objective: Success
+# Test Case: TC002
+def utest_key_manager_apply_key_usage_unknown_key():
+    # Test data
+    sut = APIKeyManager(KEYS[:1])
+    # Call SUT (act)
+    sut.apply_key_usage([{'key': "other", 'total_requests': 5, 'status': KeyStatus.ERROR}])
+    # Check result, assertion
+    CHECK_INT(sut.keys[0]['total_requests'], 0, "Known key should be unchanged")
+    CHECK_INT(sut.get_key_stats()['total_keys'], 1, "Unknown key should not be added")
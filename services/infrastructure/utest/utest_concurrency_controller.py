@@ -0,0 +1,211 @@
+# Test Module: concurrency_controller
+# Purpose: Unit tests for concurrency_controller module
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+import asyncio
+from services.infrastructure.concurrency_controller import AdaptiveConcurrencyController
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_STR, CHECK_INT, CHECK_BOOL
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+
+##################################### Test `record_success` ##################################
+
+'''
+Equivalent class of record_success(latency)
+
+Test case    *  limit  *  latency samples        * Expected Result
+             *         *                         *
+TC001        *  2      *  4 x 0.1s               *  Success - limit grows additively to 3
+TC002        *  2      *  limit at max_limit     *  Success - limit capped at max_limit
+TC003        *  8      *  0.1s then 1.0s spike   *  Success - limit halved on latency spike
+TC004        *  8      *  10 x 0.1s, 30 x 1.0s   *  Success - lasting shift becomes the baseline, limit recovers
+'''
+
+# Test Description: Healthy requests raise the limit additively
+# Test Objective: Success
+# Test Case: TC001
+def utest_concurrency_controller_record_success_additive_increase():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=2, max_limit=10)
+    # Call SUT (act)
+    for _ in range(4):
+        sut.record_success(0.1)
+    # Check result, assertion
+    CHECK_INT(sut.current_limit, 3, "Limit should grow by about one per window of requests")
+    CHECK_STR(sut.history[-1]['reason'], "increase", "Increase should be recorded in history")
+
+# Test Description: The limit never grows past max_limit
+# Test Objective: Success
+# Test Case: TC002
+def utest_concurrency_controller_record_success_capped_at_max():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=2, max_limit=2)
+    # Call SUT (act)
+    for _ in range(20):
+        sut.record_success(0.1)
+    # Check result, assertion
+    CHECK_INT(sut.current_limit, 2, "Limit should stay at max_limit")
+
+# Test Description: A latency spike cuts the limit multiplicatively
+# Test Objective: Success
+# Test Case: TC003
+def utest_concurrency_controller_record_success_latency_spike():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=8, max_limit=8, latency_spike_factor=2.0)
+    sut.record_success(0.1)
+    # Call SUT (act)
+    sut.record_success(1.0)
+    # Check result, assertion
+    CHECK_INT(sut.current_limit, 4, "Latency spike should halve the limit")
+    CHECK_INT(sut.stats['latency_spikes'], 1, "Latency spike should be counted")
+
+# Test Description: After a lasting latency shift the baseline follows and the limit grows again
+# Test Objective: Success
+# Test Case: TC004
+def utest_concurrency_controller_record_success_latency_shift():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=8, max_limit=8, cooldown=0, latency_window=10)
+    for _ in range(10):
+        sut.record_success(0.1)
+    # Call SUT (act)
+    for _ in range(30):
+        sut.record_success(1.0)
+    # Check result, assertion
+    CHECK_INT(sut.stats['latency_spikes'], 5, "Only samples before the median moves should be spikes")
+    CHECK_BOOL(sut.latency_baseline == 1.0, True, "Baseline should follow the lasting shift")
+    CHECK_BOOL(sut.current_limit > sut.min_limit, True, "Limit should recover from min_limit")
+
+##################################### Test `record_status` ##################################
+
+'''
+Equivalent class of record_status(status_code)
+
+Test case    *  limit  *  status codes      *  cooldown  * Expected Result
+             *         *                    *            *
+TC001        *  8      *  429               *  2.0       *  Success - limit halved to 4
+TC002        *  8      *  503               *  2.0       *  Success - limit halved to 4
+TC003        *  8      *  429, 429, 429     *  2.0       *  Success - one cut per congestion event
+TC004        *  1      *  429               *  0         *  Success - limit stays at min_limit
+TC005        *  8      *  400               *  2.0       *  Success - client errors ignored
+'''
+
+# Test Description: A 429 cuts the limit multiplicatively
+# Test Objective: Success
+# Test Case: TC001
+def utest_concurrency_controller_record_status_rate_limited():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=8)
+    # Call SUT (act)
+    sut.record_status(429)
+    # Check result, assertion
+    CHECK_INT(sut.current_limit, 4, "429 should halve the limit")
+    CHECK_STR(sut.history[-1]['reason'], "rate_limited", "Decrease reason should be recorded")
+
+# Test Description: A 5xx cuts the limit multiplicatively
+# Test Objective: Success
+# Test Case: TC002
+def utest_concurrency_controller_record_status_server_error():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=8)
+    # Call SUT (act)
+    sut.record_status(503)
+    # Check result, assertion
+    CHECK_INT(sut.current_limit, 4, "5xx should halve the limit")
+
+# Test Description: A burst of 429s within the cooldown only cuts once
+# Test Objective: Success
+# Test Case: TC003
+def utest_concurrency_controller_record_status_burst_within_cooldown():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=8, cooldown=2.0)
+    # Call SUT (act)
+    for _ in range(3):
+        sut.record_status(429)
+    # Check result, assertion
+    CHECK_INT(sut.current_limit, 4, "Only one decrease per cooldown window")
+    CHECK_INT(sut.stats['rate_limited'], 3, "Every 429 should still be counted")
+
+# Test Description: The limit never drops below min_limit
+# Test Objective: Success
+# Test Case: TC004
+def utest_concurrency_controller_record_status_floor_at_min():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=1, min_limit=1, cooldown=0)
+    # Call SUT (act)
+    sut.record_status(429)
+    # Check result, assertion
+    CHECK_INT(sut.current_limit, 1, "Limit should stay at min_limit")
+
+# Test Description: Client errors do not change the limit
+# Test Objective: Success
+# Test Case: TC005
+def utest_concurrency_controller_record_status_client_error_ignored():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=8)
+    # Call SUT (act)
+    sut.record_status(400)
+    # Check result, assertion
+    CHECK_INT(sut.current_limit, 8, "Client errors should not affect concurrency")
+
+##################################### Test `slot` ##################################
+
+'''
+Equivalent class of slot()
+
+Test case    *  limit  *  concurrent tasks  * Expected Result
+             *         *                    *
+TC001        *  2      *  6                 *  Success - never more than 2 in flight
+TC002        *  4      *  1 marked failed   *  Success - failure recorded, limit halved
+TC003        *  4      *  1, latency given  *  Success - reported attempt latency recorded, not the slot time
+'''
+
+# Test Description: Slots bound the number of in-flight requests
+# Test Objective: Success
+# Test Case: TC001
+@pytest.mark.asyncio
+async def utest_concurrency_controller_slot_bounds_in_flight():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=2, max_limit=2)
+    peak = {'value': 0}
+
+    async def request():
+        async with sut.slot():
+            peak['value'] = max(peak['value'], sut.in_flight)
+            await asyncio.sleep(0.01)
+    # Call SUT (act)
+    await asyncio.gather(*[request() for _ in range(6)])
+    # Check result, assertion
+    CHECK_INT(peak['value'], 2, "In-flight requests should never exceed the limit")
+    CHECK_INT(sut.in_flight, 0, "All slots should be released")
+
+# Test Description: A slot marked failed counts as a failure and cuts the limit
+# Test Objective: Success
+# Test Case: TC002
+@pytest.mark.asyncio
+async def utest_concurrency_controller_slot_marked_failed():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=4)
+    # Call SUT (act)
+    async with sut.slot() as slot:
+        slot.mark_failed()
+    # Check result, assertion
+    CHECK_INT(sut.stats['failed_requests'], 1, "Failure should be counted")
+    CHECK_INT(sut.current_limit, 2, "Failure should halve the limit")
+
+# Test Description: The latency of the successful attempt is recorded instead of the time the slot was held
+# Test Objective: Success
+# Test Case: TC003
+@pytest.mark.asyncio
+async def utest_concurrency_controller_slot_attempt_latency():
+    # Test data
+    sut = AdaptiveConcurrencyController(initial_limit=4)
+    # Call SUT (act)
+    async with sut.slot() as slot:
+        await asyncio.sleep(0.05)
+        slot.record_latency(0.01)
+    # Check result, assertion
+    CHECK_BOOL(sut.latency_baseline == 0.01, True, "Attempt latency should be recorded")
@@ -0,0 +1,203 @@
+# Test Module: job_journal
+# Purpose: Unit tests for job_journal module
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from services.infrastructure.job_journal import JobJournal, JobStatus, file_checksum
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_STR, CHECK_INT, CHECK_BOOL
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+
+def _make_job_files(tmp_path):
+    input_file = tmp_path / "chunk_1.json"
+    output_file = tmp_path / "out" / "chunk_1.json"
+    input_file.write_text('{"0": "Hello"}', encoding="utf-8")
+    output_file.parent.mkdir()
+    output_file.write_text('{"0": "Xin chao"}', encoding="utf-8")
+    return str(input_file), str(output_file)
+
+##################################### Test `record_submission` ##################################
+
+'''
+Equivalent class of record_submission(job_id, input_path, output_path, input_checksum)
+
+Test case    *  journal state            *  input_checksum   * Expected Result
+             *                           *                   *
+TC001        *  empty                    *  "abc"            *  Success - job recorded as pending
+TC002        *  completed, same checksum *  "abc"            *  Success - job stays completed
+TC003        *  completed, other checksum*  "def"            *  Success - job reset to pending, attempts 0
+'''
+
+# Test Description: Submit a new job into an empty journal
+# Test Objective: Success
+# Test Case: TC001
+def utest_job_journal_record_submission_new_job(tmp_path):
+    # Test data
+    sut = JobJournal(str(tmp_path / "journal.db"))
+    # Call SUT (act)
+    sut.record_submission("job_1", "in.json", "out.json", "abc")
+    # Check result, assertion
+    jobs = sut.get_jobs()
+    CHECK_INT(len(jobs), 1, "Journal should contain one job")
+    CHECK_STR(jobs[0]['status'], JobStatus.PENDING, "New job should be pending")
+
+# Test Description: Re-submit a completed job with an unchanged input
+# Test Objective: Success
+# Test Case: TC002
+def utest_job_journal_record_submission_completed_same_checksum(tmp_path):
+    # Test data
+    sut = JobJournal(str(tmp_path / "journal.db"))
+    sut.record_submission("job_1", "in.json", "out.json", "abc")
+    sut.record_attempt("in.json", "out.json")
+    sut.record_outcome("in.json", "out.json", True, output_checksum="xyz")
+    # Call SUT (act)
+    sut.record_submission("job_1", "in.json", "out.json", "abc")
+    # Check result, assertion
+    jobs = sut.get_jobs()
+    CHECK_STR(jobs[0]['status'], JobStatus.COMPLETED, "Completed job should stay completed")
+    CHECK_INT(jobs[0]['attempts'], 1, "Attempt count should be kept")
+
+# Test Description: Re-submit a completed job whose input changed
+# Test Objective: Success
+# Test Case: TC003
+def utest_job_journal_record_submission_completed_changed_checksum(tmp_path):
+    # Test data
+    sut = JobJournal(str(tmp_path / "journal.db"))
+    sut.record_submission("job_1", "in.json", "out.json", "abc")
+    sut.record_attempt("in.json", "out.json")
+    sut.record_outcome("in.json", "out.json", True, output_checksum="xyz")
+    # Call SUT (act)
+    sut.record_submission("job_1", "in.json", "out.json", "def")
+    # Check result, assertion
+    jobs = sut.get_jobs()
+    CHECK_STR(jobs[0]['status'], JobStatus.PENDING, "Changed input should reset the job")
+    CHECK_INT(jobs[0]['attempts'], 0, "Attempt count should be reset")
+
+##################################### Test `is_completed` ##################################
+
+'''
+Equivalent class of is_completed(input_path, output_path, input_checksum)
+
+Test case    *  journal state                 *  output file        * Expected Result
+             *                                *                     *
+TC001        *  completed, checksums match    *  unchanged          *  Success - True
+TC002        *  running (interrupted)         *  unchanged          *  Success - False
+TC003        *  completed                     *  modified           *  Success - False
+TC004        *  completed                     *  deleted            *  Success - False
+TC005        *  completed, persisted on disk  *  unchanged          *  Success - True after reopening
+'''
+
+# Test Description: Completed job with intact output is reported completed
+# Test Objective: Success
+# Test Case: TC001
+def utest_job_journal_is_completed_intact_output(tmp_path):
+    # Test data
+    input_file, output_file = _make_job_files(tmp_path)
+    sut = JobJournal(str(tmp_path / "journal.db"))
+    input_checksum = file_checksum(input_file)
+    sut.record_submission("job_1", input_file, output_file, input_checksum)
+    sut.record_attempt(input_file, output_file)
+    sut.record_outcome(input_file, output_file, True, output_checksum=file_checksum(output_file))
+    # Call SUT (act)
+    act = sut.is_completed(input_file, output_file, input_checksum)
+    # Check result, assertion
+    CHECK_BOOL(act, True, "Completed job with intact output should be skipped")
+
+# Test Description: Interrupted job is not reported completed
+# Test Objective: Success
+# Test Case: TC002
+def utest_job_journal_is_completed_interrupted_job(tmp_path):
+    # Test data
+    input_file, output_file = _make_job_files(tmp_path)
+    sut = JobJournal(str(tmp_path / "journal.db"))
+    input_checksum = file_checksum(input_file)
+    sut.record_submission("job_1", input_file, output_file, input_checksum)
+    sut.record_attempt(input_file, output_file)
+    # Call SUT (act)
+    act = sut.is_completed(input_file, output_file, input_checksum)
+    # Check result, assertion
+    CHECK_BOOL(act, False, "Interrupted job should be re-queued")
+    CHECK_INT(len(sut.get_jobs(JobStatus.RUNNING)), 1, "Interrupted job should be listed as running")
+
+# Test Description: Completed job whose output was modified is not reported completed
+# Test Objective: Success
+# Test Case: TC003
+def utest_job_journal_is_completed_modified_output(tmp_path):
+    # Test data
+    input_file, output_file = _make_job_files(tmp_path)
+    sut = JobJournal(str(tmp_path / "journal.db"))
+    input_checksum = file_checksum(input_file)
+    sut.record_submission("job_1", input_file, output_file, input_checksum)
+    sut.record_outcome(input_file, output_file, True, output_checksum=file_checksum(output_file))
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write('{"0": "tampered"}')
+    # Call SUT (act)
+    act = sut.is_completed(input_file, output_file, input_checksum)
+    # Check result, assertion
+    CHECK_BOOL(act, False, "Modified output should be re-translated")
+
+# Test Description: Completed job whose output was deleted is not reported completed
+# Test Objective: Success
+# Test Case: TC004
+def utest_job_journal_is_completed_deleted_output(tmp_path):
+    # Test data
+    input_file, output_file = _make_job_files(tmp_path)
+    sut = JobJournal(str(tmp_path / "journal.db"))
+    input_checksum = file_checksum(input_file)
+    sut.record_submission("job_1", input_file, output_file, input_checksum)
+    sut.record_outcome(input_file, output_file, True, output_checksum=file_checksum(output_file))
+    (tmp_path / "out" / "chunk_1.json").unlink()
+    # Call SUT (act)
+    act = sut.is_completed(input_file, output_file, input_checksum)
+    # Check result, assertion
+    CHECK_BOOL(act, False, "Deleted output should be re-translated")
+
+# Test Description: Completion survives closing and reopening the journal
+# Test Objective: Success
+# Test Case: TC005
+def utest_job_journal_is_completed_after_reopen(tmp_path):
+    # Test data
+    input_file, output_file = _make_job_files(tmp_path)
+    db_path = str(tmp_path / "journal.db")
+    journal = JobJournal(db_path)
+    input_checksum = file_checksum(input_file)
+    journal.record_submission("job_1", input_file, output_file, input_checksum)
+    journal.record_outcome(input_file, output_file, True, output_checksum=file_checksum(output_file))
+    journal.close()
+    sut = JobJournal(db_path)
+    # Call SUT (act)
+    act = sut.is_completed(input_file, output_file, input_checksum)
+    # Check result, assertion
+    CHECK_BOOL(act, True, "Completion should be durable across restarts")
+
+##################################### Test `get_journal_stats` ##################################
+
+'''
+Equivalent class of get_journal_stats()
+
+Test case    *  journal state                  * Expected Result
+             *                                 *
+TC001        *  1 completed, 1 failed, 1 pending *  Success - counts per status
+'''
+
+# Test Description: Journal statistics count jobs per status
+# Test Objective: Success
+# Test Case: TC001
+def utest_job_journal_get_journal_stats_counts(tmp_path):
+    # Test data
+    sut = JobJournal(str(tmp_path / "journal.db"))
+    sut.record_submission("job_1", "a.json", "oa.json", "1")
+    sut.record_submission("job_2", "b.json", "ob.json", "2")
+    sut.record_submission("job_3", "c.json", "oc.json", "3")
+    sut.record_outcome("a.json", "oa.json", True, output_checksum="x")
+    sut.record_outcome("b.json", "ob.json", False, error="boom")
+    # Call SUT (act)
+    act = sut.get_journal_stats()
+    # Check result, assertion
+    CHECK_INT(act['total_jobs'], 3, "Should count all jobs")
+    CHECK_INT(act['completed'], 1, "Should count completed jobs")
+    CHECK_INT(act['failed'], 1, "Should count failed jobs")
+    CHECK_INT(act['pending'], 1, "Should count pending jobs")
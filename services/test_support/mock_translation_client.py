@@ -0,0 +1,89 @@
+"""
+Mock Translation Client
+Offline stand-in for the translation provider, for tests and benchmarks; never selected by configuration
+"""
+
+import asyncio
+from services.common.api_client import APIClient, message_text
+
+'''
+@brief MockTranslationClient module - Offline stand-in for a translation provider, for benchmarks and dry runs.
+@details
+- Acquires keys from the APIKeyManager like a real client, so key budgets still apply.
+- Sleeps for a simulated latency proportional to the payload size instead of calling the network.
+- Echoes the last user message back as the "translation" and reports token usage.
+- Simulates automatic prefix caching: leading messages already seen in an earlier request are
+  reported as cached prompt tokens (usage.prompt_tokens_details.cached_tokens).
+@constructor
+- @param api_key_manager (APIKeyManager): Manages the pool of API keys.
+- @param logger (Logger): Logger object for logging.
+- @param base_latency (float): Fixed latency per request in seconds.
+- @param latency_per_token (float): Additional latency per prompt token in seconds.
+- @param chars_per_token (float): Characters per token used to size the payload.
+@method
+- `send_request(payload: dict) -> dict`
+    - @param payload (dict): Data that would be sent to the API.
+    - @return (dict): Chat completion shaped response.
+'''
+class MockTranslationClient(APIClient):
+    def __init__(self, api_key_manager, logger, base_latency=0.05, latency_per_token=0.0002,
+                 chars_per_token=4.0):
+        '''
+        @brief Constructor for MockTranslationClient.
+        @param api_key_manager (APIKeyManager): Manages API keys.
+        @param logger (Logger): Logger for logging events.
+        @param base_latency (float): Fixed latency per request in seconds.
+        @param latency_per_token (float): Additional latency per prompt token in seconds.
+        @param chars_per_token (float): Characters per token used to size the payload.
+        '''
+        self.api_key_manager = api_key_manager
+        self.logger = logger
+        self.base_latency = base_latency
+        self.latency_per_token = latency_per_token
+        self.chars_per_token = chars_per_token
+        self.total_requests = 0
+        self._seen_prefixes = set()
+    
+    async def send_request(self, data):
+        '''
+        @brief Simulate a request: wait for a size-proportional latency and echo the payload.
+        @param data (dict): Payload that would be sent to the API.
+        @return (dict): Chat completion shaped response.
+        @raises Exception: If no API key is available.
+        '''
+        key_info = await self.api_key_manager.get_next_available_key()
+        if not key_info:
+            self.logger.error("No available API key")
+            raise RuntimeError("No available API key")
+        self.last_used_key = key_info['key']
+        
+        messages = data.get('messages', [])
+        texts = [message_text(m) for m in messages]
+        prompt_chars = sum(len(text) for text in texts)
+        prompt_tokens = int(prompt_chars / self.chars_per_token)
+        content = texts[-1] if texts else ''
+        completion_tokens = int(len(content) / self.chars_per_token)
+        
+        # The longest run of leading messages sent before is served from the prefix cache
+        pairs = [(m.get('role'), text) for m, text in zip(messages, texts)]
+        prefixes = [hash(tuple(pairs[:index + 1])) for index in range(len(pairs))]
+        cached_chars = 0
+        for prefix, text in zip(prefixes, texts):
+            if prefix not in self._seen_prefixes:
+                break
+            cached_chars += len(text)
+        self._seen_prefixes.update(prefixes)
+        cached_tokens = int(cached_chars / self.chars_per_token)
+        
+        self.total_requests += 1
+        await asyncio.sleep(self.base_latency + self.latency_per_token * prompt_tokens)
+        
+        return {
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens}
+            }
+        }
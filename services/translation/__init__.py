@@ -1,12 +1,43 @@
 from .request_manager import RequestManager
-from .validator import Validator, ValidationStrategy, JSONValidationStrategy
+from .validator import Validator, ValidationStrategy, JSONValidationStrategy, LineValidationStrategy, IssueKind, KeyIssue
 from .standardizer import Standardizer, StandardizationInterface
+from .standardization_cache import StandardizationCache
+from .localization_standardizers import POStandardizer, XLIFFStandardizer, CSVStandardizer
+from .translation_memory import TranslationMemory
+from .fuzzy_memory import FuzzyTranslationMemory
+from .request_packer import RequestPacker, PackedRequest
+from .payload_encoding import PayloadEncoding
+from .markup_masker import MarkupMasker
+from .json_repair import RepairKind, parse_json_object
+from .glossary import Glossary, GlossaryTerm, GlossaryIndex
+from .anomaly_detector import AnomalyDetector, Anomaly, AnomalyKind
 
 __all__ = [
     'RequestManager', 
     'Validator', 
     'ValidationStrategy', 
     'JSONValidationStrategy',
+    'LineValidationStrategy',
+    'IssueKind',
+    'KeyIssue',
     'Standardizer',
-    'StandardizationInterface'
+    'StandardizationInterface',
+    'StandardizationCache',
+    'POStandardizer',
+    'XLIFFStandardizer',
+    'CSVStandardizer',
+    'TranslationMemory',
+    'FuzzyTranslationMemory',
+    'RequestPacker',
+    'PackedRequest',
+    'PayloadEncoding',
+    'MarkupMasker',
+    'RepairKind',
+    'parse_json_object',
+    'Glossary',
+    'GlossaryTerm',
+    'GlossaryIndex',
+    'AnomalyDetector',
+    'Anomaly',
+    'AnomalyKind'
 ]
\ No newline at end of file
@@ -0,0 +1,268 @@
+"""
+Anomaly Detector
+Batch-wide length-ratio, script-ratio and source-echo checks over all translated entries at once,
+flagging statistical outliers per (model, language pair) for targeted re-translation
+"""
+
+import math
+import statistics
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Tuple
+from services.common.logger import get_logger
+
+try:
+    import numpy as np
+except ImportError:  # Listed in requirements.txt; without it the detector falls back to per-string counting
+    np = None
+
+# Vietnamese letters carrying a diacritic (precomposed, NFC) and plain ASCII letters
+VIETNAMESE_DIACRITICS = "àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđ"
+VIETNAMESE_DIACRITICS += VIETNAMESE_DIACRITICS.upper()
+_ASCII_LETTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# translate deletion tables: len(text) - len(text.translate(table)) counts a character class
+_DELETE_DIACRITICS = {ord(ch): None for ch in VIETNAMESE_DIACRITICS}
+_ASCII_LETTER_BYTES = _ASCII_LETTERS.encode('ascii')
+
+# Codepoint -> class lookup for the vectorized path (1 ASCII letter, 2 Vietnamese diacritic letter);
+# the last slot is a class-0 sentinel that higher codepoints are clipped to
+_CLASS_TABLE_SIZE = max(map(ord, VIETNAMESE_DIACRITICS)) + 1
+if np is not None:
+    _CLASS_TABLE = np.zeros(_CLASS_TABLE_SIZE + 1, dtype=np.uint8)
+    _CLASS_TABLE[[ord(ch) for ch in _ASCII_LETTERS]] = 1
+    _CLASS_TABLE[[ord(ch) for ch in VIETNAMESE_DIACRITICS]] = 2
+
+# MAD is scaled by this so robust z-scores are comparable to standard z-scores
+_MAD_SCALE = 0.6745
+# Groups whose median diacritic share is lower write a target language without diacritics
+_MIN_SCRIPT_MEDIAN = 0.05
+
+class AnomalyKind:
+    """Anomaly constants, as reported by AnomalyDetector.detect"""
+    ECHO = "echo"                  # translation identical to a source containing letters
+    LENGTH_RATIO = "length_ratio"  # log length ratio far from its group's median
+    SCRIPT_RATIO = "script_ratio"  # far fewer diacritic letters than its group (text left in the source language)
+
+@dataclass(frozen=True)
+class Anomaly:
+    """A translated entry flagged for re-translation"""
+    owner: str  # file (or other owner) the entry belongs to
+    key: str
+    source: str  # source text, stripped (identifies the entry in translation memory)
+    group: str  # "<model>|<source language>-><target language>"
+    kind: str   # AnomalyKind value
+    value: float
+    score: float  # robust z-score (length_ratio), share of the group median (script_ratio), 0.0 (echo)
+
+class AnomalyDetector:
+    """Collects translated entries of a batch and flags outliers with one vectorized pass per feature"""
+    
+    def __init__(self, z_threshold: float = 3.5, min_script_share: float = 0.25, min_group_size: int = 30,
+                 min_source_chars: int = 12, min_letters: int = 12):
+        """
+        Initialize anomaly detector
+        :param z_threshold: Robust z-score (median/MAD) of the log length ratio beyond which an entry is an outlier
+        :param min_script_share: Fraction of its group's median diacritic share below which a translation is an outlier
+        :param min_group_size: Fewest scored entries a group needs before outliers are flagged
+        :param min_source_chars: Shortest source whose length ratio is scored
+        :param min_letters: Fewest letters a translation needs before its script ratio is scored
+        """
+        self.z_threshold = z_threshold
+        self.min_script_share = min_script_share
+        self.min_group_size = min_group_size
+        self.min_source_chars = min_source_chars
+        self.min_letters = min_letters
+        self.logger = get_logger("AnomalyDetector")
+        self._groups: Dict[str, int] = {}
+        self._group_ids: List[int] = []
+        self._owners: List[str] = []
+        self._keys: List[str] = []
+        self._sources: List[str] = []
+        self._translations: List[str] = []
+        self.stats = {
+            'checked_entries': 0,
+            'echo': 0,
+            'length_ratio': 0,
+            'script_ratio': 0
+        }
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def add(self, group: str, owner: str, sources: Dict[str, Any], translations: Dict[str, Any]) -> None:
+        """
+        Collect the translated text entries of one owner
+        :param group: Group the entries are compared within (model and language pair)
+        :param owner: Owner of the entries, reported with their anomalies
+        :param sources: Source entries
+        :param translations: Translations keyed like sources
+        """
+        group_id = self._groups.setdefault(group, len(self._groups))
+        for key, source in sources.items():
+            translation = translations.get(key)
+            if isinstance(source, str) and isinstance(translation, str):
+                self._group_ids.append(group_id)
+                self._owners.append(owner)
+                self._keys.append(key)
+                self._sources.append(source.strip())
+                self._translations.append(translation.strip())
+    
+    def clear(self) -> None:
+        """Drop the collected entries"""
+        self._groups.clear()
+        for column in (self._group_ids, self._owners, self._keys, self._sources, self._translations):
+            column.clear()
+    
+    def detect(self) -> List[Anomaly]:
+        """
+        Flag echoes and per-group outliers among the collected entries
+        :return: Anomalies in collection order (an entry may have several kinds)
+        """
+        if not self._keys:
+            return []
+        
+        if np is not None:
+            features = self._features_numpy()
+        else:
+            features = self._features_python()
+        echo, log_ratio, ratio_scored, script_ratio, script_scored = features
+        
+        group_names = {group_id: name for name, group_id in self._groups.items()}
+        flagged: Dict[int, List[Tuple[str, float, float]]] = {}
+        for index in (i for i, is_echo in enumerate(echo) if is_echo):
+            flagged.setdefault(index, []).append((AnomalyKind.ECHO, 1.0, 0.0))
+        # An echo is already flagged; its ratios would only duplicate it
+        for members, median, mad in self._group_statistics(log_ratio, ratio_scored):
+            # Robust z-score; the MAD floor keeps near-constant groups from flagging tiny deviations
+            scale = max(mad, 0.05)
+            for index, score in self._select(log_ratio, members, echo,
+                                             lambda value: _MAD_SCALE * (value - median) / scale,
+                                             lambda score: abs(score) > self.z_threshold):
+                flagged.setdefault(index, []).append((AnomalyKind.LENGTH_RATIO, math.exp(log_ratio[index]), score))
+        for members, median, _ in self._group_statistics(script_ratio, script_scored):
+            # Diacritic shares are bounded and skewed, so a translation left in the source language (share
+            # near 0) is judged against a fraction of the group median rather than by z-score
+            if median < _MIN_SCRIPT_MEDIAN:
+                continue
+            for index, share in self._select(script_ratio, members, echo,
+                                             lambda value: value / median,
+                                             lambda share: share < self.min_script_share):
+                flagged.setdefault(index, []).append((AnomalyKind.SCRIPT_RATIO, float(script_ratio[index]), share))
+        
+        anomalies = []
+        for index in sorted(flagged):
+            for kind, value, score in flagged[index]:
+                anomalies.append(Anomaly(
+                    self._owners[index], self._keys[index], self._sources[index], group_names[self._group_ids[index]],
+                    kind, round(value, 4), round(score, 2)
+                ))
+                self.stats[kind] += 1
+        self.stats['checked_entries'] += len(self._keys)
+        self.logger.info(f"Anomaly detection: {len(flagged)} of {len(self._keys)} entries flagged "
+                         f"in {len(self._groups)} groups")
+        return anomalies
+    
+    def _features_numpy(self) -> Tuple[Any, ...]:
+        """
+        Compute every feature with array operations (one codepoint buffer for all translations)
+        :return: Tuple of (echo, log length ratio, ratio scored, script ratio, script scored) arrays
+        """
+        source_lengths = np.fromiter(map(len, self._sources), dtype=np.int64, count=len(self._sources))
+        target_lengths = np.fromiter(map(len, self._translations), dtype=np.int64, count=len(self._translations))
+        
+        codepoints = np.frombuffer("".join(self._translations).encode('utf-32-le'), dtype=np.uint32)
+        classes = _CLASS_TABLE[np.minimum(codepoints, _CLASS_TABLE_SIZE)]
+        # Per-entry class counts: one segmented sum over the non-empty translations (reduceat
+        # segments run from one start to the next, so empty ones would repeat their neighbour's first value)
+        ascii_counts = np.zeros(len(target_lengths), dtype=np.int64)
+        diacritic_counts = np.zeros(len(target_lengths), dtype=np.int64)
+        non_empty = target_lengths > 0
+        if non_empty.any():
+            starts = (np.cumsum(target_lengths) - target_lengths)[non_empty]
+            ascii_counts[non_empty] = np.add.reduceat((classes == 1).view(np.uint8), starts, dtype=np.int64)
+            diacritic_counts[non_empty] = np.add.reduceat((classes == 2).view(np.uint8), starts, dtype=np.int64)
+        letters = ascii_counts + diacritic_counts
+        
+        echo = np.fromiter(
+            (source == translation for source, translation in zip(self._sources, self._translations)),
+            dtype=bool, count=len(self._sources)
+        ) & (letters > 0)
+        ratio_scored = (source_lengths >= self.min_source_chars) & (target_lengths > 0)
+        log_ratio = np.zeros(len(self._sources))
+        log_ratio[ratio_scored] = np.log(target_lengths[ratio_scored] / source_lengths[ratio_scored])
+        script_scored = letters >= self.min_letters
+        script_ratio = np.divide(diacritic_counts, letters, out=np.zeros(len(letters)), where=letters > 0)
+        return echo, log_ratio, ratio_scored, script_ratio, script_scored
+    
+    def _features_python(self) -> Tuple[List[Any], ...]:
+        """
+        Compute every feature with per-string counting (NumPy unavailable)
+        :return: Tuple of (echo, log length ratio, ratio scored, script ratio, script scored) lists
+        """
+        echo, log_ratio, ratio_scored, script_ratio, script_scored = [], [], [], [], []
+        for source, translation in zip(self._sources, self._translations):
+            encoded = translation.encode('utf-8')
+            ascii_count = len(encoded) - len(encoded.translate(None, _ASCII_LETTER_BYTES))
+            diacritic_count = 0 if translation.isascii() else \
+                len(translation) - len(translation.translate(_DELETE_DIACRITICS))
+            letters = ascii_count + diacritic_count
+            
+            echo.append(source == translation and letters > 0)
+            scored = len(source) >= self.min_source_chars and len(translation) > 0
+            ratio_scored.append(scored)
+            log_ratio.append(math.log(len(translation) / len(source)) if scored else 0.0)
+            script_scored.append(letters >= self.min_letters)
+            script_ratio.append(diacritic_count / letters if letters else 0.0)
+        return echo, log_ratio, ratio_scored, script_ratio, script_scored
+    
+    def _group_statistics(self, values, scored) -> List[Tuple[Any, float, float]]:
+        """
+        Median and MAD of one feature within each group large enough to be scored
+        :param values: Feature value per entry
+        :param scored: Whether each entry's value is meaningful
+        :return: (member indices, median, MAD) per group
+        """
+        groups = []
+        if np is not None:
+            group_ids = np.asarray(self._group_ids)
+            for group_id in self._groups.values():
+                members = np.flatnonzero((group_ids == group_id) & scored)
+                if len(members) >= self.min_group_size:
+                    median = float(np.median(values[members]))
+                    groups.append((members, median, float(np.median(np.abs(values[members] - median)))))
+            return groups
+        
+        members_of: Dict[int, List[int]] = {}
+        for index, group_id in enumerate(self._group_ids):
+            if scored[index]:
+                members_of.setdefault(group_id, []).append(index)
+        for members in members_of.values():
+            if len(members) >= self.min_group_size:
+                median = statistics.median(values[i] for i in members)
+                groups.append((members, median, statistics.median(abs(values[i] - median) for i in members)))
+        return groups
+    
+    @staticmethod
+    def _select(values, members, echo, score: Callable, hit: Callable) -> List[Tuple[int, float]]:
+        """
+        Score the members of a group and keep the hits that are not echoes
+        :param values: Feature value per entry
+        :param members: Member indices of the group
+        :param echo: Whether each entry is an echo (already flagged)
+        :param score: Score of a value (elementwise on arrays)
+        :param hit: Whether a score is an outlier (elementwise on arrays)
+        :return: (entry index, score) pairs
+        """
+        if np is not None:
+            scores = score(values[members])
+            hits = hit(scores)
+            return [(int(index), float(value)) for index, value in zip(members[hits], scores[hits]) if not echo[index]]
+        return [(index, value) for index in members for value in (score(values[index]),)
+                if hit(value) and not echo[index]]
+    
+    def get_detector_stats(self) -> Dict[str, Any]:
+        """
+        Get anomaly detection statistics
+        :return: Statistics dictionary (entries checked and anomalies per kind)
+        """
+        return {'backend': "numpy" if np is not None else "python", **self.stats}
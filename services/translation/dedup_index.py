@@ -0,0 +1,124 @@
+"""
+Deduplication Index
+Batch-wide index of source strings so each unique string is translated once and fanned out
+"""
+
+import hashlib
+import threading
+from typing import Dict, Any, Tuple
+from services.translation.translation_memory import normalize_source
+
+class DedupIndex:
+    """Maps every unique source string in a batch to the first job that claims it, which translates it"""
+    
+    def __init__(self, token_counter=None):
+        """
+        Initialize deduplication index
+        :param token_counter: TokenCounter used to estimate tokens saved (optional)
+        """
+        self.token_counter = token_counter
+        self._owners: Dict[bytes, int] = {}
+        self._translations: Dict[bytes, str] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'total_strings': 0,
+            'unique_strings': 0,
+            'fanned_out': 0,
+            'tokens_saved': 0
+        }
+    
+    @staticmethod
+    def digest(source: str) -> bytes:
+        """
+        Compact identity of a normalized source string
+        :param source: Source string
+        :return: 16-byte digest
+        """
+        return hashlib.blake2b(normalize_source(source).encode('utf-8'), digest_size=16).digest()
+    
+    def claim(self, job_index: int, entries: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Claim the source strings of one job as it is loaded and split its entries into those it sends
+        and those another job already sends (the first job to claim a string translates it)
+        :param job_index: Job position in the batch
+        :param entries: Entries still to translate
+        :return: Tuple of (entries to send, borrowed entries filled in by fan_out)
+        """
+        digests = {key: self.digest(source) for key, source in entries.items() if isinstance(source, str)}
+        send, borrowed = {}, {}
+        sent_digests = set()
+        with self._lock:
+            for key, source in entries.items():
+                digest = digests.get(key)
+                if digest is None:
+                    send[key] = source
+                    continue
+                
+                self.stats['total_strings'] += 1
+                if digest not in self._owners:
+                    self._owners[digest] = job_index
+                    self.stats['unique_strings'] += 1
+                if self._owners[digest] == job_index and digest not in sent_digests:
+                    send[key] = source
+                    sent_digests.add(digest)
+                else:
+                    borrowed[key] = source
+        return send, borrowed
+    
+    def resolve(self, sent: Dict[str, str], translations: Dict[str, Any]) -> None:
+        """
+        Record translations of sent entries for fan-out to their duplicates
+        :param sent: Entries that were sent
+        :param translations: Validated translations keyed like sent
+        """
+        with self._lock:
+            for key, source in sent.items():
+                translation = translations.get(key)
+                if isinstance(source, str) and isinstance(translation, str):
+                    self._translations[self.digest(source)] = translation
+    
+    def fan_out(self, borrowed: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Fill borrowed entries from translations resolved so far
+        :param borrowed: Borrowed entries from claim
+        :return: Tuple of (translations found, entries still unresolved)
+        """
+        resolved, unresolved = {}, {}
+        tokens_saved = 0
+        with self._lock:
+            for key, source in borrowed.items():
+                translation = self._translations.get(self.digest(source))
+                if translation is None:
+                    unresolved[key] = source
+                    continue
+                resolved[key] = translation
+                if self.token_counter:
+                    tokens_saved += self.token_counter.count_text(source) + self.token_counter.count_text(translation)
+            
+            self.stats['fanned_out'] += len(resolved)
+            self.stats['tokens_saved'] += tokens_saved
+        return resolved, unresolved
+    
+    def unresolved(self, borrowed: Dict[str, str]) -> Dict[bytes, str]:
+        """
+        Unique borrowed source strings with no translation resolved yet (their owning job failed)
+        :param borrowed: Borrowed entries from claim
+        :return: Source strings keyed by digest
+        """
+        with self._lock:
+            return {
+                digest: source for digest, source in ((self.digest(source), source) for source in borrowed.values())
+                if digest not in self._translations
+            }
+    
+    def get_dedup_stats(self) -> Dict[str, Any]:
+        """
+        Get deduplication statistics
+        :return: Statistics dictionary including the duplication ratio
+        """
+        total_strings = self.stats['total_strings']
+        return {
+            **self.stats,
+            'duplicate_strings': total_strings - self.stats['unique_strings'],
+            'duplication_ratio': 1 - self.stats['unique_strings'] / total_strings if total_strings else 0.0
+        }
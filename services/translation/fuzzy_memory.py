@@ -0,0 +1,328 @@
+"""
+Fuzzy Translation Memory
+Near-duplicate matching of source strings via normalized templates and MinHash/LSH
+"""
+
+import hashlib
+import re
+import sqlite3
+import struct
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from services.common.logger import get_logger
+
+# Markup tags ({i}, {/i}, {color=#fff}), interpolations ([name]) and numbers
+_SLOT_PATTERN = r'\{[^{}]*\}|\[[^\[\]]*\]|\d+(?:[.,]\d+)*'
+_PLACEHOLDER_PATTERN = re.compile(r'⟦(\d+)⟧')
+
+@dataclass
+class FuzzyMatch:
+    """Result of a fuzzy lookup"""
+    kind: str  # "template" (served from memory) or "near" (sent as a hint)
+    similarity: float
+    translation: Optional[str] = None
+    example_source: Optional[str] = None
+    example_translation: Optional[str] = None
+
+class FuzzyTranslationMemory:
+    """Template-exact and MinHash/LSH near-duplicate lookups over previously translated strings"""
+    
+    def __init__(self, db_path: str = "work_space/translation_memory.db", names: Optional[List[str]] = None,
+                 hint_threshold: float = 0.7, num_perm: int = 32, bands: int = 8):
+        """
+        Initialize fuzzy translation memory
+        :param db_path: Path to the SQLite database file (":memory:" for a volatile store)
+        :param names: Character names treated as substitutable slots
+        :param hint_threshold: Minimum estimated similarity for a near match to be sent as a hint
+        :param num_perm: Number of MinHash signature values
+        :param bands: Number of LSH bands (num_perm must be divisible by bands)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.db_path = db_path
+        self.hint_threshold = hint_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.logger = get_logger("FuzzyTranslationMemory")
+        self._lock = threading.Lock()
+        
+        # Longest names first so "Ann" never shadows "Anna"
+        name_pattern = "|".join(re.escape(name) for name in sorted(names or [], key=len, reverse=True))
+        self._slot_regex = re.compile(
+            _SLOT_PATTERN + (rf'|\b(?:{name_pattern})\b' if name_pattern else "")
+        )
+
+        self.stats = {
+            'template_hits': 0,
+            'near_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'lookup_time': 0.0
+        }
+        
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        self._conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fuzzy_templates (
+                template_key TEXT PRIMARY KEY,
+                template TEXT NOT NULL,
+                translation_template TEXT,
+                example_source TEXT NOT NULL,
+                example_translation TEXT NOT NULL,
+                signature BLOB NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fuzzy_buckets (
+                bucket INTEGER NOT NULL,
+                template_key TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fuzzy_buckets ON fuzzy_buckets (bucket)")
+        self._conn.commit()
+        
+        self.logger.info(f"Fuzzy translation memory opened: {db_path}")
+    
+    def make_template(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Normalize a string into a template with tags, numbers and names replaced by slots
+        :param text: Source string
+        :return: Tuple of (template, slot values in order)
+        """
+        slots = []
+        
+        def replace(match):
+            slots.append(match.group(0))
+            value = match.group(0)
+            if value[0] == "{":
+                return "⟦T⟧"
+            if value[0] == "[":
+                return "⟦V⟧"
+            if value[0].isdigit():
+                return "⟦D⟧"
+            return "⟦N⟧"
+        
+        template = self._slot_regex.sub(replace, text)
+        return re.sub(r'\s+', ' ', template).strip(), slots
+    
+    def _translation_template(self, slots: List[str], translation: str) -> Optional[str]:
+        """
+        Replace the source slot values found in a translation with indexed placeholders
+        :param slots: Slot values of the source string
+        :param translation: Translation of the source string
+        :return: Translation template, or None when the slots do not carry over one to one
+        """
+        translation_slots = [match.group(0) for match in self._slot_regex.finditer(translation)]
+        if Counter(translation_slots) != Counter(slots):
+            return None
+        
+        unused = {}
+        for index, value in enumerate(slots):
+            unused.setdefault(value, []).append(index)
+        return self._slot_regex.sub(lambda match: f"⟦{unused[match.group(0)].pop(0)}⟧", translation)
+    
+    def _signature(self, template: str) -> List[int]:
+        """
+        One-permutation MinHash signature over character 4-gram shingles of a template
+        (one hash per shingle split into num_perm bins, empty bins filled by rotation densification)
+        :param template: Normalized template
+        :return: num_perm signature values
+        """
+        text = template.lower()
+        shingles = {text[i:i + 4] for i in range(max(1, len(text) - 3))}
+        
+        # blake2b rather than hash(): signatures are persisted and must be stable across processes
+        bins: List[Optional[int]] = [None] * self.num_perm
+        for shingle in shingles:
+            value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+            index, value = value % self.num_perm, value >> 8
+            if bins[index] is None or value < bins[index]:
+                bins[index] = value
+        
+        # An empty bin borrows the next non-empty bin, offset by the distance so borrowed values stay distinct
+        signature = list(bins)
+        for index in range(self.num_perm):
+            if bins[index] is not None:
+                continue
+            for distance in range(1, self.num_perm):
+                value = bins[(index + distance) % self.num_perm]
+                if value is not None:
+                    signature[index] = value + (distance << 56)
+                    break
+        return signature
+    
+    def _buckets(self, context: str, signature: List[int]) -> List[int]:
+        """
+        LSH bucket ids, one per band, scoped to the translation context
+        :param context: Model / prompt version / target language identifier
+        :param signature: MinHash signature
+        :return: Signed 64-bit bucket ids (SQLite INTEGER)
+        """
+        buckets = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(
+                f"{context}|{band}|{','.join(map(str, rows))}".encode('utf-8'), digest_size=8
+            ).digest()
+            buckets.append(struct.unpack('<q', digest)[0])
+        return buckets
+    
+    @staticmethod
+    def _template_key(template: str, context: str) -> str:
+        """
+        Primary key of a template within a translation context
+        :param template: Normalized template
+        :param context: Model / prompt version / target language identifier
+        :return: Hex digest key
+        """
+        return hashlib.sha256(f"{context}\x00{template}".encode('utf-8')).hexdigest()
+    
+    def lookup(self, source: str, context: str, record_stats: bool = True) -> Optional[FuzzyMatch]:
+        """
+        Find a template match (served with slots re-substituted) or a near match (used as a hint)
+        :param source: Source string
+        :param context: Model / prompt version / target language identifier
+        :param record_stats: Count the lookup in the statistics (False for dry runs)
+        :return: FuzzyMatch or None
+        """
+        start_time = time.perf_counter()
+        try:
+            return self._lookup(source, context, record_stats)
+        finally:
+            if record_stats:
+                with self._lock:
+                    self.stats['lookup_time'] += time.perf_counter() - start_time
+    
+    def _lookup(self, source: str, context: str, record_stats: bool) -> Optional[FuzzyMatch]:
+        """Lookup implementation, see lookup()"""
+        template, slots = self.make_template(source)
+        template_key = self._template_key(template, context)
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation_template, example_source, example_translation "
+                "FROM fuzzy_templates WHERE template_key = ?", (template_key,)
+            ).fetchone()
+        if row is not None:
+            translation_template, example_source, example_translation = row
+            if translation_template is not None:
+                translation = _PLACEHOLDER_PATTERN.sub(lambda match: slots[int(match.group(1))], translation_template)
+                if record_stats:
+                    self._count('template_hits')
+                return FuzzyMatch("template", 1.0, translation=translation)
+            # Same template but the slots did not carry over cleanly: only usable as a hint
+            if record_stats:
+                self._count('near_hits')
+            return FuzzyMatch("near", 1.0, example_source=example_source, example_translation=example_translation)
+        
+        signature = self._signature(template)
+        buckets = self._buckets(context, signature)
+        with self._lock:
+            candidates = self._conn.execute(
+                f"""
+                SELECT DISTINCT t.signature, t.example_source, t.example_translation
+                FROM fuzzy_buckets b JOIN fuzzy_templates t ON t.template_key = b.template_key
+                WHERE b.bucket IN ({','.join('?' * len(buckets))})
+                LIMIT 50
+                """,
+                buckets
+            ).fetchall()
+        
+        best = None
+        for candidate_signature, example_source, example_translation in candidates:
+            values = struct.unpack(f'<{self.num_perm}Q', candidate_signature)
+            similarity = sum(1 for a, b in zip(signature, values) if a == b) / self.num_perm
+            if similarity >= self.hint_threshold and (best is None or similarity > best.similarity):
+                best = FuzzyMatch("near", similarity, example_source=example_source,
+                                  example_translation=example_translation)
+        
+        if record_stats:
+            self._count('near_hits' if best else 'misses')
+        return best
+    
+    def add_many(self, entries: Dict[str, str], context: str) -> None:
+        """
+        Index translated strings in one transaction (first translation of a template wins)
+        :param entries: Mapping of source string to validated translation
+        :param context: Model / prompt version / target language identifier
+        """
+        rows = []
+        for source, translation in entries.items():
+            template, slots = self.make_template(source)
+            if not template:
+                continue
+            signature = self._signature(template)
+            rows.append((
+                self._template_key(template, context), template, self._translation_template(slots, translation),
+                source, translation, signature
+            ))
+        
+        if not rows:
+            return
+        
+        with self._lock:
+            for template_key, template, translation_template, source, translation, signature in rows:
+                cursor = self._conn.execute(
+                    """
+                    INSERT OR IGNORE INTO fuzzy_templates
+                        (template_key, template, translation_template, example_source, example_translation, signature)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (template_key, template, translation_template, source, translation,
+                     struct.pack(f'<{self.num_perm}Q', *signature))
+                )
+                if cursor.rowcount:
+                    self._conn.executemany(
+                        "INSERT INTO fuzzy_buckets (bucket, template_key) VALUES (?, ?)",
+                        [(bucket, template_key) for bucket in self._buckets(context, signature)]
+                    )
+                    self.stats['stores'] += 1
+            self._conn.commit()
+    
+    def discard(self, sources: Iterable[str], context: str) -> int:
+        """
+        Remove the templates of source strings (e.g. ones whose translation was flagged as an anomaly)
+        :param sources: Source strings
+        :param context: Model / prompt version / target language identifier
+        :return: Number of templates removed
+        """
+        template_keys = [(self._template_key(self.make_template(source)[0], context),) for source in sources]
+        with self._lock:
+            self._conn.executemany("DELETE FROM fuzzy_buckets WHERE template_key = ?", template_keys)
+            cursor = self._conn.executemany("DELETE FROM fuzzy_templates WHERE template_key = ?", template_keys)
+            self._conn.commit()
+            return cursor.rowcount
+    
+    def _count(self, name: str) -> None:
+        """Increment a statistics counter"""
+        with self._lock:
+            self.stats[name] += 1
+    
+    def get_fuzzy_stats(self) -> Dict[str, Any]:
+        """
+        Get fuzzy matching statistics
+        :return: Statistics dictionary including the average lookup time
+        """
+        with self._lock:
+            total_templates = self._conn.execute("SELECT COUNT(*) FROM fuzzy_templates").fetchone()[0]
+            lookups = self.stats['template_hits'] + self.stats['near_hits'] + self.stats['misses']
+            return {
+                'total_templates': total_templates,
+                **self.stats,
+                'avg_lookup_ms': self.stats['lookup_time'] * 1000 / lookups if lookups else 0.0
+            }
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,356 @@
+"""
+Glossary
+Term table (source -> required target) matched with one Aho-Corasick automaton in a single pass per text
+"""
+
+import csv
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
+from services.common.logger import get_logger
+
+@dataclass(frozen=True)
+class GlossaryTerm:
+    """A source term and the translation it must get"""
+    source: str
+    target: str
+    category: str = "term"  # "name" (characters, places) or "term"
+
+@dataclass(frozen=True)
+class GlossaryIssue:
+    """A glossary term whose required translation is absent from a translated block"""
+    key: str
+    term: GlossaryTerm
+    kind: str  # "missing" (required target absent) or "untranslated" (source form left in the translation)
+
+def _fold(text: str, case_sensitive: bool) -> str:
+    """
+    Case-fold a text character by character so match offsets stay valid in the original
+    :param text: Text to fold
+    :param case_sensitive: Return the text unchanged when True
+    :return: Folded text of the same length
+    """
+    if case_sensitive:
+        return text
+    return "".join(lower if len(lower := ch.lower()) == 1 else ch for ch in text)
+
+def _is_word_char(ch: str) -> bool:
+    """Whether a character continues a word (terms only match on word boundaries)"""
+    return ch.isalnum() or ch == "_"
+
+class AhoCorasick:
+    """Multi-pattern matcher: all occurrences of all patterns in one linear scan of the text"""
+    
+    def __init__(self, patterns: List[str]):
+        """
+        Build the automaton (trie, failure links and dictionary suffix links)
+        :param patterns: Patterns to match; their index identifies them in matches
+        """
+        self.patterns = patterns
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[int]] = [None]
+        self._dict_link: List[int] = [0]
+        
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                next_node = self._goto[node].get(ch)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][ch] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(None)
+                    self._dict_link.append(0)
+                node = next_node
+            if pattern and self._output[node] is None:
+                self._output[node] = index
+        
+        # Breadth-first so every failure target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                target = self._fail[child]
+                self._dict_link[child] = target if self._output[target] is not None else self._dict_link[target]
+                queue.append(child)
+    
+    @property
+    def state_count(self) -> int:
+        """Number of automaton states"""
+        return len(self._goto)
+    
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Scan a text once
+        :param text: Text to scan (folded like the patterns)
+        :return: Iterator of (start, end, pattern index) in order of end offset
+        """
+        node = 0
+        for position, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            
+            match_node = node if self._output[node] is not None else self._dict_link[node]
+            while match_node:
+                index = self._output[match_node]
+                yield position + 1 - len(self.patterns[index]), position + 1, index
+                match_node = self._dict_link[match_node]
+
+class Glossary:
+    """Glossary terms indexed by one automaton over both their source and target forms"""
+    
+    def __init__(self, terms: List[GlossaryTerm], case_sensitive: bool = False):
+        """
+        Initialize glossary and build its automaton
+        :param terms: Glossary terms (later duplicates of a source term are ignored)
+        :param case_sensitive: Match terms case-sensitively
+        """
+        self.case_sensitive = case_sensitive
+        self.logger = get_logger("Glossary")
+        
+        self.terms: List[GlossaryTerm] = []
+        seen = set()
+        for term in terms:
+            folded = _fold(term.source.strip(), case_sensitive)
+            if folded and folded not in seen:
+                seen.add(folded)
+                self.terms.append(term)
+        
+        # One pattern per distinct folded string; each knows the terms it is the source or target of
+        patterns: Dict[str, int] = {}
+        self._sources_of: List[List[int]] = []
+        self._targets_of: List[List[int]] = []
+        for term_index, term in enumerate(self.terms):
+            for text, role in ((term.source, self._sources_of), (term.target, self._targets_of)):
+                folded = _fold(text.strip(), case_sensitive)
+                if not folded:
+                    continue
+                if folded not in patterns:
+                    patterns[folded] = len(patterns)
+                    self._sources_of.append([])
+                    self._targets_of.append([])
+                role[patterns[folded]].append(term_index)
+        
+        self._automaton = AhoCorasick(list(patterns))
+        self.logger.info(f"Glossary built: {len(self.terms)} terms, {self._automaton.state_count} automaton states")
+    
+    def __len__(self) -> int:
+        return len(self.terms)
+    
+    @classmethod
+    def load(cls, path: str, case_sensitive: bool = False) -> "Glossary":
+        """
+        Load a glossary file
+        :param path: JSON ({source: target} or {source: {"target": ..., "category": ...}})
+                     or CSV/TSV (source, target[, category] per row; a "source" header row is skipped)
+        :param case_sensitive: Match terms case-sensitively
+        :return: Glossary
+        """
+        file_path = Path(path)
+        terms = []
+        if file_path.suffix.lower() == ".json":
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for source, value in data.items():
+                if isinstance(value, dict):
+                    terms.append(GlossaryTerm(source, value.get("target", ""), value.get("category", "term")))
+                else:
+                    terms.append(GlossaryTerm(source, str(value)))
+        else:
+            delimiter = "\t" if file_path.suffix.lower() in (".tsv", ".tab") else ","
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.reader(f, delimiter=delimiter):
+                    if len(row) < 2 or row[0].strip().lower() == "source":
+                        continue
+                    category = row[2].strip() if len(row) > 2 and row[2].strip() else "term"
+                    terms.append(GlossaryTerm(row[0], row[1], category))
+        return cls(terms, case_sensitive)
+    
+    def _matches(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        All word-bounded pattern occurrences in a text
+        :param text: Text to scan
+        :return: (start, end, pattern index) per occurrence
+        """
+        folded = _fold(text, self.case_sensitive)
+        matches = []
+        for start, end, index in self._automaton.iter_matches(folded):
+            if start > 0 and _is_word_char(folded[start]) and _is_word_char(folded[start - 1]):
+                continue
+            if end < len(folded) and _is_word_char(folded[end - 1]) and _is_word_char(folded[end]):
+                continue
+            matches.append((start, end, index))
+        return matches
+    
+    def _source_term_indices(self, matches: List[Tuple[int, int, int]]) -> List[int]:
+        """
+        Terms whose source form occurs, leftmost-longest so "Dark Lord" is not also counted as "Lord"
+        :param matches: Output of _matches
+        :return: Distinct term indices in order of first occurrence
+        """
+        found: Dict[int, None] = {}
+        covered_until = 0
+        for start, end, index in sorted(matches, key=lambda match: (match[0], match[0] - match[1])):
+            if start < covered_until or not self._sources_of[index]:
+                continue
+            covered_until = end
+            for term_index in self._sources_of[index]:
+                found.setdefault(term_index)
+        return list(found)
+    
+    def term_indices(self, text: str) -> List[int]:
+        """
+        Indices (into terms) of the glossary terms occurring in a source text
+        :param text: Source text
+        :return: Distinct term indices in order of first occurrence
+        """
+        return self._source_term_indices(self._matches(text))
+    
+    def find_terms(self, text: str) -> List[GlossaryTerm]:
+        """
+        Glossary terms occurring in a source text
+        :param text: Source text
+        :return: Distinct terms in order of first occurrence
+        """
+        return [self.terms[index] for index in self.term_indices(text)]
+    
+    def check(self, source: str, translation: str, key: str = "") -> List[GlossaryIssue]:
+        """
+        Check that every glossary term of a source text got its required translation
+        :param source: Source text
+        :param translation: Translated text
+        :param key: Block key reported in the issues
+        :return: One issue per term whose target form is absent from the translation
+        """
+        required = self._source_term_indices(self._matches(source))
+        if not required:
+            return []
+        
+        present_targets, present_sources = set(), set()
+        for _, _, index in self._matches(translation):
+            present_targets.update(self._targets_of[index])
+            present_sources.update(self._sources_of[index])
+        
+        issues = []
+        for term_index in required:
+            if term_index in present_targets:
+                continue
+            term = self.terms[term_index]
+            kind = "untranslated" if term_index in present_sources else "missing"
+            issues.append(GlossaryIssue(key, term, kind))
+        return issues
+    
+    def check_blocks(self, sources: Dict[str, Any], translations: Dict[str, Any]) -> List[GlossaryIssue]:
+        """
+        Check every translated block against the glossary (each text is scanned once)
+        :param sources: Source texts keyed by block
+        :param translations: Translated texts keyed like sources
+        :return: Issues of all blocks, in block order
+        """
+        issues = []
+        for key, source in sources.items():
+            translation = translations.get(key)
+            if isinstance(source, str) and isinstance(translation, str):
+                issues.extend(self.check(source, translation, key))
+        return issues
+
+class GlossaryIndex:
+    """Batch index of glossary terms: term -> owners and the keys of their source strings containing it (inverted)"""
+    
+    def __init__(self, glossary: Glossary):
+        """
+        Initialize glossary index
+        :param glossary: Glossary to index against
+        """
+        self.glossary = glossary
+        self.postings: Dict[int, Dict[Any, Set[str]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'indexed_strings': 0,
+            'injected_terms': 0,
+            'dropped_terms': 0
+        }
+    
+    def add(self, owner: Any, entries: Dict[str, Any]) -> None:
+        """
+        Index the source strings of an owner (e.g. a batch job), scanning each string once
+        :param owner: Hashable owner of the entries
+        :param entries: Source entries keyed by the owner's keys
+        """
+        found = [
+            (key, self.glossary.term_indices(source)) for key, source in entries.items() if isinstance(source, str)
+        ]
+        with self._lock:
+            for key, term_indices in found:
+                for term_index in term_indices:
+                    self.postings.setdefault(term_index, {}).setdefault(owner, set()).add(key)
+            self.stats['indexed_strings'] += len(found)
+    
+    def discard(self, owner: Any) -> None:
+        """
+        Remove an owner's postings once its requests are done
+        :param owner: Owner passed to add
+        """
+        with self._lock:
+            for term_index in [index for index, owners in self.postings.items() if owners.pop(owner, None) is not None]:
+                if not self.postings[term_index]:
+                    del self.postings[term_index]
+    
+    def select(self, refs: Iterable[Tuple[Any, str]], token_counter, max_tokens: Optional[int]) -> Dict[str, str]:
+        """
+        Glossary entries for the terms occurring in a set of indexed source entries, within a token cap
+        :param refs: (owner, key) of each source entry of one request, as indexed by add
+        :param token_counter: TokenCounter used to cost each glossary entry
+        :param max_tokens: Token cap for the injected glossary (None for no cap)
+        :return: {source term: required target}; names first, then terms by occurrences in the entries
+        """
+        wanted: Dict[Any, Set[str]] = {}
+        for owner, key in refs:
+            wanted.setdefault(owner, set()).add(key)
+        
+        occurrences: Dict[int, int] = {}
+        with self._lock:
+            for term_index, owners in self.postings.items():
+                count = sum(len(owners[owner] & keys) for owner, keys in wanted.items() if owner in owners)
+                if count:
+                    occurrences[term_index] = count
+        
+        ranked = sorted(
+            occurrences,
+            key=lambda index: (self.glossary.terms[index].category != "name", -occurrences[index], index)
+        )
+        selected, used, dropped = {}, 0, 0
+        for term_index in ranked:
+            term = self.glossary.terms[term_index]
+            cost = token_counter.count_text(json.dumps({term.source: term.target}, ensure_ascii=False))
+            if max_tokens is not None and used + cost > max_tokens:
+                dropped += 1
+                continue
+            selected[term.source] = term.target
+            used += cost
+        
+        with self._lock:
+            self.stats['injected_terms'] += len(selected)
+            self.stats['dropped_terms'] += dropped
+        return selected
+    
+    def get_index_stats(self) -> Dict[str, Any]:
+        """
+        Get glossary index statistics
+        :return: Statistics dictionary
+        """
+        return {
+            'glossary_terms': len(self.glossary),
+            'terms_in_batch': len(self.postings),
+            **self.stats
+        }
@@ -0,0 +1,223 @@
+"""
+JSON Repair
+Finds the outermost JSON object in a model response and repairs the defects models commonly produce
+"""
+
+import json
+from typing import Dict, Any, List, Optional, Tuple
+
+# Straight and typographic double quotes a model may use as string delimiters
+_OPENING_QUOTES = '"“”„'
+_SMART_QUOTES = '“”„'
+_WHITESPACE = ' \t\r\n'
+_CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'}
+_CLOSERS = {'{': '}', '[': ']'}
+
+class RepairKind:
+    """Repair constants, as reported by repair_json"""
+    EXTRACTED = "extracted"                    # prose, code fences or trailing text around the object
+    SMART_QUOTES = "smart_quotes"              # typographic quotes used as string delimiters
+    INNER_QUOTES = "inner_quotes"              # unescaped quotes inside a string
+    CONTROL_CHARACTERS = "control_characters"  # raw line breaks or tabs inside a string
+    TRAILING_COMMAS = "trailing_commas"        # comma before a closing bracket
+    MISSING_COMMAS = "missing_commas"          # members not separated by a comma
+    TRUNCATED = "truncated"                    # response cut off: the incomplete last member is dropped
+
+_decoder = json.JSONDecoder()
+
+def _object_starts(text: str) -> List[int]:
+    """
+    Candidate starts of the response object: a brace opening an object with a quoted key (or an empty one)
+    :param text: Response text
+    :return: Offsets in text order
+    """
+    starts = []
+    position = text.find('{')
+    while position != -1:
+        following = text[position + 1:position + 64].lstrip(_WHITESPACE)
+        if not following or following[0] in _OPENING_QUOTES or following[0] == '}':
+            starts.append(position)
+        position = text.find('{', position + 1)
+    return starts
+
+def _next_significant(text: str, position: int) -> int:
+    """Offset of the first non-blank character at or after position (len(text) when none)"""
+    length = len(text)
+    while position < length and text[position] in _WHITESPACE:
+        position += 1
+    return position
+
+def _closes_string(text: str, position: int, is_key: bool) -> bool:
+    """
+    Whether the quote at position ends the current string rather than being an unescaped quote inside it
+    :param text: Response text
+    :param position: Offset of the quote
+    :param is_key: The string is an object key
+    :return: True when the characters after the quote continue the JSON structure
+    """
+    following = _next_significant(text, position + 1)
+    if following == len(text):
+        return True
+    char = text[following]
+    if is_key:
+        return char == ':'
+    if char in '}]' or char in _OPENING_QUOTES:
+        return True
+    if char != ',':
+        return False
+    # A value's closing quote is followed by a comma and the next member (or the end of the response)
+    after_comma = _next_significant(text, following + 1)
+    return after_comma == len(text) or text[after_comma] in _OPENING_QUOTES or text[after_comma] in '{}[]-0123456789'
+
+def repair_json(text: str, start: int) -> Tuple[Optional[str], List[str]]:
+    """
+    Rewrite the JSON object starting at start in one bracket- and string-aware pass
+    :param text: Response text
+    :param start: Offset of the object's opening brace
+    :return: Tuple of (repaired JSON text or None when nothing usable remains, repairs applied)
+    """
+    out: List[str] = []
+    repairs: Dict[str, None] = {}
+    stack: List[str] = []
+    # Where the output can be cut and closed into valid JSON: (output length, open brackets)
+    safe_point: Optional[Tuple[int, Tuple[str, ...]]] = None
+    expect_key = after_value = False
+    in_string = is_key = False
+    string_quote = '"'
+    length = len(text)
+    position = start
+    
+    def value_done():
+        nonlocal after_value, safe_point
+        after_value = True
+        safe_point = (len(out), tuple(stack))
+    
+    while position < length:
+        char = text[position]
+        
+        if in_string:
+            if char == '\\':
+                if position + 1 >= length:
+                    break
+                out.append(text[position:position + 2])
+                position += 2
+                continue
+            if char == '"' or (string_quote != '"' and char in _SMART_QUOTES):
+                if _closes_string(text, position, is_key):
+                    out.append('"')
+                    in_string = False
+                    if not is_key:
+                        value_done()
+                elif char == '"':
+                    out.append('\\"')
+                    repairs[RepairKind.INNER_QUOTES] = None
+                else:
+                    # Typographic quotes inside the text are kept as they are
+                    out.append(char)
+            elif char < ' ':
+                out.append(_CONTROL_ESCAPES.get(char, f"\\u{ord(char):04x}"))
+                repairs[RepairKind.CONTROL_CHARACTERS] = None
+            else:
+                out.append(char)
+            position += 1
+            continue
+        
+        if char in _WHITESPACE:
+            out.append(char)
+        elif char in '{[':
+            if after_value:
+                out.append(',')
+                repairs[RepairKind.MISSING_COMMAS] = None
+            stack.append(char)
+            out.append(char)
+            expect_key, after_value = char == '{', False
+            safe_point = (len(out), tuple(stack))
+        elif char in '}]':
+            if not stack:
+                break
+            # Drop a comma left before the closing bracket
+            last = len(out) - 1
+            while last >= 0 and out[last] in _WHITESPACE:
+                last -= 1
+            if last >= 0 and out[last] == ',':
+                del out[last]
+                repairs[RepairKind.TRAILING_COMMAS] = None
+            out.append(_CLOSERS[stack.pop()])
+            if not stack:
+                break
+            expect_key = False
+            value_done()
+        elif char == ',':
+            out.append(char)
+            expect_key, after_value = stack[-1] == '{', False
+        elif char == ':':
+            out.append(char)
+            expect_key = False
+        elif char in _OPENING_QUOTES:
+            if after_value:
+                out.append(',')
+                repairs[RepairKind.MISSING_COMMAS] = None
+                expect_key, after_value = stack[-1] == '{', False
+            if char != '"':
+                repairs[RepairKind.SMART_QUOTES] = None
+            string_quote = char
+            in_string, is_key = True, expect_key and stack[-1] == '{'
+            out.append('"')
+        else:
+            # Number or literal
+            end = position
+            while end < length and text[end] not in ',:{}[]' and text[end] not in _WHITESPACE:
+                end += 1
+            if end == length:
+                break
+            out.append(text[position:end])
+            value_done()
+            position = end
+            continue
+        position += 1
+    
+    if stack:
+        # Cut off: keep the members completed before the cut and close the open brackets
+        if safe_point is None:
+            return None, list(repairs)
+        cut, open_brackets = safe_point
+        del out[cut:]
+        while out and (out[-1] in _WHITESPACE or out[-1] == ','):
+            out.pop()
+        out.extend(_CLOSERS[bracket] for bracket in reversed(open_brackets))
+        repairs[RepairKind.TRUNCATED] = None
+    
+    return "".join(out), list(repairs)
+
+def parse_json_object(text: str, repair: bool = True) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Parse the outermost JSON object of a response
+    Candidate object starts are tried in text order: each is decoded directly, or repaired in one pass when malformed.
+    :param text: Response text (may contain prose, code fences or a truncated object)
+    :param repair: Repair malformed objects (False only extracts)
+    :return: Tuple of (parsed object or None, RepairKind values applied)
+    """
+    # Outermost start first: a well-formed object nested in a malformed outer one must not win
+    for start in _object_starts(text):
+        try:
+            data, end = _decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict):
+            surrounded = bool(text[:start].strip() or text[end:].strip())
+            return data, [RepairKind.EXTRACTED] if surrounded else []
+        if not repair:
+            continue
+        
+        repaired, repairs = repair_json(text, start)
+        if repaired is None:
+            continue
+        try:
+            data = json.loads(repaired)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            if text[:start].strip():
+                repairs.insert(0, RepairKind.EXTRACTED)
+            return data, repairs
+    return None, []
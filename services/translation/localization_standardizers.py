@@ -0,0 +1,479 @@
+"""
+Localization Standardizers
+Streaming standardizers for gettext PO, XLIFF and CSV localization files. While a file is read, the byte
+spans each translation goes to are appended to a sidecar map, so results are written back into a copy of
+the original file without parsing it again.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import xml.parsers.expat
+from abc import abstractmethod
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape as xml_escape, quoteattr
+from services.common.logger import get_logger
+from .standardizer import StandardizationInterface
+
+# [start byte, end byte, kind] of a region of the original file replaced on write-back
+Span = List[Any]
+
+_COPY_BLOCK_BYTES = 1 << 20
+_TRAILER_MAX_BYTES = 1 << 16
+_SIDECAR_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_PO_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\', 'a': '\a', 'b': '\b', 'f': '\f', 'v': '\v'}
+_PO_ESCAPE_PATTERN = re.compile(r'\\(.)')
+_PO_KEYWORD = re.compile(r'^(msgctxt|msgid_plural|msgid|msgstr(?:\[\d+\])?)\s+(".*")\s*$')
+
+def _line_ending(original: bytes) -> bytes:
+    """Line ending of the last line of a region (kept when the region is rewritten)"""
+    if original.endswith(b"\r\n"):
+        return b"\r\n"
+    return b"\n" if original.endswith(b"\n") else b""
+
+class LocalizationStandardizer(StandardizationInterface):
+    """Base for localization file standardizers: numbered entries in file order, written back through a sidecar map"""
+    
+    format_name = ""
+    suffixes: Tuple[str, ...] = ()
+    
+    def __init__(self, sidecar_dir: str = "work_space/l10n_maps", logger=None):
+        """
+        Initialize localization standardizer
+        :param sidecar_dir: Directory of the sidecar maps (one JSON file per input file)
+        :param logger: Logger to share (a new one is created when omitted)
+        """
+        self.sidecar_dir = Path(sidecar_dir)
+        self.logger = logger or get_logger(f"{self.format_name}Standardizer")
+    
+    def can_handle(self, input_data: Any) -> bool:
+        """Check if input is a file path with one of this format's suffixes"""
+        if not isinstance(input_data, (str, Path)):
+            return False
+        try:
+            path = Path(input_data)
+            return path.suffix.lower() in self.suffixes and path.is_file()
+        except (OSError, ValueError):
+            return False
+    
+    def standardize(self, input_data: Any) -> Dict[str, str]:
+        """
+        Standardize a localization file to framework format
+        :param input_data: File path
+        :return: Standardized dictionary (keys number the translatable units in file order)
+        """
+        try:
+            standardized = dict(self._iter_entries(input_data))
+            self.logger.info(f"Standardized {len(standardized)} {self.format_name} units from {input_data}")
+            return standardized
+        
+        except Exception as e:
+            error_msg = f"Failed to standardize {self.format_name} input {input_data}: {str(e)}"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+    
+    def _iter_entries(self, input_data: Any) -> Iterator[Tuple[str, str]]:
+        """
+        Stream the translatable units of a file, appending each unit's spans to its sidecar map
+        :param input_data: File path
+        :return: Iterator of (numeric key, source text) pairs
+        """
+        path = Path(input_data)
+        stat = path.stat()
+        meta: Dict[str, Any] = {}
+        sidecar_path = self.sidecar_path(path)
+        sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+        # Written through a temporary file, so a reader never sees a partial map
+        temp_path = sidecar_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        count = 0
+        try:
+            with open(path, 'rb') as f, open(temp_path, 'w', encoding='utf-8') as sidecar:
+                for unit_id, text, spans in self._iter_units(f, meta):
+                    key = None
+                    if unit_id is not None:
+                        key = str(count)
+                        count += 1
+                    sidecar.write(_SIDECAR_ENCODER.encode([key, unit_id, spans]) + "\n")
+                    if key is not None:
+                        yield key, text
+                
+                # Trailer: identifies the file version the spans belong to
+                sidecar.write(json.dumps({
+                    "format": self.format_name,
+                    "path": str(path.resolve()),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "units": count,
+                    "meta": meta
+                }, ensure_ascii=False) + "\n")
+            os.replace(temp_path, sidecar_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+    
+    @abstractmethod
+    def _iter_units(self, f, meta: Dict[str, Any]) -> Iterator[Tuple[Optional[str], str, List[Span]]]:
+        """
+        Parse a file incrementally
+        :param f: File opened in binary mode
+        :param meta: Per-file settings needed on write-back (filled by the parser)
+        :return: Iterator of (unit id, source text, spans its translation replaces) in file order; a None
+                 unit id marks a region rewritten on every write-back (e.g. a CSV header gaining the target column)
+        """
+        pass
+    
+    @abstractmethod
+    def _render(self, kind: str, original: bytes, translation: str, meta: Dict[str, Any]) -> bytes:
+        """
+        Replacement bytes of one span
+        :param kind: Span kind recorded by the parser
+        :param original: Original bytes of the span
+        :param translation: Translation of the unit
+        :param meta: Per-file settings recorded by the parser
+        :return: Bytes written in place of the span
+        """
+        pass
+    
+    def sidecar_path(self, input_path: Any) -> Path:
+        """
+        Sidecar map file of an input file (JSON lines: [key, unit id, spans] per unit, then a trailer object)
+        :param input_path: Input file path
+        :return: Path under sidecar_dir named after the hash of the absolute input path
+        """
+        digest = hashlib.sha1(str(Path(input_path).resolve()).encode('utf-8')).hexdigest()[:20]
+        return self.sidecar_dir / f"{Path(input_path).stem}.{digest}.jsonl"
+    
+    def _read_trailer(self, sidecar_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read the trailer of a sidecar map from its last line
+        :param sidecar_path: Sidecar map file
+        :return: Trailer object, or None when the map is missing or incomplete
+        """
+        try:
+            with open(sidecar_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - _TRAILER_MAX_BYTES))
+                trailer = json.loads(f.read().rstrip(b"\n").rsplit(b"\n", 1)[-1])
+        except (OSError, ValueError):
+            return None
+        return trailer if isinstance(trailer, dict) else None
+    
+    def _current_sidecar(self, input_path: Any) -> Tuple[Path, Dict[str, Any]]:
+        """
+        Sidecar map of a file, re-reading the file only when the map is missing or stale
+        :param input_path: Input file path
+        :return: Tuple of (sidecar map file, its trailer)
+        """
+        path = Path(input_path)
+        stat = path.stat()
+        sidecar_path = self.sidecar_path(path)
+        trailer = self._read_trailer(sidecar_path)
+        if trailer and trailer.get("size") == stat.st_size and trailer.get("mtime_ns") == stat.st_mtime_ns:
+            return sidecar_path, trailer
+        
+        self.logger.info(f"Sidecar map of {path} missing or stale, rebuilding it")
+        for _ in self._iter_entries(path):
+            pass
+        return sidecar_path, self._read_trailer(sidecar_path)
+    
+    def write_back(self, input_path: Any, translations: Dict[str, Any], output_path: Any) -> None:
+        """
+        Write translations into a copy of the original file, streaming both the file and its sidecar map
+        Bytes outside the recorded spans are copied unchanged; units without a translation keep their original text.
+        :param input_path: Original localization file
+        :param translations: Translations keyed like the standardized entries
+        :param output_path: File to write
+        """
+        sidecar_path, trailer = self._current_sidecar(input_path)
+        meta = trailer.get("meta", {})
+        
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(input_path, 'rb') as src, open(output_path, 'wb') as dst, \
+                open(sidecar_path, 'r', encoding='utf-8') as sidecar:
+            position = 0
+            for line in sidecar:
+                unit = json.loads(line)
+                if not isinstance(unit, list):
+                    break
+                key, _, spans = unit
+                translation = translations.get(key) if key is not None else ""
+                if translation is None:
+                    continue
+                for start, end, kind in spans:
+                    if start < position:
+                        raise ValueError(f"Sidecar map of {input_path} is out of order at byte {start}")
+                    self._copy(src, dst, start - position)
+                    dst.write(self._render(kind, src.read(end - start), str(translation), meta))
+                    position = end
+            self._copy(src, dst, None)
+        
+        self.logger.info(f"Wrote {self.format_name} translations of {input_path} to {output_path}")
+    
+    @staticmethod
+    def _copy(src, dst, size: Optional[int]) -> None:
+        """Copy size bytes (None: the rest of the file) in bounded blocks"""
+        while size is None or size > 0:
+            block = src.read(_COPY_BLOCK_BYTES if size is None else min(size, _COPY_BLOCK_BYTES))
+            if not block:
+                return
+            dst.write(block)
+            if size is not None:
+                size -= len(block)
+    
+    def get_format_name(self) -> str:
+        return self.format_name
+
+class POStandardizer(LocalizationStandardizer):
+    """gettext PO files: one unit per msgid (and one per msgid_plural), written back into msgstr"""
+    
+    format_name = "PO"
+    suffixes = (".po", ".pot")
+    
+    @staticmethod
+    def unescape(literal: str) -> str:
+        """Decode a quoted PO string literal"""
+        if '\\' not in literal:
+            return literal[1:-1]
+        return _PO_ESCAPE_PATTERN.sub(lambda match: _PO_ESCAPES.get(match.group(1), match.group(1)), literal[1:-1])
+    
+    @staticmethod
+    def escape(text: str) -> str:
+        """Encode text as the body of a PO string literal"""
+        return (text.replace('\\', '\\\\').replace('"', '\\"')
+                .replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t'))
+    
+    def _iter_units(self, f, meta: Dict[str, Any]) -> Iterator[Tuple[Optional[str], str, List[Span]]]:
+        entry: Dict[str, Any] = {}
+        field = None
+        offset = 0
+        
+        def flush():
+            msgid = entry.get("msgid", "")
+            if not msgid:
+                # The header (empty msgid) is not translated
+                return
+            unit_id = f"{entry['msgctxt']}\x04{msgid}" if "msgctxt" in entry else msgid
+            msgstr = entry.get("msgstr", {})
+            singular = [span for label, span in msgstr.items() if label in ("msgstr", "msgstr[0]")]
+            if singular:
+                yield unit_id, msgid, singular
+            plural = [span for label, span in msgstr.items() if label not in ("msgstr", "msgstr[0]")]
+            if entry.get("msgid_plural") and plural:
+                yield f"{unit_id}\x00plural", entry["msgid_plural"], plural
+        
+        for raw_line in f:
+            start, offset = offset, offset + len(raw_line)
+            line = raw_line.decode('utf-8').strip().lstrip('\ufeff')
+            
+            if not line or line[0] == "#":
+                # Blank lines and comments (including obsolete "#~" entries) end the current entry
+                if "msgstr" in entry:
+                    yield from flush()
+                    entry, field = {}, None
+            elif line[0] == '"':
+                # Continuation of the current string
+                if field and field.startswith("msgstr"):
+                    entry["msgstr"][field][1] = offset
+                elif field:
+                    entry[field] += self.unescape(line)
+            elif match := _PO_KEYWORD.match(line):
+                keyword, literal = match.groups()
+                if keyword in ("msgctxt", "msgid") and "msgstr" in entry:
+                    # A new entry without a separating blank line
+                    yield from flush()
+                    entry, field = {}, None
+                field = keyword
+                if keyword.startswith("msgstr"):
+                    entry.setdefault("msgstr", {})[keyword] = [start, offset, keyword]
+                else:
+                    entry[keyword] = self.unescape(literal)
+        yield from flush()
+    
+    def _render(self, kind: str, original: bytes, translation: str, meta: Dict[str, Any]) -> bytes:
+        return f'{kind} "{self.escape(translation)}"'.encode('utf-8') + _line_ending(original)
+
+class XLIFFStandardizer(LocalizationStandardizer):
+    """XLIFF 1.2 and 2.0 files: one unit per <trans-unit> / <segment> source, written back into its <target>"""
+    
+    format_name = "XLIFF"
+    suffixes = (".xlf", ".xliff")
+    
+    def __init__(self, sidecar_dir: str = "work_space/l10n_maps", logger=None, read_chunk_bytes: int = 1 << 16):
+        """
+        Initialize XLIFF standardizer
+        :param sidecar_dir: Directory of the sidecar maps (one JSON file per input file)
+        :param logger: Logger to share (a new one is created when omitted)
+        :param read_chunk_bytes: Bytes fed to the XML parser per read
+        """
+        super().__init__(sidecar_dir, logger)
+        self.read_chunk_bytes = read_chunk_bytes
+    
+    def _iter_units(self, f, meta: Dict[str, Any]) -> Iterator[Tuple[Optional[str], str, List[Span]]]:
+        parser = xml.parsers.expat.ParserCreate()
+        stack: List[str] = []
+        ready: List[Tuple[Optional[str], str, List[Span]]] = []
+        state: Dict[str, Any] = {"unit_id": None, "segment": 0, "in_source": False}
+        
+        def local(name: str) -> str:
+            return name.rsplit(":", 1)[-1]
+        
+        def parent_is_unit() -> bool:
+            return len(stack) >= 2 and local(stack[-2]) in ("trans-unit", "segment")
+        
+        def start_element(name, attrs):
+            stack.append(name)
+            tag = local(name)
+            if tag in ("trans-unit", "unit"):
+                state.update(unit_id=attrs.get("id", ""), segment=0)
+            if tag in ("trans-unit", "segment"):
+                state.update(text=[], markup=[], inline=False, target=None, source_end=None, prefix=name[:-len(tag)])
+            elif state["in_source"]:
+                # Inline markup inside the source is kept verbatim and the translation is written back as XML
+                state["inline"] = True
+                attributes = "".join(f" {key}={quoteattr(value)}" for key, value in attrs.items())
+                state["markup"].append(f"<{name}{attributes}>")
+            elif tag == "source" and parent_is_unit():
+                state["in_source"] = True
+            elif tag == "target" and parent_is_unit():
+                state["target"] = parser.CurrentByteIndex
+        
+        def end_element(name):
+            tag = local(name)
+            if state["in_source"] and tag == "source" and parent_is_unit():
+                state["in_source"] = False
+                # Position right after </source>, where a missing target is inserted
+                state["source_end"] = parser.CurrentByteIndex + len(name) + 3
+            elif state["in_source"]:
+                state["markup"].append(f"</{name}>")
+            elif tag == "target" and parent_is_unit() and state["target"] is not None:
+                state["target"] = [state["target"], parser.CurrentByteIndex, "target"]
+            elif tag in ("trans-unit", "segment"):
+                text = "".join(state["markup"] if state["inline"] else state["text"])
+                if text.strip() and state["source_end"] is not None:
+                    unit_id = state["unit_id"] if tag == "trans-unit" else f"{state['unit_id']}#{state['segment']}"
+                    if isinstance(state["target"], list):
+                        span = state["target"]
+                    else:
+                        span = [state["source_end"], state["source_end"], "insert:" + state["prefix"]]
+                    if state["inline"]:
+                        span[2] += "|xml"
+                    ready.append((unit_id, text, [span]))
+                state["segment"] += 1
+            stack.pop()
+        
+        def character_data(data):
+            if state["in_source"]:
+                state["text"].append(data)
+                state["markup"].append(xml_escape(data))
+        
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = character_data
+        
+        for block in iter(lambda: f.read(self.read_chunk_bytes), b''):
+            parser.Parse(block, False)
+            yield from ready
+            ready.clear()
+        parser.Parse(b'', True)
+        yield from ready
+    
+    def _render(self, kind: str, original: bytes, translation: str, meta: Dict[str, Any]) -> bytes:
+        kind, _, markup = kind.partition("|")
+        body = (translation if markup == "xml" else xml_escape(translation)).encode('utf-8')
+        if kind.startswith("insert:"):
+            prefix = kind[len("insert:"):].encode('utf-8')
+            return b"<" + prefix + b"target>" + body + b"</" + prefix + b"target>"
+        
+        start_tag_end = original.index(b">") + 1
+        if start_tag_end == len(original) and original.endswith(b"/>"):
+            # Empty <target/>: reopen it and close it after the translation
+            name = original[1:-2].split(None, 1)[0]
+            return original[:-2].rstrip() + b">" + body + b"</" + name + b">"
+        return original[:start_tag_end] + body
+
+class CSVStandardizer(LocalizationStandardizer):
+    """CSV/TSV exports with a header row: one unit per row's source column, written back into its target column"""
+    
+    format_name = "CSV"
+    suffixes = (".csv", ".tsv")
+    
+    def __init__(self, sidecar_dir: str = "work_space/l10n_maps", logger=None,
+                 source_column: str = "source", target_column: str = "target", id_column: Optional[str] = "key"):
+        """
+        Initialize CSV standardizer
+        :param sidecar_dir: Directory of the sidecar maps (one JSON file per input file)
+        :param logger: Logger to share (a new one is created when omitted)
+        :param source_column: Header of the column to translate
+        :param target_column: Header of the column translations are written to (appended when absent)
+        :param id_column: Header of the column identifying a row, recorded in the sidecar map (optional)
+        """
+        super().__init__(sidecar_dir, logger)
+        self.source_column = source_column
+        self.target_column = target_column
+        self.id_column = id_column
+    
+    def get_cache_signature(self) -> str:
+        return f"{self.format_name}|{json.dumps([self.source_column, self.target_column, self.id_column])}"
+    
+    def _iter_units(self, f, meta: Dict[str, Any]) -> Iterator[Tuple[Optional[str], str, List[Span]]]:
+        head = f.read(4096)
+        f.seek(0)
+        if Path(getattr(f, "name", "")).suffix.lower() == ".tsv":
+            delimiter = "\t"
+        else:
+            try:
+                delimiter = csv.Sniffer().sniff(head.decode('utf-8', errors='ignore'), delimiters=",;\t").delimiter
+            except csv.Error:
+                delimiter = ","
+        
+        # csv.reader pulls decoded lines; the bytes it consumed give each row's span
+        consumed = [0]
+        
+        def lines():
+            for raw_line in f:
+                consumed[0] += len(raw_line)
+                yield raw_line.decode('utf-8-sig' if consumed[0] == len(raw_line) else 'utf-8')
+        
+        reader = csv.reader(lines(), delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [column.strip().lower() for column in header]
+        if self.source_column.lower() not in columns:
+            raise ValueError(f"CSV header has no '{self.source_column}' column: {header}")
+        source_index = columns.index(self.source_column.lower())
+        id_index = columns.index(self.id_column.lower()) if self.id_column and self.id_column.lower() in columns else None
+        if self.target_column.lower() in columns:
+            target_index = columns.index(self.target_column.lower())
+        else:
+            target_index = len(header)
+            yield None, "", [[0, consumed[0], "header"]]
+        meta.update(delimiter=delimiter, target_index=target_index, target_column=self.target_column)
+        
+        row_start = consumed[0]
+        for row in reader:
+            span = [row_start, consumed[0], "row"]
+            row_start = consumed[0]
+            if source_index < len(row) and row[source_index].strip():
+                unit_id = row[id_index] if id_index is not None and id_index < len(row) else str(reader.line_num)
+                yield unit_id, row[source_index], [span]
+    
+    def _render(self, kind: str, original: bytes, translation: str, meta: Dict[str, Any]) -> bytes:
+        bom = b"\xef\xbb\xbf" if original.startswith(b"\xef\xbb\xbf") else b""
+        text = original[len(bom):].decode('utf-8')
+        row = next(csv.reader(io.StringIO(text, newline=''), delimiter=meta["delimiter"]), [])
+        target_index = meta["target_index"]
+        if kind == "header":
+            translation = meta["target_column"]
+        row.extend([""] * (target_index + 1 - len(row)))
+        row[target_index] = translation
+        
+        output = io.StringIO(newline='')
+        csv.writer(output, delimiter=meta["delimiter"],
+                   lineterminator=_line_ending(original).decode('ascii')).writerow(row)
+        return bom + output.getvalue().encode('utf-8')
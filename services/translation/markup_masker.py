@@ -0,0 +1,95 @@
+"""
+Markup Masker
+Replaces markup tags and interpolations with short numbered placeholders before a request
+and restores them in the validated translations
+"""
+
+import re
+import threading
+from collections import Counter
+from typing import Dict, Any, List, Tuple
+
+# Ren'Py text tags ({i}, {/i}, {color=#fff}), interpolations ([name]) and escaped quotes (\")
+DEFAULT_MARKUP_PATTERN = r'\{[^{}]*\}|\[[^\[\]]*\]|\\"'
+_PLACEHOLDER_PATTERN = re.compile(r'⟦(\d+)⟧')
+
+class MarkupMasker:
+    """Masks markup per entry and checks that translations keep every placeholder exactly once"""
+    
+    def __init__(self, pattern: str = DEFAULT_MARKUP_PATTERN):
+        """
+        Initialize markup masker
+        :param pattern: Regular expression matching the markup to mask
+        """
+        self._markup_regex = re.compile(pattern)
+        self._lock = threading.Lock()
+        self.stats = {
+            'masked_entries': 0,
+            'masked_tags': 0,
+            'rejected_entries': 0
+        }
+    
+    def mask(self, entries: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+        """
+        Replace markup in string entries with ⟦n⟧ placeholders numbered per entry
+        :param entries: Entries to send, keyed by block number
+        :return: Tuple of (masked entries, markup replaced in each masked entry, in placeholder order)
+        """
+        masked, slots = {}, {}
+        masked_tags = 0
+        for key, source in entries.items():
+            if not isinstance(source, str) or '⟦' in source:
+                # Never mask text that already looks like a placeholder
+                masked[key] = source
+                continue
+            
+            values: List[str] = []
+            
+            def replace(match):
+                values.append(match.group(0))
+                return f"⟦{len(values) - 1}⟧"
+            
+            masked[key] = self._markup_regex.sub(replace, source)
+            if values:
+                slots[key] = values
+                masked_tags += len(values)
+        
+        # Masking runs on the pipeline's worker threads
+        with self._lock:
+            self.stats['masked_entries'] += len(slots)
+            self.stats['masked_tags'] += masked_tags
+        return masked, slots
+    
+    def unmask(self, translations: Dict[str, Any],
+               slots: Dict[str, List[str]]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Restore markup in translations, rejecting those whose placeholder signature differs from the source
+        :param translations: Validated translations of masked entries
+        :param slots: Markup replaced in each masked entry (from mask)
+        :return: Tuple of (translations with markup restored, keys whose placeholders were lost or altered)
+        """
+        restored, rejected = {}, []
+        for key, translation in translations.items():
+            values = slots.get(key)
+            if not values or not isinstance(translation, str):
+                restored[key] = translation
+                continue
+            
+            # Placeholders may move (word order differs between languages) but each must appear exactly once
+            signature = Counter(int(number) for number in _PLACEHOLDER_PATTERN.findall(translation))
+            if signature != Counter(range(len(values))):
+                rejected.append(key)
+                continue
+            restored[key] = _PLACEHOLDER_PATTERN.sub(lambda match: values[int(match.group(1))], translation)
+        
+        with self._lock:
+            self.stats['rejected_entries'] += len(rejected)
+        return restored, rejected
+    
+    def get_masking_stats(self) -> Dict[str, Any]:
+        """
+        Get masking statistics
+        :return: Statistics dictionary
+        """
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,59 @@
+"""
+Payload Encoding
+Wire encodings of the entries sent to the model, from indented JSON to a line-numbered text format
+"""
+
+import json
+import re
+from typing import Dict, Any, Optional
+
+class PayloadEncoding:
+    """Payload encoding constants"""
+    JSON_INDENT = "json_indent"  # pretty-printed JSON (one key per line, two-space indent)
+    JSON = "json"                # minified JSON
+    LINES = "lines"              # one "<key>\t<text>" line per entry, no JSON escaping
+
+# "<key><TAB><text>"; models sometimes turn the tab into spaces
+_LINE_PATTERN = re.compile(r'^\s*(\d+)(?:\t| +)(.*)$')
+
+def resolve_encoding(entries: Dict[str, Any], encoding: str) -> str:
+    """
+    Pick the encoding actually used for a payload
+    :param entries: Entries to send, keyed by block number
+    :param encoding: Configured PayloadEncoding
+    :return: encoding, or minified JSON when the line format cannot carry every value
+             (non-string values or values containing line breaks or tabs)
+    """
+    if encoding not in (PayloadEncoding.JSON_INDENT, PayloadEncoding.JSON, PayloadEncoding.LINES):
+        return PayloadEncoding.JSON
+    if encoding == PayloadEncoding.LINES and not all(
+        isinstance(value, str) and not any(char in value for char in "\n\r\t") for value in entries.values()
+    ):
+        return PayloadEncoding.JSON
+    return encoding
+
+def encode_payload(entries: Dict[str, Any], encoding: str) -> str:
+    """
+    Encode entries for the request payload
+    :param entries: Entries to send, keyed by block number
+    :param encoding: Resolved PayloadEncoding (see resolve_encoding)
+    :return: Payload text
+    """
+    if encoding == PayloadEncoding.LINES:
+        return "\n".join(f"{key}\t{value}" for key, value in entries.items())
+    if encoding == PayloadEncoding.JSON_INDENT:
+        return json.dumps(entries, ensure_ascii=False, indent=2)
+    return json.dumps(entries, ensure_ascii=False, separators=(",", ":"))
+
+def decode_lines(text: str) -> Optional[Dict[str, str]]:
+    """
+    Parse a line-numbered response
+    :param text: Response text, optionally wrapped in a code fence
+    :return: Translations keyed by block number (later lines win), or None when no line carries a key
+    """
+    translations = {}
+    for line in text.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if match:
+            translations[match.group(1)] = match.group(2).rstrip()
+    return translations or None
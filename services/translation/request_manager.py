@@ -5,7 +5,8 @@ Handles API requests with retry logic and error handling
 
 import asyncio
 import json
-from typing import Dict, Any, Optional, Tuple, List
+import time
+from typing import Dict, Any, Optional, Tuple, List, Callable
 from services.common.logger import get_logger
 from services.common.error_codes import ERR_RETRY_MAX_EXCEEDED, ERR_REQUEST_FAILED
 from services.infrastructure.key_manager import APIKeyManager
@@ -14,12 +15,14 @@ from services.common.api_client import OpenRouterClient
 class RequestManager:
     """Manages API requests with retry logic and key rotation"""
     
-    def __init__(self, key_manager: APIKeyManager, api_url: str, config: Dict[str, Any]):
+    def __init__(self, key_manager: APIKeyManager, api_url: str, config: Dict[str, Any],
+                 status_callback: Optional[Callable[[int], None]] = None):
         """
         Initialize request manager
         :param key_manager: API key manager instance
         :param api_url: API endpoint URL
         :param config: Request configuration
+        :param status_callback: Called with every non-200 HTTP status seen by the API client
         """
         self.key_manager = key_manager
         self.api_url = api_url
@@ -27,16 +30,27 @@ class RequestManager:
         self.logger = get_logger("RequestManager")
         
         # Initialize API client
-        self.api_client = OpenRouterClient(key_manager, api_url, self.logger)
+        self.api_client = OpenRouterClient(key_manager, api_url, self.logger, status_callback)
         
         # Extract configuration
         self.max_retries = config.get("max_retries", 3)
         self.backoff_base = config.get("backoff_base", 2.0)
+        
+        # Prompt tokens billed and served from the provider's prefix cache
+        self.usage_counters: Dict[str, int] = {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "cache_write_tokens": 0,
+            "cache_hit_requests": 0
+        }
     
-    async def send_request(self, data: Dict[str, Any]) -> Tuple[int, Optional[Dict[str, Any]]]:
+    async def send_request(self, data: Dict[str, Any],
+                           latency_callback: Optional[Callable[[float], None]] = None) -> Tuple[int, Optional[Dict[str, Any]]]:
         """
         Send a translation request with retry logic
         :param data: Request data to send
+        :param latency_callback: Called with the latency of the successful attempt (retries and backoff excluded)
         :return: Tuple of (error_code, response)
         """
         self.logger.info("Starting translation request")
@@ -46,15 +60,19 @@ class RequestManager:
         while retry_count <= self.max_retries:
             try:
                 # Send request using API client
+                attempt_start = time.monotonic()
                 response = await self.api_client.send_request(data)
+                if latency_callback:
+                    latency_callback(time.monotonic() - attempt_start)
                 
                 # Report successful key usage
                 if hasattr(self.api_client, 'last_used_key'):
                     await self.key_manager.report_key_success(self.api_client.last_used_key)
                 
+                self._record_usage(response)
                 self.logger.info("Translation request completed successfully")
                 return 0, response  # ERR_NONE
-                
+            
             except Exception as e:
                 retry_count += 1
                 self.logger.error(f"Request failed (attempt {retry_count}): {str(e)}")
@@ -78,6 +96,58 @@ class RequestManager:
         
         return ERR_RETRY_MAX_EXCEEDED, None
     
+    def _record_usage(self, response: Any) -> None:
+        """
+        Add a response's token usage to the usage counters
+        :param response: API response
+        """
+        usage = response.get("usage") if isinstance(response, dict) else None
+        if not isinstance(usage, dict):
+            return
+        
+        cached_tokens, cache_write_tokens = self.parse_cached_tokens(usage)
+        # Anthropic-style usage reports cache reads and writes outside input_tokens
+        prompt_tokens = usage.get("prompt_tokens")
+        if prompt_tokens is None:
+            prompt_tokens = usage.get("input_tokens", 0) + usage.get("cache_read_input_tokens", 0) \
+                + usage.get("cache_creation_input_tokens", 0)
+        
+        self.usage_counters["requests"] += 1
+        self.usage_counters["prompt_tokens"] += prompt_tokens or 0
+        self.usage_counters["cached_tokens"] += cached_tokens
+        self.usage_counters["cache_write_tokens"] += cache_write_tokens
+        if cached_tokens:
+            self.usage_counters["cache_hit_requests"] += 1
+    
+    @staticmethod
+    def parse_cached_tokens(usage: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Read prefix-cache token counts from a usage block in any of the common provider shapes
+        (OpenAI/OpenRouter prompt_tokens_details, Anthropic cache_*_input_tokens, DeepSeek prompt_cache_hit_tokens)
+        :param usage: Usage dictionary of a response
+        :return: Tuple of (prompt tokens read from cache, prompt tokens written to cache)
+        """
+        details = usage.get("prompt_tokens_details") or {}
+        cached_tokens = (details.get("cached_tokens") or usage.get("cache_read_input_tokens")
+                         or usage.get("prompt_cache_hit_tokens") or 0)
+        cache_write_tokens = details.get("cache_write_tokens") or usage.get("cache_creation_input_tokens") or 0
+        return cached_tokens, cache_write_tokens
+    
+    @staticmethod
+    def summarize_prompt_cache(counters: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Summarize usage counters into prefix cache hit ratios
+        :param counters: Usage counters (see usage_counters)
+        :return: Counters plus the share of prompt tokens and of requests served from the cache
+        """
+        requests = counters.get("requests", 0)
+        prompt_tokens = counters.get("prompt_tokens", 0)
+        return {
+            **counters,
+            "token_hit_ratio": counters.get("cached_tokens", 0) / prompt_tokens if prompt_tokens else 0.0,
+            "request_hit_ratio": counters.get("cache_hit_requests", 0) / requests if requests else 0.0
+        }
+    
     async def _handle_error_status(self, status_code: int, error: Exception) -> None:
         """
         Handle different HTTP status codes
@@ -131,6 +201,7 @@ class RequestManager:
             "max_retries": self.max_retries,
             "backoff_base": self.backoff_base,
             "api_url": self.api_url,
+            "prompt_cache": self.summarize_prompt_cache(self.usage_counters),
             "key_manager_stats": self.key_manager.get_key_stats()
         }
     
@@ -149,7 +220,7 @@ class RequestManager:
             
             error_code, response = await self.send_request(health_data)
             return error_code == 0
-            
+        
         except Exception as e:
             self.logger.error(f"Health check failed: {e}")
             return False
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Request Packer
+Packs standardized entries from any number of files into requests that target a token budget
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+@dataclass
+class PackedRequest:
+    """Entries of one API request, keyed by request-local block numbers"""
+    entries: Dict[str, str] = field(default_factory=dict)
+    hints: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    origins: Dict[str, Tuple[Any, str]] = field(default_factory=dict)  # request key -> (owner, original key)
+    tokens: int = 0
+    target_language: Optional[str] = None
+    translations: Optional[Dict[str, Any]] = None  # valid translations keyed by request key
+    
+    def add(self, owner: Any, key: str, source: str, hint: Optional[Dict[str, str]], tokens: int) -> None:
+        """
+        Append an entry under the next request-local key
+        :param owner: Owner of the entry (e.g. the file's pipeline item)
+        :param key: Original key within the owner
+        :param source: Source string
+        :param hint: Reference translation for the entry, if any
+        :param tokens: Estimated entry cost
+        """
+        request_key = str(len(self.entries))
+        self.entries[request_key] = source
+        if hint:
+            self.hints[request_key] = hint
+        self.origins[request_key] = (owner, key)
+        self.tokens += tokens
+    
+    def owners(self) -> List[Any]:
+        """
+        Distinct owners with entries in this request
+        :return: Owners in first-entry order
+        """
+        owners: Dict[int, Any] = {}
+        for owner, _ in self.origins.values():
+            owners.setdefault(id(owner), owner)
+        return list(owners.values())
+    
+    def split_response(self, translations: Dict[str, Any]) -> List[Tuple[Any, Dict[str, Any], List[str]]]:
+        """
+        Map request-local keys of a validated response back to their owners
+        :param translations: Validated translations keyed by request key
+        :return: (owner, {original key: translation}, [original keys without a translation]) per owner,
+                 in first-entry order
+        """
+        split: Dict[int, Tuple[Any, Dict[str, Any], List[str]]] = {}
+        for request_key, (owner, key) in self.origins.items():
+            _, owner_translations, missing = split.setdefault(id(owner), (owner, {}, []))
+            if request_key in translations:
+                owner_translations[key] = translations[request_key]
+            else:
+                missing.append(key)
+        return list(split.values())
+
+class RequestPacker:
+    """Next-fit packing of entries into requests of at most token_budget estimated tokens"""
+    
+    # JSON punctuation, quotes and the block number around each value
+    ENTRY_OVERHEAD_TOKENS = 4
+    
+    def __init__(self, token_counter, token_budget: Optional[int] = None, target_language: Optional[str] = None):
+        """
+        Initialize request packer
+        :param token_counter: TokenCounter used to estimate entry costs
+        :param token_budget: Target payload tokens per request (None packs one request per owner)
+        :param target_language: Target language of every request this packer emits
+        """
+        self.token_counter = token_counter
+        self.token_budget = token_budget
+        self.target_language = target_language
+        self._current = PackedRequest(target_language=target_language)
+    
+    def entry_cost(self, source: Any, hint: Optional[Dict[str, str]] = None) -> int:
+        """
+        Estimate the payload tokens an entry adds to a request
+        :param source: Source value
+        :param hint: Reference translation sent with the entry
+        :return: Estimated tokens
+        """
+        text = source if isinstance(source, str) else json.dumps(source, ensure_ascii=False)
+        cost = self.token_counter.count_text(text) + self.ENTRY_OVERHEAD_TOKENS
+        if hint:
+            cost += self.token_counter.count_text(json.dumps(hint, ensure_ascii=False)) + self.ENTRY_OVERHEAD_TOKENS
+        return cost
+    
+    def add(self, owner: Any, entries: Dict[str, Any],
+            hints: Optional[Dict[str, Dict[str, str]]] = None) -> Tuple[List[PackedRequest], int]:
+        """
+        Add an owner's entries
+        :param owner: Owner of the entries
+        :param entries: Entries to send, keyed by original key
+        :param hints: Reference translations keyed like entries
+        :return: Tuple of (requests that filled up, number of requests holding the owner's entries)
+        """
+        hints = hints or {}
+        ready = []
+        parts = 0
+        last_request = None
+        for key, source in entries.items():
+            hint = hints.get(key)
+            cost = self.entry_cost(source, hint)
+            # An entry larger than the budget still gets a request of its own
+            if self.token_budget and self._current.entries and self._current.tokens + cost > self.token_budget:
+                ready.append(self._current)
+                self._current = PackedRequest(target_language=self.target_language)
+            self._current.add(owner, key, source, hint, cost)
+            if self._current is not last_request:
+                parts += 1
+                last_request = self._current
+        
+        if not self.token_budget:
+            ready.extend(self.flush())
+        return ready, parts
+    
+    def flush(self) -> List[PackedRequest]:
+        """
+        Emit the partially filled request, if any
+        :return: Zero or one request
+        """
+        if not self._current.entries:
+            return []
+        packed, self._current = self._current, PackedRequest(target_language=self.target_language)
+        return [packed]
@@ -0,0 +1,205 @@
+"""
+Standardization Cache
+Persistent sidecar index of standardized input files, keyed by (path, size, mtime_ns) with a content-hash fallback,
+separately for each standardizer signature (format and the settings its output depends on)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from services.common.logger import get_logger
+
+# (size, mtime_ns, sha256 hex digest) of an input file
+Fingerprint = Tuple[int, int, str]
+
+_HASH_BLOCK_BYTES = 1 << 20
+
+def hash_file(path: str) -> str:
+    """
+    Hash a file's content in fixed-size blocks
+    :param path: File path
+    :return: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def encode_entries(entries: Dict[str, str]) -> bytes:
+    """
+    Pack standardized entries into the stored binary form (zlib-compressed minified JSON)
+    :param entries: Standardized dictionary
+    :return: Compressed bytes
+    """
+    return zlib.compress(json.dumps(entries, ensure_ascii=False, separators=(",", ":")).encode('utf-8'), 1)
+
+def decode_entries(blob: bytes) -> Dict[str, str]:
+    """
+    Unpack entries stored by encode_entries
+    :param blob: Compressed bytes
+    :return: Standardized dictionary
+    """
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+class StandardizationCache:
+    """Reuses the standardized entries of input files that did not change since they were last standardized"""
+    
+    def __init__(self, db_path: str = "work_space/standardization_cache.db"):
+        """
+        Initialize standardization cache
+        :param db_path: Path to the SQLite database file (":memory:" for a volatile store)
+        """
+        self.db_path = db_path
+        self.logger = get_logger("StandardizationCache")
+        self._lock = threading.Lock()
+        self.stats = {
+            'stat_hits': 0,
+            'hash_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'pruned': 0
+        }
+        
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        # Worker processes share the same database, so wait on locks instead of failing
+        self._conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(standardized_files)")]
+        if columns and "signature" not in columns:
+            # Entries cached before signatures were recorded cannot be told apart by format, so start over
+            self.logger.info("Standardization cache has no standardizer signatures, rebuilding it")
+            self._conn.execute("DROP TABLE standardized_files")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS standardized_files (
+                path TEXT NOT NULL,
+                signature TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                entries BLOB NOT NULL,
+                stored_at REAL,
+                PRIMARY KEY (path, signature)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_standardized_files_hash ON standardized_files (content_hash, signature)"
+        )
+        self._conn.commit()
+        
+        self.logger.info(f"Standardization cache opened: {db_path}")
+    
+    @staticmethod
+    def _cache_path(path: str) -> str:
+        """Absolute path used as the cache key, so relative and absolute spellings share an entry"""
+        return os.path.abspath(path)
+    
+    def lookup(self, path: str, signature: str) -> Tuple[Optional[Dict[str, str]], Optional[Fingerprint]]:
+        """
+        Look up the standardized entries of a file
+        An unchanged size and mtime is a hit without reading the file; otherwise the content hash is
+        compared, so a touched or copied file with identical content is still a hit.
+        :param path: Input file path
+        :param signature: Standardizer signature; only entries produced under the same signature are reused
+        :return: Tuple of (cached entries or None, fingerprint to pass to store on a miss)
+        """
+        cache_path = self._cache_path(path)
+        stat = os.stat(cache_path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, entries FROM standardized_files WHERE path = ? AND signature = ?",
+                (cache_path, signature)
+            ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            with self._lock:
+                self.stats['stat_hits'] += 1
+            return decode_entries(row[2]), None
+        
+        fingerprint = (stat.st_size, stat.st_mtime_ns, hash_file(cache_path))
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entries FROM standardized_files WHERE content_hash = ? AND signature = ? AND size = ? LIMIT 1",
+                (fingerprint[2], signature, fingerprint[0])
+            ).fetchone()
+            if row is None:
+                # Changed or new: the stale row (if any) is replaced by store
+                self.stats['misses'] += 1
+                return None, fingerprint
+            
+            self._upsert(cache_path, signature, fingerprint, row[0])
+            self.stats['hash_hits'] += 1
+        return decode_entries(row[0]), None
+    
+    def store(self, path: str, signature: str, fingerprint: Fingerprint, entries: Dict[str, str]) -> bool:
+        """
+        Store the standardized entries of a file
+        :param path: Input file path
+        :param signature: Signature of the standardizer that produced the entries
+        :param fingerprint: Fingerprint returned by lookup before the file was standardized
+        :param entries: Standardized dictionary
+        :return: False when the file changed while it was being standardized (nothing stored)
+        """
+        cache_path = self._cache_path(path)
+        stat = os.stat(cache_path)
+        if (stat.st_size, stat.st_mtime_ns) != fingerprint[:2]:
+            return False
+        
+        blob = encode_entries(entries)
+        with self._lock:
+            self._upsert(cache_path, signature, fingerprint, blob)
+            self.stats['stores'] += 1
+        return True
+    
+    def _upsert(self, cache_path: str, signature: str, fingerprint: Fingerprint, blob: bytes) -> None:
+        """Insert or replace the row of a file and signature (lock held)"""
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO standardized_files (path, signature, size, mtime_ns, content_hash, entries, stored_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (cache_path, signature, fingerprint[0], fingerprint[1], fingerprint[2], blob, time.time())
+        )
+        self._conn.commit()
+    
+    def prune(self) -> int:
+        """
+        Drop the rows of files that no longer exist
+        :return: Number of rows removed
+        """
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute("SELECT DISTINCT path FROM standardized_files")]
+            missing: List[Tuple[str]] = [(path,) for path in paths if not os.path.isfile(path)]
+            if missing:
+                self._conn.executemany("DELETE FROM standardized_files WHERE path = ?", missing)
+                self._conn.commit()
+            self.stats['pruned'] += len(missing)
+        return len(missing)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get standardization cache statistics
+        :return: Statistics dictionary
+        """
+        with self._lock:
+            total_files = self._conn.execute("SELECT COUNT(*) FROM standardized_files").fetchone()[0]
+            hits = self.stats['stat_hits'] + self.stats['hash_hits']
+            lookups = hits + self.stats['misses']
+            return {
+                'total_files': total_files,
+                **self.stats,
+                'hit_rate': hits / lookups if lookups else 0.0
+            }
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
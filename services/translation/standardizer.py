@@ -5,11 +5,120 @@ Handles conversion of input text from different engine formats to framework stan
 
 import json
 import re
+from json.decoder import scanstring
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 from pathlib import Path
 from services.common.logger import get_logger
 from services.common.error_codes import ERR_STANDARDIZATION_FAILED
+from .standardization_cache import StandardizationCache
+
+# Characters read from a file to sniff its format, and per read of the incremental JSON reader
+SNIFF_CHARS = 4096
+READ_CHUNK_CHARS = 1 << 16
+
+_WHITESPACE = re.compile(r'\s*')
+# A whole "key": "string value" member with its separator: the common case, matched without the JSON scanner
+_JSON_STRING = r'"([^"\\\x00-\x1f]*(?:\\.[^"\\\x00-\x1f]*)*)"'
+_STRING_MEMBER = re.compile(r'\s*' + _JSON_STRING + r'\s*:\s*' + _JSON_STRING + r'\s*([,}])')
+
+def sniff_format(head: str) -> str:
+    """
+    Guess the format of an input from its first characters
+    :param head: Leading characters of the input (SNIFF_CHARS are enough)
+    :return: "JSON" when the first non-blank character opens an object, otherwise "Text"
+    """
+    return "JSON" if head.lstrip("\ufeff \t\r\n").startswith("{") else "Text"
+
+def iter_json_object(stream: TextIO, chunk_chars: int = READ_CHUNK_CHARS) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally read the members of a top-level JSON object
+    Only the member being decoded is buffered, so memory stays bounded by the largest value,
+    not by the file size.
+    :param stream: Text stream positioned at (or before whitespace preceding) the opening brace
+    :param chunk_chars: Characters read per refill
+    :return: Iterator of (key, value) pairs in file order
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    
+    def refill(min_chars: int = chunk_chars) -> bool:
+        nonlocal buffer, position, eof
+        if eof:
+            return False
+        chunk = stream.read(max(min_chars, chunk_chars))
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+    
+    def next_char() -> str:
+        nonlocal position
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position < len(buffer):
+                return buffer[position]
+            if not refill():
+                raise ValueError("Unexpected end of JSON input")
+    
+    def decode() -> Any:
+        nonlocal position
+        # A value is complete once a character follows it (a truncated number or literal would
+        # otherwise decode early); grow the read size while one value spans several chunks
+        wanted = chunk_chars
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                if _WHITESPACE.match(buffer, end).end() < len(buffer) or eof:
+                    position = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            wanted *= 2
+            refill(wanted)
+    
+    if not refill():
+        raise ValueError("Empty JSON input")
+    if buffer.startswith("\ufeff"):
+        position = 1
+    if next_char() != "{":
+        raise ValueError("JSON input is not an object")
+    position += 1
+    
+    if next_char() == "}":
+        return
+    while True:
+        match = _STRING_MEMBER.match(buffer, position)
+        if match:
+            key, value = match.group(1), match.group(2)
+            if "\\" in key:
+                key = scanstring(buffer, match.start(1))[0]
+            if "\\" in value:
+                value = scanstring(buffer, match.start(2))[0]
+            separator = match.group(3)
+            position = match.end()
+            yield key, value
+        else:
+            # Non-string values, or a member split across reads
+            if next_char() != '"':
+                raise ValueError(f"Expected a member name at offset {position}")
+            key = decode()
+            if next_char() != ":":
+                raise ValueError(f"Expected ':' after member name {key!r}")
+            position += 1
+            next_char()
+            value = decode()
+            yield key, value
+            separator = next_char()
+            position += 1
+        
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or '}}' after member {key!r}")
 
 class StandardizationInterface(ABC):
     """Abstract interface for input standardization"""
@@ -32,6 +141,13 @@ class StandardizationInterface(ABC):
         """
         pass
     
+    def get_cache_signature(self) -> str:
+        """
+        Identify this standardizer and the settings its output depends on, for the standardization cache
+        :return: Signature string (the format name unless settings change the entries)
+        """
+        return self.get_format_name()
+    
     @abstractmethod
     def get_format_name(self) -> str:
         """
@@ -43,17 +159,17 @@ class StandardizationInterface(ABC):
 class JSONStandardizer(StandardizationInterface):
     """Standardizer for JSON input files"""
     
-    def __init__(self):
-        self.logger = get_logger("JSONStandardizer")
+    def __init__(self, logger=None):
+        """
+        Initialize JSON standardizer
+        :param logger: Logger to share (a new one is created when omitted)
+        """
+        self.logger = logger or get_logger("JSONStandardizer")
     
     def can_handle(self, input_data: Any) -> bool:
-        """Check if input is JSON format"""
+        """Check if input is JSON format (sniffed from its first characters, not parsed)"""
         if isinstance(input_data, str):
-            try:
-                json.loads(input_data)
-                return True
-            except (json.JSONDecodeError, TypeError):
-                return False
+            return sniff_format(input_data[:SNIFF_CHARS]) == "JSON"
         elif isinstance(input_data, dict):
             return True
         return False
@@ -65,27 +181,7 @@ class JSONStandardizer(StandardizationInterface):
         :return: Standardized dictionary
         """
         try:
-            # Parse JSON if it's a string
-            if isinstance(input_data, str):
-                data = json.loads(input_data)
-            else:
-                data = input_data
-            
-            # Convert to standardized format
-            standardized = {}
-            for key, value in data.items():
-                # Ensure key is string and value is string
-                str_key = str(key)
-                str_value = str(value) if value is not None else ""
-                
-                # Validate key format (should be numeric)
-                try:
-                    int(str_key)
-                    standardized[str_key] = str_value
-                except ValueError:
-                    self.logger.warning(f"Skipping non-numeric key: {str_key}")
-                    continue
-            
+            standardized = dict(self._iter_entries(input_data))
             self.logger.info(f"Standardized {len(standardized)} entries from JSON input")
             return standardized
             
@@ -94,19 +190,51 @@ class JSONStandardizer(StandardizationInterface):
             self.logger.error(error_msg)
             raise ValueError(error_msg)
     
+    def _iter_entries(self, input_data: Any) -> Iterator[Tuple[str, str]]:
+        """
+        Yield standardized entries of a JSON string or dict
+        :param input_data: JSON string or dict
+        :return: Iterator of (numeric key, text) pairs
+        """
+        # Parse JSON if it's a string
+        data = json.loads(input_data) if isinstance(input_data, str) else input_data
+        if not isinstance(data, dict):
+            raise ValueError("JSON input is not an object")
+        return self.normalize(data.items())
+    
+    def normalize(self, pairs: Iterable[Tuple[Any, Any]]) -> Iterator[Tuple[str, str]]:
+        """
+        Convert parsed (key, value) pairs to framework format
+        :param pairs: Parsed pairs, e.g. from iter_json_object
+        :return: Iterator of (numeric key, text) pairs; non-numeric keys are skipped
+        """
+        for key, value in pairs:
+            # Ensure key is string and value is string
+            str_key = str(key)
+            str_value = str(value) if value is not None else ""
+            
+            # Validate key format (should be numeric)
+            try:
+                int(str_key)
+            except ValueError:
+                self.logger.warning(f"Skipping non-numeric key: {str_key}")
+                continue
+            yield str_key, str_value
+    
     def get_format_name(self) -> str:
         return "JSON"
 
 class TextStandardizer(StandardizationInterface):
     """Standardizer for plain text input"""
     
-    def __init__(self, delimiter: str = "\n"):
+    def __init__(self, delimiter: str = "\n", logger=None):
         """
         Initialize text standardizer
         :param delimiter: Delimiter to split text into chunks
+        :param logger: Logger to share (a new one is created when omitted)
         """
         self.delimiter = delimiter
-        self.logger = get_logger("TextStandardizer")
+        self.logger = logger or get_logger("TextStandardizer")
     
     def can_handle(self, input_data: Any) -> bool:
         """Check if input is plain text"""
@@ -122,15 +250,7 @@ class TextStandardizer(StandardizationInterface):
             if not isinstance(input_data, str):
                 raise ValueError("Input must be a string")
             
-            # Split text into chunks
-            chunks = input_data.split(self.delimiter)
-            chunks = [chunk.strip() for chunk in chunks if chunk.strip()]
-            
-            # Convert to standardized format
-            standardized = {}
-            for i, chunk in enumerate(chunks):
-                standardized[str(i)] = chunk
-            
+            standardized = dict(self.iter_chunks(input_data.split(self.delimiter)))
             self.logger.info(f"Standardized {len(standardized)} text chunks")
             return standardized
             
@@ -139,6 +259,19 @@ class TextStandardizer(StandardizationInterface):
             self.logger.error(error_msg)
             raise ValueError(error_msg)
     
+    def iter_chunks(self, chunks: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Number the non-blank chunks of a text
+        :param chunks: Chunks split on the delimiter (a text file object yields its lines)
+        :return: Iterator of (numeric key, stripped chunk) pairs
+        """
+        index = 0
+        for chunk in chunks:
+            chunk = chunk.strip()
+            if chunk:
+                yield str(index), chunk
+                index += 1
+    
     def _looks_like_json(self, text: str) -> bool:
         """Check if text looks like JSON"""
         text = text.strip()
@@ -149,18 +282,26 @@ class TextStandardizer(StandardizationInterface):
         return "Text"
 
 class FileStandardizer(StandardizationInterface):
-    """Standardizer for file input (auto-detects format)"""
+    """Standardizer for file input (format sniffed from the first characters, content parsed once while streaming)"""
     
-    def __init__(self):
-        self.logger = get_logger("FileStandardizer")
-        self.json_standardizer = JSONStandardizer()
-        self.text_standardizer = TextStandardizer()
+    def __init__(self, logger=None):
+        """
+        Initialize file standardizer
+        :param logger: Logger to share with the JSON and text standardizers (a new one is created when omitted)
+        """
+        self.logger = logger or get_logger("FileStandardizer")
+        self.json_standardizer = JSONStandardizer(self.logger)
+        self.text_standardizer = TextStandardizer(logger=self.logger)
     
     def can_handle(self, input_data: Any) -> bool:
         """Check if input is a file path"""
         if isinstance(input_data, (str, Path)):
-            path = Path(input_data)
-            return path.exists() and path.is_file()
+            try:
+                path = Path(input_data)
+                return path.is_file()
+            except (OSError, ValueError):
+                # Long or multi-line strings (e.g. raw JSON content) are not paths
+                return False
         return False
     
     def standardize(self, input_data: Any) -> Dict[str, str]:
@@ -169,57 +310,90 @@ class FileStandardizer(StandardizationInterface):
         :param input_data: File path
         :return: Standardized dictionary
         """
+        path = Path(input_data)
         try:
-            path = Path(input_data)
-            
-            # Read file content
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            try:
+                standardized = dict(self._iter_entries(path))
+            except (json.JSONDecodeError, ValueError) as e:
+                if self._sniff(path) != "JSON":
+                    raise
+                # Malformed JSON has always been translated line by line rather than rejected
+                self.logger.warning(f"Malformed JSON in {path} ({e}), treating as text")
+                with open(path, 'r', encoding='utf-8') as f:
+                    standardized = dict(self.text_standardizer.iter_chunks(f))
             
-            # Auto-detect format and use appropriate standardizer
-            if self.json_standardizer.can_handle(content):
-                self.logger.info(f"Detected JSON format in {path}")
-                return self.json_standardizer.standardize(content)
-            elif self.text_standardizer.can_handle(content):
-                self.logger.info(f"Detected text format in {path}")
-                return self.text_standardizer.standardize(content)
-            else:
-                # Try to treat as text as fallback
-                self.logger.warning(f"Unknown format in {path}, treating as text")
-                return self.text_standardizer.standardize(content)
+            self.logger.info(f"Standardized {len(standardized)} entries from {path}")
+            return standardized
                 
         except Exception as e:
             error_msg = f"Failed to standardize file input {input_data}: {str(e)}"
             self.logger.error(error_msg)
             raise ValueError(error_msg)
     
+    def _iter_entries(self, input_data: Any) -> Iterator[Tuple[str, str]]:
+        """
+        Stream standardized entries of a file without reading it whole
+        :param input_data: File path
+        :return: Iterator of (numeric key, text) pairs
+        """
+        path = Path(input_data)
+        with open(path, 'r', encoding='utf-8') as f:
+            file_format = sniff_format(f.read(SNIFF_CHARS))
+            f.seek(0)
+            if file_format == "JSON":
+                yield from self.json_standardizer.normalize(iter_json_object(f))
+            elif self.text_standardizer.delimiter == "\n":
+                yield from self.text_standardizer.iter_chunks(f)
+            else:
+                yield from self.text_standardizer.iter_chunks(f.read().split(self.text_standardizer.delimiter))
+    
+    def _sniff(self, path: Path) -> str:
+        """
+        Sniff the format of a file
+        :param path: File path
+        :return: Format name (see sniff_format)
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return sniff_format(f.read(SNIFF_CHARS))
+    
+    def get_cache_signature(self) -> str:
+        return f"File|delimiter={json.dumps(self.text_standardizer.delimiter)}"
+    
     def get_format_name(self) -> str:
         return "File"
 
 class Standardizer:
     """Main standardizer class that manages multiple standardization strategies"""
     
-    def __init__(self, auto_convert: bool = True):
+    def __init__(self, auto_convert: bool = True, cache: Optional[StandardizationCache] = None):
         """
         Initialize standardizer
         :param auto_convert: Whether to automatically convert input formats
+        :param cache: Sidecar cache of standardized input files (None to always re-standardize)
         """
         self.auto_convert = auto_convert
+        self.cache = cache
         self.logger = get_logger("Standardizer")
         
-        # Register default standardizers
+        # Register default standardizers (sharing this logger); file paths are checked first
+        # so that a path string is not mistaken for plain text
         self.standardizers: List[StandardizationInterface] = [
-            JSONStandardizer(),
-            TextStandardizer(),
-            FileStandardizer()
+            FileStandardizer(self.logger),
+            JSONStandardizer(self.logger),
+            TextStandardizer(logger=self.logger)
         ]
     
-    def add_standardizer(self, standardizer: StandardizationInterface) -> None:
+    def add_standardizer(self, standardizer: StandardizationInterface, position: Optional[int] = None) -> None:
         """
         Add a custom standardizer
         :param standardizer: Custom standardizer implementation
+        :param position: Index in the detection order (None appends; 0 takes precedence over the generic
+                         file standardizer, e.g. for file formats recognized by suffix)
         """
-        self.standardizers.append(standardizer)
+        if position is None:
+            self.standardizers.append(standardizer)
+        else:
+            self.standardizers.insert(position, standardizer)
         self.logger.info(f"Added custom standardizer: {type(standardizer).__name__}")
     
     def standardize(self, input_data: Any, force_format: Optional[str] = None) -> Dict[str, str]:
@@ -241,6 +415,17 @@ class Standardizer:
             if not standardizer:
                 raise ValueError(f"No standardizer found for input type: {type(input_data).__name__}")
             
+            if isinstance(standardizer, JSONStandardizer) and isinstance(input_data, str) and not force_format:
+                # Sniffing only looks at the first characters: text may open with a tag such as "{i}"
+                try:
+                    input_data = json.loads(input_data)
+                except json.JSONDecodeError as e:
+                    self.logger.warning(f"Input is not valid JSON ({e}), treating as text")
+                    standardizer = self._find_standardizer(input_data, "Text") or standardizer
+            
+            if self.cache and self._is_file_path(input_data):
+                return self._standardize_cached(standardizer, input_data)
+            
             # Perform standardization
             self.logger.info(f"Using {standardizer.get_format_name()} standardizer")
             return standardizer.standardize(input_data)
@@ -250,6 +435,50 @@ class Standardizer:
             self.logger.error(error_msg)
             raise ValueError(error_msg)
     
+    def write_back(self, input_path: Any, translations: Dict[str, Any], output_path: Any) -> bool:
+        """
+        Write translations in the original format of the input file, when its standardizer supports it
+        :param input_path: Input file path
+        :param translations: Translations keyed like the standardized entries
+        :param output_path: Output file path
+        :return: False when the input format has no write-back (the caller writes JSON instead)
+        """
+        standardizer = self._find_standardizer(input_path)
+        if standardizer is None or not hasattr(standardizer, "write_back"):
+            return False
+        standardizer.write_back(input_path, translations, output_path)
+        return True
+    
+    def _standardize_cached(self, standardizer: StandardizationInterface, path: Any) -> Dict[str, str]:
+        """
+        Standardize an input file, reusing the cached entries while the file is unchanged
+        :param standardizer: Standardizer selected for the file
+        :param path: Input file path
+        :return: Standardized dictionary
+        """
+        # The suffix selects parser settings (e.g. the TSV delimiter), so a renamed copy is standardized anew
+        signature = f"{standardizer.get_cache_signature()}|{Path(path).suffix.lower()}"
+        cached, fingerprint = self.cache.lookup(str(path), signature)
+        if cached is not None:
+            self.logger.info(f"Loaded {len(cached)} standardized entries of {path} from cache")
+            return cached
+        
+        self.logger.info(f"Using {standardizer.get_format_name()} standardizer")
+        standardized = standardizer.standardize(path)
+        if not self.cache.store(str(path), signature, fingerprint, standardized):
+            self.logger.warning(f"{path} changed while it was standardized, not caching it")
+        return standardized
+    
+    @staticmethod
+    def _is_file_path(input_data: Any) -> bool:
+        """Whether the input names an existing file"""
+        if not isinstance(input_data, (str, Path)):
+            return False
+        try:
+            return Path(input_data).is_file()
+        except (OSError, ValueError):
+            return False
+    
     def _find_standardizer(self, input_data: Any, force_format: Optional[str] = None) -> Optional[StandardizationInterface]:
         """
         Find appropriate standardizer for input data
@@ -306,5 +535,6 @@ class Standardizer:
         return {
             "auto_convert": self.auto_convert,
             "supported_formats": self.get_supported_formats(),
-            "total_standardizers": len(self.standardizers)
+            "total_standardizers": len(self.standardizers),
+            "cache": self.cache.get_cache_stats() if self.cache else None
         }
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""
+Translation Memory
+Two-tier cache of translated strings: in-memory LRU in front of a persistent SQLite table
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional
+from services.common.logger import get_logger
+
+def normalize_source(text: str) -> str:
+    """
+    Normalize a source string for cache lookups (Unicode NFC, collapsed whitespace)
+    :param text: Source string
+    :return: Normalized string
+    """
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text)).strip()
+
+class TranslationMemory:
+    """Caches translations keyed by hash(normalized source, model, prompt version, target language)"""
+    
+    def __init__(self, db_path: str = "work_space/translation_memory.db", memory_size: int = 10000):
+        """
+        Initialize translation memory
+        :param db_path: Path to the SQLite database file (":memory:" for a volatile store)
+        :param memory_size: Maximum number of entries kept in the in-memory LRU tier
+        """
+        self.db_path = db_path
+        self.memory_size = max(0, memory_size)
+        self.logger = get_logger("TranslationMemory")
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'tokens_saved': 0
+        }
+        
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        # Worker processes share the same database, so wait on locks instead of failing
+        self._conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                cache_key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                model TEXT,
+                prompt_version TEXT,
+                target_language TEXT,
+                created_at REAL
+            )
+        """)
+        self._conn.commit()
+        
+        self.logger.info(f"Translation memory opened: {db_path}")
+    
+    @staticmethod
+    def make_key(source: str, model: str, prompt_version: str, target_language: str) -> str:
+        """
+        Build the cache key for a source string
+        :param source: Source string
+        :param model: Model name
+        :param prompt_version: Prompt version identifier
+        :param target_language: Target language code
+        :return: Hex digest cache key
+        """
+        digest = hashlib.sha256()
+        for part in (normalize_source(source), model, prompt_version, target_language):
+            digest.update((part or "").encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+    
+    def get(self, cache_key: str) -> Optional[str]:
+        """
+        Look up a translation, promoting disk hits into the memory tier
+        :param cache_key: Cache key from make_key
+        :return: Cached translation or None
+        """
+        with self._lock:
+            translation = self._memory.get(cache_key)
+            if translation is not None:
+                self._memory.move_to_end(cache_key)
+                self.stats['memory_hits'] += 1
+                return translation
+            
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            
+            self.stats['disk_hits'] += 1
+            self._remember(cache_key, row[0])
+            return row[0]
+    
+    def peek(self, cache_key: str) -> Optional[str]:
+        """
+        Look up a translation without counting the lookup or changing the LRU order (for dry runs)
+        :param cache_key: Cache key from make_key
+        :return: Cached translation or None
+        """
+        with self._lock:
+            translation = self._memory.get(cache_key)
+            if translation is not None:
+                return translation
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def put_many(self, entries: Dict[str, Dict[str, str]]) -> None:
+        """
+        Store translations in both tiers
+        :param entries: Mapping of cache key to {"source", "translation", "model", "prompt_version", "target_language"}
+        """
+        if not entries:
+            return
+        
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO translations
+                    (cache_key, source, translation, model, prompt_version, target_language, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (cache_key, entry["source"], entry["translation"], entry.get("model"),
+                     entry.get("prompt_version"), entry.get("target_language"), now)
+                    for cache_key, entry in entries.items()
+                ]
+            )
+            self._conn.commit()
+            
+            for cache_key, entry in entries.items():
+                self._remember(cache_key, entry["translation"])
+            self.stats['stores'] += len(entries)
+    
+    def discard(self, cache_keys: Iterable[str]) -> int:
+        """
+        Remove translations from both tiers (e.g. ones flagged as anomalies), so they are translated again
+        :param cache_keys: Cache keys from make_key
+        :return: Number of stored translations removed
+        """
+        cache_keys = list(cache_keys)
+        with self._lock:
+            cursor = self._conn.executemany(
+                "DELETE FROM translations WHERE cache_key = ?", [(cache_key,) for cache_key in cache_keys]
+            )
+            self._conn.commit()
+            for cache_key in cache_keys:
+                self._memory.pop(cache_key, None)
+            return cursor.rowcount
+    
+    def record_tokens_saved(self, tokens: int) -> None:
+        """
+        Record tokens that cache hits kept out of API requests
+        :param tokens: Estimated input plus output tokens
+        """
+        with self._lock:
+            self.stats['tokens_saved'] += tokens
+    
+    def _remember(self, cache_key: str, translation: str) -> None:
+        """
+        Insert into the LRU tier, evicting the least recently used entry when full (lock held)
+        :param cache_key: Cache key
+        :param translation: Translation
+        """
+        if self.memory_size == 0:
+            return
+        
+        self._memory[cache_key] = translation
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """
+        Get translation memory statistics
+        :return: Statistics dictionary
+        """
+        with self._lock:
+            total_entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            hits = self.stats['memory_hits'] + self.stats['disk_hits']
+            lookups = hits + self.stats['misses']
+            return {
+                'total_entries': total_entries,
+                'memory_entries': len(self._memory),
+                **self.stats,
+                'hit_rate': hits / lookups if lookups else 0.0
+            }
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,94 @@
+# Test Module: anomaly_detector
+# Purpose: Unit tests for anomaly_detector module
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+import services.translation.anomaly_detector as anomaly_detector
+from services.translation.anomaly_detector import AnomalyDetector, AnomalyKind
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_BOOL
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+GROUP = "model|en->vi"
+SOURCES = ["Where are you going tonight?", "I will be back before the sun goes down.",
+           "Do not worry, everything is fine.", "We have to leave right now."]
+TRANSLATIONS = ["Tối nay cậu định đi đâu vậy?", "Tôi sẽ quay lại trước khi mặt trời lặn.",
+                "Đừng lo, mọi chuyện đều ổn cả.", "Chúng ta phải đi ngay bây giờ."]
+
+def build_batch():
+    """40 well-translated entries plus an echo, a truncated and an untranslated one"""
+    sources = {str(i): SOURCES[i % 4] for i in range(40)}
+    translations = {str(i): TRANSLATIONS[i % 4] for i in range(40)}
+    sources.update({"40": "Is this the right way?", "41": "I will be back before the sun goes down.",
+                    "42": "This line was never translated at all."})
+    translations.update({"40": "Is this the right way?", "41": "Về.",
+                         "42": "This line was never translated at all, sorry."})
+    return sources, translations
+
+##################################### Test `detect` ##################################
+
+'''
+Equivalent class of detect()
+
+Test case    *  backend  *  entries                                       * Expected Result
+             *           *                                                *
+TC001        *  numpy    *  40 normal + echo, truncated, untranslated     *  Success - the three entries flagged
+TC002        *  python   *  same batch                                    *  Success - same anomalies as TC001
+TC003        *  default  *  group smaller than min_group_size             *  Success - only the echo flagged
+'''
+
+# Test Description: Echoes and per-group length and script outliers are flagged with array operations
+# Test Objective: Success
+# Test Case: TC001
+def utest_anomaly_detector_detect():
+    # Test data
+    pytest.importorskip("numpy")
+    sut = AnomalyDetector(min_group_size=20)
+    sources, translations = build_batch()
+    sut.add(GROUP, "chunk_1.json", sources, translations)
+    # Call SUT (act)
+    anomalies = sut.detect()
+    # Check result, assertion
+    CHECK_EQUAL([(anomaly.key, anomaly.kind) for anomaly in anomalies], [
+        ("40", AnomalyKind.ECHO), ("41", AnomalyKind.LENGTH_RATIO), ("42", AnomalyKind.SCRIPT_RATIO)
+    ], "Each bad entry should be flagged once")
+    CHECK_EQUAL(anomalies[0].owner, "chunk_1.json", "Owner should be reported")
+    CHECK_EQUAL(sut.get_detector_stats()["checked_entries"], 43, "Every entry should be checked")
+    CHECK_EQUAL(sut.get_detector_stats()["backend"], "numpy", "Array path should be used")
+
+# Test Description: The pure-Python fallback flags the same entries as the NumPy path
+# Test Objective: Success
+# Test Case: TC002
+def utest_anomaly_detector_detect_python_fallback(monkeypatch):
+    # Test data
+    sources, translations = build_batch()
+    reference = AnomalyDetector(min_group_size=20)
+    reference.add(GROUP, "chunk_1.json", sources, translations)
+    expected = reference.detect()
+    monkeypatch.setattr(anomaly_detector, "np", None)
+    sut = AnomalyDetector(min_group_size=20)
+    sut.add(GROUP, "chunk_1.json", sources, translations)
+    # Call SUT (act)
+    anomalies = sut.detect()
+    # Check result, assertion
+    CHECK_EQUAL(anomalies, expected, "Both backends should agree")
+    CHECK_EQUAL(sut.get_detector_stats()["backend"], "python", "Fallback should be used")
+
+# Test Description: Small groups are not scored statistically, but echoes are still flagged
+# Test Objective: Success
+# Test Case: TC003
+def utest_anomaly_detector_detect_small_group():
+    # Test data
+    sut = AnomalyDetector()
+    sources, translations = build_batch()
+    sut.add(GROUP, "chunk_1.json", sources, translations)
+    sut.add("model|en->ja", "chunk_1.json", {"0": "Good morning everyone"}, {"0": "Good morning everyone"})
+    # Call SUT (act)
+    anomalies = sut.detect()
+    # Check result, assertion
+    CHECK_EQUAL([(anomaly.group, anomaly.key) for anomaly in anomalies],
+                [(GROUP, "40"), (GROUP, "41"), (GROUP, "42"), ("model|en->ja", "0")],
+                "Echo in the small group should still be flagged")
+    CHECK_BOOL(all(anomaly.kind == AnomalyKind.ECHO for anomaly in anomalies[3:]), True, "Only as an echo")
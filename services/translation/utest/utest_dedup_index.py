@@ -0,0 +1,134 @@
+# Test Module: dedup_index
+# Purpose: Unit tests for DedupIndex claim, resolve and fan-out
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from services.common.token_counter import TokenCounter
+from services.translation.dedup_index import DedupIndex
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_INT
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+
+##################################### Test `claim` ##################################
+
+'''
+Equivalent class of claim(job_index, entries)
+
+Test case    *  entries                                 *  claimed before      * Expected Result
+             *                                          *                      *
+TC001        *  unique strings                          *  nothing             *  Success - every entry sent
+TC002        *  same string twice (whitespace differs)  *  nothing             *  Success - first sent, second borrowed
+TC003        *  strings and a non-string value          *  by an earlier job   *  Success - claimed strings borrowed, value sent
+'''
+
+# Test Description: A job claiming unseen strings sends all of them
+# Test Objective: Success
+# Test Case: TC001
+def utest_dedup_index_claim_unique():
+    # Test data
+    sut = DedupIndex()
+    entries = {"0": "Hello", "1": "Goodbye"}
+    # Call SUT (act)
+    send, borrowed = sut.claim(0, entries)
+    # Check result, assertion
+    CHECK_EQUAL(send, entries, "Every unseen string should be sent")
+    CHECK_EQUAL(borrowed, {}, "Nothing should be borrowed")
+    CHECK_INT(sut.stats['unique_strings'], 2, "Both strings should be unique")
+
+# Test Description: A duplicate inside one job is sent once and borrowed by its other occurrence
+# Test Objective: Success
+# Test Case: TC002
+def utest_dedup_index_claim_duplicate_in_job():
+    # Test data
+    sut = DedupIndex()
+    # Call SUT (act)
+    send, borrowed = sut.claim(0, {"0": "Hello  world", "1": "Hello world "})
+    # Check result, assertion
+    CHECK_EQUAL(send, {"0": "Hello  world"}, "First occurrence should be sent")
+    CHECK_EQUAL(borrowed, {"1": "Hello world "}, "Normalized duplicate should be borrowed")
+    CHECK_EQUAL(sut.get_dedup_stats()['duplicate_strings'], 1, "One duplicate should be counted")
+
+# Test Description: Strings claimed by an earlier job are borrowed; non-string values are always sent
+# Test Objective: Success
+# Test Case: TC003
+def utest_dedup_index_claim_other_job():
+    # Test data
+    sut = DedupIndex()
+    sut.claim(1, {"0": "Hello"})
+    # Call SUT (act)
+    send, borrowed = sut.claim(0, {"0": "Hello", "1": "New", "2": 42})
+    # Check result, assertion
+    CHECK_EQUAL(send, {"1": "New", "2": 42}, "Unclaimed string and non-string value should be sent")
+    CHECK_EQUAL(borrowed, {"0": "Hello"}, "String claimed by job 1 should be borrowed")
+    CHECK_EQUAL(sut.get_dedup_stats()['total_strings'], 3, "Non-string values should not be counted")
+
+##################################### Test `fan_out` ##################################
+
+'''
+Equivalent class of fan_out(borrowed)
+
+Test case    *  owner translations resolved     * Expected Result
+             *                                  *
+TC001        *  all                             *  Success - every borrowed entry filled, tokens saved counted
+TC002        *  none                            *  Success - every borrowed entry unresolved, nothing counted
+'''
+
+# Test Description: Resolved translations fill every borrowed duplicate
+# Test Objective: Success
+# Test Case: TC001
+def utest_dedup_index_fan_out_resolved():
+    # Test data
+    sut = DedupIndex(TokenCounter())
+    send, _ = sut.claim(0, {"0": "Hello"})
+    _, borrowed = sut.claim(1, {"3": "Hello", "4": "Hello "})
+    sut.resolve(send, {"0": "Xin chào"})
+    # Call SUT (act)
+    resolved, unresolved = sut.fan_out(borrowed)
+    # Check result, assertion
+    CHECK_EQUAL(resolved, {"3": "Xin chào", "4": "Xin chào"}, "Both duplicates should be filled")
+    CHECK_EQUAL(unresolved, {}, "Nothing should be left")
+    CHECK_INT(sut.stats['fanned_out'], 2, "Two entries should be fanned out")
+    CHECK_EQUAL(sut.stats['tokens_saved'] > 0, True, "Tokens saved should be counted")
+
+# Test Description: Borrowed entries whose owner has not resolved stay unresolved
+# Test Objective: Success
+# Test Case: TC002
+def utest_dedup_index_fan_out_unresolved():
+    # Test data
+    sut = DedupIndex(TokenCounter())
+    sut.claim(0, {"0": "Hello"})
+    _, borrowed = sut.claim(1, {"3": "Hello"})
+    # Call SUT (act)
+    resolved, unresolved = sut.fan_out(borrowed)
+    # Check result, assertion
+    CHECK_EQUAL(resolved, {}, "Nothing should be filled")
+    CHECK_EQUAL(unresolved, borrowed, "Borrowed entry should stay unresolved")
+    CHECK_INT(sut.stats['fanned_out'], 0, "Nothing should be fanned out")
+
+##################################### Test `unresolved` ##################################
+
+'''
+Equivalent class of unresolved(borrowed)
+
+Test case    *  borrowed entries                                   * Expected Result
+             *                                                     *
+TC001        *  one resolved string, one unresolved string twice   *  Success - unresolved string once, nothing counted
+'''
+
+# Test Description: Borrowed strings still without a translation are listed once per unique string
+# Test Objective: Success
+# Test Case: TC001
+def utest_dedup_index_unresolved():
+    # Test data
+    sut = DedupIndex(TokenCounter())
+    send, _ = sut.claim(0, {"0": "Hello", "1": "Goodbye"})
+    _, borrowed = sut.claim(1, {"0": "Hello", "1": "Goodbye", "2": "Goodbye "})
+    sut.resolve(send, {"0": "Xin chào"})
+    # Call SUT (act)
+    unresolved = sut.unresolved(borrowed)
+    # Check result, assertion
+    CHECK_EQUAL(list(unresolved.values()), ["Goodbye "], "Unresolved string should be listed once")
+    CHECK_INT(sut.stats['fanned_out'], 0, "Nothing should be fanned out")
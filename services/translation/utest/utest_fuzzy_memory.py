@@ -0,0 +1,137 @@
+# Test Module: fuzzy_memory
+# Purpose: Unit tests for fuzzy_memory module
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from services.translation.fuzzy_memory import FuzzyTranslationMemory
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_STR, CHECK_INT, CHECK_BOOL
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+CONTEXT = "model-a|v1|vi"
+
+##################################### Test `make_template` ##################################
+
+'''
+Equivalent class of make_template(text)
+
+Test case    *  text                              *  names     * Expected Result
+             *                                    *            *
+TC001        *  "{i}Anna  has 3 apples{/i}"       *  ["Anna"]  *  Success - tags, name and number become slots
+'''
+
+# Test Description: Tags, names and numbers are replaced by slots and whitespace is collapsed
+# Test Objective: Success
+# Test Case: TC001
+def utest_fuzzy_memory_make_template_slots():
+    # Test data
+    sut = FuzzyTranslationMemory(":memory:", names=["Anna"])
+    # Call SUT (act)
+    template, slots = sut.make_template("{i}Anna  has 3 apples{/i}")
+    # Check result, assertion
+    CHECK_STR(template, "⟦T⟧⟦N⟧ has ⟦D⟧ apples⟦T⟧", "Slots should be normalized away")
+    CHECK_EQUAL(slots, ["{i}", "Anna", "3", "{/i}"], "Slot values should be kept in order")
+
+##################################### Test `lookup` ##################################
+
+'''
+Equivalent class of lookup(source, context)
+
+Test case    *  stored line                          *  looked-up line                        * Expected Result
+             *                                       *                                        *
+TC001        *  "{i}Anna has 3 apples{/i}"           *  "{b}Bob has 12 apples{/b}"            *  Success - template match, slots re-substituted
+TC002        *  "Anna has 3 apples" -> "3 quả táo"   *  "Bob has 12 apples"                   *  Success - name dropped in translation, hint only
+TC003        *  "...beach tomorrow with you"         *  "...beach today with you"             *  Success - near match returned as hint
+TC004        *  "...beach tomorrow with you"         *  "Completely unrelated sentence here"  *  Success - None
+TC005        *  "{i}Anna has 3 apples{/i}"           *  same line, other context              *  Success - None
+'''
+
+# Test Description: A line differing only in tags, names and numbers is served with its own slot values
+# Test Objective: Success
+# Test Case: TC001
+def utest_fuzzy_memory_lookup_template_match():
+    # Test data
+    sut = FuzzyTranslationMemory(":memory:", names=["Anna", "Bob"])
+    sut.add_many({"{i}Anna has 3 apples{/i}": "{i}Anna có 3 quả táo{/i}"}, CONTEXT)
+    # Call SUT (act)
+    act = sut.lookup("{b}Bob has 12 apples{/b}", CONTEXT)
+    # Check result, assertion
+    CHECK_STR(act.kind, "template", "Template match should be served from memory")
+    CHECK_STR(act.translation, "{b}Bob có 12 quả táo{/b}", "Slots should be re-substituted")
+
+# Test Description: A template whose slots do not carry over to the translation is only a hint
+# Test Objective: Success
+# Test Case: TC002
+def utest_fuzzy_memory_lookup_template_without_slot_mapping():
+    # Test data
+    sut = FuzzyTranslationMemory(":memory:", names=["Anna", "Bob"])
+    sut.add_many({"Anna has 3 apples": "Cô ấy có 3 quả táo"}, CONTEXT)
+    # Call SUT (act)
+    act = sut.lookup("Bob has 12 apples", CONTEXT)
+    # Check result, assertion
+    CHECK_STR(act.kind, "near", "Unmappable template should only be a hint")
+    CHECK_STR(act.example_translation, "Cô ấy có 3 quả táo", "Hint should carry the cached translation")
+
+# Test Description: A similar line above the threshold is returned as a hint
+# Test Objective: Success
+# Test Case: TC003
+def utest_fuzzy_memory_lookup_near_match():
+    # Test data
+    sut = FuzzyTranslationMemory(":memory:", hint_threshold=0.6)
+    sut.add_many({"I really want to go to the beach tomorrow with you": "Mai đi biển với nhau nhé"}, CONTEXT)
+    # Call SUT (act)
+    act = sut.lookup("I really want to go to the beach today with you", CONTEXT)
+    # Check result, assertion
+    CHECK_STR(act.kind, "near", "Similar line should be a near match")
+    CHECK_BOOL(act.similarity >= 0.6, True, "Similarity should be above the threshold")
+
+# Test Description: An unrelated line has no match
+# Test Objective: Success
+# Test Case: TC004
+def utest_fuzzy_memory_lookup_unrelated():
+    # Test data
+    sut = FuzzyTranslationMemory(":memory:")
+    sut.add_many({"I really want to go to the beach tomorrow with you": "Mai đi biển với nhau nhé"}, CONTEXT)
+    # Call SUT (act)
+    act = sut.lookup("Completely unrelated sentence here", CONTEXT)
+    # Check result, assertion
+    CHECK_EQUAL(act, None, "Unrelated line should not match")
+    CHECK_INT(sut.stats['misses'], 1, "Miss should be counted")
+
+# Test Description: Matches never cross translation contexts
+# Test Objective: Success
+# Test Case: TC005
+def utest_fuzzy_memory_lookup_other_context():
+    # Test data
+    sut = FuzzyTranslationMemory(":memory:", names=["Anna"])
+    sut.add_many({"{i}Anna has 3 apples{/i}": "{i}Anna có 3 quả táo{/i}"}, CONTEXT)
+    # Call SUT (act)
+    act = sut.lookup("{i}Anna has 3 apples{/i}", "model-b|v1|vi")
+    # Check result, assertion
+    CHECK_EQUAL(act, None, "Other model should not reuse translations")
+
+##################################### Test `discard` ##################################
+
+'''
+Equivalent class of discard(sources, context)
+
+Test case    *  discarded source                  *  lookup                       * Expected Result
+             *                                    *                               *
+TC001        *  "{i}Anna has 3 apples{/i}"        *  "{b}Bob has 12 apples{/b}"   *  Success - template and its buckets removed, None
+'''
+
+# Test Description: A discarded template no longer serves matching lines, even as a near match
+# Test Objective: Success
+# Test Case: TC001
+def utest_fuzzy_memory_discard():
+    # Test data
+    sut = FuzzyTranslationMemory(":memory:", names=["Anna", "Bob"])
+    sut.add_many({"{i}Anna has 3 apples{/i}": "{i}Anna has 3 apples{/i}", "Good night": "Chúc ngủ ngon"}, CONTEXT)
+    # Call SUT (act)
+    act = sut.discard(["{i}Anna  has 3 apples{/i}"], CONTEXT)
+    # Check result, assertion
+    CHECK_INT(act, 1, "One template should be removed")
+    CHECK_EQUAL(sut.lookup("{b}Bob has 12 apples{/b}", CONTEXT), None, "Discarded template should not match")
+    CHECK_STR(sut.lookup("Good night", CONTEXT).kind, "template", "Other templates should be kept")
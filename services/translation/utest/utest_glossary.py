@@ -0,0 +1,221 @@
+# Test Module: glossary
+# Purpose: Unit tests for glossary module
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from services.common.token_counter import TokenCounter
+from services.translation.glossary import Glossary, GlossaryTerm, GlossaryIndex
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_INT
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+TERMS = [
+    GlossaryTerm("Dark Lord", "Chúa Tể Bóng Tối"),
+    GlossaryTerm("sword", "kiếm"),
+    GlossaryTerm("Anna", "Anna", "name")
+]
+
+def build_index():
+    """GlossaryIndex over TERMS with two indexed owners"""
+    index = GlossaryIndex(Glossary(TERMS))
+    index.add("job-a", {"0": "The Dark Lord raised his sword.", "1": "A sword, another sword.", "2": "Run!"})
+    index.add("job-b", {"0": "Anna smiled."})
+    return index
+
+##################################### Test `GlossaryIndex.select` ##################################
+
+'''
+Equivalent class of select(refs, token_counter, max_tokens)
+
+Test case    *  refs                           *  max_tokens  * Expected Result
+             *                                 *              *
+TC001        *  keys of two owners             *  None        *  Success - names first, then terms by occurrences
+TC002        *  one key of one owner           *  None        *  Success - only the terms of that key
+TC003        *  keys of two owners             *  one entry   *  Success - first ranked entry kept, others dropped
+TC004        *  keys of a discarded owner      *  None        *  Success - empty, owner's postings removed
+'''
+
+# Test Description: Terms are counted from the postings of the referenced keys and ranked names first
+# Test Objective: Success
+# Test Case: TC001
+def utest_glossary_index_select_ranked():
+    # Test data
+    sut = build_index()
+    refs = [("job-a", "0"), ("job-a", "1"), ("job-a", "2"), ("job-b", "0")]
+    # Call SUT (act)
+    selected = sut.select(refs, TokenCounter(), None)
+    # Check result, assertion
+    CHECK_EQUAL(list(selected), ["Anna", "sword", "Dark Lord"], "Names first, then terms by occurrences")
+    CHECK_INT(sut.stats['injected_terms'], 3, "Every term should be injected")
+
+# Test Description: Only the referenced keys contribute terms, not the rest of the owner's entries
+# Test Objective: Success
+# Test Case: TC002
+def utest_glossary_index_select_keys_only():
+    # Test data
+    sut = build_index()
+    # Call SUT (act)
+    selected = sut.select([("job-a", "1")], TokenCounter(), None)
+    # Check result, assertion
+    CHECK_EQUAL(selected, {"sword": "kiếm"}, "Only the term of key 1 should be selected")
+
+# Test Description: Entries beyond the token cap are dropped and counted
+# Test Objective: Success
+# Test Case: TC003
+def utest_glossary_index_select_token_cap():
+    # Test data
+    sut = build_index()
+    token_counter = TokenCounter()
+    refs = [("job-a", "0"), ("job-a", "1"), ("job-b", "0")]
+    # Call SUT (act)
+    selected = sut.select(refs, token_counter, token_counter.count_text('{"Anna": "Anna"}'))
+    # Check result, assertion
+    CHECK_EQUAL(selected, {"Anna": "Anna"}, "Only the name should fit")
+    CHECK_INT(sut.stats['dropped_terms'], 2, "Both terms should be dropped")
+
+# Test Description: A discarded owner's postings are removed and no longer selected
+# Test Objective: Success
+# Test Case: TC004
+def utest_glossary_index_select_discarded():
+    # Test data
+    sut = build_index()
+    sut.discard("job-a")
+    # Call SUT (act)
+    selected = sut.select([("job-a", "0"), ("job-a", "1")], TokenCounter(), None)
+    # Check result, assertion
+    CHECK_EQUAL(selected, {}, "Discarded owner should select nothing")
+    CHECK_INT(sut.get_index_stats()['terms_in_batch'], 1, "Only the name of job-b should remain")
+
+##################################### Test `Glossary.find_terms` ##################################
+
+'''
+Equivalent class of find_terms(text)
+
+Test case    *  patterns                        *  text                                  * Expected Result
+             *                                  *                                        *
+TC001        *  "Dark Lord" contains "Lord"     *  "The Dark Lord came"                  *  Success - ["Dark Lord"] (longest at the same start)
+TC002        *  "Dark Lord" / "Lord Voldemort"  *  "Dark Lord Voldemort"                 *  Success - ["Dark Lord"] (leftmost wins the overlap)
+TC003        *  "sword"                         *  "swordsman", "broadsword", "sword."   *  Success - only the word-bounded occurrence
+TC004        *  "Dark Lord"                     *  "DARK LORD" (insensitive / sensitive) *  Success - found / not found
+TC005        *  "sword", "Anna"                 *  "sword, Anna, sword"                  *  Success - distinct, in order of first occurrence
+'''
+
+# Test Description: A pattern nested in a longer match at the same start is not reported
+# Test Objective: Success
+# Test Case: TC001
+def utest_glossary_find_terms_nested():
+    # Test data
+    sut = Glossary([GlossaryTerm("Lord", "Chúa"), GlossaryTerm("Dark Lord", "Chúa Tể Bóng Tối")])
+    # Call SUT (act)
+    terms = sut.find_terms("The Dark Lord came")
+    # Check result, assertion
+    CHECK_EQUAL([term.source for term in terms], ["Dark Lord"], "Only the longest match should count")
+
+# Test Description: Of two overlapping matches, the leftmost is kept
+# Test Objective: Success
+# Test Case: TC002
+def utest_glossary_find_terms_overlapping():
+    # Test data
+    sut = Glossary([GlossaryTerm("Lord Voldemort", "Chúa tể Voldemort"), GlossaryTerm("Dark Lord", "Chúa Tể Bóng Tối")])
+    # Call SUT (act)
+    terms = sut.find_terms("Dark Lord Voldemort")
+    # Check result, assertion
+    CHECK_EQUAL([term.source for term in terms], ["Dark Lord"], "The leftmost match should win")
+
+# Test Description: Terms only match on word boundaries
+# Test Objective: Success
+# Test Case: TC003
+def utest_glossary_find_terms_word_boundaries():
+    # Test data
+    sut = Glossary([GlossaryTerm("sword", "kiếm")])
+    # Call SUT (act)
+    inside_words = sut.find_terms("The swordsman lost his broadsword")
+    bounded = sut.find_terms("He drew his sword.")
+    # Check result, assertion
+    CHECK_EQUAL(inside_words, [], "Occurrences inside words should not match")
+    CHECK_EQUAL([term.source for term in bounded], ["sword"], "Punctuation should bound the word")
+
+# Test Description: Matching folds case unless the glossary is case-sensitive
+# Test Objective: Success
+# Test Case: TC004
+def utest_glossary_find_terms_case():
+    # Test data
+    terms = [GlossaryTerm("Dark Lord", "Chúa Tể Bóng Tối")]
+    # Call SUT (act)
+    insensitive = Glossary(terms).find_terms("THE DARK LORD")
+    sensitive = Glossary(terms, case_sensitive=True).find_terms("THE DARK LORD")
+    # Check result, assertion
+    CHECK_INT(len(insensitive), 1, "Case-insensitive glossary should match")
+    CHECK_EQUAL(sensitive, [], "Case-sensitive glossary should not match")
+
+# Test Description: Repeated terms are reported once, in order of first occurrence
+# Test Objective: Success
+# Test Case: TC005
+def utest_glossary_find_terms_order():
+    # Test data
+    sut = Glossary(TERMS)
+    # Call SUT (act)
+    terms = sut.find_terms("sword, Anna, sword")
+    # Check result, assertion
+    CHECK_EQUAL([term.source for term in terms], ["sword", "Anna"], "Distinct terms in order of first occurrence")
+
+##################################### Test `Glossary.check` ##################################
+
+'''
+Equivalent class of check(source, translation, key)
+
+Test case    *  translation                              * Expected Result
+             *                                           *
+TC001        *  required target present                  *  Success - no issue
+TC002        *  neither target nor source form present   *  Success - one "missing" issue
+TC003        *  source form left in the translation      *  Success - one "untranslated" issue
+TC004        *  name whose target equals its source      *  Success - no issue (target present)
+'''
+
+# Test Description: A translation using the required target has no issue
+# Test Objective: Success
+# Test Case: TC001
+def utest_glossary_check_target_present():
+    # Test data
+    sut = Glossary(TERMS)
+    # Call SUT (act)
+    issues = sut.check("The Dark Lord laughed.", "Chúa Tể Bóng Tối cười lớn.", "0")
+    # Check result, assertion
+    CHECK_EQUAL(issues, [], "No issue should be reported")
+
+# Test Description: A translation without the target or source form reports the term as missing
+# Test Objective: Success
+# Test Case: TC002
+def utest_glossary_check_missing():
+    # Test data
+    sut = Glossary(TERMS)
+    # Call SUT (act)
+    issues = sut.check("He drew his sword.", "Anh ta rút gươm ra.", "3")
+    # Check result, assertion
+    CHECK_EQUAL([(issue.key, issue.term.source, issue.kind) for issue in issues], [("3", "sword", "missing")],
+                "The term should be missing")
+
+# Test Description: A translation keeping the source form reports the term as untranslated
+# Test Objective: Success
+# Test Case: TC003
+def utest_glossary_check_untranslated():
+    # Test data
+    sut = Glossary(TERMS)
+    # Call SUT (act)
+    issues = sut.check("The Dark Lord laughed.", "Dark Lord cười lớn.", "1")
+    # Check result, assertion
+    CHECK_EQUAL([(issue.term.source, issue.kind) for issue in issues], [("Dark Lord", "untranslated")],
+                "The source form should be reported as untranslated")
+
+# Test Description: A name translated as itself is present, not untranslated
+# Test Objective: Success
+# Test Case: TC004
+def utest_glossary_check_name_kept():
+    # Test data
+    sut = Glossary(TERMS)
+    # Call SUT (act)
+    issues = sut.check_blocks({"0": "Anna smiled.", "1": 42}, {"0": "Anna mỉm cười.", "1": 42})
+    # Check result, assertion
+    CHECK_EQUAL(issues, [], "Name kept as its target should pass")
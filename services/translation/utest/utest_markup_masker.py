@@ -0,0 +1,147 @@
+# Test Module: markup_masker
+# Purpose: Unit tests for markup_masker module
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from services.translation.markup_masker import MarkupMasker
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_INT
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+SLOTS = {"0": ["{i}", "{/i}", "[name]"]}  # mask() slots of "{i}Hello{/i} [name]"
+
+##################################### Test `mask` / `unmask` round trip ##################################
+
+'''
+Equivalent class of unmask(mask(entries))
+
+Test case    *  source                                      * Expected Result
+             *                                              *
+TC001        *  tags, interpolation and escaped quote       *  Success - numbered placeholders, exact round trip
+TC002        *  nested tags "{color=#f00}{b}x{/b}{/color}"  *  Success - one placeholder per tag, exact round trip
+TC003        *  adjacent tags "{i}{b}" with no text between *  Success - placeholders stay adjacent, exact round trip
+TC004        *  no markup, non-string, existing "⟦0⟧"       *  Success - left unmasked, no slots
+TC005        *  200 round trips from 8 worker threads       *  Success - masking stats exact
+'''
+
+# Test Description: Every kind of markup is replaced by numbered placeholders and restored exactly
+# Test Objective: Success
+# Test Case: TC001
+def utest_markup_masker_round_trip():
+    # Test data
+    sut = MarkupMasker()
+    entries = {"0": 'Hello [name], {i}welcome{/i} to \\"home\\"'}
+    # Call SUT (act)
+    masked, slots = sut.mask(entries)
+    restored, rejected = sut.unmask(masked, slots)
+    # Check result, assertion
+    CHECK_EQUAL(masked["0"], "Hello ⟦0⟧, ⟦1⟧welcome⟦2⟧ to ⟦3⟧home⟦4⟧", "Markup should become placeholders")
+    CHECK_EQUAL(restored, entries, "Round trip should restore the source")
+    CHECK_EQUAL(rejected, [], "Nothing should be rejected")
+
+# Test Description: Nested tags are masked one placeholder per tag
+# Test Objective: Success
+# Test Case: TC002
+def utest_markup_masker_round_trip_nested():
+    # Test data
+    sut = MarkupMasker()
+    entries = {"0": "{color=#f00}{b}Run{/b} now{/color}"}
+    # Call SUT (act)
+    masked, slots = sut.mask(entries)
+    restored, _ = sut.unmask(masked, slots)
+    # Check result, assertion
+    CHECK_EQUAL(masked["0"], "⟦0⟧⟦1⟧Run⟦2⟧ now⟦3⟧", "Each nested tag should get its own placeholder")
+    CHECK_EQUAL(restored, entries, "Round trip should restore the source")
+
+# Test Description: Adjacent tags stay adjacent and in order
+# Test Objective: Success
+# Test Case: TC003
+def utest_markup_masker_round_trip_adjacent():
+    # Test data
+    sut = MarkupMasker()
+    entries = {"0": "{i}{b}Stop{/b}{/i}"}
+    # Call SUT (act)
+    masked, slots = sut.mask(entries)
+    restored, _ = sut.unmask({"0": "⟦0⟧⟦1⟧Dừng lại⟦2⟧⟦3⟧"}, slots)
+    # Check result, assertion
+    CHECK_EQUAL(slots["0"], ["{i}", "{b}", "{/b}", "{/i}"], "Slots should keep tag order")
+    CHECK_EQUAL(restored["0"], "{i}{b}Dừng lại{/b}{/i}", "Adjacent tags should be restored in place")
+
+# Test Description: Entries without markup, non-strings and text with placeholder brackets are not masked
+# Test Objective: Success
+# Test Case: TC004
+def utest_markup_masker_mask_nothing():
+    # Test data
+    sut = MarkupMasker()
+    entries = {"0": "Plain text", "1": 42, "2": "Already ⟦0⟧ {i}here{/i}"}
+    # Call SUT (act)
+    masked, slots = sut.mask(entries)
+    # Check result, assertion
+    CHECK_EQUAL(masked, entries, "Entries should be unchanged")
+    CHECK_EQUAL(slots, {}, "No slots should be recorded")
+    CHECK_INT(sut.stats['masked_entries'], 0, "Nothing should be counted as masked")
+
+# Test Description: Masking stats stay exact when entries are masked from the pipeline's worker threads
+# Test Objective: Success
+# Test Case: TC005
+def utest_markup_masker_round_trip_threads():
+    # Test data
+    sut = MarkupMasker()
+    entries = {"0": "{i}Hello{/i} [name]", "1": "Plain text"}
+    
+    def round_trip(_):
+        masked, slots = sut.mask(entries)
+        return sut.unmask({"0": "⟦0⟧⟦1⟧"}, slots)
+    
+    # Call SUT (act)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(round_trip, range(200)))
+    # Check result, assertion
+    CHECK_EQUAL(sut.get_masking_stats(), {'masked_entries': 200, 'masked_tags': 600, 'rejected_entries': 200},
+                "Every masked entry, tag and rejection should be counted")
+
+##################################### Test `unmask` ##################################
+
+'''
+Equivalent class of unmask(translations, slots) for the masked source "{i}Hello{/i} [name]"
+
+Test case    *  translation placeholders     * Expected Result
+             *                              *
+TC001        *  reordered ⟦2⟧ ⟦0⟧…⟦1⟧       *  Success - accepted, each value restored at its new position
+TC002        *  one dropped                  *  Failure - key rejected
+TC003        *  one duplicated               *  Failure - key rejected
+TC004        *  unknown ⟦3⟧ added            *  Failure - key rejected
+'''
+
+# Test Description: Placeholders may move; each value is restored where its placeholder went
+# Test Objective: Success
+# Test Case: TC001
+def utest_markup_masker_unmask_reordered():
+    # Test data
+    sut = MarkupMasker()
+    # Call SUT (act)
+    restored, rejected = sut.unmask({"0": "⟦2⟧, ⟦0⟧xin chào⟦1⟧"}, SLOTS)
+    # Check result, assertion
+    CHECK_EQUAL(restored, {"0": "[name], {i}xin chào{/i}"}, "Reordered placeholders should be restored")
+    CHECK_EQUAL(rejected, [], "Nothing should be rejected")
+
+# Test Description: A translation that drops, duplicates or invents a placeholder is rejected
+# Test Objective: Failure
+# Test Case: TC002, TC003, TC004
+@pytest.mark.parametrize("translation", [
+    "⟦0⟧xin chào⟦1⟧",
+    "⟦0⟧xin chào⟦1⟧ ⟦2⟧ ⟦2⟧",
+    "⟦0⟧xin chào⟦1⟧ ⟦2⟧ ⟦3⟧"
+])
+def utest_markup_masker_unmask_rejected(translation):
+    # Test data
+    sut = MarkupMasker()
+    # Call SUT (act)
+    restored, rejected = sut.unmask({"0": translation, "1": "Tạm biệt"}, SLOTS)
+    # Check result, assertion
+    CHECK_EQUAL(rejected, ["0"], "Altered placeholder signature should be rejected")
+    CHECK_EQUAL(restored, {"1": "Tạm biệt"}, "Unmasked entries should pass through")
+    CHECK_INT(sut.stats['rejected_entries'], 1, "Rejection should be counted")
@@ -0,0 +1,154 @@
+# Test Module: request_packer
+# Purpose: Unit tests for request_packer module
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from services.translation.request_packer import PackedRequest, RequestPacker
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_INT
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+
+class FakeTokenCounter:
+    """One token per character, so an entry "abcde" costs 5 + ENTRY_OVERHEAD_TOKENS = 9"""
+    
+    def count_text(self, text):
+        return len(text)
+
+def sizes(requests):
+    """Number of entries in each request"""
+    return [len(packed.entries) for packed in requests]
+
+##################################### Test `RequestPacker.add` ##################################
+
+'''
+Equivalent class of add(owner, entries, hints) then flush() under request_token_budget
+
+Test case    *  budget  *  entries (cost)                             * Expected Result
+             *          *                                             *
+TC001        *  None    *  two owners, 2 + 1 entries                  *  Success - one request per owner, emitted at add
+TC002        *  100     *  two owners, 2 + 1 entries (9 each)         *  Success - held back, one shared request at flush
+TC003        *  20      *  one owner, 3 entries (9 each)              *  Success - next-fit: [2, 1], owner spans 2 requests
+TC004        *  10      *  one entry of 23 into an empty request      *  Success - oversize entry alone in its own request
+TC005        *  20      *  9, then 23, then 9                         *  Success - [1], [1 oversize], [1]; no empty request
+TC006        *  20      *  hinted entry                               *  Success - hint cost counted, hint under request key
+'''
+
+# Test Description: Without a budget each owner's entries go out together as soon as they are added
+# Test Objective: Success
+# Test Case: TC001
+def utest_request_packer_add_no_budget():
+    # Test data
+    sut = RequestPacker(FakeTokenCounter())
+    # Call SUT (act)
+    ready_a, parts_a = sut.add("a", {"0": "Hello", "1": "World"})
+    ready_b, parts_b = sut.add("b", {"0": "Again"})
+    # Check result, assertion
+    CHECK_EQUAL((sizes(ready_a), parts_a), ([2], 1), "Owner a should get one request")
+    CHECK_EQUAL((sizes(ready_b), parts_b), ([1], 1), "Owner b should get one request")
+    CHECK_EQUAL(sut.flush(), [], "Nothing should be held back")
+
+# Test Description: Entries of several owners share a request while it stays within the budget
+# Test Objective: Success
+# Test Case: TC002
+def utest_request_packer_add_shared():
+    # Test data
+    sut = RequestPacker(FakeTokenCounter(), 100, "vi")
+    # Call SUT (act)
+    ready_a, _ = sut.add("a", {"0": "Hello", "1": "World"})
+    ready_b, _ = sut.add("b", {"0": "Again"})
+    flushed = sut.flush()
+    # Check result, assertion
+    CHECK_EQUAL(ready_a + ready_b, [], "Requests within the budget should be held back")
+    CHECK_INT(len(flushed), 1, "One shared request should be flushed")
+    packed = flushed[0]
+    CHECK_EQUAL(packed.entries, {"0": "Hello", "1": "World", "2": "Again"}, "Entries renumbered in order")
+    CHECK_EQUAL(packed.origins["2"], ("b", "0"), "Request key should map back to its owner and key")
+    CHECK_INT(packed.tokens, 27, "Request tokens should sum the entry costs")
+    CHECK_EQUAL(packed.target_language, "vi", "Request should carry the packer's language")
+
+# Test Description: An entry that does not fit closes the current request and starts the next one
+# Test Objective: Success
+# Test Case: TC003
+def utest_request_packer_add_next_fit():
+    # Test data
+    sut = RequestPacker(FakeTokenCounter(), 20)
+    # Call SUT (act)
+    ready, parts = sut.add("a", {"0": "Hello", "1": "World", "2": "Again"})
+    flushed = sut.flush()
+    # Check result, assertion
+    CHECK_EQUAL(sizes(ready) + sizes(flushed), [2, 1], "Third entry should start a new request")
+    CHECK_INT(ready[0].tokens, 18, "Full request should stay within the budget")
+    CHECK_INT(parts, 2, "Owner should span two requests")
+
+# Test Description: A single entry larger than the budget is still sent, alone
+# Test Objective: Success
+# Test Case: TC004
+def utest_request_packer_add_oversize_alone():
+    # Test data
+    sut = RequestPacker(FakeTokenCounter(), 10)
+    # Call SUT (act)
+    ready, parts = sut.add("a", {"0": "A much longer line."})
+    flushed = sut.flush()
+    # Check result, assertion
+    CHECK_EQUAL(ready, [], "Oversize entry should not emit an empty request")
+    CHECK_EQUAL(sizes(flushed), [1], "Oversize entry should get a request of its own")
+    CHECK_INT(flushed[0].tokens, 23, "Request tokens may exceed the budget")
+    CHECK_INT(parts, 1, "Owner should span one request")
+
+# Test Description: An oversize entry between small ones closes the request before it and after it
+# Test Objective: Success
+# Test Case: TC005
+def utest_request_packer_add_oversize_between():
+    # Test data
+    sut = RequestPacker(FakeTokenCounter(), 20)
+    # Call SUT (act)
+    ready, parts = sut.add("a", {"0": "Hello", "1": "A much longer line.", "2": "World"})
+    flushed = sut.flush()
+    # Check result, assertion
+    CHECK_EQUAL([list(packed.entries.values()) for packed in ready + flushed],
+                [["Hello"], ["A much longer line."], ["World"]], "Oversize entry should be isolated")
+    CHECK_INT(parts, 3, "Owner should span three requests")
+
+# Test Description: A reference translation adds to the entry cost and travels under the request key
+# Test Objective: Success
+# Test Case: TC006
+def utest_request_packer_add_hint():
+    # Test data
+    sut = RequestPacker(FakeTokenCounter(), 20)
+    hint = {"source": "Hi", "translation": "Chào"}
+    # Call SUT (act)
+    ready, _ = sut.add("a", {"0": "Hello", "1": "Hi"}, {"1": hint})
+    flushed = sut.flush()
+    # Check result, assertion
+    CHECK_EQUAL(sizes(ready) + sizes(flushed), [1, 1], "Hinted entry should not fit next to the first")
+    CHECK_EQUAL(flushed[0].hints, {"0": hint}, "Hint should be keyed by the request key")
+    CHECK_INT(flushed[0].tokens, sut.entry_cost("Hi", hint), "Hint cost should be counted")
+
+##################################### Test `PackedRequest.split_response` ##################################
+
+'''
+Equivalent class of split_response(translations)
+
+Test case    *  request                        *  translations          * Expected Result
+             *                                 *                        *
+TC001        *  owners a (2 keys), b (1 key)   *  request key 1 missing  *  Success - per owner, original keys, missing listed
+'''
+
+# Test Description: A shared response is split back into each owner's original keys
+# Test Objective: Success
+# Test Case: TC001
+def utest_packed_request_split_response():
+    # Test data
+    sut = PackedRequest()
+    sut.add("a", "5", "Hello", None, 9)
+    sut.add("b", "0", "Again", None, 9)
+    sut.add("a", "7", "World", None, 9)
+    # Call SUT (act)
+    split = sut.split_response({"0": "Xin chào", "2": "Thế giới"})
+    # Check result, assertion
+    CHECK_EQUAL(sut.owners(), ["a", "b"], "Owners in first-entry order")
+    CHECK_EQUAL(split, [("a", {"5": "Xin chào", "7": "Thế giới"}, []), ("b", {}, ["0"])],
+                "Translations and missing keys should be split by owner")
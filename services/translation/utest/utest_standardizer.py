@@ -0,0 +1,341 @@
+# Test Module: standardizer
+# Purpose: Unit tests for standardizer module
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import io
+import json
+import os
+import pytest
+import sqlite3
+from services.translation.standardizer import Standardizer, iter_json_object
+from services.translation.standardization_cache import StandardizationCache
+from services.translation.localization_standardizers import POStandardizer, XLIFFStandardizer, CSVStandardizer
+from services.test_support.test_support_assert import CHECK_EQUAL
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+ENTRIES = {"0": "{i}Hello{/i}", "1": "Say \"hi\"\n\\o/", "2": 3, "3": None, "4": {"nested": "}"}}
+
+##################################### Test `iter_json_object` ##################################
+
+'''
+Equivalent class of iter_json_object(stream, chunk_chars)
+
+Test case    *  stream                                 *  chunk_chars  * Expected Result
+             *                                         *               *
+TC001        *  indented object, escapes, non-strings  *  1, 5, 64K    *  Success - same members as json.loads, in order
+TC002        *  object missing a comma                 *  4            *  Failure - ValueError
+'''
+
+# Test Description: Members are decoded exactly, whatever the read size splits them into
+# Test Objective: Success
+# Test Case: TC001
+def utest_standardizer_iter_json_object_chunked():
+    # Test data
+    text = "\ufeff" + json.dumps(ENTRIES, ensure_ascii=False, indent=2)
+    for chunk_chars in (1, 5, 1 << 16):
+        # Call SUT (act)
+        act = list(iter_json_object(io.StringIO(text), chunk_chars))
+        # Check result, assertion
+        CHECK_EQUAL(act, list(ENTRIES.items()), f"Members should match json.loads with {chunk_chars}-char reads")
+
+# Test Description: Malformed JSON is reported instead of being silently truncated
+# Test Objective: Failure
+# Test Case: TC002
+def utest_standardizer_iter_json_object_malformed():
+    # Test data
+    stream = io.StringIO('{"0": "a" "1": "b"}')
+    # Call SUT (act)
+    with pytest.raises(ValueError):
+        list(iter_json_object(stream, 4))
+
+##################################### Test `standardize` ##################################
+
+'''
+Equivalent class of standardize(input_data) with a file path
+
+Test case    *  file content                 * Expected Result
+             *                               *
+TC001        *  JSON object                  *  Success - numeric keys kept, values as strings
+TC002        *  plain text lines             *  Success - non-blank lines numbered from 0
+TC003        *  one line, passed as its path *  Success - the file content, not the path string, is standardized
+'''
+
+# Test Description: A JSON file is sniffed and streamed into the standard format
+# Test Objective: Success
+# Test Case: TC001
+def utest_standardizer_standardize_json_file(tmp_path):
+    # Test data
+    path = tmp_path / "chunk.json"
+    path.write_text(json.dumps({"0": "Hello", "1": 2, "name": "skipped"}), encoding="utf-8")
+    sut = Standardizer()
+    # Call SUT (act)
+    act = sut.standardize(str(path))
+    # Check result, assertion
+    CHECK_EQUAL(act, {"0": "Hello", "1": "2"}, "Numeric keys should be kept as strings")
+
+# Test Description: A text file is numbered line by line
+# Test Objective: Success
+# Test Case: TC002
+def utest_standardizer_standardize_text_file(tmp_path):
+    # Test data
+    path = tmp_path / "chunk.txt"
+    path.write_text("Hello\n\n  Bye  \n", encoding="utf-8")
+    sut = Standardizer()
+    # Call SUT (act)
+    act = sut.standardize(str(path))
+    # Check result, assertion
+    CHECK_EQUAL(act, {"0": "Hello", "1": "Bye"}, "Blank lines should be skipped")
+
+# Test Description: A path string is matched by the file standardizer before the text standardizer
+# Test Objective: Success
+# Test Case: TC003
+def utest_standardizer_standardize_path_not_text(tmp_path):
+    # Test data
+    path = tmp_path / "line.txt"
+    path.write_text("Good night", encoding="utf-8")
+    sut = Standardizer()
+    # Call SUT (act)
+    act = sut.standardize(str(path))
+    # Check result, assertion
+    CHECK_EQUAL(act, {"0": "Good night"}, "The file content should be standardized")
+    CHECK_EQUAL(sut.standardize("Good night"), {"0": "Good night"}, "Text that is not a path is still text")
+
+##################################### Test `standardize` with an in-memory string ##################################
+
+'''
+Equivalent class of standardize(input_data) with a string that is not a path
+
+Test case    *  string                             * Expected Result
+             *                                     *
+TC001        *  JSON object                        *  Success - parsed as JSON
+TC002        *  text lines, first opening with {i} *  Success - sniffed as JSON, standardized as text
+'''
+
+# Test Description: A JSON string is standardized as JSON
+# Test Objective: Success
+# Test Case: TC001
+def utest_standardizer_standardize_json_string():
+    # Test data
+    sut = Standardizer()
+    # Call SUT (act)
+    act = sut.standardize('{"0": "{i}Hello{/i}", "1": 2}')
+    # Check result, assertion
+    CHECK_EQUAL(act, {"0": "{i}Hello{/i}", "1": "2"}, "JSON members should be standardized")
+
+# Test Description: Text opening with a markup tag looks like JSON but falls back to text
+# Test Objective: Success
+# Test Case: TC002
+def utest_standardizer_standardize_tag_prefixed_text():
+    # Test data
+    sut = Standardizer()
+    # Call SUT (act)
+    act = sut.standardize("{i}Hello{/i}\nBye")
+    # Check result, assertion
+    CHECK_EQUAL(act, {"0": "{i}Hello{/i}", "1": "Bye"}, "Lines should be numbered as text")
+
+##################################### Test `standardize` with a cache ##################################
+
+'''
+Equivalent class of standardize(input_data) with a StandardizationCache
+
+Test case    *  file between the two calls       * Expected Result
+             *                                   *
+TC001        *  unchanged, then only touched     *  Success - stat hit, then content-hash hit
+TC002        *  rewritten with new content       *  Success - stale entry replaced by the new entries
+TC003        *  CSV file, then a .txt copy       *  Success - copy standardized as text, not served the CSV entries
+TC004        *  CSV columns reconfigured         *  Success - re-standardized with the new columns
+TC005        *  cache written without signatures *  Success - old entries dropped, file re-standardized
+'''
+
+# Test Description: An unchanged or merely touched file is loaded from the cache
+# Test Objective: Success
+# Test Case: TC001
+def utest_standardizer_standardize_cache_hit(tmp_path):
+    # Test data
+    path = tmp_path / "chunk.json"
+    path.write_text('{"0": "Hello"}', encoding="utf-8")
+    cache = StandardizationCache(str(tmp_path / "cache.db"))
+    sut = Standardizer(cache=cache)
+    sut.standardize(str(path))
+    # Call SUT (act)
+    first = sut.standardize(str(path))
+    os.utime(path, ns=(0, 0))
+    second = sut.standardize(str(path))
+    # Check result, assertion
+    CHECK_EQUAL(first, {"0": "Hello"}, "Cached entries should match")
+    CHECK_EQUAL(second, {"0": "Hello"}, "Touched file should match by content hash")
+    stats = cache.get_cache_stats()
+    CHECK_EQUAL((stats['misses'], stats['stat_hits'], stats['hash_hits']), (1, 1, 1), "One miss, one hit of each kind")
+
+# Test Description: A modified file is re-standardized instead of served stale
+# Test Objective: Success
+# Test Case: TC002
+def utest_standardizer_standardize_cache_invalidated(tmp_path):
+    # Test data
+    path = tmp_path / "chunk.json"
+    path.write_text('{"0": "Hello"}', encoding="utf-8")
+    cache = StandardizationCache(str(tmp_path / "cache.db"))
+    sut = Standardizer(cache=cache)
+    sut.standardize(str(path))
+    path.write_text('{"0": "Bye"}', encoding="utf-8")
+    os.utime(path, ns=(0, 0))
+    # Call SUT (act)
+    act = sut.standardize(str(path))
+    # Check result, assertion
+    CHECK_EQUAL(act, {"0": "Bye"}, "Changed content should be re-standardized")
+    CHECK_EQUAL(cache.get_cache_stats()['total_files'], 1, "Stale entry should be replaced")
+
+def build_csv_standardizer(tmp_path, cache, source_column="source"):
+    """Standardizer with a CSV standardizer in front of the file standardizer, as CoreManager registers it"""
+    sut = Standardizer(cache=cache)
+    sut.add_standardizer(CSVStandardizer(str(tmp_path / "maps"), source_column=source_column), position=0)
+    return sut
+
+# Test Description: An identical copy with another suffix is not served the entries of another standardizer
+# Test Objective: Success
+# Test Case: TC003
+def utest_standardizer_standardize_cache_other_format(tmp_path):
+    # Test data
+    content = "key,source\nk1,Hello there\nk2,Bye now\n"
+    (tmp_path / "a.csv").write_text(content, encoding="utf-8")
+    (tmp_path / "a.txt").write_text(content, encoding="utf-8")
+    cache = StandardizationCache(str(tmp_path / "cache.db"))
+    sut = build_csv_standardizer(tmp_path, cache)
+    # Call SUT (act)
+    csv_entries = sut.standardize(str(tmp_path / "a.csv"))
+    text_entries = sut.standardize(str(tmp_path / "a.txt"))
+    # Check result, assertion
+    CHECK_EQUAL(csv_entries, {"0": "Hello there", "1": "Bye now"}, "CSV rows should be standardized")
+    CHECK_EQUAL(text_entries, {"0": "key,source", "1": "k1,Hello there", "2": "k2,Bye now"},
+                "Copy should be standardized as text")
+    CHECK_EQUAL(cache.get_cache_stats()['hash_hits'], 0, "Content hash should not match across formats")
+
+# Test Description: Changing the CSV source column invalidates the cached entries of an unchanged file
+# Test Objective: Success
+# Test Case: TC004
+def utest_standardizer_standardize_cache_csv_columns(tmp_path):
+    # Test data
+    path = tmp_path / "a.csv"
+    path.write_text("key,source,note\nk1,Hello there,Greeting\n", encoding="utf-8")
+    cache = StandardizationCache(str(tmp_path / "cache.db"))
+    build_csv_standardizer(tmp_path, cache).standardize(str(path))
+    sut = build_csv_standardizer(tmp_path, cache, source_column="note")
+    # Call SUT (act)
+    act = sut.standardize(str(path))
+    # Check result, assertion
+    CHECK_EQUAL(act, {"0": "Greeting"}, "New source column should be standardized")
+    CHECK_EQUAL(cache.get_cache_stats()['stat_hits'], 0, "Entries of the old columns should not be reused")
+
+# Test Description: A cache database from before signatures were recorded is rebuilt
+# Test Objective: Success
+# Test Case: TC005
+def utest_standardizer_standardize_cache_old_schema(tmp_path):
+    # Test data
+    path = tmp_path / "chunk.json"
+    path.write_text('{"0": "Hello"}', encoding="utf-8")
+    conn = sqlite3.connect(str(tmp_path / "cache.db"))
+    conn.execute("CREATE TABLE standardized_files (path TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                 "mtime_ns INTEGER NOT NULL, content_hash TEXT NOT NULL, entries BLOB NOT NULL, stored_at REAL)")
+    conn.commit()
+    conn.close()
+    cache = StandardizationCache(str(tmp_path / "cache.db"))
+    sut = Standardizer(cache=cache)
+    # Call SUT (act)
+    act = sut.standardize(str(path))
+    # Check result, assertion
+    CHECK_EQUAL(act, {"0": "Hello"}, "File should be standardized")
+    CHECK_EQUAL(cache.get_cache_stats()['stores'], 1, "Entries should be stored in the new table")
+
+##################################### Test localization standardizers ##################################
+
+'''
+Equivalent class of standardize(path) followed by write_back(path, translations, output_path)
+
+Test case    *  standardizer  *  file                                             * Expected Result
+             *                *                                                   *
+TC001        *  PO            *  header, multi-line msgid, plural, obsolete entry *  Success - msgstr lines rewritten, rest copied
+TC002        *  XLIFF         *  target present, missing, empty, inline markup    *  Success - targets filled in place
+TC003        *  CSV           *  no target column, quoted multi-line field        *  Success - target column appended
+'''
+
+PO_TEXT = '''msgid ""
+msgstr ""
+"Language: vi\\n"
+
+#: a.c:1
+msgctxt "menu"
+msgid ""
+"Open "
+"\\"file\\""
+msgstr "old"
+
+msgid "One apple"
+msgid_plural "%d apples"
+msgstr[0] ""
+msgstr[1] ""
+
+#~ msgid "Gone"
+#~ msgstr ""
+'''
+
+XLIFF_TEXT = '''<xliff version="1.2"><file><body>
+<trans-unit id="a"><source>Fish &amp; chips</source><target state="new">old</target></trans-unit>
+<trans-unit id="b"><source>Click <g id="1">here</g></source></trans-unit>
+<trans-unit id="c"><source>Empty</source><target/><alt-trans><source>Alt</source></alt-trans></trans-unit>
+</body></file></xliff>'''
+
+# Test Description: PO units are numbered in file order and written back into msgstr only
+# Test Objective: Success
+# Test Case: TC001
+def utest_standardizer_po_write_back(tmp_path):
+    # Test data
+    path = tmp_path / "game.po"
+    path.write_text(PO_TEXT, encoding="utf-8")
+    sut = POStandardizer(str(tmp_path / "maps"))
+    # Call SUT (act)
+    entries = sut.standardize(str(path))
+    sut.write_back(str(path), {"0": "Mở \"tệp\"", "1": "Một quả táo"}, str(tmp_path / "out.po"))
+    # Check result, assertion
+    CHECK_EQUAL(entries, {"0": "Open \"file\"", "1": "One apple", "2": "%d apples"}, "Header and obsolete entries skipped")
+    expected = PO_TEXT.replace('msgstr "old"', 'msgstr "Mở \\"tệp\\""').replace('msgstr[0] ""', 'msgstr[0] "Một quả táo"')
+    CHECK_EQUAL((tmp_path / "out.po").read_text(encoding="utf-8"), expected, "Only translated msgstr lines change")
+
+# Test Description: XLIFF targets are replaced, inserted or reopened; alt-trans is ignored
+# Test Objective: Success
+# Test Case: TC002
+def utest_standardizer_xliff_write_back(tmp_path):
+    # Test data
+    path = tmp_path / "game.xlf"
+    path.write_text(XLIFF_TEXT, encoding="utf-8")
+    sut = XLIFFStandardizer(str(tmp_path / "maps"), read_chunk_bytes=7)
+    # Call SUT (act)
+    entries = sut.standardize(str(path))
+    sut.write_back(str(path), {"0": "Cá & khoai", "1": "Bấm <g id=\"1\">đây</g>", "2": "Trống"},
+                   str(tmp_path / "out.xlf"))
+    # Check result, assertion
+    CHECK_EQUAL(entries, {"0": "Fish & chips", "1": "Click <g id=\"1\">here</g>", "2": "Empty"},
+                "Plain sources are unescaped, inline markup kept")
+    expected = (XLIFF_TEXT.replace('<target state="new">old</target>', '<target state="new">Cá &amp; khoai</target>')
+                .replace('</g></source>', '</g></source><target>Bấm <g id="1">đây</g></target>')
+                .replace('<target/>', '<target>Trống</target>'))
+    CHECK_EQUAL((tmp_path / "out.xlf").read_text(encoding="utf-8"), expected, "Targets should be written in place")
+
+# Test Description: A CSV export without a target column gets one, quoting preserved
+# Test Objective: Success
+# Test Case: TC003
+def utest_standardizer_csv_write_back(tmp_path):
+    # Test data
+    path = tmp_path / "game.csv"
+    path.write_bytes(b'key,source\r\nk1,"Hi, ""you"""\r\nk2,"Two\r\nlines"\r\n')
+    sut = CSVStandardizer(str(tmp_path / "maps"))
+    # Call SUT (act)
+    entries = sut.standardize(str(path))
+    sut.write_back(str(path), {"0": "Chào", "1": "Hai\r\ndòng"}, str(tmp_path / "out.csv"))
+    # Check result, assertion
+    CHECK_EQUAL(entries, {"0": "Hi, \"you\"", "1": "Two\r\nlines"}, "Rows should be numbered in order")
+    CHECK_EQUAL((tmp_path / "out.csv").read_bytes(),
+                'key,source,target\r\nk1,"Hi, ""you""",Chào\r\nk2,"Two\r\nlines","Hai\r\ndòng"\r\n'.encode('utf-8'),
+                "Target column should be appended")
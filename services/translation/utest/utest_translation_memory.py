@@ -0,0 +1,210 @@
+# Test Module: translation_memory
+# Purpose: Unit tests for translation_memory module
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from services.translation.translation_memory import TranslationMemory
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_STR, CHECK_INT, CHECK_BOOL
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+
+def _entry(source, translation):
+    return {
+        "source": source,
+        "translation": translation,
+        "model": "model-a",
+        "prompt_version": "v1",
+        "target_language": "vi"
+    }
+
+##################################### Test `make_key` ##################################
+
+'''
+Equivalent class of make_key(source, model, prompt_version, target_language)
+
+Test case    *  source pair                      *  other fields       * Expected Result
+             *                                   *                     *
+TC001        *  "Hello  world" / "Hello world "  *  identical          *  Success - same key (whitespace normalized)
+TC002        *  "Hello" / "Hello"                *  different model    *  Success - different keys
+'''
+
+# Test Description: Whitespace differences map to the same key
+# Test Objective: Success
+# Test Case: TC001
+def utest_translation_memory_make_key_normalized_whitespace():
+    # Test data
+    source_a = "Hello  world"
+    source_b = "Hello world "
+    # Call SUT (act)
+    key_a = TranslationMemory.make_key(source_a, "model-a", "v1", "vi")
+    key_b = TranslationMemory.make_key(source_b, "model-a", "v1", "vi")
+    # Check result, assertion
+    CHECK_STR(key_a, key_b, "Normalized sources should share a key")
+
+# Test Description: A different model yields a different key
+# Test Objective: Success
+# Test Case: TC002
+def utest_translation_memory_make_key_model_changes_key():
+    # Call SUT (act)
+    key_a = TranslationMemory.make_key("Hello", "model-a", "v1", "vi")
+    key_b = TranslationMemory.make_key("Hello", "model-b", "v1", "vi")
+    # Check result, assertion
+    CHECK_BOOL(key_a == key_b, False, "Model should be part of the key")
+
+##################################### Test `get` ##################################
+
+'''
+Equivalent class of get(cache_key)
+
+Test case    *  memory state                  *  memory_size  * Expected Result
+             *                                *               *
+TC001        *  empty                         *  10           *  Success - None, counted as miss
+TC002        *  stored in this instance       *  10           *  Success - memory hit
+TC003        *  stored, database reopened     *  10           *  Success - disk hit, then memory hit
+TC004        *  3 stored                      *  2            *  Success - oldest evicted from memory, served from disk
+'''
+
+# Test Description: Unknown key is a miss
+# Test Objective: Success
+# Test Case: TC001
+def utest_translation_memory_get_miss(tmp_path):
+    # Test data
+    sut = TranslationMemory(str(tmp_path / "tm.db"), memory_size=10)
+    # Call SUT (act)
+    act = sut.get("missing")
+    # Check result, assertion
+    CHECK_EQUAL(act, None, "Unknown key should return None")
+    CHECK_INT(sut.stats['misses'], 1, "Miss should be counted")
+
+# Test Description: Stored translation is served from the memory tier
+# Test Objective: Success
+# Test Case: TC002
+def utest_translation_memory_get_memory_hit(tmp_path):
+    # Test data
+    sut = TranslationMemory(str(tmp_path / "tm.db"), memory_size=10)
+    sut.put_many({"k1": _entry("Hello", "Xin chào")})
+    # Call SUT (act)
+    act = sut.get("k1")
+    # Check result, assertion
+    CHECK_STR(act, "Xin chào", "Stored translation should be returned")
+    CHECK_INT(sut.stats['memory_hits'], 1, "Hit should come from memory")
+
+# Test Description: Translations persist across instances through the SQLite tier
+# Test Objective: Success
+# Test Case: TC003
+def utest_translation_memory_get_disk_hit_after_reopen(tmp_path):
+    # Test data
+    db_path = str(tmp_path / "tm.db")
+    memory = TranslationMemory(db_path)
+    memory.put_many({"k1": _entry("Hello", "Xin chào")})
+    memory.close()
+    sut = TranslationMemory(db_path)
+    # Call SUT (act)
+    first = sut.get("k1")
+    second = sut.get("k1")
+    # Check result, assertion
+    CHECK_STR(first, "Xin chào", "Translation should survive a restart")
+    CHECK_STR(second, "Xin chào", "Promoted translation should be returned")
+    CHECK_INT(sut.stats['disk_hits'], 1, "First lookup should hit disk")
+    CHECK_INT(sut.stats['memory_hits'], 1, "Second lookup should hit memory")
+
+# Test Description: LRU tier evicts the least recently used entry
+# Test Objective: Success
+# Test Case: TC004
+def utest_translation_memory_get_lru_eviction(tmp_path):
+    # Test data
+    sut = TranslationMemory(str(tmp_path / "tm.db"), memory_size=2)
+    sut.put_many({"k1": _entry("a", "A")})
+    sut.put_many({"k2": _entry("b", "B")})
+    sut.put_many({"k3": _entry("c", "C")})
+    # Call SUT (act)
+    act = sut.get("k1")
+    # Check result, assertion
+    CHECK_STR(act, "A", "Evicted entry should still be served from disk")
+    CHECK_INT(sut.stats['disk_hits'], 1, "Evicted entry should be a disk hit")
+    CHECK_INT(len(sut._memory), 2, "Memory tier should stay within memory_size")
+
+##################################### Test `peek` ##################################
+
+'''
+Equivalent class of peek(cache_key)
+
+Test case    *  memory state                          * Expected Result
+             *                                        *
+TC001        *  "k1" in memory, "k2" on disk only     *  Success - both found, no stats, LRU order and tier unchanged
+'''
+
+# Test Description: Peeking finds translations in either tier without counting or reordering them
+# Test Objective: Success
+# Test Case: TC001
+def utest_translation_memory_peek_no_side_effects(tmp_path):
+    # Test data
+    sut = TranslationMemory(str(tmp_path / "tm.db"), memory_size=1)
+    sut.put_many({"k2": _entry("b", "B")})
+    sut.put_many({"k1": _entry("a", "A")})
+    stats = dict(sut.stats)
+    # Call SUT (act)
+    memory_hit = sut.peek("k1")
+    disk_hit = sut.peek("k2")
+    miss = sut.peek("missing")
+    # Check result, assertion
+    CHECK_STR(memory_hit, "A", "Memory tier entry should be found")
+    CHECK_STR(disk_hit, "B", "Disk tier entry should be found")
+    CHECK_EQUAL(miss, None, "Unknown key should return None")
+    CHECK_EQUAL(sut.stats, stats, "Statistics should not change")
+    CHECK_EQUAL(list(sut._memory), ["k1"], "Disk hit should not be promoted")
+
+##################################### Test `discard` ##################################
+
+'''
+Equivalent class of discard(cache_keys)
+
+Test case    *  keys                                  * Expected Result
+             *                                        *
+TC001        *  one in both tiers, one unknown         *  Success - removed from both tiers, 1 counted
+'''
+
+# Test Description: A discarded translation is gone from both tiers and misses afterwards
+# Test Objective: Success
+# Test Case: TC001
+def utest_translation_memory_discard(tmp_path):
+    # Test data
+    sut = TranslationMemory(str(tmp_path / "tm.db"))
+    sut.put_many({"k1": _entry("Hello", "Hello"), "k2": _entry("Bye", "Tạm biệt")})
+    # Call SUT (act)
+    act = sut.discard(["k1", "missing"])
+    # Check result, assertion
+    CHECK_INT(act, 1, "Only the stored translation should be counted")
+    CHECK_EQUAL(sut.get("k1"), None, "Discarded translation should miss")
+    CHECK_STR(sut.get("k2"), "Tạm biệt", "Other translations should be kept")
+    CHECK_INT(sut.get_memory_stats()['total_entries'], 1, "Disk tier should drop the row")
+
+##################################### Test `get_memory_stats` ##################################
+
+'''
+Equivalent class of get_memory_stats()
+
+Test case    *  lookups                    * Expected Result
+             *                             *
+TC001        *  1 hit, 1 miss, 12 saved    *  Success - hit_rate 0.5, tokens_saved 12
+'''
+
+# Test Description: Statistics report hit rate and tokens saved
+# Test Objective: Success
+# Test Case: TC001
+def utest_translation_memory_get_memory_stats_hit_rate(tmp_path):
+    # Test data
+    sut = TranslationMemory(str(tmp_path / "tm.db"))
+    sut.put_many({"k1": _entry("Hello", "Xin chào")})
+    sut.get("k1")
+    sut.get("k2")
+    sut.record_tokens_saved(12)
+    # Call SUT (act)
+    act = sut.get_memory_stats()
+    # Check result, assertion
+    CHECK_INT(act['total_entries'], 1, "Should count stored entries")
+    CHECK_EQUAL(act['hit_rate'], 0.5, "Hit rate should be hits over lookups")
+    CHECK_INT(act['tokens_saved'], 12, "Tokens saved should be reported")
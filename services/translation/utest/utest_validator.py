@@ -0,0 +1,215 @@
+# Test Module: validator
+# Purpose: Unit tests for validator module
+# Author: datdang
+# Created: 2026-10-18
+# Framework: pytest
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from services.translation.validator import Validator, JSONValidationStrategy, IssueKind
+from services.translation.payload_encoding import PayloadEncoding
+from services.test_support.test_support_assert import CHECK_EQUAL, CHECK_BOOL
+
+##################################### Global datas ####################################################
+PYTEST_DEFAULT_VALUE = 0xAA
+EXPECTED = {"0": "{i}Hello{/i}", "1": "\\\"Bye\\\"", "2": "See you"}
+
+##################################### Test `salvage` ##################################
+
+'''
+Equivalent class of salvage(response, expected, encoding)
+
+Test case    *  encoding  *  response                                  * Expected Result
+             *            *                                            *
+TC001        *  json      *  all keys, one empty translation           *  Success - empty key reported invalid
+TC002        *  lines     *  fenced lines, tab and space separators    *  Success - all keys valid
+TC003        *  lines     *  model answered in JSON, one key missing   *  Success - JSON fallback, missing key invalid
+TC004        *  lines     *  no numbered line                          *  Failure - every key invalid
+'''
+
+# Test Description: Valid entries are kept and empty translations of non-empty lines are reported
+# Test Objective: Success
+# Test Case: TC001
+def utest_validator_salvage_json():
+    # Test data
+    sut = Validator()
+    response = '{"0": "{i}Xin chào{/i}", "1": "", "2": "Hẹn gặp lại"}'
+    # Call SUT (act)
+    valid, invalid = sut.salvage(response, EXPECTED)
+    # Check result, assertion
+    CHECK_EQUAL(valid, {"0": "{i}Xin chào{/i}", "2": "Hẹn gặp lại"}, "Valid entries should be kept")
+    CHECK_EQUAL(invalid, ["1"], "Empty translation should be invalid")
+
+# Test Description: A line-numbered response is parsed without JSON escaping
+# Test Objective: Success
+# Test Case: TC002
+def utest_validator_salvage_lines():
+    # Test data
+    sut = Validator()
+    response = "```\n0\t{i}Xin chào{/i}\n1\t\\\"Tạm biệt\\\"\n2  Hẹn gặp lại\n```"
+    # Call SUT (act)
+    valid, invalid = sut.salvage(response, EXPECTED, PayloadEncoding.LINES)
+    # Check result, assertion
+    CHECK_EQUAL(valid, {"0": "{i}Xin chào{/i}", "1": "\\\"Tạm biệt\\\"", "2": "Hẹn gặp lại"},
+                "Every line should be parsed verbatim")
+    CHECK_EQUAL(invalid, [], "No key should be invalid")
+
+# Test Description: A JSON answer to a line-numbered request is still accepted
+# Test Objective: Success
+# Test Case: TC003
+def utest_validator_salvage_lines_json_fallback():
+    # Test data
+    sut = Validator()
+    response = '{"0": "{i}Xin chào{/i}", "2": "Hẹn gặp lại"}'
+    # Call SUT (act)
+    valid, invalid = sut.salvage(response, EXPECTED, PayloadEncoding.LINES)
+    # Check result, assertion
+    CHECK_EQUAL(sorted(valid), ["0", "2"], "JSON entries should be kept")
+    CHECK_EQUAL(invalid, ["1"], "Missing key should be invalid")
+
+# Test Description: A response without any numbered line rejects every key
+# Test Objective: Failure
+# Test Case: TC004
+def utest_validator_salvage_lines_unparseable():
+    # Test data
+    sut = Validator()
+    # Call SUT (act)
+    valid, invalid = sut.salvage("Sorry, I cannot help with that.", EXPECTED, PayloadEncoding.LINES)
+    # Check result, assertion
+    CHECK_BOOL(valid == {}, True, "Nothing should be kept")
+    CHECK_EQUAL(invalid, list(EXPECTED), "Every key should be invalid")
+
+##################################### Test `validate` (JSON repair) ##################################
+
+'''
+Equivalent class of JSONValidationStrategy.validate(response) with repair
+
+Test case    *  response                                          * Expected Result
+             *                                                    *
+TC005        *  fenced, trailing comma, smart quotes, raw newline *  Success - repaired, repairs counted
+TC006        *  truncated inside the last value                  *  Success - complete members kept, rest re-requested
+TC007        *  malformed, repair disabled                        *  Failure - every key invalid
+TC010        *  malformed outer object with a nested object     *  Success - outer object repaired, not the nested one
+'''
+
+# Test Description: Common model defects are repaired in one pass instead of rejecting the response
+# Test Objective: Success
+# Test Case: TC005
+def utest_validator_validate_repairs_json():
+    # Test data
+    sut = Validator()
+    response = '```json\n{“0”: “{i}Xin chào{/i}”, "1": "Dòng một\nDòng hai", "2": "Anh nói "không" đâu",}\n```'
+    # Call SUT (act)
+    is_valid, error_msg, parsed_data = sut.validate(response)
+    stats = sut.get_validation_stats()
+    # Check result, assertion
+    CHECK_BOOL(is_valid, True, "Repaired response should be valid")
+    CHECK_EQUAL(parsed_data, {"0": "{i}Xin chào{/i}", "1": "Dòng một\nDòng hai", "2": "Anh nói \"không\" đâu"},
+                "Every member should be recovered")
+    CHECK_EQUAL(stats["repaired_responses"], 1, "Response should be counted as repaired")
+    CHECK_EQUAL(sorted(stats["repairs"]),
+                ["control_characters", "extracted", "inner_quotes", "smart_quotes", "trailing_commas"],
+                "Each repair kind should be counted")
+
+# Test Description: A truncated response keeps its complete members and only the cut one is re-requested
+# Test Objective: Success
+# Test Case: TC006
+def utest_validator_salvage_truncated_json():
+    # Test data
+    sut = Validator()
+    response = '{"0": "{i}Xin chào{/i}", "1": "\\"Tạm biệt\\"", "2": "Hẹn gặp'
+    # Call SUT (act)
+    valid, invalid = sut.salvage(response, EXPECTED)
+    # Check result, assertion
+    CHECK_EQUAL(valid, {"0": "{i}Xin chào{/i}", "1": "\"Tạm biệt\""}, "Complete members should be kept")
+    CHECK_EQUAL(invalid, ["2"], "Only the truncated member should be invalid")
+
+# Test Description: Without repair a malformed response is rejected as before
+# Test Objective: Failure
+# Test Case: TC007
+def utest_validator_validate_repair_disabled():
+    # Test data
+    sut = Validator(JSONValidationStrategy(repair=False))
+    # Call SUT (act)
+    valid, invalid = sut.salvage('{"0": "Xin chào", "1": "Tạm biệt", "2": "Hẹn gặp lại",}', EXPECTED)
+    # Check result, assertion
+    CHECK_BOOL(valid == {}, True, "Nothing should be kept")
+    CHECK_EQUAL(invalid, list(EXPECTED), "Every key should be invalid")
+
+# Test Description: The outermost object is repaired before a well-formed nested object is considered
+# Test Objective: Success
+# Test Case: TC010
+def utest_validator_validate_repairs_outer_object():
+    # Test data
+    sut = Validator()
+    # Call SUT (act)
+    is_valid, error_msg, parsed_data = sut.validate('{"0": "a", "1": {"x": "y"}, "2": "b",}')
+    # Check result, assertion
+    CHECK_BOOL(is_valid, True, "Repaired response should be valid")
+    CHECK_EQUAL(parsed_data, {"0": "a", "1": {"x": "y"}, "2": "b"}, "Outer object should be parsed")
+    CHECK_EQUAL(sut.get_validation_stats()["repairs"], {"trailing_commas": 1}, "Only the trailing comma repaired")
+
+##################################### Test `diagnose` ##################################
+
+'''
+Equivalent class of diagnose(expected, translations) / diagnose_response(response, expected, encoding)
+
+Test case    *  translations                                                   * Expected Result
+             *                                                                 *
+TC008        *  one key per issue kind (missing, empty, identical, tags,       *  Success - one issue per key, in key order
+             *  length ratio) plus an unexpected key                           *
+TC009        *  identical and lost-tag translations in a response              *  Success - only the tag mismatch is re-requested
+TC011        *  200 responses diagnosed from 8 worker threads                  *  Success - no issue or response count lost
+'''
+
+# Test Description: Every issue kind is reported for its key in one pass
+# Test Objective: Success
+# Test Case: TC008
+def utest_validator_diagnose_issue_kinds():
+    # Test data
+    sut = Validator()
+    expected = {
+        "0": "Hello there", "1": "See you tomorrow", "2": "Dark Lord", "3": "{i}Run!{/i} [name]",
+        "4": "I will be back before the sun goes down.", "5": "Fine", "6": "42"
+    }
+    translations = {
+        "1": "  ", "2": "Dark Lord", "3": "{i}Chạy!{/i}", "4": "Về.", "5": "Được thôi", "6": "42", "7": "Thêm"
+    }
+    # Call SUT (act)
+    issues = sut.diagnose(expected, translations)
+    # Check result, assertion
+    CHECK_EQUAL([(issue.key, issue.kind) for issue in issues], [
+        ("0", IssueKind.MISSING), ("1", IssueKind.EMPTY), ("2", IssueKind.IDENTICAL),
+        ("3", IssueKind.TAG_MISMATCH), ("4", IssueKind.LENGTH_RATIO), ("7", IssueKind.UNEXPECTED)
+    ], "Each key should get its issue")
+    CHECK_EQUAL(issues[3].detail, "lost: [name]; added: ", "Lost markup should be named")
+    CHECK_EQUAL(sut.get_validation_stats()["issues"][IssueKind.MISSING], 1, "Issues should be counted per kind")
+
+# Test Description: Only blocking issues make a key invalid
+# Test Objective: Success
+# Test Case: TC009
+def utest_validator_diagnose_response_blocking():
+    # Test data
+    sut = Validator()
+    response = '{"0": "{i}Xin chào", "1": "\\\\\\"Bye\\\\\\"", "2": "Hẹn gặp lại"}'
+    # Call SUT (act)
+    valid, invalid, issues = sut.diagnose_response(response, EXPECTED)
+    # Check result, assertion
+    CHECK_EQUAL(valid, {"1": "\\\"Bye\\\"", "2": "Hẹn gặp lại"}, "Identical translation should be kept")
+    CHECK_EQUAL(invalid, ["0"], "Lost tag should be re-requested")
+    CHECK_EQUAL([issue.kind for issue in issues], [IssueKind.TAG_MISMATCH, IssueKind.IDENTICAL], "Both issues reported")
+
+# Test Description: Counters stay exact when responses are diagnosed from the pipeline's worker threads
+# Test Objective: Success
+# Test Case: TC011
+def utest_validator_diagnose_response_threads():
+    # Test data
+    sut = Validator()
+    response = '{"0": "{i}Xin chào", "1": "\\\\\\"Bye\\\\\\"", "2": "Hẹn gặp lại"}'
+    # Call SUT (act)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: sut.diagnose_response(response, EXPECTED), range(200)))
+    stats = sut.get_validation_stats()
+    # Check result, assertion
+    CHECK_EQUAL(stats["responses"], 200, "Every response should be counted")
+    CHECK_EQUAL(stats["issues"], {IssueKind.TAG_MISMATCH: 200, IssueKind.IDENTICAL: 200}, "Every issue should be counted")
@@ -5,10 +5,39 @@ Handles validation of AI responses using strategy pattern
 
 import json
 import re
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Tuple, Optional
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, List, Tuple, Optional
 from services.common.logger import get_logger
 from services.common.error_codes import ERR_VALIDATION_FAILED
+from services.translation.payload_encoding import PayloadEncoding, decode_lines
+from services.translation.json_repair import RepairKind, parse_json_object
+
+# Markup whose multiset must survive translation: placeholders (⟦0⟧), text tags ({i}) and interpolations ([name])
+_TAG_PATTERN = re.compile(r'⟦\d+⟧|\{[^{}]*\}|\[[^\[\]]*\]')
+_TAG_OPENERS = ('⟦', '{', '[')
+_LETTER_PATTERN = re.compile(r'[^\W\d_]')
+
+class IssueKind:
+    """Per-key response issue constants, as reported by Validator.diagnose"""
+    MISSING = "missing"            # expected key absent from the response
+    UNEXPECTED = "unexpected"      # response key that was not sent
+    EMPTY = "empty"                # empty (or non-text) translation of a non-empty source
+    IDENTICAL = "identical"        # translation equal to a source that contains letters
+    TAG_MISMATCH = "tag_mismatch"  # markup dropped, duplicated or invented
+    LENGTH_RATIO = "length_ratio"  # translation/source length ratio outside the configured range
+
+# Issues that make a key invalid (re-requested) by default; the others are only reported
+BLOCKING_ISSUES = (IssueKind.MISSING, IssueKind.EMPTY, IssueKind.TAG_MISMATCH)
+
+@dataclass(frozen=True)
+class KeyIssue:
+    """An issue found with one key of a response"""
+    key: str
+    kind: str  # IssueKind value
+    detail: str = ""
 
 class ValidationStrategy(ABC):
     """Abstract base class for validation strategies"""
@@ -25,15 +54,25 @@ class ValidationStrategy(ABC):
 class JSONValidationStrategy(ValidationStrategy):
     """Strategy for validating JSON responses"""
     
-    def __init__(self, strict: bool = True, allow_partial: bool = False):
+    def __init__(self, strict: bool = True, allow_partial: bool = False, repair: bool = True):
         """
         Initialize JSON validation strategy
         :param strict: Whether to enforce strict JSON validation
         :param allow_partial: Whether to allow partial JSON responses
+        :param repair: Whether to repair malformed JSON (trailing commas, smart or unescaped quotes,
+                       raw line breaks, missing commas, truncation) instead of rejecting the response
         """
         self.strict = strict
         self.allow_partial = allow_partial
+        self.repair = repair
         self.logger = get_logger("JSONValidationStrategy")
+        self._lock = threading.Lock()
+        self.stats = {
+            'responses': 0,
+            'repaired_responses': 0,
+            'unparseable_responses': 0,
+            'repairs': {}
+        }
     
     def validate(self, response: str) -> Tuple[bool, Optional[str], Optional[Dict[str, Any]]]:
         """
@@ -42,11 +81,16 @@ class JSONValidationStrategy(ValidationStrategy):
         :return: Tuple of (is_valid, error_message, parsed_data)
         """
         try:
-            # Clean the response
-            cleaned_response = self._clean_response(response)
+            with self._lock:
+                self.stats['responses'] += 1
             
-            # Try to parse as JSON
-            parsed_data = json.loads(cleaned_response)
+            # Extract the outermost object, repairing it when it does not parse as is
+            parsed_data, repairs = parse_json_object(response, self.repair)
+            if parsed_data is None:
+                with self._lock:
+                    self.stats['unparseable_responses'] += 1
+                raise json.JSONDecodeError("No JSON object found", response, 0)
+            self._record_repairs(repairs)
             
             # Additional validation if strict mode
             if self.strict:
@@ -55,48 +99,42 @@ class JSONValidationStrategy(ValidationStrategy):
                     return validation_result
             
             return True, None, parsed_data
-            
+        
         except json.JSONDecodeError as e:
             error_msg = f"Invalid JSON format: {str(e)}"
             self.logger.warning(f"JSON validation failed: {error_msg}")
             return False, error_msg, None
-            
+        
         except Exception as e:
             error_msg = f"Validation error: {str(e)}"
             self.logger.error(f"Unexpected validation error: {error_msg}")
             return False, error_msg, None
     
-    def _clean_response(self, response: str) -> str:
+    def _record_repairs(self, repairs: List[str]) -> None:
         """
-        Clean the response string before parsing
-        :param response: Raw response string
-        :return: Cleaned response string
+        Count the repairs applied to a response
+        :param repairs: RepairKind values reported by parse_json_object
         """
-        # Remove common prefixes/suffixes that might be added by AI
-        response = response.strip()
-        
-        # Remove markdown code blocks if present
-        response = re.sub(r'^```json\s*', '', response)
-        response = re.sub(r'\s*```$', '', response)
-        
-        # Remove extra text before/after JSON
-        lines = response.split('\n')
-        json_lines = []
-        in_json = False
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('{') or line.startswith('['):
-                in_json = True
-            if in_json:
-                json_lines.append(line)
-            if line.endswith('}') or line.endswith(']'):
-                break
-        
-        if json_lines:
-            return '\n'.join(json_lines)
-        
-        return response
+        structural = [kind for kind in repairs if kind != RepairKind.EXTRACTED]
+        if structural:
+            self.logger.info(f"Repaired JSON response: {', '.join(structural)}")
+        with self._lock:
+            if structural:
+                self.stats['repaired_responses'] += 1
+            for kind in repairs:
+                self.stats['repairs'][kind] = self.stats['repairs'].get(kind, 0) + 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get JSON validation statistics
+        :return: Response, repair and parse failure counts
+        """
+        with self._lock:
+            return {
+                "strategy": type(self).__name__,
+                **self.stats,
+                'repairs': dict(self.stats['repairs'])
+            }
     
     def _strict_validation(self, data: Any) -> Tuple[bool, Optional[str], Optional[Dict[str, Any]]]:
         """
@@ -124,6 +162,34 @@ class JSONValidationStrategy(ValidationStrategy):
         
         return True, None, data
 
+class LineValidationStrategy(ValidationStrategy):
+    """Strategy for validating line-numbered ("<key>\t<text>") responses"""
+    
+    def __init__(self, fallback: Optional[ValidationStrategy] = None):
+        """
+        Initialize line validation strategy
+        :param fallback: Strategy for responses the model wrote as JSON anyway
+        """
+        self.fallback = fallback or JSONValidationStrategy()
+        self.logger = get_logger("LineValidationStrategy")
+    
+    def validate(self, response: str) -> Tuple[bool, Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Validate line-numbered response
+        :param response: Raw response string to validate
+        :return: Tuple of (is_valid, error_message, parsed_data)
+        """
+        stripped = re.sub(r'^```\w*\s*|\s*```$', '', response.strip())
+        if stripped.startswith('{'):
+            return self.fallback.validate(stripped)
+        
+        parsed_data = decode_lines(stripped)
+        if parsed_data is None:
+            error_msg = "Response contains no numbered lines"
+            self.logger.warning(f"Line validation failed: {error_msg}")
+            return False, error_msg, None
+        return True, None, parsed_data
+
 class ValidationError(Exception):
     """Custom exception for validation errors"""
     def __init__(self, message: str, error_type: str = "validation"):
@@ -134,13 +200,23 @@ class ValidationError(Exception):
 class Validator:
     """Main validator class that uses strategy pattern"""
     
-    def __init__(self, strategy: ValidationStrategy = None):
+    def __init__(self, strategy: ValidationStrategy = None, blocking_issues: Iterable[str] = BLOCKING_ISSUES,
+                 length_ratio: Tuple[float, float] = (0.3, 3.0), min_ratio_chars: int = 12):
         """
         Initialize validator with a validation strategy
         :param strategy: Validation strategy to use (defaults to JSONValidationStrategy)
+        :param blocking_issues: IssueKind values that make a key invalid (missing keys always do)
+        :param length_ratio: (min, max) translation/source length ratio; outside it a key gets a length_ratio issue
+        :param min_ratio_chars: Shortest source whose length ratio is checked
         """
         self.strategy = strategy or JSONValidationStrategy()
+        self.line_strategy = LineValidationStrategy(self.strategy)
+        self.blocking_issues = frozenset(blocking_issues) | {IssueKind.MISSING}
+        self.min_length_ratio, self.max_length_ratio = length_ratio
+        self.min_ratio_chars = min_ratio_chars
         self.logger = get_logger("Validator")
+        self._lock = threading.Lock()
+        self.issue_counts: Dict[str, int] = {}
     
     def set_strategy(self, strategy: ValidationStrategy) -> None:
         """
@@ -148,6 +224,7 @@ class Validator:
         :param strategy: New validation strategy
         """
         self.strategy = strategy
+        self.line_strategy = LineValidationStrategy(strategy)
         self.logger.info(f"Validation strategy changed to: {type(strategy).__name__}")
     
     def validate(self, response: str) -> Tuple[bool, Optional[str], Optional[Dict[str, Any]]]:
@@ -175,11 +252,107 @@ class Validator:
         
         return parsed_data
     
+    def salvage(self, response: str, expected: Dict[str, Any],
+                encoding: str = PayloadEncoding.JSON) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Keep the valid entries of a response and report the expected keys that are missing or invalid
+        :param response: Raw response string to validate
+        :param expected: Source entries that were sent, keyed like the response
+        :param encoding: PayloadEncoding the entries were sent in (the response is expected in kind)
+        :return: Tuple of (valid translations of expected keys, missing or invalid keys)
+        """
+        valid, invalid, _ = self.diagnose_response(response, expected, encoding)
+        return valid, invalid
+    
+    def diagnose_response(self, response: str, expected: Dict[str, Any], encoding: str = PayloadEncoding.JSON
+                          ) -> Tuple[Dict[str, Any], List[str], List[KeyIssue]]:
+        """
+        Parse a response and diagnose it key by key against the entries that were sent
+        :param response: Raw response string to validate
+        :param expected: Source entries that were sent, keyed like the response
+        :param encoding: PayloadEncoding the entries were sent in (the response is expected in kind)
+        :return: Tuple of (valid translations of expected keys, keys with a blocking issue, all issues)
+        """
+        if encoding == PayloadEncoding.LINES:
+            is_valid, error_msg, parsed_data = self.line_strategy.validate(response)
+        else:
+            is_valid, error_msg, parsed_data = self.validate(response)
+        if not is_valid:
+            self.logger.warning(f"Response rejected, all {len(expected)} keys are invalid: {error_msg}")
+            issues = [KeyIssue(key, IssueKind.MISSING, error_msg or "") for key in expected]
+            self._count_issues(issues)
+            return {}, list(expected), issues
+        
+        issues = self.diagnose(expected, parsed_data)
+        blocked = {issue.key for issue in issues if issue.kind in self.blocking_issues}
+        valid = {key: parsed_data[key] for key in expected if key not in blocked}
+        invalid = [key for key in expected if key in blocked]
+        
+        reported = Counter(issue.kind for issue in issues if issue.kind not in self.blocking_issues)
+        if reported:
+            self.logger.info("Response issues kept: " + ", ".join(f"{kind}={count}" for kind, count in reported.items()))
+        return valid, invalid, issues
+    
+    def diagnose(self, expected: Dict[str, Any], translations: Dict[str, Any]) -> List[KeyIssue]:
+        """
+        Diagnose translations against their sources in one pass over the keys
+        :param expected: Source entries (the request's standardized dictionary)
+        :param translations: Translated entries keyed like expected
+        :return: Issues in key order (expected keys first, then unexpected ones)
+        """
+        issues = []
+        for key, source in expected.items():
+            translation = translations.get(key)
+            if translation is None:
+                issues.append(KeyIssue(key, IssueKind.MISSING))
+                continue
+            if not isinstance(source, str):
+                continue
+            if not isinstance(translation, str):
+                issues.append(KeyIssue(key, IssueKind.EMPTY, f"{type(translation).__name__} value"))
+                continue
+            
+            source_text, translated_text = source.strip(), translation.strip()
+            if not translated_text:
+                if source_text:
+                    issues.append(KeyIssue(key, IssueKind.EMPTY))
+                continue
+            if translated_text == source_text:
+                if _LETTER_PATTERN.search(source_text):
+                    issues.append(KeyIssue(key, IssueKind.IDENTICAL))
+                continue
+            
+            # Only texts with a possible tag opener are scanned for markup
+            if any(opener in source for opener in _TAG_OPENERS) or any(opener in translation for opener in _TAG_OPENERS):
+                source_tags = Counter(_TAG_PATTERN.findall(source))
+                translated_tags = Counter(_TAG_PATTERN.findall(translation))
+                if source_tags != translated_tags:
+                    lost = ", ".join((source_tags - translated_tags).elements())
+                    added = ", ".join((translated_tags - source_tags).elements())
+                    issues.append(KeyIssue(key, IssueKind.TAG_MISMATCH, f"lost: {lost}; added: {added}"))
+            
+            if len(source_text) >= self.min_ratio_chars:
+                ratio = len(translated_text) / len(source_text)
+                if not self.min_length_ratio <= ratio <= self.max_length_ratio:
+                    issues.append(KeyIssue(key, IssueKind.LENGTH_RATIO, f"{ratio:.2f}"))
+        
+        issues.extend(KeyIssue(key, IssueKind.UNEXPECTED) for key in translations if key not in expected)
+        self._count_issues(issues)
+        return issues
+    
+    def _count_issues(self, issues: List[KeyIssue]) -> None:
+        """Add issues to the per-kind counts (diagnose runs on the pipeline's worker threads)"""
+        counts = Counter(issue.kind for issue in issues)
+        with self._lock:
+            for kind, count in counts.items():
+                self.issue_counts[kind] = self.issue_counts.get(kind, 0) + count
+    
     def get_validation_stats(self) -> Dict[str, Any]:
         """
         Get validation statistics
         :return: Dictionary with validation statistics
         """
-        if hasattr(self.strategy, 'get_stats'):
-            return self.strategy.get_stats()
-        return {"strategy": type(self.strategy).__name__}
\ No newline at end of file
+        stats = self.strategy.get_stats() if hasattr(self.strategy, 'get_stats') else {"strategy": type(self.strategy).__name__}
+        with self._lock:
+            issues = dict(self.issue_counts)
+        return {**stats, 'issues': issues}
\ No newline at end of file
@@ -28,6 +28,13 @@ async def main():
     print(f"📁 Output: {output_dir}")
     print(f"🔍 Pattern: chunk_*.json")
     print(f"⚙️  Config: {config_path}")
+    
+    # --languages=vi,ja translates every file into each language (output_dir/<language>/)
+    target_languages = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--languages="):
+            target_languages = [language.strip() for language in arg.split("=", 1)[1].split(",") if language.strip()]
+            print(f"🌍 Languages: {', '.join(target_languages)}")
     print()
     
     try:
@@ -35,6 +42,26 @@ async def main():
         print("🔧 Initializing translation system...")
         applet = TranslationApplet(config_path)
         
+        if "--plan" in sys.argv:
+            # Dry run: estimate the batch without sending any request
+            plan = applet.plan_batch_from_directory(input_dir, pattern="chunk_*.json", output_dir=output_dir)
+            print("\n🧮 BATCH PLAN (dry run)")
+            print("-" * 30)
+            print(f"📄 Files: {plan['total_files']} ({plan['skipped']} already completed, "
+                  f"{len(plan['unreadable_files'])} unreadable)")
+            print(f"🔤 Entries: {plan['total_entries']} total, {plan['cached_entries']} cached, "
+                  f"{plan['deduplicated_entries']} deduplicated, {plan['sent_entries']} sent")
+            print(f"📨 Requests: {plan['requests']}")
+            print(f"🪙 Tokens: {plan['prompt_tokens']} prompt ({plan['static_prompt_tokens']} static prefix) + "
+                  f"{plan['completion_tokens']} completion")
+            print(f"💰 Estimated cost: ${plan['estimated_cost']:.4f}")
+            if plan['eta_seconds'] is not None:
+                print(f"⏱️  ETA: {plan['eta_seconds'] / 60:.1f} min with {plan['keys']} keys "
+                      f"(bound by {plan['bottleneck']})")
+            else:
+                print(f"⏱️  ETA: unknown ({plan['bottleneck']})")
+            return
+        
         # Perform health check
         print("🏥 Performing health check...")
         if await applet.health_check():
@@ -63,7 +90,8 @@ async def main():
         summary = await applet.translate_batch_from_directory(
             input_dir=input_dir,
             output_dir=output_dir,
-            pattern="chunk_*.json"
+            pattern="chunk_*.json",
+            target_languages=target_languages
         )
         
         # Display results
@@ -104,7 +132,7 @@ async def main():
         print(f"\n🎯 Framework: Refactored Architecture")
         print(f"🏗️  Middleware: CoreManager + Services")
         print(f"🔧 Applet: Single TranslationApplet")
-        
+    
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
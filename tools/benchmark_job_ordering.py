@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch job ordering (filename / LPT / SJF) against a mock translation client
+
+This script will:
+1. Build a synthetic mixed-size batch from the playground chunks (one huge chunk last by name)
+2. Run it through CoreManager with the offline MockTranslationClient for each ordering policy
+3. Report makespan (batch wall time) and mean job completion time per policy
+
+Usage:
+    python3 tools/benchmark_job_ordering.py [--files 24] [--lanes 4]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.chdir(PROJECT_ROOT)
+
+from middleware import CoreManager
+from services.infrastructure import JobOrdering
+from services.test_support.mock_translation_client import MockTranslationClient
+
+def build_corpus(corpus_dir: Path, num_files: int, seed: int) -> None:
+    """Write a mixed-size batch of chunk files built from the playground entries"""
+    entries = []
+    for chunk_path in sorted(Path("playground").glob("chunk_*.json")):
+        with open(chunk_path, 'r', encoding='utf-8') as f:
+            entries.extend(json.load(f).values())
+    
+    rng = random.Random(seed)
+    for i in range(1, num_files + 1):
+        # Mostly small chunks, a few large ones, and the largest one last by file name
+        if i == num_files:
+            size = 400
+        elif rng.random() < 0.15:
+            size = rng.randint(150, 300)
+        else:
+            size = rng.randint(10, 60)
+        chunk = {str(k): rng.choice(entries) for k in range(size)}
+        with open(corpus_dir / f"chunk_{i}.json", 'w', encoding='utf-8') as f:
+            json.dump(chunk, f, ensure_ascii=False, indent=2)
+
+def write_benchmark_config(config_path: Path) -> None:
+    """Write a copy of config/config.yaml without the journal, concurrency control, memory or anomaly checks"""
+    with open("config/config.yaml", 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    config["journal"] = {"enabled": False}
+    config["concurrency"] = {"enabled": False}
+    config["translation_memory"] = {"enabled": False}
+    config["anomaly_detection"] = {"enabled": False}
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f)
+
+async def run_ordering(config_path: Path, corpus_dir: Path, output_dir: Path,
+                       ordering: str, lanes: int) -> dict:
+    """Run the batch once with the given ordering and measure completion times"""
+    core_manager = CoreManager(str(config_path), api_keys=["mock-key"])
+    core_manager.request_manager.api_client = MockTranslationClient(
+        core_manager.key_manager, core_manager.request_manager.logger
+    )
+    core_manager.key_manager.max_requests_per_minute = 10 ** 9
+    
+    file_paths = sorted(corpus_dir.glob("chunk_*.json"), key=lambda p: core_manager._extract_file_number(p.name))
+    jobs = [(f"job_{p.stem}", str(p), str(output_dir / p.name)) for p in file_paths]
+    jobs = core_manager._order_jobs(jobs, ordering)
+    
+    semaphore = asyncio.Semaphore(lanes)
+    completion_times = []
+    start_time = time.perf_counter()
+    
+    async def run_job(input_path: str, output_path: str) -> None:
+        async with semaphore:
+            await core_manager._execute_translation_job(input_path, output_path)
+            completion_times.append(time.perf_counter() - start_time)
+    
+    await asyncio.gather(*[run_job(input_path, output_path) for _, input_path, output_path in jobs])
+    
+    return {
+        "ordering": ordering,
+        "makespan": max(completion_times),
+        "mean_completion": sum(completion_times) / len(completion_times)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch job ordering policies")
+    parser.add_argument("--files", type=int, default=24, help="Number of chunk files")
+    parser.add_argument("--lanes", type=int, default=4, help="Concurrent request lanes")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the corpus")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        corpus_dir = tmp_path / "corpus"
+        corpus_dir.mkdir()
+        build_corpus(corpus_dir, args.files, args.seed)
+        config_path = tmp_path / "config.yaml"
+        write_benchmark_config(config_path)
+        
+        results = []
+        for ordering in (JobOrdering.FILENAME, JobOrdering.LPT, JobOrdering.SJF):
+            output_dir = tmp_path / f"output_{ordering}"
+            results.append(asyncio.run(run_ordering(config_path, corpus_dir, output_dir, ordering, args.lanes)))
+    
+    print(f"\n{args.files} files, {args.lanes} lanes, mock provider")
+    print(f"{'ordering':<10} {'makespan (s)':>14} {'mean completion (s)':>21}")
+    for result in results:
+        print(f"{result['ordering']:<10} {result['makespan']:>14.2f} {result['mean_completion']:>21.2f}")
+
+if __name__ == "__main__":
+    main()
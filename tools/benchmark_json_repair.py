@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON response repair against the previous line-based cleaner
+
+This script will:
+1. Build mock responses from the playground chunks (requests of --request-size entries)
+2. Inject one common model defect per response (code fence and prose, trailing comma, typographic quotes,
+   unescaped inner quotes, raw line breaks, missing commas, truncation) or leave it clean
+3. Parse every response with the previous cleaner (strip fences, keep lines from "{" to "}") and with
+   Validator.salvage, and report per defect how many responses and keys would be re-requested
+
+Usage:
+    python3 tools/benchmark_json_repair.py [--request-size 40] [--seed 7]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.chdir(PROJECT_ROOT)
+
+from services.translation import Standardizer, Validator
+
+def legacy_clean(response: str) -> str:
+    """The cleaner JSONValidationStrategy used before repair (kept here for comparison)"""
+    response = response.strip()
+    response = re.sub(r'^```json\s*', '', response)
+    response = re.sub(r'\s*```$', '', response)
+    json_lines = []
+    in_json = False
+    for line in response.split('\n'):
+        line = line.strip()
+        if line.startswith('{') or line.startswith('['):
+            in_json = True
+        if in_json:
+            json_lines.append(line)
+        if line.endswith('}') or line.endswith(']'):
+            break
+    return '\n'.join(json_lines) if json_lines else response
+
+def legacy_invalid_keys(response: str, expected: dict) -> list:
+    """Keys the previous cleaner would re-request (all of them when the response does not parse)"""
+    try:
+        data = json.loads(legacy_clean(response))
+    except json.JSONDecodeError:
+        return list(expected)
+    if not isinstance(data, dict):
+        return list(expected)
+    return [key for key in expected if not isinstance(data.get(key), str) or not data[key].strip()]
+
+def inject_defect(entries: dict, defect: str, rng: random.Random) -> str:
+    """Serialize a mock translation of the entries with one defect"""
+    if defect == "inner_quotes":
+        key = rng.choice(list(entries))
+        entries = {**entries, key: entries[key] + ' - "không" đâu'}
+    if defect == "control_characters":
+        key = rng.choice(list(entries))
+        entries = {**entries, key: entries[key].replace(" ", "\x00", 1)}
+    
+    body = json.dumps(entries, ensure_ascii=False, indent=2)
+    if defect == "inner_quotes":
+        body = body.replace('\\"', '"')
+    elif defect == "control_characters":
+        # Source texts may hold literal "\n" escapes, so the raw line break is marked with NUL
+        body = body.replace('\\u0000', '\n')
+    elif defect == "extracted":
+        body = f"Here is the translation:\n```json\n{body}\n```\nLet me know if you need changes."
+    elif defect == "trailing_commas":
+        body = body[:body.rindex('"') + 1] + ",\n}"
+    elif defect == "smart_quotes":
+        body = re.sub(r'"(\d+)": "', r'“\1”: “', body).replace('",\n', '”,\n')
+    elif defect == "missing_commas":
+        lines = body.split("\n")
+        line = rng.randrange(1, len(lines) - 2)
+        lines[line] = lines[line].rstrip(',')
+        body = "\n".join(lines)
+    elif defect == "truncated":
+        body = body[:int(len(body) * rng.uniform(0.5, 0.95))]
+    return body
+
+DEFECTS = ["clean", "extracted", "trailing_commas", "smart_quotes", "inner_quotes",
+           "control_characters", "missing_commas", "truncated"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON response repair")
+    parser.add_argument("--input-dir", default="playground", help="Directory with the input chunks")
+    parser.add_argument("--pattern", default="chunk_*.json", help="Input file pattern")
+    parser.add_argument("--request-size", type=int, default=40, help="Entries per mock response")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for defect placement")
+    args = parser.parse_args()
+    
+    standardizer = Standardizer()
+    entries = []
+    for path in sorted(Path(args.input_dir).glob(args.pattern)):
+        entries.extend(value for value in standardizer.standardize(str(path)).values() if isinstance(value, str))
+    if not entries:
+        print(f"No files matching {args.pattern} in {args.input_dir}")
+        return
+    requests = [
+        {str(k): text for k, text in enumerate(entries[i:i + args.request_size])}
+        for i in range(0, len(entries), args.request_size)
+    ]
+    
+    rng = random.Random(args.seed)
+    validator = Validator()
+    print(f"\n{len(requests)} mock responses of up to {args.request_size} entries per defect")
+    print(f"{'defect':<20} {'legacy retries':>15} {'repair retries':>15} {'legacy keys':>12} {'repair keys':>12}")
+    totals = [0, 0, 0, 0]
+    legacy_time = repair_time = 0.0
+    for defect in DEFECTS:
+        row = [0, 0, 0, 0]
+        for expected in requests:
+            response = inject_defect(expected, defect, rng)
+            
+            start = time.perf_counter()
+            legacy_keys = legacy_invalid_keys(response, expected)
+            legacy_time += time.perf_counter() - start
+            start = time.perf_counter()
+            _, repair_keys = validator.salvage(response, expected)
+            repair_time += time.perf_counter() - start
+            
+            row[0] += bool(legacy_keys)
+            row[1] += bool(repair_keys)
+            row[2] += len(legacy_keys)
+            row[3] += len(repair_keys)
+        totals = [total + value for total, value in zip(totals, row)]
+        print(f"{defect:<20} {row[0] / len(requests):>15.1%} {row[1] / len(requests):>15.1%} "
+              f"{row[2]:>12} {row[3]:>12}")
+    
+    responses = len(requests) * len(DEFECTS)
+    print(f"{'total':<20} {totals[0] / responses:>15.1%} {totals[1] / responses:>15.1%} "
+          f"{totals[2]:>12} {totals[3]:>12}")
+    print(f"\nparse time: legacy {legacy_time * 1000:.1f} ms, repair {repair_time * 1000:.1f} ms")
+    print(f"repairs: {validator.get_validation_stats()['repairs']}")
+
+if __name__ == "__main__":
+    main()
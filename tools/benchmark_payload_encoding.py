@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark payload encodings by token cost
+
+This script will:
+1. Load the playground chunks through the standardizer
+2. Encode each chunk with every payload encoding (indented JSON, minified JSON, line-numbered text)
+3. Count payload tokens with the tokenizer configured in config/config.yaml and report tokens per entry,
+   plus the one-off prompt tokens each encoding adds to the static prefix
+
+Usage:
+    python3 tools/benchmark_payload_encoding.py [--input-dir playground] [--pattern "chunk_*.json"]
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.chdir(PROJECT_ROOT)
+
+from services.common.token_counter import TokenCounter
+from services.infrastructure import ConfigManager
+from services.translation import Standardizer, PayloadEncoding
+from services.translation.payload_encoding import resolve_encoding, encode_payload
+
+ENCODINGS = [PayloadEncoding.JSON_INDENT, PayloadEncoding.JSON, PayloadEncoding.LINES]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark payload encodings by token cost")
+    parser.add_argument("--input-dir", default="playground", help="Directory with the input chunks")
+    parser.add_argument("--pattern", default="chunk_*.json", help="Input file pattern")
+    args = parser.parse_args()
+    
+    config_manager = ConfigManager("config/config.yaml")
+    tokenizer_config = config_manager.get_tokenizer_config()
+    token_counter = TokenCounter(
+        tokenizer_name=tokenizer_config.get("name"),
+        chars_per_token=tokenizer_config.get("chars_per_token", 4.0)
+    )
+    standardizer = Standardizer()
+    
+    chunks = [standardizer.standardize(str(path)) for path in sorted(Path(args.input_dir).glob(args.pattern))]
+    if not chunks:
+        print(f"No files matching {args.pattern} in {args.input_dir}")
+        return
+    entries = sum(len(chunk) for chunk in chunks)
+    
+    print(f"\n{len(chunks)} files, {entries} entries, tokenizer: {tokenizer_config.get('name') or 'character heuristic'}")
+    print(f"{'encoding':<12} {'tokens':>8} {'tokens/entry':>13} {'vs json_indent':>15} {'fallbacks':>10} {'prompt tok':>11}")
+    baseline = None
+    for encoding in ENCODINGS:
+        tokens = 0
+        fallbacks = 0
+        for chunk in chunks:
+            used = resolve_encoding(chunk, encoding)
+            fallbacks += used != encoding
+            tokens += token_counter.count_text(encode_payload(chunk, used))
+        baseline = baseline or tokens
+        # The line format adds its rules to the static (cacheable) prompt prefix once per request
+        prompt_tokens = token_counter.count_text(config_manager.get_prompt("lines_format_rules", "")) \
+            if encoding == PayloadEncoding.LINES else 0
+        print(f"{encoding:<12} {tokens:>8} {tokens / entries:>13.2f} {tokens / baseline - 1:>+15.1%} "
+              f"{fallbacks:>10} {prompt_tokens:>11}")
+
+if __name__ == "__main__":
+    main()
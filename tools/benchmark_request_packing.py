@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark token-budget request packing against a mock translation client
+
+This script will:
+1. Build a synthetic mixed-size batch from the playground chunks (many small chunks, a few large ones)
+2. Run it through the batch pipeline with the offline MockTranslationClient for each request token budget
+3. Report requests sent, entries and payload tokens per request, prompt overhead tokens,
+   the minutes of RPM quota the batch consumes, the prompt prefix cache hit ratio and the makespan
+
+Usage:
+    python3 tools/benchmark_request_packing.py [--files 40] [--lanes 4] [--rpm 20] [--budgets none 1000 2000 4000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.chdir(PROJECT_ROOT)
+
+from middleware import CoreManager
+from services.common.api_client import message_text
+from services.test_support.mock_translation_client import MockTranslationClient
+
+def build_corpus(corpus_dir: Path, num_files: int, seed: int) -> None:
+    """Write a mixed-size batch of chunk files built from the playground entries"""
+    entries = []
+    for chunk_path in sorted(Path("playground").glob("chunk_*.json")):
+        with open(chunk_path, 'r', encoding='utf-8') as f:
+            entries.extend(json.load(f).values())
+    
+    rng = random.Random(seed)
+    for i in range(1, num_files + 1):
+        # Mostly small chunks and a few large ones
+        size = rng.randint(150, 300) if rng.random() < 0.1 else rng.randint(3, 30)
+        chunk = {str(k): rng.choice(entries) for k in range(size)}
+        with open(corpus_dir / f"chunk_{i}.json", 'w', encoding='utf-8') as f:
+            json.dump(chunk, f, ensure_ascii=False, indent=2)
+
+def write_benchmark_config(config_path: Path, token_budget) -> None:
+    """Write a copy of config/config.yaml with the given token budget and no journal, memory or deduplication"""
+    with open("config/config.yaml", 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    config["journal"] = {"enabled": False}
+    config["concurrency"] = {"enabled": False}
+    config["translation_memory"] = {"enabled": False}
+    config["anomaly_detection"] = {"enabled": False}
+    config["pipeline"]["deduplicate"] = False
+    config["translation"]["request_token_budget"] = token_budget
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f)
+
+async def run_budget(config_path: Path, corpus_dir: Path, output_dir: Path, lanes: int) -> dict:
+    """Run the batch once and measure requests, prompt tokens and wall time"""
+    core_manager = CoreManager(str(config_path), api_keys=["mock-key"])
+    core_manager.request_manager.api_client = MockTranslationClient(
+        core_manager.key_manager, core_manager.request_manager.logger
+    )
+    core_manager.key_manager.max_requests_per_minute = 10 ** 9
+    token_counter = core_manager.token_counter
+    
+    totals = {"requests": 0, "prompt_tokens": 0, "payload_tokens": 0}
+    send_request = core_manager._send_request
+    
+    async def counting_send_request(request_data):
+        messages = request_data["messages"]
+        totals["requests"] += 1
+        totals["prompt_tokens"] += sum(token_counter.count_text(message_text(m)) for m in messages)
+        totals["payload_tokens"] += token_counter.count_text(message_text(messages[-1]))
+        return await send_request(request_data)
+    
+    core_manager._send_request = counting_send_request
+    
+    file_paths = sorted(corpus_dir.glob("chunk_*.json"), key=lambda p: core_manager._extract_file_number(p.name))
+    jobs = [(str(p), str(output_dir / p.name)) for p in file_paths]
+    
+    start_time = time.perf_counter()
+    results = await core_manager.translate_files(jobs, max_concurrent=lanes)
+    makespan = time.perf_counter() - start_time
+    
+    usage = core_manager.request_manager.usage_counters
+    return {
+        **totals,
+        "cache_hit_ratio": usage["cached_tokens"] / usage["prompt_tokens"] if usage["prompt_tokens"] else 0.0,
+        "failed": sum(1 for result in results if result.get("status") != "success"),
+        "entries": sum(len(json.loads(Path(p).read_text(encoding='utf-8'))) for p in file_paths),
+        "makespan": makespan
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark token-budget request packing")
+    parser.add_argument("--files", type=int, default=40, help="Number of chunk files")
+    parser.add_argument("--lanes", type=int, default=4, help="Concurrent request lanes")
+    parser.add_argument("--rpm", type=int, default=20, help="Requests per minute allowed per key")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the corpus")
+    parser.add_argument("--budgets", nargs="+", default=["none", "1000", "2000", "4000"],
+                        help="Request token budgets to compare (\"none\" = one request per file)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        corpus_dir = tmp_path / "corpus"
+        corpus_dir.mkdir()
+        build_corpus(corpus_dir, args.files, args.seed)
+        
+        results = []
+        for budget in args.budgets:
+            token_budget = None if budget.lower() == "none" else int(budget)
+            config_path = tmp_path / f"config_{budget}.yaml"
+            write_benchmark_config(config_path, token_budget)
+            result = asyncio.run(run_budget(config_path, corpus_dir, tmp_path / f"output_{budget}", args.lanes))
+            results.append({"budget": budget, **result})
+    
+    print(f"\n{args.files} files, {results[0]['entries']} entries, {args.lanes} lanes, mock provider")
+    print(f"{'budget':<8} {'requests':>9} {'entries/req':>12} {'payload/req':>12} "
+          f"{'overhead tok':>13} {'RPM minutes':>12} {'cache hit':>10} {'makespan (s)':>13} {'failed':>7}")
+    for result in results:
+        requests = result["requests"] or 1
+        print(f"{result['budget']:<8} {result['requests']:>9} {result['entries'] / requests:>12.1f} "
+              f"{result['payload_tokens'] / requests:>12.0f} "
+              f"{result['prompt_tokens'] - result['payload_tokens']:>13} "
+              f"{result['requests'] / args.rpm:>12.2f} {result['cache_hit_ratio']:>10.1%} "
+              f"{result['makespan']:>13.2f} {result['failed']:>7}")
+
+if __name__ == "__main__":
+    main()